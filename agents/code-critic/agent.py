@@ -17,13 +17,15 @@ import sys
 import re
 import subprocess
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from shared.analysis_cache import AnalysisCache
 from shared.base_agent import BaseAgent
+from shared.commit_context import CommitContext
 from shared.confidence import ProactivityQueue
 
 
@@ -35,6 +37,9 @@ class CodeCriticAgent(BaseAgent):
     rather than just implementing features.
     """
 
+    # Bump when review logic changes in ways the rules don't capture
+    REVIEW_VERSION = 1
+
     def __init__(
         self,
         anthropic_api_key: str,
@@ -128,6 +133,17 @@ class CodeCriticAgent(BaseAgent):
             }
         }
 
+        # File reviews cached by content; version tracks the rule definitions
+        self.analysis_cache = AnalysisCache()
+        self.ruleset_version = AnalysisCache.ruleset_version(
+            self.REVIEW_VERSION,
+            {
+                name: {k: v for k, v in rule.items() if k != "context_check"}
+                for rules in (self.security_rules, self.performance_rules, self.best_practice_rules)
+                for name, rule in rules.items()
+            }
+        )
+
     def get_system_prompt(self) -> str:
         """Return code-critic specific system prompt"""
         return """You are the Code Critic Agent, an adversarial reviewer for FibreFlow.
@@ -214,11 +230,17 @@ Remember: Better to flag a potential issue than miss a real one."""
     def _review_commit(
         self,
         commit_hash: str,
-        review_types: List[str]
+        review_types: List[str],
+        context: Optional[CommitContext] = None
     ) -> Dict[str, Any]:
         """
         Perform adversarial review on a commit.
 
+        Args:
+            commit_hash: Commit to review
+            review_types: Rule sets to run
+            context: Pre-parsed commit (avoids running git again)
+
         Returns:
             {
                 commit: str,
@@ -230,22 +252,39 @@ Remember: Better to flag a potential issue than miss a real one."""
                 issues: [...]
             }
         """
-        # Get commit diff
+        if context is not None:
+            added_lines = context.added_lines
+        else:
+            added_lines = self._get_commit_additions(commit_hash)
+            if isinstance(added_lines, dict):
+                return added_lines  # Error result
+
+        issues = self._review_lines(added_lines, review_types)
+
+        return self._record_review(commit_hash, issues)
+
+    def _get_commit_additions(self, commit_hash: str):
+        """
+        Get the lines added by a commit.
+
+        Returns:
+            List of {file, line, content} dicts, or an {error} dict
+        """
         try:
-            result = subprocess.run(
-                ["git", "show", commit_hash, "--unified=5"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            diff = result.stdout
+            return CommitContext.from_git(commit_hash, str(self.repo_path)).added_lines
         except subprocess.CalledProcessError as e:
             return {"error": f"Failed to get commit: {e}"}
 
-        # Parse diff for added lines
-        added_lines = self._parse_diff(diff)
+    def _review_lines(
+        self,
+        added_lines: List[Dict[str, Any]],
+        review_types: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the requested rule sets over added lines.
 
+        Pure CPU work with no I/O, so callers may shard it per file.
+        """
         issues = []
 
         # Run requested reviews
@@ -258,15 +297,26 @@ Remember: Better to flag a potential issue than miss a real one."""
         if "all" in review_types or "best_practices" in review_types:
             issues.extend(self._check_best_practices(added_lines))
 
-        # Add issues to proactivity queue
-        for issue in issues:
-            self.queue.add_task(
-                task_type=issue["category"],
-                description=issue["description"],
-                file=issue["file"],
-                line=issue.get("line"),
-                context={"commit": commit_hash, "severity": issue["severity"]}
-            )
+        return issues
+
+    def _record_review(self, commit_hash: str, issues: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Queue review issues and build the review summary."""
+        # Add issues to proactivity queue (single write)
+        self.queue.add_tasks(
+            {
+                "type": issue["category"],
+                "description": issue["description"],
+                "file": issue["file"],
+                "line": issue.get("line"),
+                "context": {
+                    "commit": commit_hash,
+                    "severity": issue["severity"],
+                    "code_snippet": issue.get("code_snippet"),
+                    "rule": issue["rule"]
+                }
+            }
+            for issue in issues
+        )
 
         # Count by severity
         severity_counts = {
@@ -291,63 +341,31 @@ Remember: Better to flag a potential issue than miss a real one."""
             return {"error": f"File not found: {file_path}"}
 
         # Read file content
-        with open(file_full_path, 'r') as f:
-            lines = f.readlines()
-
-        # Convert to format similar to diff
-        added_lines = [
-            {"file": file_path, "line": i+1, "content": line.rstrip()}
-            for i, line in enumerate(lines)
+        with open(file_full_path, 'rb') as f:
+            data = f.read()
+
+        def review():
+            # Convert to format similar to diff
+            added_lines = [
+                {"file": file_path, "line": i+1, "content": line.rstrip()}
+                for i, line in enumerate(data.decode('utf-8').splitlines())
+            ]
+            return self._review_lines(added_lines, [focus])
+
+        # Unchanged contents reuse cached issues (re-labelled with this path)
+        issues = [
+            dict(issue, file=file_path)
+            for issue in self.analysis_cache.get_or_compute(
+                f"code-critic/{focus}", self.ruleset_version, data, review
+            )
         ]
 
-        issues = []
-
-        if focus in ["all", "security"]:
-            issues.extend(self._check_security(added_lines))
-
-        if focus in ["all", "performance"]:
-            issues.extend(self._check_performance(added_lines))
-
-        if focus in ["all", "best_practices"]:
-            issues.extend(self._check_best_practices(added_lines))
-
         return {
             "file": file_path,
             "issues_found": len(issues),
             "issues": issues
         }
 
-    def _parse_diff(self, diff: str) -> List[Dict[str, Any]]:
-        """Parse git diff and extract added lines"""
-        added_lines = []
-        current_file = None
-        current_line_num = None
-
-        for line in diff.split('\n'):
-            # Track current file
-            if line.startswith('+++'):
-                current_file = line[6:].strip()
-                if current_file.startswith('b/'):
-                    current_file = current_file[2:]
-
-            # Track line numbers
-            elif line.startswith('@@'):
-                match = re.search(r'\+(\d+)', line)
-                if match:
-                    current_line_num = int(match.group(1))
-
-            # Collect added lines
-            elif line.startswith('+') and not line.startswith('+++'):
-                if current_file and current_line_num:
-                    added_lines.append({
-                        "file": current_file,
-                        "line": current_line_num,
-                        "content": line[1:].strip()
-                    })
-                    current_line_num += 1
-
-        return added_lines
-
     def _check_security(self, lines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Check for security issues"""
         issues = []
@@ -365,6 +383,7 @@ Remember: Better to flag a potential issue than miss a real one."""
                             "description": f"{rule['description']}: {content[:50]}...",
                             "file": line_info["file"],
                             "line": line_info["line"],
+                            "code_snippet": content,
                             "suggestion": self._get_suggestion(rule_name)
                         })
 
@@ -399,6 +418,7 @@ Remember: Better to flag a potential issue than miss a real one."""
                             "description": rule["description"],
                             "file": file,
                             "line": line_num,
+                            "code_snippet": match.group(0).strip(),
                             "suggestion": self._get_suggestion(rule_name)
                         })
 
@@ -428,6 +448,7 @@ Remember: Better to flag a potential issue than miss a real one."""
                             "description": f"{rule['description']}: {content[:50]}...",
                             "file": line_info["file"],
                             "line": line_info["line"],
+                            "code_snippet": content,
                             "suggestion": self._get_suggestion(rule_name)
                         })
 
@@ -167,6 +167,12 @@ class ConvexAgent(BaseAgent):
     Inherits common agent functionality from BaseAgent.
     """
 
+    # Mutations never run alongside other calls
+    SERIAL_TOOLS = frozenset({"add_task", "update_task", "delete_task"})
+
+    # Task reads are briefly cached; any task mutation invalidates them
+    CACHED_TOOLS = ["list_tasks", "get_task", "search_tasks", "get_task_stats"]
+
     def __init__(
         self,
         model: str = "claude-3-haiku-20240307",
@@ -190,7 +196,8 @@ class ConvexAgent(BaseAgent):
         super().__init__(
             anthropic_api_key=api_key,
             model=model,
-            max_tokens=4096
+            max_tokens=4096,
+            parallel_tools=True
         )
 
         # Load Convex configuration
@@ -217,7 +224,8 @@ class ConvexAgent(BaseAgent):
                     "type": "object",
                     "properties": {},
                     "required": []
-                }
+                },
+                "cache": {"ttl": 30}
             },
             {
                 "name": "add_task",
@@ -245,7 +253,8 @@ class ConvexAgent(BaseAgent):
                         }
                     },
                     "required": ["title"]
-                }
+                },
+                "invalidates": self.CACHED_TOOLS
             },
             {
                 "name": "get_task",
@@ -259,7 +268,8 @@ class ConvexAgent(BaseAgent):
                         }
                     },
                     "required": ["taskId"]
-                }
+                },
+                "cache": {"ttl": 30}
             },
             {
                 "name": "update_task",
@@ -291,7 +301,8 @@ class ConvexAgent(BaseAgent):
                         }
                     },
                     "required": ["taskId"]
-                }
+                },
+                "invalidates": self.CACHED_TOOLS
             },
             {
                 "name": "delete_task",
@@ -305,7 +316,8 @@ class ConvexAgent(BaseAgent):
                         }
                     },
                     "required": ["taskId"]
-                }
+                },
+                "invalidates": self.CACHED_TOOLS
             },
             {
                 "name": "search_tasks",
@@ -319,7 +331,8 @@ class ConvexAgent(BaseAgent):
                         }
                     },
                     "required": ["query"]
-                }
+                },
+                "cache": {"ttl": 30}
             },
             {
                 "name": "get_task_stats",
@@ -328,7 +341,8 @@ class ConvexAgent(BaseAgent):
                     "type": "object",
                     "properties": {},
                     "required": []
-                }
+                },
+                "cache": {"ttl": 30}
             },
             # Sync Tools
             {
@@ -6,9 +6,15 @@ Connects Claude AI with your Convex database for intelligent data operations.
 
 import os
 import json
+import sys
 import requests
+from pathlib import Path
 from typing import List, Dict, Any, Optional
-from anthropic import Anthropic
+
+# Add project root to path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.llm_transport import create_client, transport_from_env
 
 
 class ConvexClient:
@@ -175,10 +181,11 @@ class ConvexAgent:
         """
         # Load API key
         api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
+        transport = transport_from_env()
+        if not api_key and transport is None:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
 
-        self.client = Anthropic(api_key=api_key)
+        self.client = create_client(api_key, transport)
         self.model = model
         self.conversation_history: List[Dict[str, Any]] = []
         self.max_tokens = 4096
@@ -9,9 +9,19 @@ the full FibreFlow database.
 
 import os
 import json
+import sys
 import requests
+from pathlib import Path
 from typing import List, Dict, Any, Optional
-from anthropic import Anthropic
+
+# Add project root to path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.llm_transport import create_client, transport_from_env
+from shared.tool_cache import ToolResultCache
+
+# Table discovery probes ~30 endpoints; reuse the result across sessions
+DISCOVERY_CACHE = {"ttl": 3600, "persist": True}
 
 
 class UniversalConvexClient:
@@ -116,10 +126,11 @@ class UniversalConvexAgent:
     ):
         """Initialize the Universal Convex Agent."""
         api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
+        transport = transport_from_env()
+        if not api_key and transport is None:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
 
-        self.client = Anthropic(api_key=api_key)
+        self.client = create_client(api_key, transport)
         self.model = model
         self.conversation_history: List[Dict[str, Any]] = []
         self.max_tokens = 4096
@@ -130,9 +141,18 @@ class UniversalConvexAgent:
 
         self.convex = UniversalConvexClient(self.convex_url)
 
-        # Discover available tables
-        print(f"🔍 Discovering available tables...")
-        self.available_tables = self.convex.discover_tables()
+        # Discover available tables (cached per deployment)
+        self.tool_cache = ToolResultCache(namespace=f"{type(self).__name__}:{self.convex_url}")
+        cached = self.tool_cache.get("discover_tables", {}, DISCOVERY_CACHE)
+        if cached is not None:
+            self.available_tables = self.convex.available_tables = json.loads(cached)
+        else:
+            print(f"🔍 Discovering available tables...")
+            self.available_tables = self.convex.discover_tables()
+            if self.available_tables:
+                self.tool_cache.put(
+                    "discover_tables", {}, json.dumps(self.available_tables), DISCOVERY_CACHE
+                )
 
         print(f"✅ Universal Convex Agent initialized")
         print(f"   Model: {model}")
@@ -21,23 +21,33 @@ Usage:
         file_path="agents/neon-database/agent.py",
         function_name="execute_query"
     )
+
+    # Overnight backfill through the Message Batches API
+    results = agent.write_docstrings([
+        {"file_path": "agents/neon-database/agent.py", "function_name": "execute_query"},
+        ...
+    ])
 """
 
 import os
 import ast
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 # Import BaseAgent
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from shared.analysis_cache import AnalysisCache
 from shared.base_agent import BaseAgent
 
 
 class DocWriterAgent(BaseAgent):
     """Agent for automatic documentation generation and maintenance."""
 
+    # Bump when function extraction changes (invalidates cached scans)
+    SCAN_VERSION = "1"
+
     def __init__(self, anthropic_api_key: str, model: str = "claude-sonnet-4-20250514"):
         """Initialize doc writer agent.
 
@@ -47,6 +57,7 @@ class DocWriterAgent(BaseAgent):
         """
         super().__init__(anthropic_api_key, model)
         self.project_root = Path(os.getcwd())
+        self.analysis_cache = AnalysisCache()
 
     def get_system_prompt(self) -> str:
         """Get system prompt for documentation generation."""
@@ -177,45 +188,28 @@ Always generate documentation that is:
                 "error": f"Tool execution failed: {str(e)}"
             }
 
-    def _scan_for_missing_docstrings(self, file_path: str) -> Dict[str, Any]:
+    def _scan_for_missing_docstrings(self, file_path: str, tree: Optional[ast.AST] = None) -> Dict[str, Any]:
         """Scan Python file for functions without docstrings.
 
         Args:
             file_path: Path to Python file to scan
+            tree: Already-parsed AST of the file (skips reading and parsing)
 
         Returns:
             Dict with undocumented functions list
         """
         try:
-            # Read source file
-            with open(file_path, 'r') as f:
-                source = f.read()
-
-            # Parse AST
-            tree = ast.parse(source)
-
-            # Extract functions
-            functions = []
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Skip private functions unless __init__
-                    if node.name.startswith('_') and node.name != '__init__':
-                        continue
-
-                    # Get docstring
-                    docstring = ast.get_docstring(node)
-
-                    # Get function signature
-                    args = [arg.arg for arg in node.args.args]
-
-                    functions.append({
-                        "name": node.name,
-                        "line": node.lineno,
-                        "args": args,
-                        "has_docstring": bool(docstring),
-                        "docstring_length": len(docstring) if docstring else 0
-                    })
+            if tree is None:
+                # Read source file; unchanged contents reuse cached functions
+                with open(file_path, 'rb') as f:
+                    source = f.read()
+
+                functions = self.analysis_cache.get_or_compute(
+                    "doc-writer/functions", self.SCAN_VERSION, source,
+                    lambda: self._extract_functions(ast.parse(source))
+                )
+            else:
+                functions = self._extract_functions(tree)
 
             # Identify missing/incomplete docstrings
             missing = [f for f in functions if not f['has_docstring']]
@@ -239,6 +233,39 @@ Always generate documentation that is:
                 "error": f"Failed to scan file: {str(e)}"
             }
 
+    def _extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
+        """Extract public functions (plus __init__) from a parsed module.
+
+        Args:
+            tree: Parsed AST of the file
+
+        Returns:
+            List of function info dicts (name, line, args, docstring status)
+        """
+        functions = []
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef):
+                # Skip private functions unless __init__
+                if node.name.startswith('_') and node.name != '__init__':
+                    continue
+
+                # Get docstring
+                docstring = ast.get_docstring(node)
+
+                # Get function signature
+                args = [arg.arg for arg in node.args.args]
+
+                functions.append({
+                    "name": node.name,
+                    "line": node.lineno,
+                    "args": args,
+                    "has_docstring": bool(docstring),
+                    "docstring_length": len(docstring) if docstring else 0
+                })
+
+        return functions
+
     def _write_docstring(self, file_path: str, function_name: str) -> Dict[str, Any]:
         """Generate Google-style docstring for a function.
 
@@ -250,47 +277,115 @@ Always generate documentation that is:
             Dict with generated docstring
         """
         try:
-            # Read source
-            with open(file_path, 'r') as f:
-                source = f.read()
+            request = self._docstring_request(file_path, function_name)
 
-            # Parse AST to find function
-            tree = ast.parse(source)
+            if not request["success"]:
+                return request
 
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name == function_name:
-                    # Extract function details
-                    func_source = ast.get_source_segment(source, node)
+            # Use Claude to generate docstring
+            message = self.anthropic.messages.create(**request["params"])
+
+            return self._docstring_result(request, message.content[0].text)
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to generate docstring: {str(e)}"
+            }
 
-                    # Get arguments with types
-                    args = []
+    def write_docstrings(self, targets: List[Dict[str, str]], poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """Generate docstrings for many functions in one Message Batch.
 
-                    for arg in node.args.args:
-                        arg_name = arg.arg
-                        arg_type = None
+        For overnight backfills: half the cost of calling write_docstring
+        per function, and a single polling thread however many there are.
 
-                        if arg.annotation:
-                            if isinstance(arg.annotation, ast.Name):
-                                arg_type = arg.annotation.id
-                            else:
-                                arg_type = ast.unparse(arg.annotation)
+        Args:
+            targets: Dicts with file_path and function_name
+            poll_interval: Seconds between batch status checks
 
-                        args.append({
-                            "name": arg_name,
-                            "type": arg_type
-                        })
+        Returns:
+            One write_docstring-style result per target, in order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+        batch = self.message_batch(poll_interval=poll_interval)
+        queued = []
+
+        for index, target in enumerate(targets):
+            try:
+                request = self._docstring_request(target["file_path"], target["function_name"])
+            except Exception as e:
+                request = {"success": False, "error": f"Failed to generate docstring: {str(e)}"}
+
+            if request["success"]:
+                queued.append((index, request, batch.add(request["params"])))
+            else:
+                results[index] = request
 
-                    # Get return type
-                    return_type = None
+        if queued:
+            self.run_batch(batch)
 
-                    if node.returns:
-                        if isinstance(node.returns, ast.Name):
-                            return_type = node.returns.id
+        for index, request, handle in queued:
+            if handle.ok:
+                results[index] = self._docstring_result(request, handle.message.content[0].text)
+            else:
+                results[index] = {
+                    "success": False,
+                    "error": f"Failed to generate docstring: {handle.error}"
+                }
+
+        return results
+
+    def _docstring_request(self, file_path: str, function_name: str) -> Dict[str, Any]:
+        """Build the Claude request documenting a function.
+
+        Args:
+            file_path: Path to source file
+            function_name: Name of function to document
+
+        Returns:
+            Dict with request params, function args and return type
+        """
+        # Read source
+        with open(file_path, 'r') as f:
+            source = f.read()
+
+        # Parse AST to find function
+        tree = ast.parse(source)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and node.name == function_name:
+                # Extract function details
+                func_source = ast.get_source_segment(source, node)
+
+                # Get arguments with types
+                args = []
+
+                for arg in node.args.args:
+                    arg_name = arg.arg
+                    arg_type = None
+
+                    if arg.annotation:
+                        if isinstance(arg.annotation, ast.Name):
+                            arg_type = arg.annotation.id
                         else:
-                            return_type = ast.unparse(node.returns)
+                            arg_type = ast.unparse(arg.annotation)
+
+                    args.append({
+                        "name": arg_name,
+                        "type": arg_type
+                    })
+
+                # Get return type
+                return_type = None
+
+                if node.returns:
+                    if isinstance(node.returns, ast.Name):
+                        return_type = node.returns.id
+                    else:
+                        return_type = ast.unparse(node.returns)
 
-                    # Build prompt for Claude
-                    prompt = f"""Generate a Google-style docstring for this function:
+                # Build prompt for Claude
+                prompt = f"""Generate a Google-style docstring for this function:
 
 File: {file_path}
 Function: {function_name}
@@ -311,37 +406,31 @@ Generate a comprehensive Google-style docstring that includes:
 
 Return ONLY the docstring text (no code, no quotes, no function signature)."""
 
-                    # Use Claude to generate docstring
-                    message = self.anthropic.messages.create(
-                        model=self.model,
-                        max_tokens=1500,
-                        system=self.get_system_prompt(),
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-
-                    docstring = message.content[0].text.strip()
-
-                    # Clean up (remove any code blocks)
-                    docstring = self._clean_generated_text(docstring)
-
-                    return {
-                        "success": True,
-                        "function_name": function_name,
-                        "docstring": docstring,
-                        "args": args,
-                        "return_type": return_type
-                    }
-
-            return {
-                "success": False,
-                "error": f"Function '{function_name}' not found in {file_path}"
-            }
+                return {
+                    "success": True,
+                    "function_name": function_name,
+                    "params": self.single_shot_params(prompt, max_tokens=1500),
+                    "args": args,
+                    "return_type": return_type
+                }
 
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to generate docstring: {str(e)}"
-            }
+        return {
+            "success": False,
+            "error": f"Function '{function_name}' not found in {file_path}"
+        }
+
+    def _docstring_result(self, request: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """Turn Claude's response to a docstring request into a result."""
+        # Clean up (remove any code blocks)
+        docstring = self._clean_generated_text(text.strip())
+
+        return {
+            "success": True,
+            "function_name": request["function_name"],
+            "docstring": docstring,
+            "args": request["args"],
+            "return_type": request["return_type"]
+        }
 
     def _generate_agent_readme(self, agent_dir: str) -> Dict[str, Any]:
         """Generate README.md for an agent.
@@ -18,15 +18,21 @@ import os
 import sys
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from shared.analysis_cache import AnalysisCache
 from shared.base_agent import BaseAgent
 from shared.confidence import ProactivityQueue
+from shared.file_enumerator import list_repository_files
+from shared.pattern_scanner import PatternScanner
+from shared.test_index import TestIndex
 
 
 class GitWatcherAgent(BaseAgent):
@@ -37,15 +43,38 @@ class GitWatcherAgent(BaseAgent):
     and populates the proactivity queue with discovered tasks.
     """
 
+    # Bump when scan logic changes in ways the patterns don't capture
+    SCANNER_VERSION = 2
+
+    # Public function definitions (used for missing-test detection)
+    FUNCTION_PATTERN = r'^\s*def\s+(\w+)\s*\('
+
+    # File types included in repository scans
+    SCAN_SUFFIXES = [".py", ".js", ".ts", ".md"]
+
     def __init__(
         self,
         anthropic_api_key: str,
         model: str = "claude-3-5-haiku-20241022",
-        repository_path: str = "."
+        repository_path: str = ".",
+        max_workers: Optional[int] = None
     ):
+        """Initialize git watcher agent.
+
+        Args:
+            anthropic_api_key: Anthropic API key
+            model: Claude model to use
+            repository_path: Repository to watch
+            max_workers: Size of the thread pool that reads and scans files
+                (default: ThreadPoolExecutor's default)
+        """
         super().__init__(anthropic_api_key, model)
         self.repo_path = Path(repository_path).resolve()
         self.queue = ProactivityQueue()
+        self.max_workers = max_workers
+
+        # Test names per test file, re-parsed only when a test file changes
+        self.test_index = TestIndex(self.repo_path / "tests")
 
         # Patterns for detection
         self.todo_patterns = [
@@ -74,7 +103,7 @@ class GitWatcherAgent(BaseAgent):
             ]
         }
 
-        # Files to ignore
+        # Files to ignore (directory names end with "/"; pruned, never walked)
         self.ignore_patterns = [
             ".git/",
             "venv/",
@@ -85,6 +114,19 @@ class GitWatcherAgent(BaseAgent):
             ".env"
         ]
 
+        # All detection patterns compiled into one single-pass scanner
+        self.scanner = PatternScanner()
+        self.scanner.add_rule("todo", self.todo_patterns, per_line=True)
+        for issue_type, patterns in self.security_patterns.items():
+            self.scanner.add_rule(issue_type, patterns)
+        self.scanner.add_rule("function", [self.FUNCTION_PATTERN], per_line=True)
+
+        # Per-file findings cached by content (unchanged files cost one lookup)
+        self.analysis_cache = AnalysisCache()
+        self.ruleset_version = AnalysisCache.ruleset_version(
+            self.SCANNER_VERSION, self.scanner.rules
+        )
+
     def get_system_prompt(self) -> str:
         """Return git-watcher specific system prompt"""
         return """You are the Git Watcher Agent, part of FibreFlow's proactive agent system.
@@ -219,8 +261,8 @@ You are the "eyes" of the proactive system - always watching, always learning.""
         """
         tasks_found = []
 
-        # Determine scan path
-        scan_path = Path(path) if path else self.repo_path
+        # Determine scan path (relative paths are inside the repository)
+        scan_path = self.repo_path / path if path else self.repo_path
 
         # Get files to scan
         if since_commit:
@@ -230,25 +272,19 @@ You are the "eyes" of the proactive system - always watching, always learning.""
             # Scan all files
             files = self._get_all_files(scan_path)
 
-        # Perform scans based on type
-        if scan_type in ["todos", "all"]:
-            tasks_found.extend(self._scan_for_todos(files))
+        # One pass over the files (new cache entries written once at the end).
+        # A whole-repository scan sees every file, so afterwards entries for
+        # deleted or changed files are pruned from the cache.
+        full_scan = not since_commit and scan_path == self.repo_path
+        sweep = (
+            self.analysis_cache.sweep("git-watcher/scan", self.ruleset_version)
+            if full_scan else nullcontext()
+        )
+        with self.analysis_cache.batch(), sweep:
+            tasks_found.extend(self._scan_files(files, scan_type))
 
-        if scan_type in ["security", "all"]:
-            tasks_found.extend(self._scan_for_security_issues(files))
-
-        if scan_type in ["missing_tests", "all"]:
-            tasks_found.extend(self._scan_for_missing_tests(files))
-
-        # Add discovered tasks to queue
-        for task in tasks_found:
-            self.queue.add_task(
-                task_type=task["type"],
-                description=task["description"],
-                file=task["file"],
-                line=task.get("line"),
-                context=task.get("context", {})
-            )
+        # Add discovered tasks to queue (single write)
+        self.queue.add_tasks(tasks_found)
 
         return {
             "tasks_discovered": len(tasks_found),
@@ -294,15 +330,21 @@ You are the "eyes" of the proactive system - always watching, always learning.""
         if "best_practices" in analysis_types:
             issues.extend(self._analyze_best_practices(added_lines))
 
-        # Add issues to queue
-        for issue in issues:
-            self.queue.add_task(
-                task_type=issue["type"],
-                description=issue["description"],
-                file=issue["file"],
-                line=issue.get("line"),
-                context={"commit": commit_hash}
-            )
+        # Add issues to queue (single write)
+        self.queue.add_tasks(
+            {
+                "type": issue["type"],
+                "description": issue["description"],
+                "file": issue["file"],
+                "line": issue.get("line"),
+                "context": {
+                    "commit": commit_hash,
+                    "code_snippet": issue.get("code_snippet"),
+                    "rule": issue.get("rule")
+                }
+            }
+            for issue in issues
+        )
 
         return {
             "commit": commit_hash,
@@ -311,18 +353,8 @@ You are the "eyes" of the proactive system - always watching, always learning.""
         }
 
     def _get_all_files(self, scan_path: Path) -> List[Path]:
-        """Get all Python files in repository"""
-        files = []
-        for pattern in ["**/*.py", "**/*.js", "**/*.ts", "**/*.md"]:
-            files.extend(scan_path.glob(pattern))
-
-        # Filter ignored patterns
-        filtered = []
-        for f in files:
-            if not any(ignore in str(f) for ignore in self.ignore_patterns):
-                filtered.append(f)
-
-        return filtered
+        """Get all scannable files (git ls-files, honouring .gitignore and ignore_patterns)"""
+        return list_repository_files(scan_path, self.SCAN_SUFFIXES, self.ignore_patterns)
 
     def _get_changed_files(self, since_commit: str) -> List[Path]:
         """Get files changed since specific commit"""
@@ -339,106 +371,142 @@ You are the "eyes" of the proactive system - always watching, always learning.""
         except subprocess.CalledProcessError:
             return []
 
-    def _scan_for_todos(self, files: List[Path]) -> List[Dict[str, Any]]:
-        """Scan files for TODO/FIXME/HACK comments"""
-        tasks = []
-
-        for file_path in files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    for line_num, line in enumerate(f, 1):
-                        for pattern in self.todo_patterns:
-                            match = re.search(pattern, line)
-                            if match:
-                                comment_text = match.group(1).strip() if match.groups() else "See comment"
-                                tasks.append({
-                                    "type": "tech_debt",
-                                    "description": f"TODO comment: {comment_text}",
-                                    "file": str(file_path.relative_to(self.repo_path)),
-                                    "line": line_num,
-                                    "context": {"full_line": line.strip()}
-                                })
-            except Exception:
+    def _scan_files(self, files: List[Path], scan_type: str) -> List[Dict[str, Any]]:
+        """Scan each file once and turn its findings into tasks for scan_type"""
+        todos, security, missing_tests = [], [], []
+
+        if scan_type in ["missing_tests", "all"]:
+            self.test_index.refresh()
+
+        # Read and scan in a bounded pool; results come back in file order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            all_findings = list(pool.map(self._cached_file_findings, files))
+
+        for file_path, findings in zip(files, all_findings):
+            if findings is None:
                 continue  # Skip files that can't be read
 
-        return tasks
-
-    def _scan_for_security_issues(self, files: List[Path]) -> List[Dict[str, Any]]:
-        """Scan for security vulnerabilities"""
-        tasks = []
-
-        for file_path in files:
-            if not file_path.suffix in ['.py', '.js', '.ts']:
-                continue  # Only scan code files
-
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-
-                    for issue_type, patterns in self.security_patterns.items():
-                        for pattern in patterns:
-                            for match in re.finditer(pattern, content):
-                                line_num = content[:match.start()].count('\n') + 1
-                                tasks.append({
-                                    "type": "security",
-                                    "description": f"Potential {issue_type.replace('_', ' ')} detected",
-                                    "file": str(file_path.relative_to(self.repo_path)),
-                                    "line": line_num,
-                                    "context": {"code_snippet": lines[line_num - 1].strip()}
-                                })
-            except Exception:
-                continue
-
-        return tasks
-
-    def _scan_for_missing_tests(self, files: List[Path]) -> List[Dict[str, Any]]:
-        """Scan for functions without test coverage"""
-        tasks = []
-
-        # Simple heuristic: Find new functions in non-test files
-        for file_path in files:
-            if "test" in str(file_path) or not file_path.suffix == '.py':
-                continue  # Skip test files and non-Python
-
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    for line_num, line in enumerate(f, 1):
-                        # Detect function definitions
-                        if re.match(r'^\s*def\s+(\w+)\s*\(', line):
-                            func_match = re.search(r'def\s+(\w+)', line)
-                            if func_match:
-                                func_name = func_match.group(1)
-                                if not func_name.startswith('_'):  # Skip private functions
-                                    # Check if test exists (simplified heuristic)
-                                    test_file = self.repo_path / "tests" / f"test_{file_path.stem}.py"
-                                    has_test = self._function_has_test(test_file, func_name)
-
-                                    if not has_test:
-                                        tasks.append({
-                                            "type": "test_coverage",
-                                            "description": f"Function {func_name}() has no test coverage",
-                                            "file": str(file_path.relative_to(self.repo_path)),
-                                            "line": line_num,
-                                            "context": {"function_name": func_name}
-                                        })
-            except Exception:
-                continue
-
-        return tasks
+            relative = str(file_path.relative_to(self.repo_path))
 
-    def _function_has_test(self, test_file: Path, func_name: str) -> bool:
-        """Check if function has corresponding test"""
-        if not test_file.exists():
-            return False
+            if scan_type in ["todos", "all"]:
+                todos.extend(self._todo_tasks(relative, findings["todos"]))
+
+            # Only scan code files
+            if scan_type in ["security", "all"] and file_path.suffix in ['.py', '.js', '.ts']:
+                security.extend(self._security_tasks(relative, findings["security"]))
+
+            # Skip test files and non-Python
+            if scan_type in ["missing_tests", "all"] and "test" not in str(file_path) and file_path.suffix == '.py':
+                test_file = self.repo_path / "tests" / f"test_{file_path.stem}.py"
+                missing_tests.extend(self._missing_test_tasks(relative, findings["functions"], test_file))
 
+        return todos + security + missing_tests
+
+    def _cached_file_findings(self, file_path: Path) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Scan a file, reusing findings for unchanged content.
+
+        Returns:
+            {todos: [...], security: [...], functions: [...]}, or None if the
+            file can't be read as UTF-8
+        """
         try:
-            with open(test_file, 'r') as f:
-                content = f.read()
-                # Look for test_function_name pattern
-                return bool(re.search(rf'def test_{func_name}', content))
-        except Exception:
-            return False
+            data = file_path.read_bytes()
+            content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        return self.analysis_cache.get_or_compute(
+            "git-watcher/scan", self.ruleset_version, data, lambda: self._find_all(content)
+        )
+
+    def _find_all(self, content: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Find TODOs, security matches and public functions in a single scan"""
+        todos, security, functions = [], [], []
+
+        for match in self.scanner.scan(content):
+            if match["rule"] == "todo":
+                comment = match["groups"][0] if match["groups"] else None
+                todos.append((match["line"], match["pattern"], {
+                    "line": match["line"],
+                    "comment": comment.strip() if comment is not None else "See comment",
+                    "full_line": match["text"]
+                }))
+            elif match["rule"] == "function":
+                if not match["groups"][0].startswith('_'):  # Skip private functions
+                    functions.append({"name": match["groups"][0], "line": match["line"]})
+            else:
+                security.append((match["pattern"], match["start"], {
+                    "rule": match["rule"],
+                    "line": match["line"],
+                    "code_snippet": match["text"]
+                }))
+
+        # Same order as checking pattern by pattern: TODOs by line, security by rule
+        return {
+            "todos": [finding for *_, finding in sorted(todos, key=lambda t: t[:2])],
+            "security": [finding for *_, finding in sorted(security, key=lambda t: t[:2])],
+            "functions": functions
+        }
+
+    def _todo_tasks(self, file: str, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tasks for TODO/FIXME/HACK comments"""
+        return [
+            {
+                "type": "tech_debt",
+                "description": f"TODO comment: {finding['comment']}",
+                "file": file,
+                "line": finding["line"],
+                "context": {"full_line": finding["full_line"]}
+            }
+            for finding in findings
+        ]
+
+    def _security_tasks(self, file: str, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tasks for security pattern matches"""
+        return [
+            {
+                "type": "security",
+                "description": f"Potential {finding['rule'].replace('_', ' ')} detected",
+                "file": file,
+                "line": finding["line"],
+                "context": {
+                    "code_snippet": finding["code_snippet"],
+                    "rule": finding["rule"]
+                }
+            }
+            for finding in findings
+        ]
+
+    def _missing_test_tasks(
+        self,
+        file: str,
+        functions: List[Dict[str, Any]],
+        test_file: Path
+    ) -> List[Dict[str, Any]]:
+        """Tasks for public functions without test coverage"""
+        # Function definitions are cached; the test file is checked once (by mtime)
+        entry = self.test_index.entry(test_file)
+        tested = entry.tested_prefixes if entry else frozenset()
+
+        return [
+            {
+                "type": "test_coverage",
+                "description": f"Function {func['name']}() has no test coverage",
+                "file": file,
+                "line": func["line"],
+                "context": {
+                    "function_name": func["name"],
+                    # Used somewhere in the tests, just without a dedicated test
+                    "referenced_in_tests": self.test_index.is_referenced(func["name"])
+                }
+            }
+            for func in functions
+            if func["name"] not in tested
+        ]
+
+    def _function_has_test(self, test_file: Path, func_name: str) -> bool:
+        """Check if function has corresponding test (test_<func_name>* in test_file)"""
+        return self.test_index.has_test(test_file, func_name)
 
     def _parse_diff_for_additions(self, diff: str) -> List[Dict[str, Any]]:
         """Parse git diff and extract added lines"""
@@ -482,9 +550,11 @@ You are the "eyes" of the proactive system - always watching, always learning.""
                         issues.append({
                             "severity": "high",
                             "type": "security",
+                            "rule": issue_type,
                             "description": f"Potential {issue_type.replace('_', ' ')} in new code",
                             "file": line_info["file"],
-                            "line": line_info["line"]
+                            "line": line_info["line"],
+                            "code_snippet": content
                         })
 
         return issues
@@ -507,7 +577,8 @@ You are the "eyes" of the proactive system - always watching, always learning.""
                             "type": "test_coverage",
                             "description": f"New function {func_name}() added without test",
                             "file": line_info["file"],
-                            "line": line_info["line"]
+                            "line": line_info["line"],
+                            "code_snippet": content
                         })
 
         return issues
@@ -527,7 +598,8 @@ You are the "eyes" of the proactive system - always watching, always learning.""
                         "type": "best_practices",
                         "description": "I/O operation without error handling",
                         "file": line_info["file"],
-                        "line": line_info["line"]
+                        "line": line_info["line"],
+                        "code_snippet": content
                     })
 
         return issues
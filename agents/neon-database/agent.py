@@ -6,6 +6,7 @@ Connects Claude AI with your Neon PostgreSQL database for intelligent data opera
 
 import os
 import json
+import hashlib
 import sys
 import psycopg2
 from pathlib import Path
@@ -39,7 +40,7 @@ class PostgresClient:
             maxconn: Maximum number of connections in pool (default: 10)
         """
         self.connection_string = connection_string
-        self.pool = pool.SimpleConnectionPool(
+        self.pool = pool.ThreadedConnectionPool(
             minconn=minconn,
             maxconn=maxconn,
             dsn=connection_string,
@@ -198,6 +199,12 @@ class NeonAgent(BaseAgent):
     Inherits common agent functionality from BaseAgent.
     """
 
+    # Writes never run alongside other queries
+    SERIAL_TOOLS = frozenset({"execute_insert", "execute_update", "execute_delete"})
+
+    # Cached lookups; any write (including DDL sent as a query) invalidates them
+    CACHED_TOOLS = ["list_tables", "describe_table", "get_table_stats"]
+
     def __init__(
         self,
         model: str = "claude-3-haiku-20240307",
@@ -219,7 +226,8 @@ class NeonAgent(BaseAgent):
         super().__init__(
             anthropic_api_key=api_key,
             model=model,
-            max_tokens=4096
+            max_tokens=4096,
+            parallel_tools=True
         )
 
         # Load database configuration
@@ -241,6 +249,11 @@ class NeonAgent(BaseAgent):
             if conn:
                 self.db.return_connection(conn)
 
+    def tool_cache_namespace(self) -> str:
+        """Cached tool results are per database."""
+        database = hashlib.sha1(self.connection_string.encode()).hexdigest()[:12]
+        return f"{type(self).__name__}:{database}"
+
     def define_tools(self) -> List[Dict[str, Any]]:
         """
         Define PostgreSQL database tools for the agent.
@@ -255,7 +268,9 @@ class NeonAgent(BaseAgent):
                     "type": "object",
                     "properties": {},
                     "required": []
-                }
+                },
+                # Schema rarely changes - reuse across sessions
+                "cache": {"ttl": 3600, "persist": True}
             },
             {
                 "name": "describe_table",
@@ -269,7 +284,8 @@ class NeonAgent(BaseAgent):
                         }
                     },
                     "required": ["table_name"]
-                }
+                },
+                "cache": {"ttl": 3600, "max_entries": 256, "persist": True}
             },
             {
                 "name": "get_table_stats",
@@ -283,7 +299,8 @@ class NeonAgent(BaseAgent):
                         }
                     },
                     "required": ["table_name"]
-                }
+                },
+                "cache": {"ttl": 60}
             },
             # Query Execution Tools
             {
@@ -312,7 +329,8 @@ class NeonAgent(BaseAgent):
                         }
                     },
                     "required": ["query"]
-                }
+                },
+                "invalidates": self.CACHED_TOOLS
             },
             {
                 "name": "execute_update",
@@ -326,7 +344,8 @@ class NeonAgent(BaseAgent):
                         }
                     },
                     "required": ["query"]
-                }
+                },
+                "invalidates": self.CACHED_TOOLS
             },
             {
                 "name": "execute_delete",
@@ -340,7 +359,8 @@ class NeonAgent(BaseAgent):
                         }
                     },
                     "required": ["query"]
-                }
+                },
+                "invalidates": self.CACHED_TOOLS
             },
             # Analysis Tools
             {
@@ -22,23 +22,34 @@ Usage:
         function_name="execute_query",
         test_type="unit"
     )
+
+    # Overnight backfill through the Message Batches API
+    results = agent.generate_tests_batch([
+        {"file_path": "agents/neon-database/agent.py", "function_name": "execute_query"},
+        ...
+    ])
 """
 
 import os
 import ast
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 # Import BaseAgent
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from shared.analysis_cache import AnalysisCache
 from shared.base_agent import BaseAgent
+from shared.test_index import TestIndex
 
 
 class TestGeneratorAgent(BaseAgent):
     """Agent for automatic test generation with pytest patterns."""
 
+    # Bump when function extraction changes (invalidates cached scans)
+    SCAN_VERSION = "1"
+
     def __init__(self, anthropic_api_key: str, model: str = "claude-3-5-haiku-20241022"):
         """Initialize test generator agent.
 
@@ -48,6 +59,10 @@ class TestGeneratorAgent(BaseAgent):
         """
         super().__init__(anthropic_api_key, model)
         self.project_root = Path(os.getcwd())
+        self.analysis_cache = AnalysisCache()
+
+        # Test names per test file, re-parsed only when a test file changes
+        self.test_index = TestIndex(self.project_root / "tests")
 
     def get_system_prompt(self) -> str:
         """Get system prompt for test generation."""
@@ -183,67 +198,36 @@ Always generate runnable, high-quality tests that follow best practices."""
                 "error": f"Tool execution failed: {str(e)}"
             }
 
-    def _scan_for_untested_functions(self, file_path: str) -> Dict[str, Any]:
+    def _scan_for_untested_functions(self, file_path: str, tree: Optional[ast.AST] = None) -> Dict[str, Any]:
         """Scan Python file for functions without tests.
 
         Args:
             file_path: Path to Python file to scan
+            tree: Already-parsed AST of the file (skips reading and parsing)
 
         Returns:
             Dict with untested functions list
         """
         try:
-            # Read source file
-            with open(file_path, 'r') as f:
-                source = f.read()
-
-            # Parse AST
-            tree = ast.parse(source)
-
-            # Extract functions and methods
-            functions = []
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Skip private functions (start with _) unless they're special methods
-                    if node.name.startswith('_') and not node.name.startswith('__'):
-                        continue
-
-                    # Get function signature
-                    args = [arg.arg for arg in node.args.args]
-
-                    # Get docstring
-                    docstring = ast.get_docstring(node)
-
-                    functions.append({
-                        "name": node.name,
-                        "line": node.lineno,
-                        "args": args,
-                        "has_docstring": bool(docstring),
-                        "docstring": docstring[:200] if docstring else None
-                    })
+            if tree is None:
+                # Read source file; unchanged contents reuse cached functions
+                with open(file_path, 'rb') as f:
+                    source = f.read()
+
+                functions = self.analysis_cache.get_or_compute(
+                    "test-generator/functions", self.SCAN_VERSION, source,
+                    lambda: self._extract_functions(ast.parse(source))
+                )
+            else:
+                functions = self._extract_functions(tree)
 
             # Determine test file path
             test_file_path = self._get_test_file_path(file_path)
 
-            # Check which functions have tests
-            existing_tests = set()
-
-            if os.path.exists(test_file_path):
-                with open(test_file_path, 'r') as f:
-                    test_source = f.read()
-
-                # Look for test functions
-                for func in functions:
-                    # Common test patterns
-                    patterns = [
-                        f"def test_{func['name']}",
-                        f"def test_{func['name']}_success",
-                        f"def test_{func['name']}_error"
-                    ]
-
-                    if any(pattern in test_source for pattern in patterns):
-                        existing_tests.add(func['name'])
+            # Check which functions have tests (test_<name>, test_<name>_success, ...)
+            entry = self.test_index.entry(test_file_path)
+            tested = entry.tested_prefixes if entry else frozenset()
+            existing_tests = {f['name'] for f in functions if f['name'] in tested}
 
             # Identify untested functions
             untested = [f for f in functions if f['name'] not in existing_tests]
@@ -265,6 +249,39 @@ Always generate runnable, high-quality tests that follow best practices."""
                 "error": f"Failed to scan file: {str(e)}"
             }
 
+    def _extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
+        """Extract public functions and methods from a parsed module.
+
+        Args:
+            tree: Parsed AST of the file
+
+        Returns:
+            List of function info dicts (name, line, args, docstring)
+        """
+        functions = []
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef):
+                # Skip private functions (start with _) unless they're special methods
+                if node.name.startswith('_') and not node.name.startswith('__'):
+                    continue
+
+                # Get function signature
+                args = [arg.arg for arg in node.args.args]
+
+                # Get docstring
+                docstring = ast.get_docstring(node)
+
+                functions.append({
+                    "name": node.name,
+                    "line": node.lineno,
+                    "args": args,
+                    "has_docstring": bool(docstring),
+                    "docstring": docstring[:200] if docstring else None
+                })
+
+        return functions
+
     def _generate_tests(self, file_path: str, function_name: str, test_type: str, include_edge_cases: bool = True) -> Dict[str, Any]:
         """Generate pytest tests for a function.
 
@@ -278,25 +295,101 @@ Always generate runnable, high-quality tests that follow best practices."""
             Dict with generated test code
         """
         try:
-            # Analyze function
-            analysis = self._analyze_function_signature(file_path, function_name)
+            request = self._tests_request(file_path, function_name, test_type, include_edge_cases)
+
+            if not request["success"]:
+                return request
+
+            # Use Claude to generate tests
+            message = self.anthropic.messages.create(**request["params"])
+
+            return self._tests_result(request, message.content[0].text)
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to generate tests: {str(e)}"
+            }
+
+    def generate_tests_batch(self, targets: List[Dict[str, Any]], poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """Generate tests for many functions in one Message Batch.
 
-            if not analysis["success"]:
-                return analysis
+        For overnight backfills: half the cost of calling generate_tests
+        per function, and a single polling thread however many there are.
 
-            # Determine agent/module name for markers
-            path_parts = Path(file_path).parts
+        Args:
+            targets: Dicts with file_path, function_name and optionally
+                test_type (default "unit") and include_edge_cases
+            poll_interval: Seconds between batch status checks
 
-            if "agents" in path_parts:
-                agent_idx = path_parts.index("agents")
-                module_name = path_parts[agent_idx + 1] if len(path_parts) > agent_idx + 1 else "unknown"
-            elif "shared" in path_parts:
-                module_name = "shared"
+        Returns:
+            One generate_tests-style result per target, in order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+        batch = self.message_batch(poll_interval=poll_interval)
+        queued = []
+
+        for index, target in enumerate(targets):
+            try:
+                request = self._tests_request(
+                    target["file_path"],
+                    target["function_name"],
+                    target.get("test_type", "unit"),
+                    target.get("include_edge_cases", True)
+                )
+            except Exception as e:
+                request = {"success": False, "error": f"Failed to generate tests: {str(e)}"}
+
+            if request["success"]:
+                queued.append((index, request, batch.add(request["params"])))
             else:
-                module_name = "core"
+                results[index] = request
 
-            # Build test generation prompt
-            prompt = f"""Generate pytest tests for this function:
+        if queued:
+            self.run_batch(batch)
+
+        for index, request, handle in queued:
+            if handle.ok:
+                results[index] = self._tests_result(request, handle.message.content[0].text)
+            else:
+                results[index] = {
+                    "success": False,
+                    "error": f"Failed to generate tests: {handle.error}"
+                }
+
+        return results
+
+    def _tests_request(self, file_path: str, function_name: str, test_type: str, include_edge_cases: bool) -> Dict[str, Any]:
+        """Build the Claude request generating tests for a function.
+
+        Args:
+            file_path: Path to source file
+            function_name: Name of function to test
+            test_type: Type of test (unit/integration)
+            include_edge_cases: Whether to include edge case tests
+
+        Returns:
+            Dict with request params and the test file path
+        """
+        # Analyze function
+        analysis = self._analyze_function_signature(file_path, function_name)
+
+        if not analysis["success"]:
+            return analysis
+
+        # Determine agent/module name for markers
+        path_parts = Path(file_path).parts
+
+        if "agents" in path_parts:
+            agent_idx = path_parts.index("agents")
+            module_name = path_parts[agent_idx + 1] if len(path_parts) > agent_idx + 1 else "unknown"
+        elif "shared" in path_parts:
+            module_name = "shared"
+        else:
+            module_name = "core"
+
+        # Build test generation prompt
+        prompt = f"""Generate pytest tests for this function:
 
 File: {file_path}
 Function: {function_name}
@@ -320,32 +413,26 @@ Requirements:
 
 Return ONLY the test code (no explanations)."""
 
-            # Use Claude to generate tests
-            message = self.anthropic.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                system=self.get_system_prompt(),
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            test_code = message.content[0].text
-
-            # Clean up code (remove markdown formatting if present)
-            test_code = self._clean_generated_code(test_code)
-
-            return {
-                "success": True,
-                "function_name": function_name,
-                "test_type": test_type,
-                "test_code": test_code,
-                "test_file_path": self._get_test_file_path(file_path)
-            }
-
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to generate tests: {str(e)}"
-            }
+        return {
+            "success": True,
+            "function_name": function_name,
+            "test_type": test_type,
+            "params": self.single_shot_params(prompt, max_tokens=2000),
+            "test_file_path": self._get_test_file_path(file_path)
+        }
+
+    def _tests_result(self, request: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """Turn Claude's response to a test generation request into a result."""
+        # Clean up code (remove markdown formatting if present)
+        test_code = self._clean_generated_code(text)
+
+        return {
+            "success": True,
+            "function_name": request["function_name"],
+            "test_type": request["test_type"],
+            "test_code": test_code,
+            "test_file_path": request["test_file_path"]
+        }
 
     def _analyze_function_signature(self, file_path: str, function_name: str) -> Dict[str, Any]:
         """Extract function signature and context.
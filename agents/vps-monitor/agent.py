@@ -275,10 +275,12 @@ class VPSMonitorAgent(BaseAgent):
             ssh_user: SSH username
         """
         # Initialize base agent with Claude 3.5 Haiku model
+        # (all tools are read-only SSH commands, so they can run side by side)
         super().__init__(
             anthropic_api_key=anthropic_api_key,
             model="claude-3-5-haiku-20241022",
-            max_tokens=4096
+            max_tokens=4096,
+            parallel_tools=True
         )
 
         # Initialize VPS-specific client
@@ -294,7 +296,9 @@ class VPSMonitorAgent(BaseAgent):
                     "type": "object",
                     "properties": {},
                     "required": []
-                }
+                },
+                # Hostname/OS/kernel are static; uptime may lag by a minute
+                "cache": {"ttl": 60}
             },
             {
                 "name": "get_cpu_usage",
@@ -0,0 +1,138 @@
+"""
+Agent Load Benchmark - orchestration overhead, concurrency and tail latency
+
+Runs BaseAgent and AsyncAgentAdapter conversations against the replay
+transport (shared/llm_transport.py), so results are reproducible on an
+offline box and don't depend on the live API:
+- Overhead: chat() / chat_stream() with zero model latency - everything
+  measured is our own tool loop, request building and history handling
+- Concurrency: many conversations at once with fixed model latency;
+  throughput and peak in-flight model calls show where we serialize
+- Tail latency: the replay script's lognormal latency, p95/p99 per chat
+
+Usage:
+    python benchmarks/agent_load_benchmark.py
+    python benchmarks/agent_load_benchmark.py --script benchmarks/replay/agent_tools.json --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.performance_suite import BenchmarkSuite
+from shared.async_base_agent import AsyncAgentAdapter
+from shared.base_agent import BaseAgent
+from shared.llm_transport import LatencyModel, ReplayTransport
+
+
+DEFAULT_SCRIPT = project_root / "benchmarks" / "replay" / "agent_tools.json"
+QUESTION = "What is the status of the api and worker?"
+
+
+class LookupAgent(BaseAgent):
+    """Agent with one in-memory tool, so only orchestration is measured"""
+
+    STATUSES = {"api": "running", "worker": "running"}
+
+    def define_tools(self) -> List[Dict[str, Any]]:
+        return [{
+            "name": "lookup",
+            "description": "Look up a service status",
+            "input_schema": {"type": "object", "properties": {"key": {"type": "string"}}}
+        }]
+
+    def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
+        return json.dumps({"status": self.STATUSES.get(tool_input["key"], "unknown")})
+
+    def get_system_prompt(self) -> str:
+        return "You report service status."
+
+
+def new_agent(transport: ReplayTransport) -> LookupAgent:
+    return LookupAgent("sk-ant-offline", transport=transport)
+
+
+def chat_once(transport: ReplayTransport) -> str:
+    """One fresh conversation through chat()"""
+    return new_agent(transport).chat(QUESTION)
+
+
+def stream_once(transport: ReplayTransport) -> str:
+    """One fresh conversation through chat_stream()"""
+    return "".join(
+        event["text"] for event in new_agent(transport).chat_stream(QUESTION) if event["type"] == "text"
+    )
+
+
+def concurrent_chats(transport: ReplayTransport, conversations: int, concurrency: int) -> None:
+    """Run conversations on a thread pool"""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: chat_once(transport), range(conversations)))
+
+
+def concurrent_async_chats(transport: ReplayTransport, conversations: int) -> None:
+    """Run conversations as coroutines on one event loop"""
+    template = new_agent(transport)
+
+    async def run():
+        await asyncio.gather(*(AsyncAgentAdapter(template).chat(QUESTION) for _ in range(conversations)))
+
+    asyncio.run(run())
+
+
+def report_throughput(label: str, transport: ReplayTransport, run, conversations: int) -> None:
+    """Time a batch of conversations and print throughput"""
+    transport.peak_in_flight = 0
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(f"   {label}: {conversations / elapsed:.1f} chats/s "
+          f"({elapsed:.2f}s, peak {transport.peak_in_flight} model calls in flight)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline agent load benchmark")
+    parser.add_argument("--script", default=str(DEFAULT_SCRIPT), help="Replay script JSON")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent conversations")
+    parser.add_argument("--conversations", type=int, default=200, help="Conversations per load run")
+    parser.add_argument("--seed", type=int, default=None, help="Override the script's latency seed")
+    args = parser.parse_args()
+
+    scripts = ReplayTransport.from_file(args.script).scripts
+    instant = ReplayTransport(scripts)
+    fixed = ReplayTransport(scripts, LatencyModel("fixed", ms=50))
+    recorded = ReplayTransport.from_file(args.script, seed=args.seed)
+
+    suite = BenchmarkSuite("Agent Orchestration (replay transport)")
+
+    # 1. Our own overhead per conversation (2 model calls, 2 tool calls)
+    suite.add_benchmark("chat() overhead", chat_once, category="overhead",
+                        iterations=200, transport=instant)
+    suite.add_benchmark("chat_stream() overhead", stream_once, category="overhead",
+                        iterations=200, transport=instant)
+
+    # 2. Tail latency under the script's latency distribution
+    suite.add_benchmark("chat() end to end", chat_once, category="latency",
+                        iterations=100, transport=recorded)
+
+    suite.print_summary()
+
+    # 3. Concurrency: with 50ms per model call, ideal throughput is
+    #    concurrency / 0.1s; the gap is where we serialize
+    print(f"⚙️  Concurrency ({args.conversations} conversations, 2 × 50ms model calls each)")
+    report_throughput(
+        f"threads x{args.concurrency}", fixed,
+        lambda: concurrent_chats(fixed, args.conversations, args.concurrency), args.conversations
+    )
+    report_throughput(
+        "asyncio (all at once)", fixed,
+        lambda: concurrent_async_chats(fixed, args.conversations), args.conversations
+    )
@@ -0,0 +1,127 @@
+"""
+Pattern Scanner Benchmark for GitWatcherAgent
+
+Compares the single-pass PatternScanner against the previous per-pattern
+implementation (one re.search per pattern per line for TODOs, one
+re.finditer per security pattern with O(n²) line counting):
+- Repository corpus: every file GitWatcherAgent would scan in this repo
+- Large file: one generated module with many matches (worst case for line counting)
+
+Both implementations must produce identical findings; the benchmark
+aborts if they diverge.
+
+Usage:
+    python benchmarks/pattern_scanner_benchmark.py
+"""
+
+import importlib.util
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.performance_suite import BenchmarkSuite
+
+
+def load_git_watcher():
+    """Load GitWatcherAgent from its hyphenated agent directory"""
+    agent_file = project_root / "agents" / "git-watcher" / "agent.py"
+    spec = importlib.util.spec_from_file_location("git_watcher_agent", agent_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.GitWatcherAgent
+
+
+def legacy_find_all(agent, content: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Previous GitWatcherAgent scan: one regex call per pattern"""
+    lines = content.split('\n')
+    todos, security, functions = [], [], []
+
+    for line_num, line in enumerate(lines, 1):
+        for pattern in agent.todo_patterns:
+            match = re.search(pattern, line)
+            if match:
+                todos.append({
+                    "line": line_num,
+                    "comment": match.group(1).strip() if match.groups() else "See comment",
+                    "full_line": line.strip()
+                })
+
+    for issue_type, patterns in agent.security_patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, content):
+                line_num = content[:match.start()].count('\n') + 1
+                security.append({
+                    "rule": issue_type,
+                    "line": line_num,
+                    "code_snippet": lines[line_num - 1].strip()
+                })
+
+    for line_num, line in enumerate(lines, 1):
+        if re.match(r'^\s*def\s+(\w+)\s*\(', line):
+            func_match = re.search(r'def\s+(\w+)', line)
+            if func_match and not func_match.group(1).startswith('_'):
+                functions.append({"name": func_match.group(1), "line": line_num})
+
+    return {"todos": todos, "security": security, "functions": functions}
+
+
+def scan_all(find, contents: List[str]) -> List[Dict[str, List[Dict[str, Any]]]]:
+    """Run a finder over every file content"""
+    return [find(content) for content in contents]
+
+
+def large_module(functions: int = 2000) -> str:
+    """Generate a module with a TODO, a secret and an eval in every function"""
+    blocks = []
+    for i in range(functions):
+        blocks.append(
+            f"def handler_{i}(request):\n"
+            f"    # TODO: validate request {i}\n"
+            f"    password = \"hunter{i}\"\n"
+            f"    return eval(request.body)\n"
+        )
+    return "\n".join(blocks)
+
+
+if __name__ == "__main__":
+    GitWatcherAgent = load_git_watcher()
+    agent = GitWatcherAgent("sk-ant-benchmark", repository_path=str(project_root))
+
+    corpus = []
+    for file_path in agent._get_all_files(project_root):
+        try:
+            corpus.append(file_path.read_text(encoding='utf-8'))
+        except (OSError, UnicodeDecodeError):
+            continue
+    large = [large_module()]
+
+    # Findings must match exactly before timings mean anything
+    for name, contents in [("repository", corpus), ("large file", large)]:
+        if scan_all(agent._find_all, contents) != scan_all(lambda c: legacy_find_all(agent, c), contents):
+            print(f"❌ Findings differ on {name} corpus")
+            sys.exit(1)
+    print(f"✅ Identical findings on {len(corpus)} repository files and generated module\n")
+
+    suite = BenchmarkSuite("GitWatcher Pattern Scanning")
+    suite.add_benchmark(
+        "Per-pattern scan (previous)", scan_all, category="repository",
+        iterations=5, warmup=1, find=lambda c: legacy_find_all(agent, c), contents=corpus
+    )
+    suite.add_benchmark(
+        "Single-pass PatternScanner", scan_all, category="repository",
+        iterations=5, warmup=1, find=agent._find_all, contents=corpus
+    )
+    suite.add_benchmark(
+        "Per-pattern scan (previous)", scan_all, category="large_file",
+        iterations=5, warmup=1, find=lambda c: legacy_find_all(agent, c), contents=large
+    )
+    suite.add_benchmark(
+        "Single-pass PatternScanner", scan_all, category="large_file",
+        iterations=5, warmup=1, find=agent._find_all, contents=large
+    )
+
+    suite.print_summary()
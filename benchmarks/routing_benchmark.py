@@ -0,0 +1,102 @@
+"""
+Routing Benchmark for AgentOrchestrator
+
+Compares TriggerIndex routing against the previous per-trigger substring
+scan on generated registries of growing size (up to 500 agents and 5,000
+triggers). The substring scan also matches inside words, so only the
+index's results are checked: every generated task must route to the agent
+whose triggers it was built from.
+
+Usage:
+    python benchmarks/routing_benchmark.py
+"""
+
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.performance_suite import BenchmarkSuite
+from orchestrator.orchestrator import AgentOrchestrator
+
+
+def legacy_find_agent_for_task(agents: List[Dict[str, Any]], task_description: str) -> List[Dict[str, Any]]:
+    """Previous routing: substring test of every trigger of every agent"""
+    task_lower = task_description.lower()
+    matches = []
+    for agent in agents:
+        matched = [t for t in agent.get("triggers", []) if t.lower() in task_lower]
+        if matched:
+            matches.append({"agent_id": agent["id"], "confidence": len(matched), "matched_keywords": matched})
+    matches.sort(key=lambda x: x["confidence"], reverse=True)
+    return matches
+
+
+def generated_registry(agent_count: int, triggers_per_agent: int = 10) -> Dict[str, Any]:
+    """Registry of agents with distinct one- and two-word triggers"""
+    agents = []
+    for i in range(agent_count):
+        triggers = [f"topic{i}x{j}" for j in range(triggers_per_agent - 2)]
+        triggers += [f"area{i} report", f"area{i} status"]
+        agents.append({
+            "id": f"agent-{i}",
+            "name": f"Agent {i}",
+            "description": f"Generated agent {i}",
+            "path": f"agents/agent-{i}",
+            "triggers": triggers,
+        })
+    return {"agents": agents}
+
+
+def generated_tasks(registry: Dict[str, Any], count: int = 200) -> List[Dict[str, str]]:
+    """Tasks naming two triggers of a random agent amid filler words"""
+    rng = random.Random(0)
+    tasks = []
+    for _ in range(count):
+        agent = rng.choice(registry["agents"])
+        first, second = rng.sample(agent["triggers"], 2)
+        text = f"Could you please look at the {first} numbers and then summarise the {second} for this week?"
+        tasks.append({"agent_id": agent["id"], "text": text})
+    return tasks
+
+
+def route_all(route, tasks: List[Dict[str, str]]) -> None:
+    """Route every task"""
+    for task in tasks:
+        route(task["text"])
+
+
+if __name__ == "__main__":
+    suite = BenchmarkSuite("Orchestrator Keyword Routing")
+
+    for agent_count in (5, 50, 500):
+        registry = generated_registry(agent_count)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(registry, f)
+        orchestrator = AgentOrchestrator(registry_path=f.name)
+        Path(f.name).unlink()
+        tasks = generated_tasks(registry)
+
+        for task in tasks:
+            matches = orchestrator.find_agent_for_task(task["text"])
+            if not matches or matches[0]["agent_id"] != task["agent_id"]:
+                print(f"❌ Misrouted: {task['text']}")
+                sys.exit(1)
+
+        category = f"{agent_count}_agents"
+        suite.add_benchmark(
+            f"Substring scan (previous), {len(tasks)} tasks", route_all, category=category,
+            iterations=10, warmup=1, route=lambda text: legacy_find_agent_for_task(registry["agents"], text),
+            tasks=tasks
+        )
+        suite.add_benchmark(
+            f"TriggerIndex, {len(tasks)} tasks", route_all, category=category,
+            iterations=10, warmup=1, route=orchestrator.find_agent_for_task, tasks=tasks
+        )
+
+    suite.print_summary()
@@ -12,6 +12,7 @@ Usage:
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
 import os
 import sys
@@ -20,6 +21,9 @@ from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.agent_pool import AgentPool
 
 # Import Superior Brain
 try:
@@ -66,30 +70,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize brain (singleton)
-brain = None
-
-def get_brain() -> SuperiorAgentBrain:
-    """Get or create brain instance."""
-    global brain
-    if brain is None and SuperiorAgentBrain is not None:
-        logger.info("Initializing Superior Brain...")
-        # Initialize with optional components based on availability
-        brain = SuperiorAgentBrain(
-            enable_vector_memory=True,  # Requires Qdrant
-            enable_persistent_memory=True,  # Requires Neon
-            enable_meta_learning=True,
-            enable_knowledge_graph=True,
-            enable_orchestration=True
-        )
-        logger.info("Superior Brain initialized")
+# Brain instances are pooled: each query checks one out (pinned to its
+# session_id, so conversations never mix) and runs in a worker thread, so
+# concurrent queries run side by side
+BRAIN_ID = "superior-brain"
+
+
+def build_brain() -> SuperiorAgentBrain:
+    """Build a brain instance."""
+    logger.info("Initializing Superior Brain...")
+    # Initialize with optional components based on availability
+    brain = SuperiorAgentBrain(
+        enable_vector_memory=True,  # Requires Qdrant
+        enable_persistent_memory=True,  # Requires Neon
+        enable_meta_learning=True,
+        enable_knowledge_graph=True,
+        enable_orchestration=True
+    )
+    logger.info("Superior Brain initialized")
     return brain
 
 
+brains = AgentPool({BRAIN_ID: build_brain} if SuperiorAgentBrain is not None else {})
+
+
 # Request/Response Models
 class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=5000)
     user_id: Optional[str] = Field(default="anonymous")
+    session_id: Optional[str] = Field(default=None, description="Continue this conversation (omit for a one-off question)")
     use_memory: bool = Field(default=True, description="Use vector memory for recall")
     use_orchestration: bool = Field(default=True, description="Route to specialized agents")
 
@@ -151,14 +160,14 @@ async def health():
     }
 
     try:
-        brain_instance = get_brain()
-        if brain_instance:
-            components["brain"] = True
-            components["vector_memory"] = brain_instance.vector_memory is not None
-            components["persistent_memory"] = brain_instance.persistent_memory is not None
-            components["orchestration"] = brain_instance.orchestrator is not None
-            components["meta_learning"] = brain_instance.meta_learner is not None
-            components["knowledge_graph"] = brain_instance.knowledge_graph is not None
+        if SuperiorAgentBrain is not None:
+            async with brains.checkout_async(BRAIN_ID) as brain_instance:
+                components["brain"] = True
+                components["vector_memory"] = brain_instance.vector_memory is not None
+                components["persistent_memory"] = brain_instance.persistent_memory is not None
+                components["orchestration"] = brain_instance.orchestrator is not None
+                components["meta_learning"] = brain_instance.meta_learner is not None
+                components["knowledge_graph"] = brain_instance.knowledge_graph is not None
     except Exception as e:
         logger.error(f"Health check error: {e}")
 
@@ -180,18 +189,19 @@ async def chat(request: ChatRequest):
     start_time = datetime.utcnow()
 
     try:
-        brain_instance = get_brain()
-        if not brain_instance:
+        if SuperiorAgentBrain is None:
             raise HTTPException(
                 status_code=503,
                 detail="Superior Brain not available - check Qdrant and database connections"
             )
 
-        # Process query through brain
-        result = brain_instance.process_query(
-            query=request.message,
-            user_id=request.user_id
-        )
+        # Process query through this request's (or session's) brain, in a worker thread
+        async with brains.checkout_async(BRAIN_ID, request.session_id) as brain_instance:
+            result = await run_in_threadpool(
+                brain_instance.process_query,
+                query=request.message,
+                user_id=request.user_id
+            )
 
         execution_time = (datetime.utcnow() - start_time).total_seconds()
 
@@ -218,29 +228,28 @@ async def chat(request: ChatRequest):
 async def memory_stats():
     """Get memory system statistics."""
     try:
-        brain_instance = get_brain()
-        if not brain_instance:
+        if SuperiorAgentBrain is None:
             return {"error": "Brain not initialized"}
 
         stats = {}
-
-        # Vector memory stats
-        if brain_instance.vector_memory:
-            try:
-                collection = brain_instance.vector_memory.client.get_collection(
-                    collection_name=brain_instance.vector_memory.collection_name
-                )
-                stats["vector_memory"] = {
-                    "vectors_count": collection.vectors_count or 0,
-                    "status": "available"
-                }
-            except Exception as e:
-                stats["vector_memory"] = {"status": "error", "message": str(e)}
-
-        # Persistent memory stats
-        if brain_instance.persistent_memory:
-            # This would query Neon for conversation count, etc.
-            stats["persistent_memory"] = {"status": "available"}
+        async with brains.checkout_async(BRAIN_ID) as brain_instance:
+            # Vector memory stats
+            if brain_instance.vector_memory:
+                try:
+                    collection = brain_instance.vector_memory.client.get_collection(
+                        collection_name=brain_instance.vector_memory.collection_name
+                    )
+                    stats["vector_memory"] = {
+                        "vectors_count": collection.vectors_count or 0,
+                        "status": "available"
+                    }
+                except Exception as e:
+                    stats["vector_memory"] = {"status": "error", "message": str(e)}
+
+            # Persistent memory stats
+            if brain_instance.persistent_memory:
+                # This would query Neon for conversation count, etc.
+                stats["persistent_memory"] = {"status": "available"}
 
         return stats
 
@@ -258,15 +267,18 @@ async def consolidate_memory():
     Should be run periodically (weekly).
     """
     try:
-        brain_instance = get_brain()
-        if not brain_instance or not brain_instance.consolidator:
+        if SuperiorAgentBrain is None:
             raise HTTPException(status_code=503, detail="Consolidator not available")
 
         # Run consolidation
-        result = brain_instance.sleep(
-            conversation_days=7,
-            performance_days=14
-        )
+        async with brains.checkout_async(BRAIN_ID) as brain_instance:
+            if not brain_instance.consolidator:
+                raise HTTPException(status_code=503, detail="Consolidator not available")
+            result = await run_in_threadpool(
+                brain_instance.sleep,
+                conversation_days=7,
+                performance_days=14
+            )
 
         return {
             "status": "completed",
@@ -285,24 +297,19 @@ async def consolidate_memory():
 async def startup_event():
     """Initialize brain on startup."""
     logger.info("🧠 Starting Superior Brain API...")
-    try:
-        get_brain()
-        logger.info("✅ Superior Brain API ready")
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize brain: {e}")
+    error = (await run_in_threadpool(brains.warm_up)).get(BRAIN_ID, "Superior Brain not available")
+    if error:
+        logger.error(f"❌ Failed to initialize brain: {error}")
         logger.warning("⚠️  API will run in degraded mode")
+    else:
+        logger.info("✅ Superior Brain API ready")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    global brain
     logger.info("Shutting down Superior Brain API...")
-    if brain:
-        try:
-            brain.close()
-        except:
-            pass
+    brains.close()
     logger.info("Shutdown complete")
 
 
@@ -267,6 +267,38 @@ class MetaLearner:
             result = cursor.fetchone()
             return dict(result) if result else None
 
+    def get_routing_stats(self, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Get recent outcome stats for outcome-weighted routing.
+
+        One row per (agent, task type), plus one per agent across all task
+        types (task_type None).
+
+        Args:
+            days: Look back period
+
+        Returns:
+            Rows with agent_id, task_type, attempts, successes and p50_ms
+        """
+        conn = self._connect()
+
+        cutoff_date = datetime.now() - timedelta(days=days)
+
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    agent_id,
+                    task_type,
+                    COUNT(*) as attempts,
+                    SUM(CASE WHEN success THEN 1 ELSE 0 END) as successes,
+                    percentile_cont(0.5) WITHIN GROUP (ORDER BY execution_time_ms) as p50_ms
+                FROM agent_performance
+                WHERE timestamp > %s
+                GROUP BY GROUPING SETS ((agent_id, task_type), (agent_id))
+            """, (cutoff_date,))
+
+            return [dict(row) for row in cursor.fetchall()]
+
     def get_learning_insights(
         self,
         insight_type: Optional[str] = None,
@@ -5,7 +5,7 @@ Integrates all memory systems for human-like intelligence.
 
 This is the "complete brain" - combining all cognitive components:
 - LLM (CPU): Claude Sonnet for processing
-- Context Window (RAM): 200K token working memory
+- Context Window (RAM): 200K token working memory, compacted to stay within it
 - Vector Memory (Episodic): Qdrant for semantic recall
 - Persistent Memory (Long-term): Neon for conversation storage
 - Meta-Learning (Neuroplasticity): Performance improvement
@@ -33,7 +33,9 @@ from memory import (
     MemoryConsolidation
 )
 from orchestrator.orchestrator import AgentOrchestrator
-from anthropic import Anthropic
+from shared.outcome_scorer import OutcomeScorer
+from shared.history_manager import HistoryManager
+from shared.llm_transport import ReplayTransport, create_client, transport_from_env
 
 
 class SuperiorAgentBrain:
@@ -58,7 +60,8 @@ class SuperiorAgentBrain:
         enable_persistent_memory: bool = True,
         enable_meta_learning: bool = True,
         enable_knowledge_graph: bool = True,
-        enable_orchestration: bool = True
+        enable_orchestration: bool = True,
+        transport: Optional[ReplayTransport] = None
     ):
         """
         Initialize the superior agent brain.
@@ -70,6 +73,8 @@ class SuperiorAgentBrain:
             enable_meta_learning: Enable performance tracking
             enable_knowledge_graph: Enable shared learning
             enable_orchestration: Enable task routing
+            transport: Local stand-in for the Messages API (default: LLM_TRANSPORT,
+                       else the live API)
         """
         print("\n" + "="*70)
         print("🧠 INITIALIZING SUPERIOR AGENT BRAIN")
@@ -77,10 +82,11 @@ class SuperiorAgentBrain:
 
         # 1. CPU (Processing Unit)
         api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
+        transport = transport or transport_from_env()
+        if not api_key and transport is None:
             raise ValueError("ANTHROPIC_API_KEY required")
 
-        self.client = Anthropic(api_key=api_key)
+        self.client = create_client(api_key, transport)
         self.model = model
         self.max_tokens = 8192
         print(f"✅ CPU: {model}")
@@ -88,6 +94,8 @@ class SuperiorAgentBrain:
         # 2. RAM (Working Memory / Context Window)
         self.conversation_history: List[Dict[str, Any]] = []
         self.context_limit = 200000  # tokens
+        # Leave room for the response; old turns are summarized past this
+        self.history = HistoryManager(budget_tokens=self.context_limit - self.max_tokens)
         print(f"✅ RAM: {self.context_limit:,} token context window")
 
         # 3. Long-term Memory Systems
@@ -142,7 +150,12 @@ class SuperiorAgentBrain:
         self.orchestrator = None
         if enable_orchestration:
             try:
-                self.orchestrator = AgentOrchestrator()
+                outcome_scorer = None
+                if self.meta_learner:
+                    # Rank agents by their recorded outcomes, from a snapshot refreshed every 5 minutes
+                    outcome_scorer = OutcomeScorer(self.meta_learner.get_routing_stats)
+                    outcome_scorer.start_refreshing(interval=300)
+                self.orchestrator = AgentOrchestrator(outcome_scorer=outcome_scorer)
                 agent_count = len(self.orchestrator.list_agents())
                 print(f"✅ Orchestrator: {agent_count} specialized agents available")
             except Exception as e:
@@ -209,7 +222,7 @@ class SuperiorAgentBrain:
 
         if self.orchestrator:
             print("\n🎯 Routing to specialist...")
-            routing = self.orchestrator.route_task(query, auto_select=True)
+            routing = self.orchestrator.route_task(query, auto_select=True, task_type="query_response")
 
             if routing['status'] == 'routed':
                 selected_agent = routing['agent']['agent_id']
@@ -244,11 +257,18 @@ class SuperiorAgentBrain:
             "content": enhanced_query
         })
 
+        # Keep working memory within the context window
+        self.conversation_history = self.history.compact(self.conversation_history)
+        request = {}
+        if self.history.summary:
+            request["system"] = self.history.system_prompt()
+
         # Generate response
         response = self.client.messages.create(
             model=self.model,
             max_tokens=self.max_tokens,
-            messages=self.conversation_history
+            messages=self.conversation_history,
+            **request
         )
 
         # Extract response text
@@ -368,6 +388,8 @@ class SuperiorAgentBrain:
             "session_id": self.session_id,
             "model": self.model,
             "conversation_length": len(self.conversation_history),
+            "context_tokens_estimate": self.history.count_tokens(self.conversation_history),
+            "compacted_messages": self.history.dropped_messages,
             "components": {
                 "vector_memory": self.vector_memory is not None,
                 "persistent_memory": self.persistent_memory is not None,
@@ -396,6 +418,7 @@ class SuperiorAgentBrain:
     def reset_conversation(self):
         """Clear working memory (reset conversation)."""
         self.conversation_history = []
+        self.history.reset()
         print("🔄 Working memory cleared")
 
     def close(self):
@@ -405,6 +428,9 @@ class SuperiorAgentBrain:
         if self.persistent_memory:
             self.persistent_memory.close()
 
+        if self.orchestrator:
+            self.orchestrator.close()
+
         if self.meta_learner:
             self.meta_learner.close()
 
@@ -42,7 +42,8 @@ class MetricsCollector:
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
 
         self.events: List[MetricEvent] = []
-        self.lock = threading.Lock()
+        # Re-entrant: the *_all_*_summary methods call the per-name summaries
+        self.lock = threading.RLock()
 
         # In-memory aggregates for fast queries
         self.agent_stats = defaultdict(lambda: {
@@ -126,6 +127,41 @@ class MetricsCollector:
             if context_tokens:
                 stats["total_context_tokens"] += context_tokens
 
+    def record_span(self, span: Any):
+        """
+        Record a BaseAgent span (model call, tool call or whole chat).
+
+        Register as a span hook: agent.add_span_hook(collector.record_span)
+
+        Chats are aggregated under the agent name, model calls under
+        "<agent>:model" and each tool under "<agent>:tool:<name>", so every
+        summary stays comparable (one chat, one API call, one tool run).
+        """
+        if span.kind == "chat":
+            name = span.agent
+        elif span.kind == "tool":
+            name = f"{span.agent}:tool:{span.name}"
+        else:
+            name = f"{span.agent}:{span.kind}"
+
+        metadata = dict(span.metadata)
+        if span.kind == "model":
+            metadata["model"] = span.name
+        if span.turn is not None:
+            metadata["turn" if span.kind == "model" else "turns"] = span.turn
+        if span.usage:
+            metadata["usage"] = span.usage
+
+        self.record_agent_call(
+            agent_name=name,
+            operation=span.kind,
+            duration_ms=span.duration_ms,
+            success=span.success,
+            tokens_used=span.tokens or None,
+            error_type=span.error_type,
+            metadata=metadata,
+        )
+
     def get_agent_summary(self, agent_name: str) -> Dict:
         """Get summary statistics for an agent"""
         with self.lock:
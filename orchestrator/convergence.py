@@ -33,13 +33,16 @@ Usage:
 
     print(f"Consensus: {result['consensus']}")
     print(f"Tasks: {result['unified_tasks']}")
+
+    # CPU-bound per-file scans across all cores
+    orchestrator = ConvergenceOrchestrator(api_key, executor="process")
 """
 
 import os
 import asyncio
-import subprocess
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Set
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Set, Tuple, Union
 from pathlib import Path
 
 # Import agents and shared modules
@@ -68,43 +71,124 @@ CodeCriticAgent = code_critic_module.CodeCriticAgent
 TestGeneratorAgent = test_gen_module.TestGeneratorAgent
 DocWriterAgent = doc_writer_module.DocWriterAgent
 
-# Import queue
+# Import queue and shared commit context
+from shared.commit_context import CommitContext
 from shared.confidence import ProactivityQueue
 
 
+# Per-file scan workers
+#
+# These are module-level so they can be pickled into a ProcessPoolExecutor.
+# Each worker process builds one instance per (agent class, API key) and
+# reuses it for every shard it receives (agent classes are loaded from file
+# paths, so the instances themselves never cross process boundaries - only
+# plain dicts do). In thread mode the cache lives in this process, so
+# ConvergenceOrchestrator.shutdown() drops its entries.
+
+_worker_agents: Dict[Tuple[type, str], Any] = {}
+
+
+def _get_worker_agent(agent_class, api_key: str):
+    """Get (or lazily build) this process's instance of an agent class for an API key."""
+    key = (agent_class, api_key)
+    agent = _worker_agents.get(key)
+    if agent is None:
+        agent = agent_class(api_key)
+        _worker_agents[key] = agent
+    return agent
+
+
+def _release_worker_agents(api_key: str) -> None:
+    """Drop this process's cached agent instances built with an API key."""
+    for key in [key for key in _worker_agents if key[1] == api_key]:
+        _worker_agents.pop(key, None)
+
+
+def _critic_review_shard(api_key: str, added_lines: List[Dict[str, Any]], review_types: List[str]) -> List[Dict[str, Any]]:
+    """Run critic rules over one file's added lines."""
+    return _get_worker_agent(CodeCriticAgent, api_key)._review_lines(added_lines, review_types)
+
+
+def _test_gen_scan_shard(api_key: str, file_path: str, tree=None) -> Dict[str, Any]:
+    """Scan one file for untested functions."""
+    return _get_worker_agent(TestGeneratorAgent, api_key)._scan_for_untested_functions(file_path, tree)
+
+
+def _doc_writer_scan_shard(api_key: str, file_path: str, tree=None) -> Dict[str, Any]:
+    """Scan one file for missing docstrings."""
+    return _get_worker_agent(DocWriterAgent, api_key)._scan_for_missing_docstrings(file_path, tree)
+
+
 class ConvergenceOrchestrator:
     """Orchestrates multiple agents in parallel for consensus-driven analysis."""
 
-    def __init__(self, anthropic_api_key: str, timeout: int = 30):
+    def __init__(
+        self,
+        anthropic_api_key: str,
+        timeout: int = 30,
+        deadline: Optional[float] = None,
+        executor: Union[str, Executor, None] = "thread",
+        max_workers: Optional[int] = None
+    ):
         """Initialize convergence orchestrator.
 
         Args:
             anthropic_api_key: Anthropic API key for agent initialization
             timeout: Timeout in seconds for each agent (default: 30)
+            deadline: Overall time budget in seconds for the whole fan-out;
+                agents still running when it expires are cancelled and the
+                finished ones are kept (default: None, no global deadline)
+            executor: Where per-file scan work runs: "thread" (event loop's
+                default executor), "process" (a ProcessPoolExecutor owned by
+                this orchestrator, sidesteps the GIL for regex/AST scans), or
+                any concurrent.futures.Executor supplied by the caller
+            max_workers: Worker count for the "process" executor
+                (default: os.cpu_count())
         """
         self.api_key = anthropic_api_key
         self.timeout = timeout
+        self.deadline = deadline
+
+        # Scan executor (None = asyncio default thread pool)
+        self._owns_executor = False
+        if executor == "process":
+            self.executor: Optional[Executor] = ProcessPoolExecutor(max_workers=max_workers)
+            self._owns_executor = True
+        elif executor == "thread" or executor is None:
+            self.executor = None
+        elif isinstance(executor, Executor):
+            self.executor = executor
+        else:
+            raise ValueError(f"Unknown executor: {executor!r} (use 'thread', 'process' or an Executor)")
 
         # Initialize queue for storing converged tasks
         self.queue = ProactivityQueue()
 
-    async def analyze_commit(self, commit_hash: str = "HEAD") -> Dict[str, Any]:
+    async def analyze_commit(
+        self,
+        commit_hash: str = "HEAD",
+        on_agent_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """Analyze a commit using multiple agents in parallel.
 
         Args:
             commit_hash: Git commit hash to analyze (default: HEAD)
+            on_agent_result: Optional callback receiving (agent_name, result)
+                as soon as each agent finishes
 
         Returns:
             Dict with convergence results and unified task list
         """
         try:
-            # Get commit details
-            commit_info = self._get_commit_info(commit_hash)
+            # Get commit details once (single git show + one AST per file)
+            loop = asyncio.get_event_loop()
 
-            if not commit_info["success"]:
+            try:
+                context = await loop.run_in_executor(None, CommitContext.from_git, commit_hash)
+            except Exception as e:
                 return {
                     "success": False,
-                    "error": commit_info.get("error")
+                    "error": f"Failed to get commit info: {str(e)}"
                 }
 
             # Run agents in parallel
@@ -113,7 +197,9 @@ class ConvergenceOrchestrator:
 
             agent_results = await self._run_agents_parallel(
                 commit_hash=commit_hash,
-                files_changed=commit_info["files_changed"]
+                files_changed=context.files_changed,
+                on_result=on_agent_result,
+                context=context
             )
 
             # Analyze convergence
@@ -125,26 +211,29 @@ class ConvergenceOrchestrator:
                 convergence=convergence
             )
 
-            # Add tasks to proactivity queue
-            for task in unified_tasks:
-                self.queue.add_task(
-                    task_type=task["type"],
-                    description=task["description"],
-                    file=task["file"],
-                    line=task.get("line"),
-                    context={
+            # Add tasks to proactivity queue (single write)
+            self.queue.add_tasks(
+                {
+                    "type": task["type"],
+                    "description": task["description"],
+                    "file": task["file"],
+                    "line": task.get("line"),
+                    "context": {
                         "confidence": task["confidence"],
                         "auto_fixable": task["auto_fixable"],
                         "risk_level": task["risk_level"],
-                        "source": task["source"]
+                        "source": task["source"],
+                        "function_name": task.get("function_name")
                     }
-                )
+                }
+                for task in unified_tasks
+            )
 
             return {
                 "success": True,
                 "commit_hash": commit_hash,
-                "commit_message": commit_info["message"],
-                "files_changed": len(commit_info["files_changed"]),
+                "commit_message": context.message,
+                "files_changed": len(context.files_changed),
                 "agents_run": len(agent_results),
                 "agents_succeeded": sum(1 for r in agent_results.values() if r["success"]),
                 "agent_results": agent_results,
@@ -159,158 +248,320 @@ class ConvergenceOrchestrator:
                 "error": f"Convergence analysis failed: {str(e)}"
             }
 
-    async def _run_agents_parallel(self, commit_hash: str, files_changed: List[str]) -> Dict[str, Dict[str, Any]]:
-        """Run all agents in parallel with timeout.
+    async def _run_agents_parallel(
+        self,
+        commit_hash: str,
+        files_changed: List[str],
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        context: Optional[CommitContext] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run all agents concurrently with per-agent timeout and global deadline.
 
         Args:
             commit_hash: Commit to analyze
             files_changed: List of modified files
+            on_result: Optional callback invoked as (agent_name, result) the
+                moment each agent finishes
+            context: Pre-parsed commit shared by all agents (optional)
 
         Returns:
             Dict mapping agent name to result
         """
-        # Create agent tasks
-        tasks = {
-            "critic": self._run_critic_agent(commit_hash),
-            "test_gen": self._run_test_gen_agent(files_changed),
-            "doc_writer": self._run_doc_writer_agent(files_changed)
-            # Impact analyzer will be added in next component
-        }
-
-        # Run all agents concurrently with timeout
         results = {}
 
-        for agent_name, task in tasks.items():
-            try:
-                print(f"Starting {agent_name} agent...")
+        async for agent_name, result in self.stream_agents(commit_hash, files_changed, context):
+            results[agent_name] = result
 
-                result = await asyncio.wait_for(task, timeout=self.timeout)
+            if on_result:
+                on_result(agent_name, result)
 
-                results[agent_name] = {
-                    "success": True,
-                    "data": result,
-                    "agent": agent_name
-                }
+        print()
 
-                print(f"✓ {agent_name} completed")
+        return results
 
-            except asyncio.TimeoutError:
-                results[agent_name] = {
-                    "success": False,
-                    "error": f"Agent timed out after {self.timeout}s",
-                    "agent": agent_name
-                }
+    async def stream_agents(
+        self,
+        commit_hash: str,
+        files_changed: List[str],
+        context: Optional[CommitContext] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Run all agents concurrently, yielding each result as it completes.
 
-                print(f"✗ {agent_name} timed out")
+        Each agent is bounded by self.timeout. If self.deadline expires first,
+        the agents still running are cancelled and reported as failed, while
+        results that already arrived are unaffected.
 
-            except Exception as e:
-                results[agent_name] = {
-                    "success": False,
-                    "error": str(e),
-                    "agent": agent_name
-                }
+        Args:
+            commit_hash: Commit to analyze
+            files_changed: List of modified files
+            context: Pre-parsed commit shared by all agents (optional)
 
-                print(f"✗ {agent_name} failed: {str(e)}")
+        Yields:
+            (agent_name, result) tuples in completion order
+        """
+        agents = {
+            "critic": self._run_critic_agent(commit_hash, context),
+            "test_gen": self._run_test_gen_agent(files_changed, context),
+            "doc_writer": self._run_doc_writer_agent(files_changed, context)
+            # Impact analyzer will be added in next component
+        }
 
-        print()
+        tasks = {}
+        for agent_name, coro in agents.items():
+            print(f"Starting {agent_name} agent...")
+            tasks[asyncio.ensure_future(self._run_agent(agent_name, coro))] = agent_name
 
-        return results
+        loop = asyncio.get_event_loop()
+        deadline_at = loop.time() + self.deadline if self.deadline is not None else None
+        pending = set(tasks)
 
-    async def _run_critic_agent(self, commit_hash: str) -> Dict[str, Any]:
-        """Run code critic agent on commit.
+        try:
+            while pending:
+                remaining = None if deadline_at is None else max(0.0, deadline_at - loop.time())
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # Global deadline reached: cancel stragglers, keep what we have
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+                    for task in pending:
+                        agent_name = tasks[task]
+                        print(f"✗ {agent_name} cancelled at global deadline")
+                        yield agent_name, {
+                            "success": False,
+                            "error": f"Agent cancelled at global deadline ({self.deadline}s)",
+                            "agent": agent_name
+                        }
+
+                    pending = set()
+                    break
+
+                for task in done:
+                    agent_name = tasks[task]
+
+                    if task.cancelled():
+                        print(f"✗ {agent_name} cancelled")
+                        yield agent_name, {
+                            "success": False,
+                            "error": "Agent was cancelled",
+                            "agent": agent_name
+                        }
+                    else:
+                        yield agent_name, task.result()
+
+        finally:
+            # Consumer stopped early or was cancelled: don't leak agent tasks
+            for task in pending:
+                task.cancel()
+
+    async def _run_agent(self, agent_name: str, coro) -> Dict[str, Any]:
+        """Run a single agent coroutine with the per-agent timeout.
 
         Args:
-            commit_hash: Commit to review
+            agent_name: Agent identifier used in the result
+            coro: Agent coroutine
 
         Returns:
-            Critic analysis results
+            Result dict with success flag and data or error
         """
-        # Run in executor to avoid blocking
         loop = asyncio.get_event_loop()
+        started = loop.time()
 
-        def run_critic():
-            critic = CodeCriticAgent(self.api_key)
-            return critic._review_commit(
-                commit_hash=commit_hash,
-                review_types=["security", "performance", "best_practices"]
-            )
+        try:
+            result = await asyncio.wait_for(coro, timeout=self.timeout)
 
-        return await loop.run_in_executor(None, run_critic)
+            print(f"✓ {agent_name} completed")
 
-    async def _run_test_gen_agent(self, files_changed: List[str]) -> Dict[str, Any]:
-        """Run test generator agent on changed files.
+            return {
+                "success": True,
+                "data": result,
+                "agent": agent_name,
+                "duration_seconds": round(loop.time() - started, 3)
+            }
+
+        except asyncio.TimeoutError:
+            print(f"✗ {agent_name} timed out")
+
+            return {
+                "success": False,
+                "error": f"Agent timed out after {self.timeout}s",
+                "agent": agent_name
+            }
+
+        except Exception as e:
+            print(f"✗ {agent_name} failed: {str(e)}")
+
+            return {
+                "success": False,
+                "error": str(e),
+                "agent": agent_name
+            }
+
+    def shutdown(self) -> None:
+        """Shut down the scan executor if this orchestrator created it and drop cached scan agents."""
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            self._owns_executor = False
+        _release_worker_agents(self.api_key)
+
+    @staticmethod
+    def _shared_ast(context: Optional[CommitContext], file_path: str):
+        """AST for file_path from the shared context (None = let the agent parse)."""
+        return context.get_ast(file_path) if context is not None else None
+
+    async def _map_shards(self, fn: Callable, shards: List[Tuple]) -> List[Any]:
+        """Run fn(*shard) for every shard on the scan executor.
+
+        Results are returned in shard order regardless of which worker
+        finishes first, so merged output is deterministic.
 
         Args:
-            files_changed: List of modified files
+            fn: Module-level (picklable) worker function
+            shards: Argument tuples, one per unit of work (typically a file)
 
         Returns:
-            Test generation analysis
+            List of results aligned with shards
         """
         loop = asyncio.get_event_loop()
 
-        def run_test_gen():
-            test_gen = TestGeneratorAgent(self.api_key)
+        return await asyncio.gather(*[
+            loop.run_in_executor(self.executor, fn, *shard)
+            for shard in shards
+        ])
 
-            # Scan Python files for untested functions
-            results = []
+    async def _run_critic_agent(
+        self,
+        commit_hash: str,
+        context: Optional[CommitContext] = None
+    ) -> Dict[str, Any]:
+        """Run code critic agent on commit.
 
-            for file_path in files_changed:
-                if file_path.endswith('.py'):
-                    scan = test_gen._scan_for_untested_functions(file_path)
+        The diff is parsed once, then rule checks are sharded per file.
 
-                    if scan["success"] and scan["untested"]:
-                        results.append({
-                            "file": file_path,
-                            "untested_count": scan["untested_functions"],
-                            "untested": scan["untested"][:5],  # First 5
-                            "coverage": scan["coverage_percent"]
-                        })
+        Args:
+            commit_hash: Commit to review
+            context: Pre-parsed commit (avoids another git show)
 
-            return {
-                "files_scanned": len([f for f in files_changed if f.endswith('.py')]),
-                "files_with_gaps": len(results),
-                "results": results
-            }
+        Returns:
+            Critic analysis results
+        """
+        # Run in executor to avoid blocking
+        loop = asyncio.get_event_loop()
+        review_types = ["security", "performance", "best_practices"]
 
-        return await loop.run_in_executor(None, run_test_gen)
+        critic = await loop.run_in_executor(None, CodeCriticAgent, self.api_key)
 
-    async def _run_doc_writer_agent(self, files_changed: List[str]) -> Dict[str, Any]:
-        """Run doc writer agent on changed files.
+        if context is not None:
+            added_lines = context.added_lines
+        else:
+            added_lines = await loop.run_in_executor(None, critic._get_commit_additions, commit_hash)
+
+            if isinstance(added_lines, dict):
+                return added_lines  # Error result
+
+        # Group added lines per file, preserving diff order
+        lines_by_file: Dict[str, List[Dict[str, Any]]] = {}
+        for line_info in added_lines:
+            lines_by_file.setdefault(line_info["file"], []).append(line_info)
+
+        shard_issues = await self._map_shards(
+            _critic_review_shard,
+            [(self.api_key, file_lines, review_types) for file_lines in lines_by_file.values()]
+        )
+
+        # Restore the unsharded ordering: category first, then diff order
+        category_rank = {"security": 0, "performance": 1, "best_practices": 2}
+        issues = sorted(
+            (issue for file_issues in shard_issues for issue in file_issues),
+            key=lambda issue: category_rank.get(issue["category"], 3)
+        )
+
+        return await loop.run_in_executor(None, critic._record_review, commit_hash, issues)
+
+    async def _run_test_gen_agent(
+        self,
+        files_changed: List[str],
+        context: Optional[CommitContext] = None
+    ) -> Dict[str, Any]:
+        """Run test generator agent on changed files.
 
         Args:
             files_changed: List of modified files
+            context: Pre-parsed commit supplying each file's AST (optional)
 
         Returns:
-            Documentation analysis
+            Test generation analysis
         """
-        loop = asyncio.get_event_loop()
-
-        def run_doc_writer():
-            doc_writer = DocWriterAgent(self.api_key)
+        # Scan Python files for untested functions, one shard per file
+        python_files = [f for f in files_changed if f.endswith('.py')]
+        scans = await self._map_shards(
+            _test_gen_scan_shard,
+            [(self.api_key, file_path, self._shared_ast(context, file_path)) for file_path in python_files]
+        )
+
+        results = []
+
+        for file_path, scan in zip(python_files, scans):
+            if scan["success"] and scan["untested"]:
+                results.append({
+                    "file": file_path,
+                    "untested_count": scan["untested_functions"],
+                    "untested": scan["untested"][:5],  # First 5
+                    "coverage": scan["coverage_percent"]
+                })
 
-            # Scan Python files for missing docstrings
-            results = []
+        return {
+            "files_scanned": len(python_files),
+            "files_with_gaps": len(results),
+            "results": results
+        }
 
-            for file_path in files_changed:
-                if file_path.endswith('.py'):
-                    scan = doc_writer._scan_for_missing_docstrings(file_path)
+    async def _run_doc_writer_agent(
+        self,
+        files_changed: List[str],
+        context: Optional[CommitContext] = None
+    ) -> Dict[str, Any]:
+        """Run doc writer agent on changed files.
 
-                    if scan["success"] and (scan["missing"] or scan["incomplete"]):
-                        results.append({
-                            "file": file_path,
-                            "missing_count": scan["missing_docstrings"],
-                            "incomplete_count": scan["incomplete_docstrings"],
-                            "missing": scan["missing"][:5],  # First 5
-                            "coverage": scan["coverage_percent"]
-                        })
+        Args:
+            files_changed: List of modified files
+            context: Pre-parsed commit supplying each file's AST (optional)
 
-            return {
-                "files_scanned": len([f for f in files_changed if f.endswith('.py')]),
-                "files_with_gaps": len(results),
-                "results": results
-            }
+        Returns:
+            Documentation analysis
+        """
+        # Scan Python files for missing docstrings, one shard per file
+        python_files = [f for f in files_changed if f.endswith('.py')]
+        scans = await self._map_shards(
+            _doc_writer_scan_shard,
+            [(self.api_key, file_path, self._shared_ast(context, file_path)) for file_path in python_files]
+        )
+
+        results = []
+
+        for file_path, scan in zip(python_files, scans):
+            if scan["success"] and (scan["missing"] or scan["incomplete"]):
+                results.append({
+                    "file": file_path,
+                    "missing_count": scan["missing_docstrings"],
+                    "incomplete_count": scan["incomplete_docstrings"],
+                    "missing": scan["missing"][:5],  # First 5
+                    "coverage": scan["coverage_percent"]
+                })
 
-        return await loop.run_in_executor(None, run_doc_writer)
+        return {
+            "files_scanned": len(python_files),
+            "files_with_gaps": len(results),
+            "results": results
+        }
 
     def _analyze_convergence(self, agent_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze convergence across agent results.
@@ -500,41 +751,6 @@ class ConvergenceOrchestrator:
 
         return tasks
 
-    def _get_commit_info(self, commit_hash: str) -> Dict[str, Any]:
-        """Get information about a commit.
-
-        Args:
-            commit_hash: Git commit hash
-
-        Returns:
-            Dict with commit details
-        """
-        try:
-            # Get commit message
-            message = subprocess.check_output(
-                ["git", "log", "-1", "--pretty=%B", commit_hash],
-                text=True
-            ).strip()
-
-            # Get files changed
-            files = subprocess.check_output(
-                ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", commit_hash],
-                text=True
-            ).strip().split('\n')
-
-            return {
-                "success": True,
-                "hash": commit_hash,
-                "message": message,
-                "files_changed": [f for f in files if f]
-            }
-
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to get commit info: {str(e)}"
-            }
-
 
 if __name__ == "__main__":
     """Demo usage of Convergence Orchestrator."""
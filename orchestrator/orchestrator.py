@@ -2,14 +2,53 @@
 """
 Agent Orchestrator - Routes tasks to specialized agents
 Acts as the central coordinator for the agent workforce
+
+Keyword routing uses a TriggerIndex compiled once from the registry
+(shared/trigger_index.py): whole-word trigger matching in one pass over
+the task, independent of how many agents and triggers are registered.
+
+The registry is served by AgentRegistry (shared/agent_registry.py): agents
+are indexed by id and category, and with watch=True edits to registry.json
+are picked up without a restart - the indexes and routing trie are rebuilt
+and swapped in atomically, and subscribers are notified.
+
+Agent instances live in an AgentPool (shared/agent_pool.py) keyed by agent
+id: built on first use (or by warm_up()) from the registry entry's
+agent.py, then reused - per request, or pinned to a conversation with
+session_id - and evicted once idle. When a registry reload changes or
+removes an agent's entry, its pooled instances are dropped. An agent_wrapper (e.g. AsyncAgentAdapter
+for async services) is applied to each instance as it's built.
+
+With an embedder configured, a semantic tier (shared/semantic_router.py)
+backs up keyword routing: when no trigger matches, or the top agents tie
+on keyword confidence, agents are ranked by cosine similarity between the
+task and their cached description/capability embeddings.
+
+With an OutcomeScorer (shared/outcome_scorer.py), matches are finally
+re-ranked by confidence blended with each agent's recent success rate and
+median latency from MetaLearner, read from a periodically refreshed
+in-memory snapshot.
 """
 
+import importlib.util
 import json
 import os
 import sys
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Callable, Dict, List, Any, Optional, Union
 from pathlib import Path
 
+# Add project root to path for shared imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.agent_pool import AgentFactory, AgentPool
+from shared.agent_registry import AgentRegistry, RegistryListener, RegistrySnapshot
+from shared.base_agent import BaseAgent
+from shared.outcome_scorer import OutcomeScorer
+from shared.semantic_router import Embedder, SemanticRouter, create_embedder
+from shared.trigger_index import TriggerIndex
+
 
 class AgentOrchestrator:
     """
@@ -17,29 +56,96 @@ class AgentOrchestrator:
     Routes user requests to the appropriate agent based on context.
     """
 
-    def __init__(self, registry_path: str = None):
+    def __init__(
+        self,
+        registry_path: str = None,
+        watch: bool = False,
+        poll_interval: float = 2.0,
+        max_idle_agents: int = 4,
+        agent_idle_ttl: float = 900.0,
+        max_agent_sessions: int = 100,
+        agent_wrapper: Optional[Callable[[Any], Any]] = None,
+        embedder: Union[str, Embedder, None] = None,
+        semantic_threshold: float = 0.25,
+        vector_cache_path: Optional[str] = None,
+        outcome_scorer: Optional[OutcomeScorer] = None
+    ):
         """
         Initialize orchestrator with agent registry.
 
         Args:
             registry_path: Path to registry.json file
+            watch: Reload the registry when the file changes (for long-running services)
+            poll_interval: Seconds between registry file checks when watching
+            max_idle_agents: Idle instances kept per agent
+            agent_idle_ttl: Seconds before an unused agent instance is dropped
+            max_agent_sessions: Conversations pinned to an instance at once
+            agent_wrapper: Applied to every pooled instance as it's built
+            embedder: Enables semantic routing - an embedder or create_embedder()
+                      name ('local', 'hashing', 'voyage', 'openai')
+            semantic_threshold: Minimum cosine similarity for a semantic match
+            vector_cache_path: Agent embedding cache (default: agent_vectors.json
+                               next to the registry)
+            outcome_scorer: Re-ranks matches by agent success rate and latency
         """
         if registry_path is None:
             registry_path = Path(__file__).parent / "registry.json"
 
         self.registry_path = Path(registry_path)
-        self.registry = self._load_registry()
-        self.agents = {}  # Cached agent instances
-
-    def _load_registry(self) -> Dict[str, Any]:
-        """Load agent registry from JSON file."""
-        try:
-            with open(self.registry_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Agent registry not found at {self.registry_path}")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid registry JSON: {e}")
+        self.registry_service = AgentRegistry(self.registry_path)
+        if watch:
+            self.registry_service.start_watching(poll_interval)
+        self.agent_wrapper = agent_wrapper
+        self.agents = AgentPool(
+            resolve_factory=self._pooled_factory, max_idle=max_idle_agents, idle_ttl=agent_idle_ttl,
+            max_sessions=max_agent_sessions
+        )
+        self._pooled_entries = self.registry_service.snapshot.by_id  # Entries the pool was built from
+        self.registry_service.subscribe(self._on_registry_change)
+
+        self.semantic_threshold = semantic_threshold
+        self._semantic_router: Optional[SemanticRouter] = None
+        self._semantic_fit = (-1, None)  # (registry version, agent matrix) of the router's last fit
+        self._semantic_lock = threading.Lock()
+        if embedder is not None:
+            if isinstance(embedder, str):
+                embedder = create_embedder(embedder)
+            cache_path = vector_cache_path or self.registry_path.with_name("agent_vectors.json")
+            self._semantic_router = SemanticRouter(embedder, cache_path=str(cache_path))
+
+        self.outcome_scorer = outcome_scorer
+
+    @property
+    def registry(self) -> Dict[str, Any]:
+        """Current parsed registry."""
+        return self.registry_service.snapshot.data
+
+    @property
+    def routing_index(self) -> TriggerIndex:
+        """Trigger index of the current registry."""
+        return self.registry_service.snapshot.index
+
+    def subscribe(self, listener: RegistryListener):
+        """
+        Call listener with every reloaded registry snapshot.
+
+        Returns:
+            Function that unsubscribes the listener
+        """
+        return self.registry_service.subscribe(listener)
+
+    def _on_registry_change(self, snapshot: RegistrySnapshot) -> None:
+        """Drop pooled instances of agents whose registry entry changed or disappeared."""
+        previous, self._pooled_entries = self._pooled_entries, snapshot.by_id
+        changed = [agent_id for agent_id, entry in previous.items() if snapshot.by_id.get(agent_id) != entry]
+        if changed:
+            self.agents.invalidate(changed)
+
+    def close(self):
+        """Stop watching the registry file and refreshing outcome stats."""
+        self.registry_service.stop_watching()
+        if self.outcome_scorer:
+            self.outcome_scorer.stop_refreshing()
 
     def list_agents(self) -> List[Dict[str, Any]]:
         """
@@ -48,7 +154,7 @@ class AgentOrchestrator:
         Returns:
             List of agent information dictionaries
         """
-        return self.registry.get("agents", [])
+        return self.registry_service.snapshot.agents
 
     def get_agent_by_id(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -60,61 +166,255 @@ class AgentOrchestrator:
         Returns:
             Agent info dict or None if not found
         """
-        for agent in self.registry.get("agents", []):
-            if agent["id"] == agent_id:
-                return agent
-        return None
+        return self.registry_service.snapshot.by_id.get(agent_id)
+
+    def get_agents_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """
+        Get the agents of a registry category.
+
+        Args:
+            category: Category name (e.g., 'database')
+
+        Returns:
+            Agent info dicts (empty if the category doesn't exist)
+        """
+        return self.registry_service.snapshot.by_category.get(category, [])
+
+    def agent_factory(self, agent_id: str) -> AgentFactory:
+        """
+        Get the constructor of a registered agent.
+
+        Loads <path>/agent.py of the registry entry and returns the class
+        named by its optional "class" field, else the one BaseAgent subclass
+        the module defines. Agents needing constructor arguments should be
+        registered on self.agents with their own factory instead.
 
-    def find_agent_for_task(self, task_description: str) -> List[Dict[str, str]]:
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            Callable building a new instance
+
+        Raises:
+            KeyError: Unknown agent id
+            ValueError: No unique agent class in the module
+        """
+        agent = self.get_agent_by_id(agent_id)
+        if agent is None:
+            raise KeyError(f"Agent '{agent_id}' not found")
+
+        agent_path = project_root / agent["path"] / "agent.py"
+        spec = importlib.util.spec_from_file_location(f"{agent_id.replace('-', '_')}_agent", agent_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        if agent.get("class"):
+            return getattr(module, agent["class"])
+
+        classes = [
+            obj for obj in vars(module).values()
+            if isinstance(obj, type) and issubclass(obj, BaseAgent) and obj.__module__ == module.__name__
+        ]
+        if len(classes) != 1:
+            raise ValueError(f"{agent_path} defines {len(classes)} agent classes; set \"class\" in the registry")
+        return classes[0]
+
+    def _pooled_factory(self, agent_id: str) -> AgentFactory:
+        """Factory of pooled instances: the agent class, wrapped if configured."""
+        agent_class = self.agent_factory(agent_id)
+        if self.agent_wrapper is None:
+            return agent_class
+        wrapper = self.agent_wrapper
+        return lambda: wrapper(agent_class())
+
+    def checkout(self, agent_id: str, session_id: Optional[str] = None):
+        """
+        Use a pooled agent instance for the duration of a with block.
+
+        Args:
+            agent_id: Agent identifier
+            session_id: Conversation to continue (None for a one-off request)
+        """
+        return self.agents.checkout(agent_id, session_id)
+
+    def checkout_async(self, agent_id: str, session_id: Optional[str] = None):
+        """
+        Use a pooled agent instance for the duration of an async with block;
+        an instance that has to be built is built in a worker thread.
+
+        Args:
+            agent_id: Agent identifier
+            session_id: Conversation to continue (None for a one-off request)
+        """
+        return self.agents.checkout_async(agent_id, session_id)
+
+    def warm_up(self, agent_ids: Optional[List[str]] = None, instances: int = 1) -> Dict[str, Optional[str]]:
+        """
+        Build agent instances ahead of the first request.
+
+        Args:
+            agent_ids: Agents to build (default: every active registry agent)
+            instances: Idle instances to have ready per agent
+
+        Returns:
+            Agent id → None if ready, else the error that prevented it
+        """
+        if agent_ids is None:
+            agent_ids = [a["id"] for a in self.list_agents() if a.get("status", "active") == "active"]
+        return self.agents.warm_up(agent_ids, instances)
+
+    def find_agent_for_task(self, task_description: str, snapshot: Optional[RegistrySnapshot] = None) -> List[Dict[str, str]]:
         """
         Find best agent(s) for a given task based on keywords.
 
+        Triggers match whole words, case-insensitively; confidence is the
+        number of distinct triggers found.
+
         Args:
             task_description: User's task/question description
+            snapshot: Registry snapshot to route against (default: current)
 
         Returns:
             List of matching agents with confidence scores
         """
-        task_lower = task_description.lower()
+        snapshot = snapshot or self.registry_service.snapshot
+        agents = snapshot.agents
+        hits = snapshot.index.match(task_description)
         matches = []
 
-        for agent in self.registry.get("agents", []):
-            score = 0
-            matched_triggers = []
-
-            # Check trigger keywords
-            for trigger in agent.get("triggers", []):
-                if trigger.lower() in task_lower:
-                    score += 1
-                    matched_triggers.append(trigger)
-
-            if score > 0:
-                matches.append({
-                    "agent_id": agent["id"],
-                    "agent_name": agent["name"],
-                    "confidence": score,
-                    "matched_keywords": matched_triggers,
-                    "description": agent["description"],
-                    "path": agent["path"]
-                })
+        for agent_pos in sorted(hits):
+            agent = agents[agent_pos]
+            triggers = agent.get("triggers", [])
+            matches.append({
+                "agent_id": agent["id"],
+                "agent_name": agent["name"],
+                "confidence": len(hits[agent_pos]),
+                "matched_keywords": [triggers[pos] for pos in hits[agent_pos]],
+                "description": agent["description"],
+                "path": agent["path"]
+            })
 
         # Sort by confidence (highest first)
         matches.sort(key=lambda x: x["confidence"], reverse=True)
 
         return matches
 
-    def route_task(self, task_description: str, auto_select: bool = False) -> Dict[str, Any]:
+    @property
+    def semantic_router(self) -> Optional[SemanticRouter]:
+        """Semantic router fitted to the current registry (None if disabled)."""
+        if self._semantic_router is not None:
+            self._semantic_matrix(self.registry_service.snapshot)
+        return self._semantic_router
+
+    def _semantic_matrix(self, snapshot: RegistrySnapshot):
+        """Agent matrix whose rows are the agents of snapshot, in order."""
+        version, matrix = self._semantic_fit
+        if version == snapshot.version:
+            return matrix
+        with self._semantic_lock:
+            version, matrix = self._semantic_fit
+            if version == snapshot.version:
+                return matrix
+            router = self._semantic_router
+            if snapshot.version < version:
+                # A route still holding a superseded snapshot: don't refit backwards
+                return router.agent_matrix(snapshot.agents)
+            # Cached vectors make this cheap; only new or edited agents are embedded
+            router.fit(snapshot.agents)
+            self._semantic_fit = (snapshot.version, router.matrix)
+            return router.matrix
+
+    def find_agent_semantic(
+        self,
+        task_description: str,
+        top_k: int = 3,
+        snapshot: Optional[RegistrySnapshot] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find agents whose description is semantically closest to a task.
+
+        Args:
+            task_description: User's task/question description
+            top_k: Maximum number of agents to return
+            snapshot: Registry snapshot to route against (default: current)
+
+        Returns:
+            Matching agents above semantic_threshold, most similar first
+            (empty if semantic routing is disabled)
+        """
+        router = self._semantic_router
+        if router is None:
+            return []
+
+        snapshot = snapshot or self.registry_service.snapshot
+        agents = snapshot.agents
+        matches = []
+        for agent_pos, similarity in router.rank(task_description, top_k, self._semantic_matrix(snapshot)):
+            if similarity < self.semantic_threshold:
+                continue
+            agent = agents[agent_pos]
+            matches.append({
+                "agent_id": agent["id"],
+                "agent_name": agent["name"],
+                "confidence": round(similarity, 3),
+                "matched_keywords": [],
+                "description": agent["description"],
+                "path": agent["path"],
+                "similarity": round(similarity, 3),
+                "routing": "semantic"
+            })
+        return matches
+
+    def _semantic_tier(
+        self,
+        task_description: str,
+        matches: List[Dict[str, Any]],
+        snapshot: RegistrySnapshot
+    ) -> List[Dict[str, Any]]:
+        """Resolve a keyword miss or tie with semantic similarity, against the route's snapshot."""
+        if not matches:
+            return self.find_agent_semantic(task_description, snapshot=snapshot)
+
+        tied = [m for m in matches if m["confidence"] == matches[0]["confidence"]]
+        if len(tied) < 2:
+            return matches
+
+        agents = snapshot.agents
+        ranked = self._semantic_router.rank(task_description, len(agents), self._semantic_matrix(snapshot))
+        similarity = {agents[pos]["id"]: score for pos, score in ranked}
+        for match in tied:
+            match["similarity"] = round(similarity.get(match["agent_id"], 0.0), 3)
+        tied.sort(key=lambda m: m["similarity"], reverse=True)
+        return tied + matches[len(tied):]
+
+    def route_task(
+        self,
+        task_description: str,
+        auto_select: bool = False,
+        task_type: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Route a task to the appropriate agent.
 
+        Keyword triggers are tried first; the semantic tier (if enabled)
+        only runs when they match nothing or the best agents tie. The
+        outcome scorer (if set) then ranks the matches.
+
         Args:
             task_description: User's task description
             auto_select: If True, automatically select best agent. If False, return options.
+            task_type: Task type for outcome stats (e.g. 'query_response')
 
         Returns:
             Routing decision with agent info and confidence
         """
-        matches = self.find_agent_for_task(task_description)
+        # One snapshot for the whole route, even if the registry reloads meanwhile
+        snapshot = self.registry_service.snapshot
+        matches = self.find_agent_for_task(task_description, snapshot)
+        if self._semantic_router is not None:
+            matches = self._semantic_tier(task_description, matches, snapshot)
+        if self.outcome_scorer is not None and matches:
+            matches = self.outcome_scorer.rank(matches, task_type)
 
         if not matches:
             return {
@@ -71,12 +71,11 @@ class ProactivityView:
 
     def _show_queue_summary(self):
         """Display queue summary statistics"""
-        result = self.queue.get_tasks(filter_confidence="all", limit=10000)
-        tasks = result["tasks"]
+        summary = self.queue.get_summary()
 
-        high = len([t for t in tasks if t["confidence"] == "high"])
-        medium = len([t for t in tasks if t["confidence"] == "medium"])
-        low = len([t for t in tasks if t["confidence"] == "low"])
+        high = summary["high_confidence"]
+        medium = summary["medium_confidence"]
+        low = summary["low_confidence"]
 
         print(f"\n{self.HEADER}{'=' * 70}{self.END}")
         print(f"{self.HEADER}{self.BOLD}Proactive Task Queue{self.END}")
@@ -85,7 +84,7 @@ class ProactivityView:
         print(f"{self.GREEN}[HIGH CONFIDENCE]{self.END} {high} tasks  ", end="")
         print(f"{self.YELLOW}[MEDIUM CONFIDENCE]{self.END} {medium} tasks  ", end="")
         print(f"{self.RED}[LOW CONFIDENCE]{self.END} {low} tasks")
-        print(f"\n{self.BLUE}Total: {result['total_tasks']} tasks{self.END}")
+        print(f"\n{self.BLUE}Total: {summary['total_tasks']} tasks{self.END}")
 
     def _show_menu(self):
         """Display interactive menu"""
@@ -3,6 +3,7 @@ Shared utilities and base classes for Claude agents.
 """
 
 from .base_agent import BaseAgent
+from .async_base_agent import AsyncBaseAgent, AsyncAgentAdapter
 from .config import validate_env_vars, get_agent_config, EnvironmentConfigError
 
-__all__ = ['BaseAgent', 'validate_env_vars', 'get_agent_config', 'EnvironmentConfigError']
+__all__ = ['BaseAgent', 'AsyncBaseAgent', 'AsyncAgentAdapter', 'validate_env_vars', 'get_agent_config', 'EnvironmentConfigError']
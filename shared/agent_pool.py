@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Agent Pool - Reusable agent instances keyed by agent id
+
+Building an agent is expensive: API clients, database connection pools,
+Convex table discovery. The APIs used to build a fresh agent per request.
+AgentPool keeps built instances and hands them out again:
+    - Lazy: an agent is built the first time it's needed (or by warm_up())
+    - Request checkout: any idle instance, history cleared on return
+    - Session checkout: the session keeps the same instance, so its
+      conversation continues - and never mixes with another session's.
+      At most max_sessions are kept; a new one evicts the least recently
+      used
+    - Idle eviction: instances and sessions unused for idle_ttl are dropped
+    - Invalidation: invalidate() forgets an agent whose definition changed
+      (the orchestrator calls it on registry reloads), so the next checkout
+      builds from the new definition
+
+An instance is used by one checkout at a time; a session is expected to
+send one request at a time. Dropped instances are closed if they have
+close().
+
+Usage:
+    from shared.agent_pool import AgentPool
+
+    pool = AgentPool({"contractor-agent": ContractorAgent})
+    pool.warm_up()
+
+    with pool.checkout("contractor-agent") as agent:                 # one-off request
+        agent.chat("How many contractors are active?")
+
+    with pool.checkout("contractor-agent", session_id="u42") as agent:  # conversation
+        agent.chat("And which of them are in Gauteng?")
+    pool.end_session("u42")
+
+    async with pool.checkout_async("contractor-agent") as agent:     # in an event loop:
+        await agent.chat("...")                                       # builds in a thread
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import asyncio
+import threading
+import time
+
+
+AgentFactory = Callable[[], Any]
+
+
+@dataclass
+class _Session:
+    agent_id: str
+    agent: Any
+    last_used: float
+
+
+class AgentPool:
+    """Lazily built, reusable agent instances with per-session checkout."""
+
+    def __init__(
+        self,
+        factories: Optional[Dict[str, AgentFactory]] = None,
+        resolve_factory: Optional[Callable[[str], AgentFactory]] = None,
+        max_idle: int = 4,
+        idle_ttl: float = 900.0,
+        max_sessions: int = 100
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            factories: Agent id → callable building a new instance
+            resolve_factory: Fallback giving the factory of an unregistered id
+                             (raises KeyError if it has none)
+            max_idle: Idle instances kept per agent id
+            idle_ttl: Seconds before an unused instance or session is evicted
+            max_sessions: Sessions kept; the least recently used is evicted
+                          to make room for a new one
+        """
+        self.factories: Dict[str, AgentFactory] = dict(factories or {})
+        self.resolve_factory = resolve_factory
+        self.max_idle = max_idle
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+
+        self.created = 0
+        self.reused = 0
+
+        self._idle: Dict[str, List[Tuple[float, Any]]] = {}  # agent id → [(released at, agent)], newest last
+        self._sessions: Dict[str, _Session] = {}  # least recently used first
+        self._resolved: Set[str] = set()  # Ids whose factory came from resolve_factory
+        self._generation: Dict[str, int] = {}  # agent id → invalidate() count
+        self._in_use: Dict[int, int] = {}  # id(agent) → generation, between acquire and release
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def register(self, agent_id: str, factory: AgentFactory) -> None:
+        """Set how instances of an agent are built."""
+        with self._lock:
+            self.factories[agent_id] = factory
+            self._resolved.discard(agent_id)
+
+    def acquire(self, agent_id: str, session_id: Optional[str] = None) -> Any:
+        """
+        Take an agent instance (prefer checkout()).
+
+        Args:
+            agent_id: Registry agent id
+            session_id: Conversation to continue (None for a one-off request)
+
+        Returns:
+            Agent instance, exclusively yours until release()
+        """
+        agent = self._take(agent_id, session_id)
+        if agent is None:
+            agent = self._build(agent_id, session_id)
+        return agent
+
+    async def acquire_async(self, agent_id: str, session_id: Optional[str] = None) -> Any:
+        """acquire() for event loops: an instance that has to be built is built in a worker thread."""
+        agent = self._take(agent_id, session_id)
+        if agent is not None:
+            return agent
+
+        build = asyncio.get_running_loop().run_in_executor(None, self._build, agent_id, session_id)
+        try:
+            return await asyncio.shield(build)
+        except asyncio.CancelledError:
+            # The build can't be interrupted; pool the instance once it's done
+            build.add_done_callback(
+                lambda f: None if f.cancelled() or f.exception() else self.release(agent_id, f.result(), session_id)
+            )
+            raise
+
+    def release(self, agent_id: str, agent: Any, session_id: Optional[str] = None) -> None:
+        """Return an instance taken with acquire()."""
+        with self._lock:
+            generation = self._in_use.pop(id(agent), None)
+            if generation is not None and generation != self._generation.get(agent_id, 0):
+                stale = True  # Built from a definition invalidate() has since replaced
+            elif session_id is not None and session_id in self._sessions:
+                # Stays with its session until end_session() or eviction
+                self._sessions[session_id].last_used = time.monotonic()
+                return
+            else:
+                stale = False
+        if stale:
+            self._discard([agent])
+        else:
+            self._park(agent_id, agent)
+
+    @contextmanager
+    def checkout(self, agent_id: str, session_id: Optional[str] = None) -> Iterator[Any]:
+        """Use an agent instance for the duration of a with block."""
+        agent = self.acquire(agent_id, session_id)
+        try:
+            yield agent
+        finally:
+            self.release(agent_id, agent, session_id)
+
+    @asynccontextmanager
+    async def checkout_async(self, agent_id: str, session_id: Optional[str] = None) -> AsyncIterator[Any]:
+        """checkout() for event loops: never builds an agent on the loop."""
+        agent = await self.acquire_async(agent_id, session_id)
+        try:
+            yield agent
+        finally:
+            self.release(agent_id, agent, session_id)
+
+    def end_session(self, session_id: str) -> bool:
+        """
+        Finish a conversation; its instance goes back to the idle pool.
+
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            in_use = session is not None and id(session.agent) in self._in_use
+        if session is None:
+            return False
+        if not in_use:  # Else release() parks it
+            self._park(session.agent_id, session.agent)
+        return True
+
+    def invalidate(self, agent_ids: Iterable[str]) -> int:
+        """
+        Forget agents whose definition changed (e.g. their registry entry).
+
+        Drops their resolved factory (registered factories are kept), idle
+        instances and sessions; instances checked out right now are dropped
+        when released.
+
+        Returns:
+            Number of instances dropped now
+        """
+        dropped = []
+        with self._lock:
+            for agent_id in set(agent_ids):
+                self._generation[agent_id] = self._generation.get(agent_id, 0) + 1
+                if agent_id in self._resolved:
+                    self._resolved.discard(agent_id)
+                    self.factories.pop(agent_id, None)
+                dropped += [agent for _, agent in self._idle.pop(agent_id, [])]
+                for session_id in [sid for sid, s in self._sessions.items() if s.agent_id == agent_id]:
+                    agent = self._sessions.pop(session_id).agent
+                    if id(agent) not in self._in_use:
+                        dropped.append(agent)
+        self._discard(dropped)
+        return len(dropped)
+
+    def warm_up(self, agent_ids: Optional[Iterable[str]] = None, instances: int = 1) -> Dict[str, Optional[str]]:
+        """
+        Build idle instances ahead of the first request.
+
+        Args:
+            agent_ids: Agents to build (default: every registered factory)
+            instances: Idle instances to have ready per agent
+
+        Returns:
+            Agent id → None if ready, else the error that prevented it
+        """
+        results: Dict[str, Optional[str]] = {}
+        for agent_id in list(agent_ids if agent_ids is not None else self.factories):
+            try:
+                with self._lock:
+                    generation = self._generation.get(agent_id, 0)
+                factory = self._factory(agent_id)
+                with self._lock:
+                    missing = max(0, min(instances, self.max_idle) - len(self._idle.get(agent_id, [])))
+                for _ in range(missing):
+                    agent = factory()
+                    with self._lock:
+                        self.created += 1
+                        current = generation == self._generation.get(agent_id, 0)
+                        if current:
+                            self._idle.setdefault(agent_id, []).append((time.monotonic(), agent))
+                    if not current:
+                        self._discard([agent])
+                        break
+                results[agent_id] = None
+            except Exception as e:
+                results[agent_id] = f"{type(e).__name__}: {e}"
+        return results
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Drop idle instances and sessions unused for idle_ttl seconds.
+
+        Returns:
+            Number of instances dropped
+        """
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.idle_ttl
+        evicted = 0
+        dropped = []
+
+        with self._lock:
+            for agent_id, idle in self._idle.items():
+                kept = [(released, agent) for released, agent in idle if released >= cutoff]
+                dropped += [agent for released, agent in idle if released < cutoff]
+                self._idle[agent_id] = kept
+
+            stale = [sid for sid, session in self._sessions.items() if session.last_used < cutoff]
+            for session_id in stale:
+                agent = self._sessions.pop(session_id).agent
+                if id(agent) not in self._in_use:
+                    dropped.append(agent)
+            evicted = len(dropped)
+            self._last_sweep = now
+
+        self._discard(dropped)
+        return evicted
+
+    def close(self) -> None:
+        """Drop every idle and session instance, closing those that have close()."""
+        with self._lock:
+            agents = [agent for idle in self._idle.values() for _, agent in idle]
+            agents += [s.agent for s in self._sessions.values() if id(s.agent) not in self._in_use]
+            self._idle.clear()
+            self._sessions.clear()
+        self._discard(agents)
+
+    def stats(self) -> Dict[str, Any]:
+        """Instance counts for health endpoints."""
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": {agent_id: len(idle) for agent_id, idle in self._idle.items() if idle},
+                "sessions": len(self._sessions),
+                "in_use": len(self._in_use)
+            }
+
+    def _take(self, agent_id: str, session_id: Optional[str]) -> Optional[Any]:
+        """The session's instance or an idle one, without building (None if there's neither)."""
+        self._maybe_sweep()
+
+        evicted = None
+        with self._lock:
+            if session_id is not None and session_id in self._sessions:
+                session = self._sessions.pop(session_id)
+                if session.agent_id != agent_id:
+                    self._sessions[session_id] = session
+                    raise ValueError(f"Session {session_id} belongs to {session.agent_id}, not {agent_id}")
+                session.last_used = time.monotonic()
+                self._sessions[session_id] = session  # Now the most recently used
+                self._in_use[id(session.agent)] = self._generation.get(agent_id, 0)
+                return session.agent
+
+            idle = self._idle.get(agent_id)
+            if not idle:
+                return None
+            agent = idle.pop()[1]
+            self.reused += 1
+            self._in_use[id(agent)] = self._generation.get(agent_id, 0)
+            if session_id is not None:
+                evicted = self._add_session(session_id, agent_id, agent)
+        if evicted is not None:
+            self._park(*evicted)
+        return agent
+
+    def _build(self, agent_id: str, session_id: Optional[str]) -> Any:
+        """Build a new instance (outside the lock: construction can take seconds)."""
+        with self._lock:
+            generation = self._generation.get(agent_id, 0)
+        agent = self._factory(agent_id)()
+        evicted = None
+        with self._lock:
+            self.created += 1
+            self._in_use[id(agent)] = generation
+            if session_id is not None:
+                evicted = self._add_session(session_id, agent_id, agent)
+        if evicted is not None:
+            self._park(*evicted)
+        return agent
+
+    def _add_session(self, session_id: str, agent_id: str, agent: Any) -> Optional[Tuple[str, Any]]:
+        """
+        Pin an instance to a new session, evicting the least recently used
+        session if there are max_sessions (hold the lock).
+
+        Returns:
+            (agent id, instance) of the evicted session if its instance
+            should be parked; an instance in use is parked by release()
+        """
+        evicted = None
+        if len(self._sessions) >= self.max_sessions:
+            oldest = next(iter(self._sessions))
+            session = self._sessions.pop(oldest)
+            if id(session.agent) not in self._in_use:
+                evicted = (session.agent_id, session.agent)
+        self._sessions[session_id] = _Session(agent_id, agent, time.monotonic())
+        return evicted
+
+    def _factory(self, agent_id: str) -> AgentFactory:
+        factory = self.factories.get(agent_id)
+        if factory is None and self.resolve_factory is not None:
+            factory = self.resolve_factory(agent_id)
+            with self._lock:
+                if agent_id not in self.factories:
+                    self.factories[agent_id] = factory
+                    self._resolved.add(agent_id)
+        if factory is None:
+            raise KeyError(f"No factory for agent '{agent_id}'")
+        return factory
+
+    def _park(self, agent_id: str, agent: Any) -> None:
+        """Clear an instance's conversation and keep it for reuse (if there's room)."""
+        reset = getattr(agent, "clear_history", None) or getattr(agent, "reset_conversation", None)
+        if reset is not None:
+            reset()
+        with self._lock:
+            idle = self._idle.setdefault(agent_id, [])
+            kept = len(idle) < self.max_idle
+            if kept:
+                idle.append((time.monotonic(), agent))
+        if not kept:
+            self._discard([agent])
+
+    def _discard(self, agents: List[Any]) -> None:
+        """Close dropped instances that have close()."""
+        for agent in agents:
+            close = getattr(agent, "close", None)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                print(f"Warning: Could not close {type(agent).__name__}: {e}")
+
+    def _maybe_sweep(self) -> None:
+        """Evict idle instances at most every quarter idle_ttl."""
+        if time.monotonic() - self._last_sweep >= self.idle_ttl / 4:
+            self.evict_idle()
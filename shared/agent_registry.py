@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Agent Registry - Hot-reloading view of orchestrator/registry.json
+
+The orchestrator used to read registry.json once, look agents up with a
+linear scan and never notice edits until restarted. AgentRegistry keeps
+the parsed registry in an immutable RegistrySnapshot:
+    - by_id / by_category dict indexes
+    - the compiled TriggerIndex used for routing
+and replaces the whole snapshot when the file changes (mtime/size polled by
+a background thread). Readers take one snapshot reference and use it
+throughout a route, so a reload never blocks or tears an in-flight route.
+Subscribers are called with each new snapshot.
+
+An edit that leaves the file missing or invalid is reported and skipped;
+the previous snapshot stays in service until the file is fixed.
+
+Usage:
+    from shared.agent_registry import AgentRegistry
+
+    registry = AgentRegistry("orchestrator/registry.json")
+    registry.subscribe(lambda snapshot: print(f"{len(snapshot.agents)} agents"))
+    registry.start_watching(poll_interval=2.0)
+
+    snapshot = registry.snapshot
+    snapshot.by_id["vps-monitor"]
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+
+from shared.trigger_index import TriggerIndex
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """One parsed version of the registry file"""
+    data: Dict[str, Any]
+    agents: List[Dict[str, Any]]
+    by_id: Dict[str, Dict[str, Any]]
+    by_category: Dict[str, List[Dict[str, Any]]]
+    index: TriggerIndex
+    version: int = 0
+    signature: Tuple[int, int] = field(default=(0, 0), compare=False)
+
+    @classmethod
+    def build(cls, data: Dict[str, Any], version: int = 0, signature: Tuple[int, int] = (0, 0)) -> "RegistrySnapshot":
+        """Index a parsed registry."""
+        agents = data.get("agents", [])
+        by_id = {agent["id"]: agent for agent in agents}
+        by_category = {
+            category: [by_id[agent_id] for agent_id in agent_ids if agent_id in by_id]
+            for category, agent_ids in data.get("agent_categories", {}).items()
+        }
+        return cls(data, agents, by_id, by_category, TriggerIndex(agents), version, signature)
+
+
+RegistryListener = Callable[[RegistrySnapshot], None]
+
+
+class AgentRegistry:
+    """Registry file loader with atomic snapshot swaps and change notifications."""
+
+    def __init__(self, path: str):
+        """
+        Load the registry.
+
+        Args:
+            path: Path to registry.json
+
+        Raises:
+            FileNotFoundError: The registry file doesn't exist
+            ValueError: The registry file isn't valid JSON
+        """
+        self.path = Path(path)
+        self._listeners: List[RegistryListener] = []
+        self._lock = threading.Lock()  # Serializes reloads, not reads
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+        signature = self._signature()
+        if signature is None:
+            raise FileNotFoundError(f"Agent registry not found at {self.path}")
+        self._snapshot = RegistrySnapshot.build(self._read(), version=1, signature=signature)
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        """Current registry snapshot (never changes once taken)."""
+        return self._snapshot
+
+    def subscribe(self, listener: RegistryListener) -> Callable[[], None]:
+        """
+        Call listener with every new snapshot.
+
+        Returns:
+            Function that unsubscribes the listener
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read the registry if the file changed.
+
+        Args:
+            force: Re-read even if mtime and size are unchanged
+
+        Returns:
+            True if a new snapshot was installed
+        """
+        with self._lock:
+            signature = self._signature()
+            if signature is None:
+                print(f"Warning: Agent registry {self.path} is missing; keeping version {self._snapshot.version}")
+                return False
+            if signature == self._snapshot.signature and not force:
+                return False
+
+            try:
+                data = self._read()
+            except ValueError as e:
+                print(f"Warning: {e}; keeping registry version {self._snapshot.version}")
+                return False
+
+            self._snapshot = RegistrySnapshot.build(data, self._snapshot.version + 1, signature)
+            snapshot, listeners = self._snapshot, list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"Warning: registry listener {listener!r} failed: {e}")
+        return True
+
+    def start_watching(self, poll_interval: float = 2.0) -> None:
+        """Poll the file for changes on a daemon thread (no-op if already watching)."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(poll_interval,), name=f"registry-watch:{self.path.name}", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the polling thread."""
+        if self._watcher is None:
+            return
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(self, poll_interval: float) -> None:
+        while not self._stop.wait(poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Warning: registry reload failed: {e}")
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime ns, size) of the file, or None if it's missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid registry JSON: {e}")
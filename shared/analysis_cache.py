@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Analysis Cache
+
+Stores per-file analyzer findings keyed by (analyzer, rule-set version,
+git blob SHA), so unchanged file contents are never analyzed twice:
+    - Same bytes → same blob SHA → cached findings returned instantly
+    - Edited file → new blob SHA → analyzed once, then cached
+    - Changed rules → new rule-set version → old entries simply stop matching
+
+Findings must depend only on file contents; callers attach file paths
+and other location-specific data after lookup.
+
+Each (analyzer, version) bucket is read from SQLite in one query on first
+use, so a repository scan costs one in-memory lookup per unchanged file.
+Wrap scans in batch() to store all new findings in a single transaction.
+Lookups are thread-safe, so files can be analyzed from a worker pool.
+
+Eviction keeps the cache from growing forever:
+    - sweep(): wrap a scan that enumerates every file; afterwards the
+      analyzer's entries that weren't looked up (deleted files, old
+      contents, old rule-set versions) are deleted
+    - max_entries: beyond it, the least recently used entries are deleted
+      (hits are recorded with the batch's writes)
+
+Architecture:
+    File bytes → blob SHA → SQLite (shared/analysis_cache.db) → findings
+
+Usage:
+    from shared.analysis_cache import AnalysisCache
+
+    cache = AnalysisCache()
+    version = AnalysisCache.ruleset_version(todo_patterns)
+
+    with open("agents/example.py", "rb") as f:
+        data = f.read()
+
+    with cache.batch():
+        findings = cache.get_or_compute(
+            "git-watcher/todos", version, data,
+            lambda: find_todos(data.decode("utf-8"))
+        )
+
+    with cache.batch(), cache.sweep("git-watcher/todos", version):
+        ...  # get_or_compute() for every file in the repository
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import hashlib
+import json
+import sqlite3
+import threading
+
+
+class AnalysisCache:
+    """SQLite cache of analyzer findings addressed by file content."""
+
+    # Outside batch(), hits are recorded once this many have accumulated
+    TOUCH_FLUSH = 256
+
+    def __init__(self, db_path: str = "shared/analysis_cache.db", max_entries: int = 100000):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path to SQLite cache database
+            max_entries: Entries kept; the least recently used are evicted
+                         (down to 90%) when a write goes over
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        # (analyzer, version) → {blob_sha: findings JSON}, loaded once per bucket
+        self._buckets: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+        # Writes deferred by batch() (None when not batching)
+        self._pending: Optional[List[Tuple[str, str, str, str]]] = None
+        self._batch_depth = 0
+
+        # Hits not yet recorded as last_used: (analyzer, version, blob_sha)
+        self._touched: Set[Tuple[str, str, str]] = set()
+
+        # sweep() in progress: (analyzer, version) → blob SHAs looked up
+        self._sweeps: Dict[Tuple[str, str], Set[str]] = {}
+
+        # Guards buckets, pending writes and counters (analysis runs unlocked)
+        self._lock = threading.RLock()
+
+        self._ensure_database()
+        self._entries = self._count()  # Upper bound between writes (replaced rows aren't subtracted)
+
+    @staticmethod
+    def blob_sha(data: bytes) -> str:
+        """Git blob SHA of file contents (same as `git hash-object`)."""
+        header = f"blob {len(data)}\0".encode()
+        return hashlib.sha1(header + data).hexdigest()
+
+    @staticmethod
+    def ruleset_version(*rules: Any) -> str:
+        """Derive a rule-set version from JSON-serializable rule definitions.
+
+        Editing any pattern yields a new version, so stale findings are
+        never served after the rules change.
+        """
+        payload = json.dumps(rules, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_database(self) -> None:
+        """Create the cache table if it doesn't exist."""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS findings (
+                    analyzer TEXT NOT NULL,
+                    ruleset_version TEXT NOT NULL,
+                    blob_sha TEXT NOT NULL,
+                    findings TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_used TEXT,
+                    PRIMARY KEY (analyzer, ruleset_version, blob_sha)
+                ) WITHOUT ROWID
+            """)
+            # Caches created before eviction existed
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(findings)")}
+            if "last_used" not in columns:
+                conn.execute("ALTER TABLE findings ADD COLUMN last_used TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_findings_last_used "
+                "ON findings(COALESCE(last_used, created_at))"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _bucket(self, analyzer: str, version: str) -> Dict[str, str]:
+        """Load every entry for (analyzer, version) with a single query."""
+        key = (analyzer, version)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                return bucket
+
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT blob_sha, findings FROM findings "
+                    "WHERE analyzer = ? AND ruleset_version = ?",
+                    key
+                ).fetchall()
+            finally:
+                conn.close()
+
+            bucket = self._buckets.setdefault(key, dict(rows))
+
+        return bucket
+
+    def get(self, analyzer: str, version: str, blob_sha: str) -> Optional[Any]:
+        """Look up cached findings.
+
+        Returns:
+            Cached findings, or None on a miss
+        """
+        if self._sweeps:
+            with self._lock:
+                seen = self._sweeps.get((analyzer, version))
+                if seen is not None:
+                    seen.add(blob_sha)
+        cached = self._bucket(analyzer, version).get(blob_sha)
+        return json.loads(cached) if cached is not None else None
+
+    def put(self, analyzer: str, version: str, blob_sha: str, findings: Any) -> None:
+        """Store findings for one file content (JSON-serializable)."""
+        payload = json.dumps(findings)
+        row = (analyzer, version, blob_sha, payload)
+
+        with self._lock:
+            self._bucket(analyzer, version)[blob_sha] = payload
+            if self._pending is not None:
+                self._pending.append(row)
+                return
+
+        self._write([row])
+
+    @contextmanager
+    def batch(self) -> Iterator["AnalysisCache"]:
+        """Defer writes inside the block and store them in one transaction."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._pending = []
+            self._batch_depth += 1
+
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                pending = None
+                if self._batch_depth == 0:
+                    pending, self._pending = self._pending, None
+            if pending is not None:
+                self._write(pending)
+
+    @contextmanager
+    def sweep(self, analyzer: str, version: str) -> Iterator["AnalysisCache"]:
+        """Delete the analyzer's entries not looked up inside the block.
+
+        Use around a scan that enumerates every file: entries for deleted
+        files, old file contents and other rule-set versions are dropped.
+        Nothing is deleted if the block raises.
+        """
+        key = (analyzer, version)
+        with self._lock:
+            self._sweeps[key] = set()
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._sweeps.pop(key, None)
+            raise
+        with self._lock:
+            seen = self._sweeps.pop(key)
+        self.prune(analyzer, version, seen)
+
+    def prune(self, analyzer: str, version: str, live: Set[str]) -> int:
+        """Keep only the analyzer's entries for version whose blob SHA is in live.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            for key in [key for key in self._buckets if key[0] == analyzer]:
+                if key[1] != version:
+                    del self._buckets[key]
+                else:
+                    bucket = self._buckets[key]
+                    self._buckets[key] = {sha: bucket[sha] for sha in live if sha in bucket}
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS live (blob_sha TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM temp.live")
+                conn.executemany("INSERT OR IGNORE INTO temp.live VALUES (?)", [(sha,) for sha in live])
+                removed = conn.execute(
+                    "DELETE FROM findings WHERE analyzer = ? AND "
+                    "(ruleset_version != ? OR blob_sha NOT IN (SELECT blob_sha FROM temp.live))",
+                    (analyzer, version)
+                ).rowcount
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.evicted += removed
+            self._entries = max(0, self._entries - removed)
+        return removed
+
+    def _write(self, rows: List[Tuple[str, str, str, str]]) -> None:
+        """Persist (analyzer, version, blob_sha, findings JSON) rows and recorded hits."""
+        with self._lock:
+            touched, self._touched = self._touched, set()
+        if not rows and not touched:
+            return
+
+        now = datetime.utcnow().isoformat() + "Z"
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO findings "
+                    "(analyzer, ruleset_version, blob_sha, findings, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [row + (now, now) for row in rows]
+                )
+                conn.executemany(
+                    "UPDATE findings SET last_used = ? "
+                    "WHERE analyzer = ? AND ruleset_version = ? AND blob_sha = ?",
+                    [(now,) + key for key in touched]
+                )
+                evicted = self._evict_over_cap(conn, len(rows))
+        finally:
+            conn.close()
+
+        if evicted:
+            with self._lock:
+                self.evicted += evicted
+                self._buckets.clear()  # Reloaded on next use, without the evicted entries
+
+    def _evict_over_cap(self, conn: sqlite3.Connection, inserted: int) -> int:
+        """Delete least recently used entries once over max_entries.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            self._entries += inserted
+            if self._entries <= self.max_entries:
+                return 0
+
+        count = conn.execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+        excess = count - max(int(self.max_entries * 0.9), 1) if count > self.max_entries else 0
+        if excess:
+            conn.execute(
+                "DELETE FROM findings WHERE (analyzer, ruleset_version, blob_sha) IN ("
+                "SELECT analyzer, ruleset_version, blob_sha FROM findings "
+                "ORDER BY COALESCE(last_used, created_at) LIMIT ?)",
+                (excess,)
+            )
+        with self._lock:
+            self._entries = count - excess
+        return excess
+
+    def _count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+        finally:
+            conn.close()
+
+    def get_or_compute(
+        self,
+        analyzer: str,
+        version: str,
+        data: bytes,
+        compute: Callable[[], Any]
+    ) -> Any:
+        """Return cached findings for data, computing and storing them on a miss.
+
+        Args:
+            analyzer: Analyzer name (e.g. "git-watcher/security")
+            version: Rule-set version of the analyzer
+            data: Raw file contents
+            compute: Zero-argument callable producing the findings
+
+        Returns:
+            Findings (as round-tripped through JSON)
+        """
+        blob_sha = self.blob_sha(data)
+        cached = self.get(analyzer, version, blob_sha)
+
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+                self._touched.add((analyzer, version, blob_sha))
+                flush = self._pending is None and len(self._touched) >= self.TOUCH_FLUSH
+            if flush:
+                self._write([])
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        self.put(analyzer, version, blob_sha, compute())
+
+        # Return the stored form so hits and misses have identical shapes (tuples → lists)
+        return self.get(analyzer, version, blob_sha)
+
+    def clear(self, analyzer: Optional[str] = None) -> int:
+        """Delete cached findings (for one analyzer, or everything).
+
+        Returns:
+            Number of entries removed
+        """
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if analyzer and key[0] != analyzer
+        }
+
+        conn = self._connect()
+        try:
+            with conn:
+                if analyzer:
+                    cursor = conn.execute("DELETE FROM findings WHERE analyzer = ?", (analyzer,))
+                else:
+                    cursor = conn.execute("DELETE FROM findings")
+            with self._lock:
+                self._entries = max(0, self._entries - cursor.rowcount)
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get entry count and this instance's hit/miss counters."""
+        conn = self._connect()
+        try:
+            entries = conn.execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+        finally:
+            conn.close()
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
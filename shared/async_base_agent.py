@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Async Base Agent - Non-blocking Claude agents for async servers
+
+AsyncBaseAgent is the asyncio counterpart of BaseAgent, built on
+AsyncAnthropic. chat(), chat_stream() and execute_tool() are coroutines,
+so a FastAPI endpoint can await a whole tool-calling conversation without
+blocking the event loop - one worker serves many users at once.
+
+Everything that doesn't do I/O (conversation history, domain memory,
+request building, SERIAL_TOOLS / parallel_tools settings) is inherited
+from BaseAgent and behaves identically.
+
+Existing sync agents don't need rewriting: AsyncAgentAdapter wraps any
+BaseAgent, talks to Claude through AsyncAnthropic and runs the wrapped
+agent's execute_tool() in a worker thread.
+
+Usage:
+    from shared.async_base_agent import AsyncAgentAdapter
+
+    @app.post("/chat")
+    async def chat(request: ChatRequest):
+        # One adapter per conversation; tools come from the sync agent
+        agent = AsyncAgentAdapter(get_vps_agent())
+        return {"response": await agent.chat(request.message)}
+"""
+
+import asyncio
+import time
+from abc import abstractmethod
+from functools import partial
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional
+
+from shared.base_agent import BaseAgent
+from shared.llm_transport import ReplayTransport, create_async_client
+
+
+class AsyncToolScheduler:
+    """
+    Runs one response's tool calls as asyncio tasks, honouring serial tools.
+
+    Same ordering rules as ToolScheduler: parallel-safe tools overlap, a
+    serial tool waits for every earlier tool and blocks every later one.
+    With parallel=False every tool is treated as serial (strict order).
+    """
+
+    def __init__(
+        self,
+        run_tool,
+        serial_tools: FrozenSet[str],
+        semaphore: asyncio.Semaphore,
+        parallel: bool = True
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            run_tool: Coroutine function (tool_name, tool_input) -> result string
+            serial_tools: Names of tools that must not overlap any other tool
+            semaphore: Caps tools running at once (shared per agent)
+            parallel: Allow parallel-safe tools to overlap
+        """
+        self.run_tool = run_tool
+        self.serial_tools = serial_tools
+        self.semaphore = semaphore
+        self.parallel = parallel
+        self._barrier: Optional[asyncio.Task] = None
+        self._since_barrier: List[asyncio.Task] = []
+
+    def submit(self, name: str, tool_input: Dict[str, Any]) -> asyncio.Task:
+        """Schedule a tool call; returns a Task for its result."""
+        if not self.parallel or name in self.serial_tools:
+            waits_for = self._since_barrier + ([self._barrier] if self._barrier else [])
+            task = asyncio.ensure_future(self._run_after(waits_for, name, tool_input))
+            self._barrier, self._since_barrier = task, []
+        else:
+            waits_for = [self._barrier] if self._barrier else []
+            task = asyncio.ensure_future(self._run_after(waits_for, name, tool_input))
+            self._since_barrier.append(task)
+        return task
+
+    async def _run_after(self, waits_for: List[asyncio.Task], name: str, tool_input: Dict[str, Any]) -> str:
+        """Wait for dependencies, then run the tool within the concurrency limit."""
+        if waits_for:
+            await asyncio.wait(waits_for)
+        async with self.semaphore:
+            return await self.run_tool(name, tool_input)
+
+
+class AsyncBaseAgent(BaseAgent):
+    """
+    Abstract base class for asyncio Claude-powered agents.
+
+    Subclasses implement the same hooks as BaseAgent, except that
+    execute_tool() is a coroutine:
+    - define_tools(): Return list of available tools
+    - execute_tool(): async - Execute a specific tool
+    - get_system_prompt(): Return agent-specific system prompt
+    """
+
+    def __init__(
+        self,
+        anthropic_api_key: str,
+        model: str = "claude-3-haiku-20240307",
+        max_tokens: int = 4096,
+        state_file: Optional[str] = None,
+        parallel_tools: bool = False,
+        max_tool_concurrency: int = 4,
+        prompt_caching: bool = True,
+        max_history_tokens: Optional[int] = 100000,
+        state_save_delay: float = 1.0,
+        transport: Optional[ReplayTransport] = None
+    ):
+        """
+        Initialize the async agent.
+
+        Args:
+            anthropic_api_key: Anthropic API key for Claude
+            model: Claude model to use (default: claude-3-haiku-20240307)
+            max_tokens: Maximum tokens per response (default: 4096)
+            state_file: Optional path to persistent state JSON file (for domain memory)
+            parallel_tools: Run the tools of one response concurrently (default: False)
+            max_tool_concurrency: Maximum tools running at once for this agent (default: 4)
+            prompt_caching: Mark cache_control breakpoints on every request (default: True)
+            max_history_tokens: Compact conversation history above this many tokens
+                                (default: 100000, None keeps everything)
+            state_save_delay: Seconds to coalesce state changes into one write (default: 1.0)
+            transport: Local stand-in for the Messages API (default: LLM_TRANSPORT,
+                       else the live API - see shared/llm_transport.py)
+        """
+        super().__init__(
+            anthropic_api_key,
+            model=model,
+            max_tokens=max_tokens,
+            state_file=state_file,
+            parallel_tools=parallel_tools,
+            max_tool_concurrency=max_tool_concurrency,
+            prompt_caching=prompt_caching,
+            max_history_tokens=max_history_tokens,
+            state_save_delay=state_save_delay,
+            transport=transport
+        )
+        self.async_anthropic = create_async_client(anthropic_api_key, transport)
+        self._tool_semaphore: Optional[asyncio.Semaphore] = None
+
+    @abstractmethod
+    async def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
+        """
+        Execute a specific tool (coroutine).
+
+        Args:
+            tool_name: Name of the tool to execute
+            tool_input: Tool parameters
+
+        Returns:
+            JSON-serialized result string
+        """
+        raise NotImplementedError("Subclasses must implement execute_tool()")
+
+    def _new_scheduler(self) -> AsyncToolScheduler:
+        """Scheduler for one response's tool calls."""
+        if self._tool_semaphore is None:
+            # Created on first use so it belongs to the running event loop
+            self._tool_semaphore = asyncio.Semaphore(self.max_tool_concurrency)
+        return AsyncToolScheduler(
+            self._run_tool_async, self.SERIAL_TOOLS, self._tool_semaphore, parallel=self.parallel_tools
+        )
+
+    async def _run_tool_async(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
+        """Execute a tool through the tool result cache."""
+        call_started = time.perf_counter() if self.span_hooks else None
+        result = self._cached_tool_result(tool_name, tool_input)
+        cached = result is not None
+        if not cached:
+            result = await self.execute_tool(tool_name, tool_input)
+            self._after_tool(tool_name, tool_input, result)
+        if call_started is not None:
+            self._tool_span(call_started, tool_name, result, cached)
+        return result
+
+    async def _execute_tools(self, tool_blocks: List[Any]) -> List[str]:
+        """
+        Execute the tool_use blocks of one response.
+
+        Returns:
+            Tool results, in the same order as tool_blocks
+        """
+        scheduler = self._new_scheduler()
+        tasks = [scheduler.submit(block.name, block.input) for block in tool_blocks]
+        return list(await asyncio.gather(*tasks))
+
+    async def chat(self, user_message: str, max_turns: int = 10) -> str:
+        """
+        Process user message and return agent response.
+
+        Same tool-calling loop as BaseAgent.chat(), without blocking the
+        event loop.
+
+        Args:
+            user_message: User's question or command
+            max_turns: Maximum conversation turns (default: 10)
+
+        Returns:
+            Agent's final response text
+        """
+        if not self.span_hooks:
+            return await self._chat(user_message, max_turns)
+
+        with self._chat_span("chat"):
+            return await self._chat(user_message, max_turns)
+
+    async def _chat(self, user_message: str, max_turns: int) -> str:
+        """Tool-calling loop behind chat()."""
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        system_prompt = self.get_system_prompt()
+        tools = self.define_tools()
+
+        for turn in range(1, max_turns + 1):
+            call_started = time.perf_counter() if self.span_hooks else None
+            response = await self.async_anthropic.messages.create(
+                **self._request_params(system_prompt, tools)
+            )
+            self._record_usage(response)
+            if call_started is not None:
+                self._model_span(call_started, response, turn)
+
+            if response.stop_reason == "end_turn":
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": response.content
+                })
+                return self._extract_text(response.content)
+
+            elif response.stop_reason == "tool_use":
+                tool_blocks = [block for block in response.content if block.type == "tool_use"]
+                results = await self._execute_tools(tool_blocks)
+
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": response.content
+                })
+                self.conversation_history.append({
+                    "role": "user",
+                    "content": [self._tool_result(block, result) for block, result in zip(tool_blocks, results)]
+                })
+
+            else:
+                return f"Unexpected stop reason: {response.stop_reason}"
+
+        return "Maximum conversation turns reached."
+
+    async def chat_stream(self, user_message: str, max_turns: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process user message, streaming the response as it is generated.
+
+        Async counterpart of BaseAgent.chat_stream(); yields the same events
+        and starts each tool as soon as its tool_use block is complete.
+
+        Args:
+            user_message: User's question or command
+            max_turns: Maximum conversation turns (default: 10)
+
+        Yields:
+            Event dictionaries (text / tool_use / tool_result / done)
+        """
+        if not self.span_hooks:
+            async for event in self._chat_stream(user_message, max_turns):
+                yield event
+            return
+
+        with self._chat_span("chat_stream"):
+            async for event in self._chat_stream(user_message, max_turns):
+                yield event
+
+    async def _chat_stream(self, user_message: str, max_turns: int) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming tool-calling loop behind chat_stream()."""
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        system_prompt = self.get_system_prompt()
+        tools = self.define_tools()
+
+        for turn in range(1, max_turns + 1):
+            scheduler = self._new_scheduler()
+            started = []
+            call_started = time.perf_counter() if self.span_hooks else None
+            first_text_ms = None
+
+            async with self.async_anthropic.messages.stream(
+                **self._request_params(system_prompt, tools)
+            ) as stream:
+                async for event in stream:
+                    if event.type == "text":
+                        if call_started is not None and first_text_ms is None:
+                            first_text_ms = (time.perf_counter() - call_started) * 1000
+                        yield {"type": "text", "text": event.text}
+
+                    elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                        block = event.content_block
+                        started.append((block, scheduler.submit(block.name, block.input)))
+                        yield {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+
+                response = await stream.get_final_message()
+                self._record_usage(response)
+                if call_started is not None:
+                    self._model_span(call_started, response, turn, first_text_ms=first_text_ms)
+
+            if response.stop_reason == "end_turn":
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": response.content
+                })
+                yield {"type": "done", "text": self._extract_text(response.content)}
+                return
+
+            elif response.stop_reason == "tool_use":
+                tool_results = []
+                for block, task in started:
+                    tool_results.append(self._tool_result(block, await task))
+                    yield {"type": "tool_result", "tool_use_id": block.id, "content": tool_results[-1]["content"]}
+
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": response.content
+                })
+                self.conversation_history.append({
+                    "role": "user",
+                    "content": tool_results
+                })
+
+            else:
+                yield {"type": "done", "text": f"Unexpected stop reason: {response.stop_reason}"}
+                return
+
+        yield {"type": "done", "text": "Maximum conversation turns reached."}
+
+
+class AsyncAgentAdapter(AsyncBaseAgent):
+    """
+    Async facade over an existing sync BaseAgent.
+
+    Claude calls go through AsyncAnthropic; the wrapped agent's
+    execute_tool() runs in the default thread pool. The adapter keeps its
+    own conversation history, so create one per conversation and share
+    the (stateless) sync agent between them.
+    """
+
+    def __init__(self, agent: BaseAgent, anthropic_api_key: Optional[str] = None):
+        """
+        Wrap a sync agent.
+
+        Args:
+            agent: Sync agent providing tools, system prompt and settings
+            anthropic_api_key: API key (default: the wrapped agent's key)
+        """
+        super().__init__(
+            anthropic_api_key or getattr(agent.anthropic, "api_key", None),
+            model=agent.model,
+            max_tokens=agent.max_tokens,
+            parallel_tools=agent.parallel_tools,
+            max_tool_concurrency=agent.max_tool_concurrency,
+            prompt_caching=agent.prompt_caching,
+            max_history_tokens=agent.history_manager.budget_tokens if agent.history_manager else None,
+            transport=agent.transport
+        )
+        self.agent = agent
+        self.SERIAL_TOOLS = agent.SERIAL_TOOLS
+
+        # Share the wrapped agent's tool result cache and span hooks across conversations
+        self._tool_policies = agent._get_tool_policies()
+        self.tool_cache = agent.tool_cache
+        self.agent_name = agent.agent_name
+        self.span_hooks = agent.span_hooks
+
+    def define_tools(self) -> List[Dict[str, Any]]:
+        """Tools of the wrapped agent."""
+        return self.agent.define_tools()
+
+    def get_system_prompt(self) -> str:
+        """System prompt of the wrapped agent."""
+        return self.agent.get_system_prompt()
+
+    async def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
+        """Run the wrapped agent's tool in a worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.agent.execute_tool, tool_name, tool_input))
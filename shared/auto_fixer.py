@@ -412,17 +412,14 @@ Changes:
 
 # Demo usage
 if __name__ == "__main__":
-    import json
+    from shared.confidence import ProactivityQueue
 
     fixer = AutoFixer()
 
     # Load queue
-    queue_file = Path("shared/proactivity_queue.json")
-    if queue_file.exists():
-        with open(queue_file) as f:
-            queue = json.load(f)
-
-        high_conf_tasks = [t for t in queue["tasks"] if t["confidence"] == "high"][:5]
+    queue = ProactivityQueue()
+    if queue.get_summary()["total_tasks"]:
+        high_conf_tasks = queue.get_tasks(filter_confidence="high", limit=5)["tasks"]
 
         print(f"🔧 Auto-Fixer Demo\n")
         print(f"Found {len(high_conf_tasks)} high-confidence tasks to fix\n")
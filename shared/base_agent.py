@@ -12,22 +12,124 @@ across all agent implementations. It handles:
 
 All specialized agents (VPS Monitor, Database, etc.) should inherit from this class.
 
+Two ways to talk to an agent:
+- chat(): blocks until the final answer, returns its text
+- chat_stream(): yields text deltas as they arrive and starts each tool as
+  soon as its tool_use block is complete, while the response keeps streaming
+
+Parallel tool execution (opt-in, parallel_tools=True):
+When Claude asks for several tools in one response, they run concurrently on
+a per-agent thread pool (max_tool_concurrency workers). Tools listed in
+SERIAL_TOOLS (e.g. mutations) wait for every earlier tool and block every
+later one. tool_result blocks are always returned in tool_use order.
+
+Prompt caching (on by default, prompt_caching=False to disable):
+Every request marks cache_control breakpoints on the tool list, the system
+prompt and the latest message, so each turn of a tool loop re-reads the
+unchanged prefix from the cache instead of reprocessing it. Token usage,
+including cache reads and writes, is kept per call in last_usage and
+summed in usage_totals.
+
+History budget (max_history_tokens, default 100,000; None to disable):
+Before each request the conversation is checked against the budget. Once
+over it, old tool results are truncated and the oldest turns are folded
+into a summary pinned to the system prompt (see shared/history_manager.py),
+so per-turn input tokens stay bounded in long sessions.
+
+Tool result caching (declared per tool):
+A tool definition may carry a "cache" policy (ttl, max_entries, persist)
+so repeated calls with the same input are answered from memory, and an
+"invalidates" list naming tools whose cached results a mutation makes
+stale. See shared/tool_cache.py.
+
+Instrumentation (off until a hook is added):
+add_span_hook() registers a callable that receives a Span (shared/spans.py)
+for every model call, tool call and chat - latency, turns and token usage.
+MetricsCollector.record_span is the standard hook. With no hooks, nothing
+is timed.
+
+Offline runs (transport=ReplayTransport(...) or LLM_TRANSPORT=replay:<file>):
+The Messages API client can be swapped for a deterministic local stand-in
+that replays scripted responses and tool calls with a configurable
+latency distribution, for load tests and benchmarks without the live API
+(see shared/llm_transport.py).
+
+Batch mode (bulk single-shot requests):
+Backfills that make one independent request per item (a docstring per
+function, tests per function) can go through the Message Batches API at
+half the cost: build requests with single_shot_params(), add them to
+message_batch(), and run_batch() submits, polls and maps every result back
+to its handle (see shared/message_batch.py).
+
 Domain Memory Philosophy:
 "The magic is in the memory. The agent is a policy that transforms one
 consistent memory state into another."
 
 Each agent can optionally implement persistent state that survives across
 sessions. This prevents agents from being "amnesiacs with tool belts."
+State is written atomically, and set_state()/update_state() changes are
+coalesced into one write per state_save_delay (see shared/state_store.py).
 
 Resolves: DEBT-003 (Duplicate Agent Pattern Code)
 """
 
-from typing import List, Dict, Any, Optional
-from anthropic import Anthropic
+from typing import List, Dict, Any, FrozenSet, Iterator, Optional
 from abc import ABC, abstractmethod
-import json
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import os
-from pathlib import Path
+import threading
+import time
+
+from shared.history_manager import HistoryManager
+from shared.llm_transport import ReplayTransport, create_client
+from shared.message_batch import BatchHandle, MessageBatch
+from shared.spans import Span, SpanHook
+from shared.state_store import StateStore, open_state_store
+from shared.tool_cache import TOOL_POLICY_KEYS, ToolResultCache, is_error_result
+
+
+class ToolScheduler:
+    """
+    Runs one response's tool calls on an executor, honouring serial tools.
+
+    Parallel-safe tools run concurrently with each other. A serial tool
+    starts only after every earlier tool has finished, and later tools
+    start only after it has finished. Dependencies are always submitted
+    before their dependents, so a FIFO executor never deadlocks.
+    """
+
+    def __init__(self, executor: Executor, run_tool, serial_tools: FrozenSet[str]):
+        """
+        Initialize the scheduler.
+
+        Args:
+            executor: Where tools run
+            run_tool: Callable(tool_name, tool_input) -> result string
+            serial_tools: Names of tools that must not overlap any other tool
+        """
+        self.executor = executor
+        self.run_tool = run_tool
+        self.serial_tools = serial_tools
+        self._barrier: Optional[Future] = None  # Last serial tool
+        self._since_barrier: List[Future] = []   # Parallel tools started after it
+
+    def submit(self, name: str, tool_input: Dict[str, Any]) -> Future:
+        """Schedule a tool call; returns a Future for its result."""
+        if name in self.serial_tools:
+            waits_for = self._since_barrier + ([self._barrier] if self._barrier else [])
+            future = self.executor.submit(self._run_after, waits_for, name, tool_input)
+            self._barrier, self._since_barrier = future, []
+        else:
+            waits_for = [self._barrier] if self._barrier else []
+            future = self.executor.submit(self._run_after, waits_for, name, tool_input)
+            self._since_barrier.append(future)
+        return future
+
+    def _run_after(self, waits_for: List[Future], name: str, tool_input: Dict[str, Any]) -> str:
+        """Wait for dependencies, then run the tool."""
+        wait(waits_for)
+        return self.run_tool(name, tool_input)
 
 
 class BaseAgent(ABC):
@@ -44,14 +146,35 @@ class BaseAgent(ABC):
     - define_tools(): Return list of available tools
     - execute_tool(): Execute a specific tool
     - get_system_prompt(): Return agent-specific system prompt
+
+    Subclasses may set:
+    - SERIAL_TOOLS: Tools never run alongside others (mutations) when
+      parallel_tools is enabled
     """
 
+    # Tools that are unsafe to run concurrently with any other tool
+    SERIAL_TOOLS: FrozenSet[str] = frozenset()
+
+    # Usage fields reported by the Messages API
+    USAGE_FIELDS = (
+        "input_tokens",
+        "output_tokens",
+        "cache_creation_input_tokens",
+        "cache_read_input_tokens"
+    )
+
     def __init__(
         self,
         anthropic_api_key: str,
         model: str = "claude-3-haiku-20240307",
         max_tokens: int = 4096,
-        state_file: Optional[str] = None
+        state_file: Optional[str] = None,
+        parallel_tools: bool = False,
+        max_tool_concurrency: int = 4,
+        prompt_caching: bool = True,
+        max_history_tokens: Optional[int] = 100000,
+        state_save_delay: float = 1.0,
+        transport: Optional[ReplayTransport] = None
     ):
         """
         Initialize the base agent.
@@ -61,15 +184,51 @@ class BaseAgent(ABC):
             model: Claude model to use (default: claude-3-haiku-20240307)
             max_tokens: Maximum tokens per response (default: 4096)
             state_file: Optional path to persistent state JSON file (for domain memory)
+            parallel_tools: Run the tools of one response concurrently (default: False)
+            max_tool_concurrency: Maximum tools running at once for this agent (default: 4)
+            prompt_caching: Mark cache_control breakpoints on every request (default: True)
+            max_history_tokens: Compact conversation history above this many tokens
+                                (default: 100000, None keeps everything)
+            state_save_delay: Seconds to coalesce state changes into one write (default: 1.0)
+            transport: Local stand-in for the Messages API (default: LLM_TRANSPORT,
+                       else the live API - see shared/llm_transport.py)
         """
-        self.anthropic = Anthropic(api_key=anthropic_api_key)
+        self.transport = transport
+        self.anthropic = create_client(anthropic_api_key, transport)
         self.model = model
         self.max_tokens = max_tokens
         self.conversation_history: List[Dict[str, Any]] = []
-
-        # Domain memory (persistent state)
+        self.history_manager: Optional[HistoryManager] = (
+            HistoryManager(budget_tokens=max_history_tokens) if max_history_tokens else None
+        )
+
+        # Prompt caching and token usage
+        self.prompt_caching = prompt_caching
+        self.last_usage: Dict[str, int] = {}
+        self.usage_totals: Dict[str, int] = {field: 0 for field in self.USAGE_FIELDS}
+        self.model_calls = 0
+
+        # Instrumentation (spans are only timed when a hook is registered)
+        self.agent_name = type(self).__name__
+        self.span_hooks: List[SpanHook] = []
+
+        # Tool execution (per-agent pool, created on first parallel batch)
+        self.parallel_tools = parallel_tools
+        self.max_tool_concurrency = max_tool_concurrency
+        self._tool_executor: Optional[ThreadPoolExecutor] = None
+        self._tool_executor_lock = threading.Lock()
+
+        # Tool result cache (created when a tool declares a cache policy)
+        self._tool_policies: Optional[Dict[str, Dict[str, Any]]] = None
+        self.tool_cache: Optional[ToolResultCache] = None
+        self._tool_policies_lock = threading.Lock()
+
+        # Domain memory (persistent state; .db/.sqlite files use SQLite)
         self.state_file = state_file
         self.state: Dict[str, Any] = {}
+        self.state_store: Optional[StateStore] = (
+            open_state_store(state_file, save_delay=state_save_delay) if state_file else None
+        )
         if state_file:
             self.load_state()
 
@@ -152,6 +311,14 @@ class BaseAgent(ABC):
         Returns:
             Agent's final response text
         """
+        if not self.span_hooks:
+            return self._chat(user_message, max_turns)
+
+        with self._chat_span("chat"):
+            return self._chat(user_message, max_turns)
+
+    def _chat(self, user_message: str, max_turns: int) -> str:
+        """Tool-calling loop behind chat()."""
         # Add user message to conversation history
         self.conversation_history.append({
             "role": "user",
@@ -166,21 +333,18 @@ class BaseAgent(ABC):
             turn_count += 1
 
             # Call Claude API
+            call_started = time.perf_counter() if self.span_hooks else None
             response = self.anthropic.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                system=system_prompt,
-                tools=tools,
-                messages=self.conversation_history
+                **self._request_params(system_prompt, tools)
             )
+            self._record_usage(response)
+            if call_started is not None:
+                self._model_span(call_started, response, turn_count)
 
             # Handle response based on stop reason
             if response.stop_reason == "end_turn":
                 # Extract text response
-                final_text = ""
-                for block in response.content:
-                    if block.type == "text":
-                        final_text += block.text
+                final_text = self._extract_text(response.content)
 
                 # Add to history
                 self.conversation_history.append({
@@ -192,20 +356,13 @@ class BaseAgent(ABC):
 
             elif response.stop_reason == "tool_use":
                 # Collect tool use blocks and execute them
-                assistant_content = []
-                tool_results = []
-
-                for block in response.content:
-                    assistant_content.append(block)
+                assistant_content = list(response.content)
+                tool_blocks = [block for block in response.content if block.type == "tool_use"]
 
-                    if block.type == "tool_use":
-                        # Execute the tool
-                        tool_result = self.execute_tool(block.name, block.input)
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": block.id,
-                            "content": tool_result
-                        })
+                tool_results = [
+                    self._tool_result(block, result)
+                    for block, result in zip(tool_blocks, self._execute_tools(tool_blocks))
+                ]
 
                 # Add assistant's tool use to history
                 self.conversation_history.append({
@@ -227,9 +384,421 @@ class BaseAgent(ABC):
 
         return "Maximum conversation turns reached."
 
+    def chat_stream(self, user_message: str, max_turns: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Process user message, streaming the response as it is generated.
+
+        Same tool-calling loop as chat(), on the streaming Messages API.
+        Each tool starts running as soon as its tool_use block is complete
+        (one at a time, in order, unless parallel_tools is enabled), while
+        the rest of the response keeps streaming.
+
+        Args:
+            user_message: User's question or command
+            max_turns: Maximum conversation turns (default: 10)
+
+        Yields:
+            Event dictionaries:
+            - {"type": "text", "text": str}: text delta
+            - {"type": "tool_use", "id": str, "name": str, "input": dict}: tool started
+            - {"type": "tool_result", "tool_use_id": str, "content": str}: tool finished
+            - {"type": "done", "text": str}: final response text (same as chat() returns)
+
+        Example:
+            for event in agent.chat_stream("Check CPU usage"):
+                if event["type"] == "text":
+                    print(event["text"], end="", flush=True)
+        """
+        if not self.span_hooks:
+            yield from self._chat_stream(user_message, max_turns)
+            return
+
+        with self._chat_span("chat_stream"):
+            yield from self._chat_stream(user_message, max_turns)
+
+    def _chat_stream(self, user_message: str, max_turns: int) -> Iterator[Dict[str, Any]]:
+        """Streaming tool-calling loop behind chat_stream()."""
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        system_prompt = self.get_system_prompt()
+        tools = self.define_tools()
+
+        with ThreadPoolExecutor(max_workers=1) as serial_runner:
+            executor = self._get_tool_executor() if self.parallel_tools else serial_runner
+
+            for turn in range(1, max_turns + 1):
+                scheduler = ToolScheduler(executor, self._run_tool, self.SERIAL_TOOLS)
+                started = []
+                call_started = time.perf_counter() if self.span_hooks else None
+                first_text_ms = None
+
+                with self.anthropic.messages.stream(
+                    **self._request_params(system_prompt, tools)
+                ) as stream:
+                    for event in stream:
+                        if event.type == "text":
+                            if call_started is not None and first_text_ms is None:
+                                first_text_ms = (time.perf_counter() - call_started) * 1000
+                            yield {"type": "text", "text": event.text}
+
+                        elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                            # Input is complete - run the tool while the response streams on
+                            block = event.content_block
+                            started.append((block, scheduler.submit(block.name, block.input)))
+                            yield {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+
+                    response = stream.get_final_message()
+                    self._record_usage(response)
+                    if call_started is not None:
+                        self._model_span(call_started, response, turn, first_text_ms=first_text_ms)
+
+                if response.stop_reason == "end_turn":
+                    self.conversation_history.append({
+                        "role": "assistant",
+                        "content": response.content
+                    })
+                    yield {"type": "done", "text": self._extract_text(response.content)}
+                    return
+
+                elif response.stop_reason == "tool_use":
+                    tool_results = []
+                    for block, future in started:
+                        tool_results.append(self._tool_result(block, future.result()))
+                        yield {"type": "tool_result", "tool_use_id": block.id, "content": tool_results[-1]["content"]}
+
+                    self.conversation_history.append({
+                        "role": "assistant",
+                        "content": response.content
+                    })
+                    self.conversation_history.append({
+                        "role": "user",
+                        "content": tool_results
+                    })
+
+                else:
+                    yield {"type": "done", "text": f"Unexpected stop reason: {response.stop_reason}"}
+                    return
+
+        yield {"type": "done", "text": "Maximum conversation turns reached."}
+
+    def _get_tool_executor(self) -> ThreadPoolExecutor:
+        """Get (or lazily create) this agent's tool thread pool."""
+        with self._tool_executor_lock:
+            if self._tool_executor is None:
+                self._tool_executor = ThreadPoolExecutor(
+                    max_workers=self.max_tool_concurrency,
+                    thread_name_prefix=f"{type(self).__name__}-tools"
+                )
+            return self._tool_executor
+
+    def _execute_tools(self, tool_blocks: List[Any]) -> List[str]:
+        """
+        Execute the tool_use blocks of one response.
+
+        Runs them in order on the calling thread, or concurrently on the
+        agent's pool when parallel_tools is enabled (SERIAL_TOOLS still
+        run alone).
+
+        Args:
+            tool_blocks: tool_use content blocks
+
+        Returns:
+            Tool results, in the same order as tool_blocks
+        """
+        if not self.parallel_tools or len(tool_blocks) < 2:
+            return [self._run_tool(block.name, block.input) for block in tool_blocks]
+
+        scheduler = ToolScheduler(self._get_tool_executor(), self._run_tool, self.SERIAL_TOOLS)
+        futures = [scheduler.submit(block.name, block.input) for block in tool_blocks]
+        return [future.result() for future in futures]
+
+    def tool_cache_namespace(self) -> str:
+        """
+        Namespace of this agent's cached tool results.
+
+        Override to separate data sources (e.g. one per database), so
+        persisted results are never served for the wrong one.
+        """
+        return type(self).__name__
+
+    def _get_tool_policies(self) -> Dict[str, Dict[str, Any]]:
+        """Cache policies declared in define_tools(), by tool name (read once)."""
+        if self._tool_policies is not None:
+            return self._tool_policies
+
+        with self._tool_policies_lock:
+            if self._tool_policies is None:
+                policies = {
+                    tool["name"]: {key: tool[key] for key in TOOL_POLICY_KEYS if key in tool}
+                    for tool in self.define_tools()
+                    if any(key in tool for key in TOOL_POLICY_KEYS)
+                }
+                if policies and self.tool_cache is None:
+                    self.tool_cache = ToolResultCache(self.tool_cache_namespace())
+                self._tool_policies = policies
+        return self._tool_policies
+
+    def _cached_tool_result(self, tool_name: str, tool_input: Dict[str, Any]) -> Optional[str]:
+        """Cached result of a tool call, or None if it must run."""
+        policy = self._get_tool_policies().get(tool_name)
+        if not policy or "cache" not in policy:
+            return None
+        return self.tool_cache.get(tool_name, tool_input, policy["cache"])
+
+    def _after_tool(self, tool_name: str, tool_input: Dict[str, Any], result: str) -> None:
+        """Cache a fresh tool result and apply the tool's invalidations."""
+        policy = self._get_tool_policies().get(tool_name)
+        if not policy:
+            return
+        if "cache" in policy and not is_error_result(result):
+            self.tool_cache.put(tool_name, tool_input, result, policy["cache"])
+        if policy.get("invalidates"):
+            self.tool_cache.invalidate(policy["invalidates"])
+
+    def _run_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
+        """Execute a tool through the tool result cache."""
+        call_started = time.perf_counter() if self.span_hooks else None
+        result = self._cached_tool_result(tool_name, tool_input)
+        cached = result is not None
+        if not cached:
+            result = self.execute_tool(tool_name, tool_input)
+            self._after_tool(tool_name, tool_input, result)
+        if call_started is not None:
+            self._tool_span(call_started, tool_name, result, cached)
+        return result
+
+    @staticmethod
+    def _api_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tool definitions without cache policy keys, as sent to the API."""
+        if not any(key in tool for tool in tools for key in TOOL_POLICY_KEYS):
+            return tools
+        return [
+            {key: value for key, value in tool.items() if key not in TOOL_POLICY_KEYS}
+            for tool in tools
+        ]
+
+    def _request_params(self, system_prompt: str, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build Messages API parameters for the next turn.
+
+        Compacts the conversation history first if it is over budget.
+        With prompt_caching, adds cache_control breakpoints (tools, system,
+        latest message) to copies - the tool definitions and the
+        conversation history themselves are never modified.
+
+        Args:
+            system_prompt: Agent system prompt
+            tools: Tool definitions
+
+        Returns:
+            Keyword arguments for messages.create() / messages.stream()
+        """
+        if self.history_manager:
+            self.conversation_history = self.history_manager.compact(self.conversation_history)
+            system_prompt = self.history_manager.system_prompt(system_prompt)
+        tools = self._api_tools(tools)
+
+        if not self.prompt_caching:
+            return {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "system": system_prompt,
+                "tools": tools,
+                "messages": self.conversation_history
+            }
+
+        cache_control = {"type": "ephemeral"}
+        messages = list(self.conversation_history)
+        if messages:
+            messages[-1] = self._cache_message(messages[-1], cache_control)
+
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "system": [{"type": "text", "text": system_prompt, "cache_control": cache_control}],
+            "tools": tools[:-1] + [{**tools[-1], "cache_control": cache_control}] if tools else tools,
+            "messages": messages
+        }
+
+    @staticmethod
+    def _cache_message(message: Dict[str, Any], cache_control: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Copy of a message with a cache breakpoint on its last content block.
+
+        Everything up to and including this message becomes a cacheable
+        prefix for the next turn of the tool loop.
+        """
+        content = message["content"]
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = list(content)
+        if not blocks:
+            return message
+
+        last = blocks[-1]
+        if not isinstance(last, dict):
+            # SDK content block (assistant turn) - convert to its request form
+            if not hasattr(last, "model_dump"):
+                return message
+            last = last.model_dump(exclude_none=True)
+        blocks[-1] = {**last, "cache_control": cache_control}
+        return {**message, "content": blocks}
+
+    def _record_usage(self, response: Any) -> Dict[str, int]:
+        """
+        Record the token usage of one Messages API call.
+
+        Args:
+            response: Message returned by the API
+
+        Returns:
+            Usage of this call (also stored in last_usage and summed in usage_totals)
+        """
+        usage = getattr(response, "usage", None)
+        self.last_usage = {field: getattr(usage, field, None) or 0 for field in self.USAGE_FIELDS}
+        for field, tokens in self.last_usage.items():
+            self.usage_totals[field] += tokens
+        self.model_calls += 1
+        return self.last_usage
+
+    # Batch mode
+
+    def single_shot_params(self, prompt: str, max_tokens: int, system: Optional[str] = None) -> Dict[str, Any]:
+        """
+        messages.create() arguments for a one-message request outside the chat loop.
+
+        Args:
+            prompt: User message
+            max_tokens: Response token limit
+            system: System prompt (default: get_system_prompt())
+
+        Returns:
+            Request parameters, usable directly or added to a MessageBatch
+        """
+        system_block = {"type": "text", "text": system if system is not None else self.get_system_prompt()}
+        if self.prompt_caching:
+            # Requests of a backfill share the system prompt
+            system_block["cache_control"] = {"type": "ephemeral"}
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "system": [system_block],
+            "messages": [{"role": "user", "content": prompt}]
+        }
+
+    def message_batch(self, poll_interval: float = 30.0, timeout: Optional[float] = None) -> MessageBatch:
+        """
+        Start a Message Batches API batch on this agent's client.
+
+        Example:
+            batch = agent.message_batch()
+            handles = [batch.add(agent.single_shot_params(p, 1000)) for p in prompts]
+            agent.run_batch(batch)
+        """
+        return MessageBatch(self.anthropic, poll_interval=poll_interval, timeout=timeout)
+
+    def run_batch(self, batch: MessageBatch) -> List[BatchHandle]:
+        """
+        Submit a batch and block until its results are in (one thread, however many requests).
+
+        Usage of succeeded requests is recorded like chat() calls.
+        """
+        handles = batch.run()
+        for handle in handles:
+            if handle.ok:
+                self._record_usage(handle.message)
+        return handles
+
+    # Instrumentation
+
+    def add_span_hook(self, hook: SpanHook) -> None:
+        """
+        Register a callable receiving a Span for every model call, tool call and chat.
+
+        Example:
+            agent.add_span_hook(get_collector().record_span)
+        """
+        self.span_hooks.append(hook)
+
+    def _emit_span(self, span: Span) -> None:
+        """Send a span to every hook; a failing hook never breaks the chat."""
+        for hook in self.span_hooks:
+            try:
+                hook(span)
+            except Exception as e:
+                print(f"Warning: span hook {hook!r} failed: {e}")
+
+    def _model_span(self, call_started: float, response: Any, turn: int, **metadata: Any) -> None:
+        """Emit the span of one Messages API call (usage from last_usage)."""
+        self._emit_span(Span(
+            agent=self.agent_name,
+            kind="model",
+            name=self.model,
+            duration_ms=(time.perf_counter() - call_started) * 1000,
+            turn=turn,
+            usage=dict(self.last_usage),
+            metadata={"stop_reason": response.stop_reason, **metadata}
+        ))
+
+    def _tool_span(self, call_started: float, tool_name: str, result: str, cached: bool) -> None:
+        """Emit the span of one tool call."""
+        self._emit_span(Span(
+            agent=self.agent_name,
+            kind="tool",
+            name=tool_name,
+            duration_ms=(time.perf_counter() - call_started) * 1000,
+            success=not is_error_result(result),
+            metadata={"cached": cached}
+        ))
+
+    @contextmanager
+    def _chat_span(self, name: str) -> Iterator[Span]:
+        """Time a whole chat: turns taken and tokens used across its model calls."""
+        call_started = time.perf_counter()
+        calls_before = self.model_calls
+        usage_before = dict(self.usage_totals)
+        span = Span(agent=self.agent_name, kind="chat", name=name, duration_ms=0.0)
+        try:
+            yield span
+        except GeneratorExit:
+            # Stream closed by the consumer before it finished
+            span.metadata["closed_early"] = True
+            raise
+        except Exception as e:
+            span.success = False
+            span.error_type = type(e).__name__
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - call_started) * 1000
+            span.turn = self.model_calls - calls_before
+            span.usage = {
+                field: self.usage_totals[field] - usage_before[field] for field in self.USAGE_FIELDS
+            }
+            self._emit_span(span)
+
+    @staticmethod
+    def _extract_text(content: List[Any]) -> str:
+        """Concatenate the text blocks of a response."""
+        return "".join(block.text for block in content if block.type == "text")
+
+    @staticmethod
+    def _tool_result(block: Any, result: str) -> Dict[str, Any]:
+        """Build the tool_result content block answering a tool_use block."""
+        return {
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": result
+        }
+
     def clear_history(self):
         """Clear conversation history."""
         self.conversation_history = []
+        if self.history_manager:
+            self.history_manager.reset()
 
     def reset_conversation(self):
         """
@@ -266,20 +835,16 @@ class BaseAgent(ABC):
 
         This implements the "bootup ritual" - reading where we are in the world.
 
-        If state_file doesn't exist, initializes empty state.
+        If state_file doesn't exist, initializes empty state. A corrupt
+        state file is moved aside (<state_file>.corrupt), not overwritten.
         Subclasses can override to add custom state initialization.
         """
-        if not self.state_file:
+        if not self.state_store:
             return
 
-        state_path = Path(self.state_file)
-        if state_path.exists():
-            try:
-                with open(state_path, 'r') as f:
-                    self.state = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"Warning: Could not load state from {self.state_file}: {e}")
-                self.state = {}
+        state = self.state_store.load()
+        if state is not None:
+            self.state = state
         else:
             # Initialize empty state
             self.state = self.initialize_state()
@@ -292,17 +857,18 @@ class BaseAgent(ABC):
         Called after each interaction to persist agent's understanding of
         "where we are" for the next session.
 
+        Writes immediately and atomically (temp file, fsync, rename), so a
+        crash never leaves a half-written state file. Frequent updates
+        should go through set_state()/update_state(), which are debounced.
+
         Creates parent directories if they don't exist.
         """
-        if not self.state_file:
+        if not self.state_store:
             return
 
-        state_path = Path(self.state_file)
-        state_path.parent.mkdir(parents=True, exist_ok=True)
-
         try:
-            with open(state_path, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            with self.state_store.lock:
+                self.state_store.save(self.state)
         except Exception as e:
             print(f"Warning: Could not save state to {self.state_file}: {e}")
 
@@ -349,24 +915,40 @@ class BaseAgent(ABC):
         """
         Set value in persistent state.
 
-        Does NOT automatically save to disk. Call save_state() to persist.
+        Saved automatically after state_save_delay seconds; many changes
+        within the delay become one write. Call save_state() to persist
+        immediately. After mutating a value in place (e.g. appending to a
+        journal list), set it again to schedule the save.
 
         Args:
             key: State key
             value: State value
         """
-        self.state[key] = value
+        if not self.state_store:
+            self.state[key] = value
+            return
+
+        with self.state_store.lock:
+            self.state[key] = value
+            self.state_store.schedule(self.state, [key])
 
     def update_state(self, updates: Dict[str, Any]) -> None:
         """
         Update multiple state values at once.
 
-        Does NOT automatically save to disk. Call save_state() to persist.
+        Saved automatically like set_state(). Call save_state() to persist
+        immediately.
 
         Args:
             updates: Dictionary of key-value pairs to update
         """
-        self.state.update(updates)
+        if not self.state_store:
+            self.state.update(updates)
+            return
+
+        with self.state_store.lock:
+            self.state.update(updates)
+            self.state_store.schedule(self.state, list(updates))
 
     def clear_state(self) -> None:
         """
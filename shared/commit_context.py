@@ -0,0 +1,200 @@
+"""
+Commit Context - Parse a commit once, share it with every analyzer
+
+Collects everything the commit analyzers need from a single `git show`:
+    - Commit hash and message
+    - Files changed
+    - Full unified diff
+    - Added lines per file (with correct new-file line numbers)
+    - Parsed AST per changed Python file (one ast.parse per file)
+
+Architecture:
+    git show (once) → CommitContext → Critic / Test-Gen / Doc-Writer / Consequence Analyzer
+
+Usage:
+    from shared.commit_context import CommitContext
+
+    context = CommitContext.from_git("HEAD")
+
+    print(context.message)
+    for file_path, lines in context.added_lines_by_file.items():
+        print(file_path, len(lines))
+
+    tree = context.get_ast("shared/confidence.py")
+"""
+
+import ast
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+class CommitContext:
+    """Everything analyzers need to know about one commit, gathered once."""
+
+    HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+
+    def __init__(
+        self,
+        commit_hash: str,
+        message: str,
+        files_changed: List[str],
+        diff: str,
+        repo_path: str = "."
+    ):
+        """Build a context from already-collected commit data.
+
+        Most callers should use CommitContext.from_git() instead.
+
+        Args:
+            commit_hash: Full commit hash
+            message: Commit message
+            files_changed: Paths changed by the commit (repo-relative)
+            diff: Unified diff of the commit
+            repo_path: Repository root used to read sources for ASTs
+        """
+        self.hash = commit_hash
+        self.message = message
+        self.files_changed = files_changed
+        self.diff = diff
+        self.repo_path = Path(repo_path).resolve()
+
+        self.added_lines_by_file = self._parse_added_lines(diff)
+        self.asts: Dict[str, Optional[ast.AST]] = self._parse_python_files()
+
+    @classmethod
+    def from_git(cls, commit_hash: str = "HEAD", repo_path: str = ".") -> "CommitContext":
+        """Collect commit details with a single `git show`.
+
+        Args:
+            commit_hash: Commit to load (default: HEAD)
+            repo_path: Repository root
+
+        Returns:
+            CommitContext
+
+        Raises:
+            subprocess.CalledProcessError: If git cannot show the commit
+        """
+        output = subprocess.run(
+            ["git", "show", "--no-renames", "--format=%H%x00%B%x00", commit_hash],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+
+        full_hash, message, diff = output.split('\x00', 2)
+        diff = diff.lstrip('\n')
+
+        return cls(
+            commit_hash=full_hash.strip(),
+            message=message.strip(),
+            files_changed=cls._parse_files_changed(diff),
+            diff=diff,
+            repo_path=repo_path
+        )
+
+    @property
+    def added_lines(self) -> List[Dict[str, Any]]:
+        """All added lines across files, in diff order."""
+        return [
+            line_info
+            for file_lines in self.added_lines_by_file.values()
+            for line_info in file_lines
+        ]
+
+    @property
+    def python_files(self) -> List[str]:
+        """Changed Python files, in diff order."""
+        return [f for f in self.files_changed if f.endswith('.py')]
+
+    def get_ast(self, file_path: str) -> Optional[ast.AST]:
+        """Get the parsed AST for a changed Python file.
+
+        Returns:
+            AST module, or None if the file was deleted or doesn't parse
+        """
+        return self.asts.get(file_path)
+
+    def to_commit_info(self) -> Dict[str, Any]:
+        """Legacy commit-info dict shape used by the analyzers."""
+        return {
+            "success": True,
+            "hash": self.hash,
+            "message": self.message,
+            "files_changed": self.files_changed,
+            "diff": self.diff
+        }
+
+    @staticmethod
+    def _parse_files_changed(diff: str) -> List[str]:
+        """Extract changed file paths from `diff --git` headers."""
+        files = []
+
+        for line in diff.split('\n'):
+            if line.startswith('diff --git '):
+                match = re.match(r'diff --git a/.* b/(.*)$', line)
+                if match:
+                    files.append(match.group(1))
+            elif line.startswith('diff --cc ') or line.startswith('diff --combined '):
+                files.append(line.split(' ', 2)[2])
+
+        return files
+
+    def _parse_added_lines(self, diff: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Parse the diff into added lines grouped by file.
+
+        Context lines advance the line counter too, so reported line numbers
+        match the file as of this commit.
+        """
+        added: Dict[str, List[Dict[str, Any]]] = {}
+        current_file = None
+        current_line_num = None
+
+        for line in diff.split('\n'):
+            if line.startswith('diff '):
+                current_file = None
+                current_line_num = None
+
+            # Track current file (None for deletions); headers precede the first hunk
+            elif current_line_num is None and line.startswith('+++ '):
+                target = line[4:].strip()
+                current_file = target[2:] if target.startswith('b/') else None
+
+            # Track line numbers
+            elif line.startswith('@@'):
+                match = self.HUNK_HEADER.match(line)
+                current_line_num = int(match.group(1)) if match else None
+
+            elif current_file is None or current_line_num is None:
+                continue
+
+            # Collect added lines
+            elif line.startswith('+'):
+                added.setdefault(current_file, []).append({
+                    "file": current_file,
+                    "line": current_line_num,
+                    "content": line[1:].strip()
+                })
+                current_line_num += 1
+
+            # Context lines exist in the new file as well
+            elif line.startswith(' '):
+                current_line_num += 1
+
+        return added
+
+    def _parse_python_files(self) -> Dict[str, Optional[ast.AST]]:
+        """Parse every changed Python file exactly once (sources read from the working tree)."""
+        asts: Dict[str, Optional[ast.AST]] = {}
+
+        for file_path in self.python_files:
+            try:
+                source = (self.repo_path / file_path).read_text(encoding='utf-8')
+                asts[file_path] = ast.parse(source)
+            except (OSError, SyntaxError, ValueError, UnicodeDecodeError):
+                asts[file_path] = None
+
+        return asts
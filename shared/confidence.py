@@ -5,12 +5,21 @@ Confidence Scoring System for Proactive Tasks
 Analyzes discovered tasks and assigns confidence scores (high/medium/low)
 based on risk assessment, context analysis, and auto-fix feasibility.
 
+Scored tasks are kept in the proactivity queue, a SQLite database
+(shared/proactivity_queue.db) migrated once from the legacy JSON file.
+
 Part of FibreFlow Proactive Agent System.
 """
 
-from typing import Dict, Any, Literal
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Literal, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import os
 import re
+import sqlite3
 
 
 ConfidenceLevel = Literal["high", "medium", "low"]
@@ -214,44 +223,475 @@ class ConfidenceScorer:
 
 
 class ProactivityQueue:
-    """Manages the proactive task queue with CRUD operations"""
+    """
+    Manages the proactive task queue with CRUD operations.
+
+    Tasks are stored in a SQLite database (WAL mode) next to the legacy
+    JSON queue file, so adds and updates touch a single row instead of
+    rewriting the whole queue. The JSON file is imported once on first use
+    and can be regenerated with export_json() for consumers that still read it.
+
+    Every task carries a content fingerprint (type + file + normalized
+    snippet + rule) held in a unique index. The snippet and rule are stored
+    on the task, so the fingerprint is always recomputable from the row.
+    Tasks without a snippet (legacy imports, findings without code) are
+    fingerprinted from their description and line instead; when such a task
+    is rediscovered with a snippet, it adopts the snippet and fingerprint.
+    Re-discovered findings are merged into the existing task (seen_count,
+    last_seen) instead of being appended.
+    """
+
+    # Columns stored natively; any other task fields live in the `extra` JSON blob
+    TASK_COLUMNS = [
+        "id", "type", "description", "file", "line", "confidence", "reasoning",
+        "auto_fixable", "estimated_effort", "risk_level", "created_at", "status",
+        "age_hours", "fingerprint", "seen_count", "last_seen", "snippet", "rule"
+    ]
+
+    # Columns added after the initial schema: name -> column definition
+    ADDED_COLUMNS = {
+        "fingerprint": "TEXT",
+        "seen_count": "INTEGER NOT NULL DEFAULT 1",
+        "last_seen": "TEXT",
+        "snippet": "TEXT",
+        "rule": "TEXT"
+    }
 
-    def __init__(self, queue_file: str = "shared/proactivity_queue.json"):
+    # Bumped when fingerprint inputs change; older rows are re-fingerprinted on open
+    FINGERPRINT_VERSION = "2"
+
+    CONFIDENCE_ORDER_SQL = (
+        "CASE confidence WHEN 'high' THEN 0 WHEN 'medium' THEN 1 "
+        "WHEN 'low' THEN 2 ELSE 3 END"
+    )
+
+    def __init__(
+        self,
+        queue_file: str = "shared/proactivity_queue.json",
+        db_path: Optional[str] = None
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            queue_file: Legacy JSON queue (migration source and export target)
+            db_path: SQLite database path (default: queue_file with .db suffix)
+        """
         self.queue_file = queue_file
+        self.db_path = db_path or str(Path(queue_file).with_suffix(".db"))
         self.scorer = ConfidenceScorer()
+        self._ensure_database()
+        self._migrate_from_json()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with row access by column name."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    @contextmanager
+    def _write(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """
+        Write transaction that takes the write lock up front (BEGIN IMMEDIATE).
 
-    def load_queue(self) -> Dict[str, Any]:
-        """Load queue from JSON file"""
-        import json
-        from pathlib import Path
+        Concurrent writers queue on the busy timeout instead of both reading
+        (fingerprint lookup, next ID) and then colliding on INSERT. Commits on
+        success, rolls back on error.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            yield conn
+
+    def _ensure_database(self) -> None:
+        """Create tables and indexes if they don't exist."""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("BEGIN IMMEDIATE")  # Two processes opening a new database at once
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL UNIQUE,
+                    type TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    line INTEGER,
+                    confidence TEXT NOT NULL,
+                    reasoning TEXT,
+                    auto_fixable INTEGER NOT NULL DEFAULT 0,
+                    estimated_effort INTEGER,
+                    risk_level TEXT,
+                    created_at TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    age_hours REAL DEFAULT 0,
+                    extra TEXT
+                )
+            """)
+
+            # Bring databases created before fingerprinting up to date
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+            for name, definition in self.ADDED_COLUMNS.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {definition}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            if self._get_meta(conn, "fingerprint_version") != self.FINGERPRINT_VERSION:
+                # Version 1 fingerprinted snippet-less rows from the description alone
+                conn.execute("UPDATE tasks SET fingerprint = NULL WHERE snippet IS NULL")
+                self._set_meta(conn, "fingerprint_version", self.FINGERPRINT_VERSION)
+            self._backfill_fingerprints(conn)
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_fingerprint ON tasks(fingerprint)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_unfingerprinted "
+                "ON tasks(file, type, line) WHERE snippet IS NULL"
+            )
+
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_confidence ON tasks(confidence)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks(type)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _migrate_from_json(self) -> int:
+        """
+        One-shot import of the legacy JSON queue into SQLite.
+
+        Runs only once per database; subsequent calls are no-ops.
+
+        Returns:
+            Number of tasks imported
+        """
+        conn = self._connect()
+        try:
+            if self._get_meta(conn, "migrated_from_json"):
+                return 0
+
+            imported = 0
+            queue_path = Path(self.queue_file)
+            legacy: Dict[str, Any] = {}
+
+            if queue_path.exists():
+                try:
+                    with open(queue_path) as f:
+                        legacy = json.load(f)
+                except (json.JSONDecodeError, OSError) as e:
+                    # Left unmarked: the import is retried next time the queue is opened
+                    print(f"Warning: Could not migrate {self.queue_file}, will retry: {e}")
+                    return 0
+
+            with self._write(conn):
+                if self._get_meta(conn, "migrated_from_json"):
+                    return 0  # Another process imported it meanwhile
+
+                for task in legacy.get("tasks", []):
+                    if conn.execute(
+                        "SELECT 1 FROM tasks WHERE id = ?", (task.get("id"),)
+                    ).fetchone():
+                        continue
+                    self._upsert_task(conn, task)
+                    imported += 1
+
+                if legacy.get("last_updated"):
+                    self._set_meta(conn, "last_updated", legacy["last_updated"])
+                self._set_meta(conn, "migrated_from_json", datetime.utcnow().isoformat() + "Z")
+
+            return imported
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM queue_meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO queue_meta (key, value) VALUES (?, ?)",
+            (key, value)
+        )
+
+    def _touch(self, conn: sqlite3.Connection) -> None:
+        """Record the queue modification time."""
+        self._set_meta(conn, "last_updated", datetime.utcnow().isoformat() + "Z")
+
+    def _split_task(self, task: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Split a task dict into native column values and extra fields."""
+        columns = {k: task.get(k) for k in self.TASK_COLUMNS}
+        columns["auto_fixable"] = 1 if columns["auto_fixable"] else 0
+        columns["fingerprint"] = columns["fingerprint"] or self._fingerprint_for(task)
+        columns["seen_count"] = columns["seen_count"] or 1
+        columns["last_seen"] = columns["last_seen"] or columns["created_at"]
+        extra = {k: v for k, v in task.items() if k not in self.TASK_COLUMNS}
+        return columns, extra
+
+    @staticmethod
+    def normalize_snippet(snippet: Optional[str]) -> str:
+        """Collapse whitespace, drop a trailing period and lowercase."""
+        return re.sub(r"\s+", " ", (snippet or "").strip().rstrip(".")).lower()
+
+    @staticmethod
+    def fingerprint(
+        task_type: str,
+        file: str,
+        snippet: str = "",
+        rule: str = "",
+        line: Optional[int] = None
+    ) -> str:
+        """
+        Compute the content fingerprint used to deduplicate tasks.
+
+        Line numbers are left out when there is a code snippet, so findings
+        survive code moving around; whitespace and case in the snippet are
+        normalized.
+
+        Args:
+            task_type: Task category
+            file: File path where the issue was found
+            snippet: Offending code (or description when no code is available)
+            rule: Rule/pattern name that produced the finding
+            line: Line number, only passed for description-based fingerprints
+
+        Returns:
+            Hex SHA-1 digest
+        """
+        parts = [task_type or "", file or "", ProactivityQueue.normalize_snippet(snippet), rule or ""]
+        if line is not None:
+            parts.append(str(line))
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _fingerprint_for(self, task: Dict[str, Any]) -> str:
+        """Fingerprint a task from its stored snippet and rule (description and line without a snippet)."""
+        if task.get("snippet"):
+            return self.fingerprint(task.get("type"), task.get("file"), task["snippet"], task.get("rule") or "")
+        return self.fingerprint(
+            task.get("type"), task.get("file"), task.get("description", ""), task.get("rule") or "", task.get("line")
+        )
+
+    def _upsert_task(self, conn: sqlite3.Connection, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a task, or merge it into the existing task with the same fingerprint.
 
-        queue_path = Path(self.queue_file)
-        if not queue_path.exists():
+        Returns:
+            The stored task (existing one when merged)
+        """
+        columns, extra = self._split_task(task)
+
+        row = conn.execute(
+            "SELECT * FROM tasks WHERE fingerprint = ?", (columns["fingerprint"],)
+        ).fetchone()
+
+        if row is None and columns["snippet"]:
+            # Same finding stored without a snippet (legacy import): adopt this one's
+            row = conn.execute(
+                "SELECT * FROM tasks WHERE snippet IS NULL AND file = ? AND type = ? "
+                "AND line IS ? AND description = ?",
+                (columns["file"], columns["type"], columns["line"], columns["description"])
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE tasks SET snippet = ?, rule = ?, fingerprint = ? WHERE seq = ?",
+                    (columns["snippet"], columns["rule"], columns["fingerprint"], row["seq"])
+                )
+
+        if row:
+            # The latest sighting says where the code is now
+            conn.execute(
+                "UPDATE tasks SET seen_count = seen_count + ?, "
+                "line = CASE WHEN ? >= COALESCE(last_seen, '') THEN COALESCE(?, line) ELSE line END, "
+                "last_seen = MAX(COALESCE(last_seen, ''), ?) WHERE seq = ?",
+                (columns["seen_count"], columns["last_seen"], columns["line"], columns["last_seen"], row["seq"])
+            )
+            return self._row_to_task(conn.execute(
+                "SELECT * FROM tasks WHERE seq = ?", (row["seq"],)
+            ).fetchone())
+
+        if not columns["id"]:
+            columns["id"] = self._next_task_id(conn)
+        columns["extra"] = json.dumps(extra) if extra else None
+        names = list(columns.keys())
+        conn.execute(
+            f"INSERT INTO tasks ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+            [columns[n] for n in names]
+        )
+        return {**task, **{k: v for k, v in columns.items() if k != "extra"},
+                "auto_fixable": bool(columns["auto_fixable"])}
+
+    def _backfill_fingerprints(self, conn: sqlite3.Connection) -> None:
+        """Fingerprint rows stored before deduplication existed and merge duplicates."""
+        owners: Dict[str, int] = {
+            row["fingerprint"]: row["seq"]
+            for row in conn.execute("SELECT seq, fingerprint FROM tasks WHERE fingerprint IS NOT NULL")
+        }
+
+        for row in conn.execute("SELECT * FROM tasks WHERE fingerprint IS NULL ORDER BY seq").fetchall():
+            fp = self._fingerprint_for(self._row_to_task(row))
+            last_seen = row["last_seen"] or row["created_at"]
+
+            if fp in owners:
+                conn.execute(
+                    "UPDATE tasks SET seen_count = seen_count + ?, "
+                    "last_seen = MAX(COALESCE(last_seen, created_at), ?) WHERE seq = ?",
+                    (row["seen_count"] or 1, last_seen, owners[fp])
+                )
+                conn.execute("DELETE FROM tasks WHERE seq = ?", (row["seq"],))
+            else:
+                conn.execute(
+                    "UPDATE tasks SET fingerprint = ?, last_seen = ? WHERE seq = ?",
+                    (fp, last_seen, row["seq"])
+                )
+                owners[fp] = row["seq"]
+
+    def _row_to_task(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row back into the task dict shape."""
+        task = {k: row[k] for k in self.TASK_COLUMNS}
+        task["auto_fixable"] = bool(task["auto_fixable"])
+        if row["extra"]:
+            task.update(json.loads(row["extra"]))
+        return task
+
+    def _next_task_id(self, conn: sqlite3.Connection) -> str:
+        """Generate the next task ID (never reuses IDs of removed tasks)."""
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+        ).fetchone()
+        next_seq = (row["seq"] if row else 0) + 1
+
+        task_id = f"task-{next_seq:03d}"
+        while conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone():
+            next_seq += 1
+            task_id = f"task-{next_seq:03d}"
+
+        return task_id
+
+    def _confidence_counts(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        counts = {"high": 0, "medium": 0, "low": 0}
+        for row in conn.execute(
+            "SELECT confidence, COUNT(*) AS n FROM tasks GROUP BY confidence"
+        ):
+            counts[row["confidence"]] = row["n"]
+        return counts
+
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Get queue counts without loading any tasks.
+
+        Returns:
+            {version, last_updated, total_tasks, high_confidence,
+             medium_confidence, low_confidence}
+        """
+        conn = self._connect()
+        try:
+            counts = self._confidence_counts(conn)
+            total = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
             return {
                 "version": "1.0",
-                "last_updated": datetime.utcnow().isoformat() + "Z",
-                "total_tasks": 0,
-                "high_confidence": 0,
-                "medium_confidence": 0,
-                "low_confidence": 0,
-                "tasks": []
+                "last_updated": self._get_meta(conn, "last_updated")
+                or datetime.utcnow().isoformat() + "Z",
+                "total_tasks": total,
+                "high_confidence": counts["high"],
+                "medium_confidence": counts["medium"],
+                "low_confidence": counts["low"]
             }
+        finally:
+            conn.close()
+
+    def load_queue(self) -> Dict[str, Any]:
+        """Load the full queue (summary plus every task) in the legacy JSON shape"""
+        queue = self.get_summary()
+
+        conn = self._connect()
+        try:
+            queue["tasks"] = [
+                self._row_to_task(row)
+                for row in conn.execute("SELECT * FROM tasks ORDER BY seq")
+            ]
+        finally:
+            conn.close()
 
-        with open(queue_path) as f:
-            return json.load(f)
+        return queue
 
     def save_queue(self, queue: Dict[str, Any]) -> None:
-        """Save queue to JSON file"""
-        import json
-        from pathlib import Path
+        """Replace the stored queue with the given legacy-shaped queue dict"""
+        conn = self._connect()
+        try:
+            with self._write(conn):
+                conn.execute("DELETE FROM tasks")
+                for task in queue.get("tasks", []):
+                    self._upsert_task(conn, task)
+                self._touch(conn)
+        finally:
+            conn.close()
+
+    def export_json(self, output_file: Optional[str] = None) -> str:
+        """
+        Export the queue to JSON (legacy format) for the dashboard.
 
-        queue["last_updated"] = datetime.utcnow().isoformat() + "Z"
+        Args:
+            output_file: Destination path (default: queue_file)
 
-        queue_path = Path(self.queue_file)
-        queue_path.parent.mkdir(parents=True, exist_ok=True)
+        Returns:
+            Path written
+        """
+        output_path = Path(output_file or self.queue_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(queue_path, 'w') as f:
+        queue = self.load_queue()
+
+        tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
             json.dump(queue, f, indent=2)
+        os.replace(tmp_path, output_path)
+
+        return str(output_path)
+
+    def _build_task(
+        self,
+        task_type: str,
+        description: str,
+        file: str,
+        line: Optional[int],
+        context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Score and fingerprint a finding, building its task dict (without an ID)."""
+        context = dict(context or {})
+        context.update({"file": file, "line": line})
+        score_result = self.scorer.score_task(description, task_type, context)
+        now = datetime.utcnow().isoformat() + "Z"
+
+        task = {
+            "type": task_type,
+            "description": description,
+            "file": file,
+            "line": line,
+            "confidence": score_result["confidence"],
+            "reasoning": score_result["reasoning"],
+            "auto_fixable": score_result["auto_fixable"],
+            "estimated_effort": score_result["estimated_effort"],
+            "risk_level": score_result["risk_level"],
+            "created_at": now,
+            "status": "queued",
+            "age_hours": 0,
+            "seen_count": 1,
+            "last_seen": now
+        }
+        snippet = context.get("code_snippet") or context.get("full_line") or context.get("function_name")
+        task["snippet"] = self.normalize_snippet(snippet) or None
+        task["rule"] = context.get("rule") or None
+        task["fingerprint"] = self._fingerprint_for(task)
+        return task
 
     def add_task(
         self,
@@ -274,40 +714,56 @@ class ProactivityQueue:
         Returns:
             Created task object
         """
-        queue = self.load_queue()
-
-        # Generate task ID
-        task_id = f"task-{len(queue['tasks']) + 1:03d}"
-
-        # Score confidence
-        context = context or {}
-        context.update({"file": file, "line": line})
-        score_result = self.scorer.score_task(description, task_type, context)
-
-        # Create task
-        task = {
-            "id": task_id,
+        return self.add_tasks([{
             "type": task_type,
             "description": description,
             "file": file,
             "line": line,
-            "confidence": score_result["confidence"],
-            "reasoning": score_result["reasoning"],
-            "auto_fixable": score_result["auto_fixable"],
-            "estimated_effort": score_result["estimated_effort"],
-            "risk_level": score_result["risk_level"],
-            "created_at": datetime.utcnow().isoformat() + "Z",
-            "status": "queued",
-            "age_hours": 0
-        }
+            "context": context
+        }])[0]
 
-        # Add to queue
-        queue["tasks"].append(task)
-        queue["total_tasks"] = len(queue["tasks"])
-        queue[f"{score_result['confidence']}_confidence"] += 1
+    def add_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add many tasks in a single transaction.
 
-        self.save_queue(queue)
-        return task
+        All findings are scored first, then written with one commit, so a scan
+        that discovers hundreds of issues costs one write instead of hundreds.
+        Findings whose fingerprint is already queued are merged into the
+        existing task (seen_count incremented, last_seen refreshed).
+
+        Args:
+            tasks: Findings shaped like {type, description, file, line?, context?}.
+                Context keys code_snippet/full_line/function_name and rule
+                feed the fingerprint.
+
+        Returns:
+            Stored task objects, in input order (existing task when merged)
+        """
+        # Score everything before touching the database
+        new_tasks = [
+            self._build_task(
+                task_type=t["type"],
+                description=t["description"],
+                file=t["file"],
+                line=t.get("line"),
+                context=t.get("context")
+            )
+            for t in tasks
+        ]
+
+        if not new_tasks:
+            return []
+
+        conn = self._connect()
+        try:
+            with self._write(conn):
+                stored = [self._upsert_task(conn, task) for task in new_tasks]
+                self._touch(conn)
+        finally:
+            conn.close()
+
+        # Keep "id" first to match the legacy task layout
+        return [{"id": task.pop("id"), **task} for task in stored]
 
     def get_tasks(
         self,
@@ -328,66 +784,93 @@ class ProactivityQueue:
         Returns:
             {total_tasks, filtered_tasks, tasks: [...]}
         """
-        queue = self.load_queue()
-        tasks = queue["tasks"]
+        where = []
+        params: List[Any] = []
 
         # Filter by confidence
         if filter_confidence != "all":
-            tasks = [t for t in tasks if t["confidence"] == filter_confidence]
+            where.append("confidence = ?")
+            params.append(filter_confidence)
 
         # Filter by type
         if filter_type:
-            tasks = [t for t in tasks if t["type"] == filter_type]
+            where.append("type = ?")
+            params.append(filter_type)
 
-        # Sort
+        # Sort (seq keeps insertion order stable within equal keys)
         if sort_by == "confidence":
-            confidence_order = {"high": 0, "medium": 1, "low": 2}
-            tasks = sorted(tasks, key=lambda t: confidence_order.get(t["confidence"], 3))
+            order = f"{self.CONFIDENCE_ORDER_SQL}, seq"
         elif sort_by == "age":
-            tasks = sorted(tasks, key=lambda t: t["created_at"], reverse=True)
+            order = "created_at DESC, seq"
         elif sort_by == "effort":
-            tasks = sorted(tasks, key=lambda t: t["estimated_effort"])
-
-        # Limit
-        tasks = tasks[:limit]
+            order = "estimated_effort, seq"
+        else:
+            order = "seq"
+
+        query = "SELECT * FROM tasks"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+            tasks = [self._row_to_task(row) for row in conn.execute(query, params)]
+        finally:
+            conn.close()
 
         return {
-            "total_tasks": queue["total_tasks"],
+            "total_tasks": total,
             "filtered_tasks": len(tasks),
             "tasks": tasks
         }
 
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single task by ID (None if not found)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            return self._row_to_task(row) if row else None
+        finally:
+            conn.close()
+
     def update_task(self, task_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update task fields"""
-        queue = self.load_queue()
-
-        for task in queue["tasks"]:
-            if task["id"] == task_id:
+        conn = self._connect()
+        try:
+            with self._write(conn):
+                row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                if not row:
+                    raise ValueError(f"Task {task_id} not found")
+
+                task = self._row_to_task(row)
                 task.update(updates)
-                self.save_queue(queue)
-                return task
 
-        raise ValueError(f"Task {task_id} not found")
+                columns, extra = self._split_task(task)
+                columns.pop("id")
+                columns["extra"] = json.dumps(extra) if extra else None
+                conn.execute(
+                    f"UPDATE tasks SET {', '.join(f'{k} = ?' for k in columns)} WHERE seq = ?",
+                    [*columns.values(), row["seq"]]
+                )
+                self._touch(conn)
+        finally:
+            conn.close()
+
+        return task
 
     def remove_task(self, task_id: str) -> bool:
         """Remove task from queue"""
-        queue = self.load_queue()
-
-        initial_count = len(queue["tasks"])
-        queue["tasks"] = [t for t in queue["tasks"] if t["id"] != task_id]
-
-        if len(queue["tasks"]) < initial_count:
-            queue["total_tasks"] = len(queue["tasks"])
-
-            # Recalculate confidence counts
-            queue["high_confidence"] = len([t for t in queue["tasks"] if t["confidence"] == "high"])
-            queue["medium_confidence"] = len([t for t in queue["tasks"] if t["confidence"] == "medium"])
-            queue["low_confidence"] = len([t for t in queue["tasks"] if t["confidence"] == "low"])
-
-            self.save_queue(queue)
-            return True
-
-        return False
+        conn = self._connect()
+        try:
+            with self._write(conn):
+                cursor = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                if cursor.rowcount:
+                    self._touch(conn)
+                return cursor.rowcount > 0
+        finally:
+            conn.close()
 
 
 # Example usage
@@ -27,11 +27,12 @@ Usage:
 import os
 import re
 import ast
-import subprocess
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
 from datetime import datetime
 
+from shared.commit_context import CommitContext
+
 
 class ConsequenceAnalyzer:
     """Analyzes code changes to predict real-world consequences."""
@@ -40,18 +41,26 @@ class ConsequenceAnalyzer:
         """Initialize consequence analyzer."""
         self.project_root = Path(os.getcwd())
 
-    def analyze_commit(self, commit_hash: str = "HEAD") -> Dict[str, Any]:
+    def analyze_commit(
+        self,
+        commit_hash: str = "HEAD",
+        context: Optional[CommitContext] = None
+    ) -> Dict[str, Any]:
         """Analyze a commit for real-world impact.
 
         Args:
             commit_hash: Git commit hash to analyze (default: HEAD)
+            context: Pre-parsed commit shared with other analyzers (optional)
 
         Returns:
             Dict with impact analysis and recommendations
         """
         try:
             # Get commit details
-            commit_info = self._get_commit_info(commit_hash)
+            if context is not None:
+                commit_info = context.to_commit_info()
+            else:
+                commit_info = self._get_commit_info(commit_hash)
 
             if not commit_info["success"]:
                 return {
@@ -722,31 +731,7 @@ class ConsequenceAnalyzer:
             Dict with commit details
         """
         try:
-            # Get commit message
-            message = subprocess.check_output(
-                ["git", "log", "-1", "--pretty=%B", commit_hash],
-                text=True
-            ).strip()
-
-            # Get files changed
-            files = subprocess.check_output(
-                ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", commit_hash],
-                text=True
-            ).strip().split('\n')
-
-            # Get full diff
-            diff = subprocess.check_output(
-                ["git", "show", commit_hash],
-                text=True
-            )
-
-            return {
-                "success": True,
-                "hash": commit_hash,
-                "message": message,
-                "files_changed": [f for f in files if f],
-                "diff": diff
-            }
+            return CommitContext.from_git(commit_hash, str(self.project_root)).to_commit_info()
 
         except Exception as e:
             return {
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Repository File Enumeration
+
+Lists the files a repository scan should look at, without walking into
+ignored directories:
+    - Inside a git work tree: `git ls-files` (tracked + untracked files,
+      minus anything matched by .gitignore), one subprocess call
+    - Otherwise: os.walk, pruning ignored directories before descending
+
+Either way, ignore patterns are applied per path component, so an ignored
+directory (e.g. node_modules/) is skipped as a whole - even when its files
+are tracked - and nothing under it is ever stat'ed or read.
+
+Ignore pattern forms:
+    "node_modules/"   → directory name, pruned at any depth
+    "*.pyc"           → glob on the file name
+    ".env"            → exact file or directory name
+
+Usage:
+    from shared.file_enumerator import list_repository_files
+
+    files = list_repository_files(
+        Path("."), suffixes=[".py", ".md"], ignore_patterns=["node_modules/", "*.log"]
+    )
+"""
+
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, List, Optional
+import os
+import subprocess
+
+
+class IgnoreRules:
+    """Matches path components against ignore patterns."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.dirs = set()
+        self.names = set()
+        self.globs = []
+
+        for pattern in patterns:
+            if pattern.endswith("/"):
+                self.dirs.add(pattern.rstrip("/"))
+            elif any(ch in pattern for ch in "*?["):
+                self.globs.append(pattern)
+            else:
+                self.names.add(pattern)
+
+    def ignores_dir(self, name: str) -> bool:
+        """Whether a directory should be pruned."""
+        return name in self.dirs or name in self.names
+
+    def ignores_file(self, name: str) -> bool:
+        """Whether a file should be skipped."""
+        return name in self.names or any(fnmatch(name, glob) for glob in self.globs)
+
+    def ignores_path(self, parts: Iterable[str]) -> bool:
+        """Whether a relative path (as components) is ignored."""
+        *dirs, name = parts
+        return any(self.ignores_dir(d) for d in dirs) or self.ignores_file(name)
+
+
+def git_ls_files(root: Path) -> Optional[List[str]]:
+    """Relative paths of tracked and untracked, non-gitignored files under root.
+
+    Returns:
+        Paths relative to root, or None if root isn't inside a git work tree
+    """
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=root,
+            capture_output=True,
+            check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    paths = os.fsdecode(result.stdout).split("\0")
+    return list(dict.fromkeys(p for p in paths if p))  # Unmerged files are listed per stage
+
+
+def walk_files(root: Path, rules: IgnoreRules) -> List[str]:
+    """Relative paths of files under root, pruning ignored directories."""
+    paths = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Prune in place so os.walk never descends into ignored directories
+        dirnames[:] = sorted(d for d in dirnames if not rules.ignores_dir(d))
+        relative_dir = Path(dirpath).relative_to(root)
+
+        for name in sorted(filenames):
+            paths.append(str(relative_dir / name))
+
+    return paths
+
+
+def list_repository_files(
+    root: Path,
+    suffixes: Iterable[str],
+    ignore_patterns: Iterable[str] = ()
+) -> List[Path]:
+    """List files under root with the given suffixes, skipping ignored paths.
+
+    Args:
+        root: Directory to enumerate
+        suffixes: File suffixes to keep (e.g. [".py", ".js"])
+        ignore_patterns: Directory names ("venv/"), file globs ("*.log")
+            or exact names (".env")
+
+    Returns:
+        Absolute file paths, sorted
+    """
+    root = Path(root).resolve()
+    suffixes = set(suffixes)
+    rules = IgnoreRules(ignore_patterns)
+
+    relative = git_ls_files(root)
+    if relative is None:
+        relative = walk_files(root, rules)
+
+    files = []
+    for path in relative:
+        parts = Path(path).parts
+        if Path(path).suffix in suffixes and not rules.ignores_path(parts):
+            files.append(root / path)
+
+    return sorted(files)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Conversation History Manager - Token-budgeted working memory
+
+Long-lived agents resend their whole conversation on every turn, so input
+tokens grow linearly with session length - mostly from old tool results
+(full SELECT result sets, system reports) nobody will look at again.
+
+HistoryManager keeps a conversation under a token budget:
+    1. Under budget → history untouched (prompt cache prefix stays stable)
+    2. Over budget  → old tool results are truncated to a short preview
+    3. Still over   → oldest turns are folded into a pinned summary and
+                      dropped, leaving a sliding window of recent turns
+
+Compaction brings the history down to target_ratio of the budget, so it
+happens once in a while rather than on every turn. Turns are only ever
+dropped whole (a user message and everything answering it), so tool_use
+blocks never lose their tool_result. The current turn is never dropped.
+
+Token counts are estimated (~4 characters per token) unless a counter is
+supplied; the budget only needs to be approximately right.
+
+Usage:
+    from shared.history_manager import HistoryManager
+
+    history = HistoryManager(budget_tokens=100000)
+    messages = history.compact(messages)
+    system = history.system_prompt("You are a helpful assistant.")
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import json
+import re
+
+
+# Rough characters-per-token ratio for English text and JSON
+CHARS_PER_TOKEN = 4
+
+# Suffix of a truncated tool result; such results are never truncated again
+TRUNCATED_SUFFIX = re.compile(r"\n\.\.\. \[truncated \d+ chars\]$")
+
+
+def _block_field(block: Any, field: str, default: Any = None) -> Any:
+    """Read a field from a content block (dict or SDK object)."""
+    if isinstance(block, dict):
+        return block.get(field, default)
+    return getattr(block, field, default)
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimate the token count of a message, content block or string.
+
+    Args:
+        value: String, content block, message or list of messages
+
+    Returns:
+        Approximate token count
+    """
+    if isinstance(value, str):
+        return len(value) // CHARS_PER_TOKEN + 1
+    if isinstance(value, dict):
+        return sum(estimate_tokens(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_tokens(v) for v in value)
+    if hasattr(value, "model_dump"):
+        return estimate_tokens(value.model_dump(exclude_none=True))
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN + 1
+
+
+def is_turn_start(message: Dict[str, Any]) -> bool:
+    """True for a user message that starts a turn (not a tool_result reply)."""
+    if message.get("role") != "user":
+        return False
+    content = message.get("content")
+    if isinstance(content, str):
+        return True
+    return not any(_block_field(block, "type") == "tool_result" for block in content)
+
+
+def message_text(message: Dict[str, Any]) -> str:
+    """Text of a message, ignoring tool blocks."""
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        _block_field(block, "text", "") for block in content
+        if _block_field(block, "type") == "text"
+    )
+
+
+class HistoryManager:
+    """
+    Keeps a conversation history within a token budget.
+
+    The pinned summary of dropped turns is exposed through summary and
+    system_prompt(); the history itself always starts at a user turn.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = 100000,
+        target_ratio: float = 0.6,
+        keep_recent_turns: int = 2,
+        tool_result_max_chars: int = 2000,
+        summary_max_chars: int = 4000,
+        count_tokens: Optional[Callable[[Any], int]] = None,
+        summarize: Optional[Callable[[List[Dict[str, Any]], str], str]] = None
+    ):
+        """
+        Initialize the history manager.
+
+        Args:
+            budget_tokens: Compact once the history is estimated above this
+            target_ratio: Compact down to this fraction of the budget (default: 0.6)
+            keep_recent_turns: Turns whose tool results are never truncated (default: 2)
+            tool_result_max_chars: Preview length for truncated tool results (default: 2000)
+            summary_max_chars: Maximum length of the pinned summary (default: 4000)
+            count_tokens: Optional exact counter (value -> tokens), default estimate_tokens
+            summarize: Optional (dropped messages, previous summary) -> new summary,
+                       default is an extractive summary of requests and answers
+        """
+        self.budget_tokens = budget_tokens
+        self.target_tokens = int(budget_tokens * target_ratio)
+        self.keep_recent_turns = keep_recent_turns
+        self.tool_result_max_chars = tool_result_max_chars
+        self.summary_max_chars = summary_max_chars
+        self.count_tokens = count_tokens or estimate_tokens
+        self.summarize = summarize or self._extractive_summary
+
+        self.summary = ""
+        self.compactions = 0
+        self.dropped_messages = 0
+
+    def compact(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bring a history under budget.
+
+        Args:
+            history: Conversation messages (not modified)
+
+        Returns:
+            The same list if under budget, otherwise a compacted copy
+        """
+        if self.count_tokens(history) <= self.budget_tokens:
+            return history
+
+        turn_starts = [i for i, message in enumerate(history) if is_turn_start(message)]
+        if not turn_starts:
+            return history
+
+        # 1. Truncate tool results outside the recent window
+        recent_start = turn_starts[-min(self.keep_recent_turns, len(turn_starts))]
+        truncated = [
+            self._truncate_tool_results(message) if i < recent_start else message
+            for i, message in enumerate(history)
+        ]
+        changed = any(new is not old for new, old in zip(truncated, history))
+        history = truncated
+
+        # 2. Fold the oldest turns into the summary until under target
+        tokens = self.count_tokens(history)
+        cut = 0
+        for start in turn_starts[1:]:
+            if tokens <= self.target_tokens:
+                break
+            tokens -= self.count_tokens(history[cut:start])
+            cut = start
+
+        if cut:
+            summary = self.summarize(history[:cut], self.summary)
+            if len(summary) > self.summary_max_chars:
+                # Keep the most recent whole lines
+                summary = summary[-self.summary_max_chars:]
+                summary = summary[summary.find("\n") + 1:]
+            self.summary = summary
+            self.dropped_messages += cut
+            history = history[cut:]
+            changed = True
+
+        if changed:
+            self.compactions += 1
+        return history
+
+    def system_prompt(self, system_prompt: str = "") -> str:
+        """System prompt with the pinned summary of dropped turns appended."""
+        if not self.summary:
+            return system_prompt
+        pinned = f"## Earlier in this conversation (summarized):\n{self.summary}"
+        return f"{system_prompt}\n\n{pinned}" if system_prompt else pinned
+
+    def reset(self) -> None:
+        """Forget the pinned summary (conversation cleared)."""
+        self.summary = ""
+
+    def _truncate_tool_results(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a message with long tool_result contents cut to a preview."""
+        content = message.get("content")
+        if isinstance(content, str):
+            return message
+
+        blocks = []
+        changed = False
+        for block in content:
+            result = block.get("content") if isinstance(block, dict) and block.get("type") == "tool_result" else None
+            if (
+                isinstance(result, str)
+                and len(result) > self.tool_result_max_chars
+                and not TRUNCATED_SUFFIX.search(result)
+            ):
+                omitted = len(result) - self.tool_result_max_chars
+                block = {
+                    **block,
+                    "content": f"{result[:self.tool_result_max_chars]}\n... [truncated {omitted} chars]"
+                }
+                changed = True
+            blocks.append(block)
+        return {**message, "content": blocks} if changed else message
+
+    def _extractive_summary(self, messages: List[Dict[str, Any]], previous: str) -> str:
+        """Summarize dropped turns as one line per request, tool set and answer."""
+        lines = [previous] if previous else []
+        for message in messages:
+            text = " ".join(message_text(message).split())
+            if message["role"] == "user" and is_turn_start(message):
+                lines.append(f"- User: {text[:300]}")
+            elif message["role"] == "assistant":
+                content = message["content"]
+                tools = [] if isinstance(content, str) else [
+                    _block_field(block, "name") for block in content
+                    if _block_field(block, "type") == "tool_use"
+                ]
+                if tools:
+                    lines.append(f"- Tools used: {', '.join(tools)}")
+                if text:
+                    lines.append(f"- Assistant: {text[:300]}")
+        return "\n".join(lines)
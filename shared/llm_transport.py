@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+LLM Transport - Pluggable Messages API client for agents
+
+Agents reach Claude through one object: client.messages.create() and
+client.messages.stream(). This module picks that object, so BaseAgent,
+AsyncBaseAgent, SuperiorAgentBrain and the FastAPI layers can run against
+either the live API or a deterministic local stand-in:
+    - "anthropic" (default): the Anthropic SDK client
+    - ReplayTransport: replays scripted/recorded responses and tool calls
+      with a configurable latency distribution - for load tests and
+      benchmarks on an offline box
+
+Selecting a transport:
+    agent = VPSMonitorAgent(api_key, transport=ReplayTransport.from_file("replay.json"))
+
+    # Or for a whole process (e.g. a FastAPI app under a load generator)
+    LLM_TRANSPORT=replay:benchmarks/replay/vps_monitor.json uvicorn deploy.brain_api:app
+
+Replay script (JSON):
+    {
+        "latency": {"distribution": "lognormal", "median_ms": 800, "sigma": 0.4,
+                    "per_output_token_ms": 0},
+        "scripts": [
+            {"match": "disk", "turns": [
+                {"content": [{"type": "tool_use", "name": "get_disk_usage", "input": {}}]},
+                {"content": [{"type": "text", "text": "Disk usage is at 41%."}]}
+            ]},
+            {"turns": [{"content": [{"type": "text", "text": "Done."}]}]}
+        ]
+    }
+
+Each request is placed within its turn: the user message that started it
+picks the first script whose "match" it contains (a script without
+"match" is the fallback), and the Nth model call of the turn gets turn N
+(the last turn repeats). Replies depend only on the request, so
+concurrent conversations don't disturb each other. Latency
+draws come from a seeded generator: the same run produces the same set of
+latencies. RecordingClient captures live responses into this format.
+
+Latency distributions: fixed (ms), uniform (min_ms, max_ms), normal
+(mean_ms, stdev_ms), lognormal (median_ms, sigma), empirical (samples_ms).
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+import time
+
+from anthropic import Anthropic, AsyncAnthropic
+from anthropic.types import Message
+
+from shared.history_manager import CHARS_PER_TOKEN, is_turn_start, message_text
+
+
+# Environment variable selecting the process-wide transport
+TRANSPORT_ENV = "LLM_TRANSPORT"
+
+# Transports loaded from LLM_TRANSPORT, shared by every client in the process
+_env_transports: Dict[str, "ReplayTransport"] = {}
+_env_lock = threading.Lock()
+
+
+class LatencyModel:
+    """Seeded latency distribution for replayed model calls."""
+
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "empirical")
+
+    def __init__(self, distribution: str = "fixed", seed: int = 0, per_output_token_ms: float = 0.0, **params: Any):
+        """
+        Initialize the model.
+
+        Args:
+            distribution: fixed, uniform, normal, lognormal or empirical
+            seed: Random seed (same seed, same sequence of latencies)
+            per_output_token_ms: Extra generation time per output token
+            **params: Distribution parameters (ms, min_ms/max_ms, mean_ms/stdev_ms,
+                      median_ms/sigma, samples_ms)
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        if distribution == "empirical" and not params.get("samples_ms"):
+            raise ValueError("Empirical latency needs samples_ms")
+
+        self.distribution = distribution
+        self.per_output_token_ms = per_output_token_ms
+        self.params = params
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec: Optional[Dict[str, Any]]) -> "LatencyModel":
+        """Build from a script's "latency" object (None means no latency)."""
+        if not spec:
+            return cls("fixed", ms=0)
+        return cls(**spec)
+
+    def sample_ms(self, output_tokens: int = 0) -> float:
+        """Draw one call's latency in milliseconds."""
+        p = self.params
+        with self._lock:
+            if self.distribution == "fixed":
+                ms = p.get("ms", 0)
+            elif self.distribution == "uniform":
+                ms = self._random.uniform(p["min_ms"], p["max_ms"])
+            elif self.distribution == "normal":
+                ms = self._random.gauss(p["mean_ms"], p["stdev_ms"])
+            elif self.distribution == "lognormal":
+                ms = self._random.lognormvariate(math.log(p["median_ms"]), p["sigma"])
+            else:
+                ms = self._random.choice(p["samples_ms"])
+        return max(0.0, ms) + output_tokens * self.per_output_token_ms
+
+
+class ReplayTransport:
+    """Deterministic local stand-in for the Messages API."""
+
+    def __init__(self, scripts: List[Dict[str, Any]], latency: Optional[LatencyModel] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            scripts: Conversation scripts ({"match": ..., "turns": [...]})
+            latency: Latency model (default: no latency)
+        """
+        if not scripts:
+            raise ValueError("Replay transport needs at least one script")
+        self.scripts = scripts
+        self.latency = latency or LatencyModel("fixed", ms=0)
+
+        # Load statistics
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, seed: Optional[int] = None) -> "ReplayTransport":
+        """Load a replay script file (seed overrides the file's latency seed)."""
+        with open(path, "r") as f:
+            config = json.load(f)
+        latency_spec = dict(config.get("latency") or {})
+        if seed is not None:
+            latency_spec["seed"] = seed
+        latency = LatencyModel.from_spec(latency_spec) if latency_spec else None
+        return cls(config["scripts"], latency)
+
+    def client(self) -> "ReplayClient":
+        """Synchronous client (stand-in for Anthropic)."""
+        return ReplayClient(self)
+
+    def async_client(self) -> "AsyncReplayClient":
+        """Asynchronous client (stand-in for AsyncAnthropic)."""
+        return AsyncReplayClient(self)
+
+    def respond(self, params: Dict[str, Any]) -> Tuple[Message, float]:
+        """
+        Build the reply to a request.
+
+        Returns:
+            (response message, latency in seconds to simulate)
+        """
+        opening, step = current_turn(params.get("messages", []))
+        turns = self._script_for(opening)["turns"]
+        turn_index = min(step, len(turns) - 1)
+        turn = turns[turn_index]
+
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+
+        content = []
+        for block_index, block in enumerate(turn.get("content", [])):
+            if block.get("type") == "tool_use" and "id" not in block:
+                block = {**block, "id": f"toolu_replay_{turn_index}_{block_index}"}
+            content.append(block)
+
+        usage = turn.get("usage") or {
+            "input_tokens": _estimate_request_tokens(params),
+            "output_tokens": max(1, len(json.dumps(content)) // CHARS_PER_TOKEN),
+        }
+        stop_reason = turn.get("stop_reason") or (
+            "tool_use" if any(block.get("type") == "tool_use" for block in content) else "end_turn"
+        )
+
+        message = Message.model_validate({
+            "id": f"msg_replay_{call_number}",
+            "type": "message",
+            "role": "assistant",
+            "model": params.get("model", "replay"),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": usage,
+        })
+        return message, self.latency.sample_ms(usage["output_tokens"]) / 1000
+
+    def _script_for(self, opening: str) -> Dict[str, Any]:
+        """First script matching the user message that started the turn."""
+        opening = opening.lower()
+        fallback = None
+        for script in self.scripts:
+            match = script.get("match")
+            if match is None:
+                fallback = fallback or script
+            elif match.lower() in opening:
+                return script
+        return fallback or self.scripts[-1]
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+def current_turn(messages: List[Dict[str, Any]]) -> Tuple[str, int]:
+    """
+    Locate a request within its turn.
+
+    Returns:
+        (text of the user message that started the turn,
+         assistant messages since then - 0 for the first model call)
+    """
+    for index in range(len(messages) - 1, -1, -1):
+        if is_turn_start(messages[index]):
+            later = messages[index + 1:]
+            return message_text(messages[index]), sum(1 for m in later if m.get("role") == "assistant")
+    return "", 0
+
+
+def _estimate_request_tokens(params: Dict[str, Any]) -> int:
+    """Rough input token count of a request."""
+    payload = {key: params.get(key) for key in ("system", "tools", "messages")}
+    return max(1, len(json.dumps(payload, default=str)) // CHARS_PER_TOKEN)
+
+
+def _stream_events(message: Message) -> Iterator[SimpleNamespace]:
+    """The MessageStream events agents consume: text deltas and block stops."""
+    for index, block in enumerate(message.content):
+        if block.type == "text":
+            for word in block.text.split(" "):
+                yield SimpleNamespace(type="text", text=word)
+        yield SimpleNamespace(type="content_block_stop", index=index, content_block=block)
+    yield SimpleNamespace(type="message_stop", message=message)
+
+
+class _ReplayStream:
+    """Stand-in for the SDK's MessageStream context manager."""
+
+    def __init__(self, transport: ReplayTransport, params: Dict[str, Any]):
+        self.transport = transport
+        self.params = params
+        self.message: Optional[Message] = None
+
+    def __enter__(self) -> "_ReplayStream":
+        self.transport._enter()
+        self.message, delay = self.transport.respond(self.params)
+        time.sleep(delay)
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        self.transport._exit()
+        return False
+
+    def __iter__(self) -> Iterator[SimpleNamespace]:
+        return _stream_events(self.message)
+
+    def get_final_message(self) -> Message:
+        return self.message
+
+
+class _AsyncReplayStream(_ReplayStream):
+    """Stand-in for the SDK's AsyncMessageStream context manager."""
+
+    async def __aenter__(self) -> "_AsyncReplayStream":
+        self.transport._enter()
+        self.message, delay = self.transport.respond(self.params)
+        await asyncio.sleep(delay)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> bool:
+        self.transport._exit()
+        return False
+
+    async def __aiter__(self):
+        for event in _stream_events(self.message):
+            yield event
+
+    async def get_final_message(self) -> Message:
+        return self.message
+
+
+class _ReplayMessages:
+    def __init__(self, transport: ReplayTransport):
+        self.transport = transport
+
+    def create(self, **params: Any) -> Message:
+        self.transport._enter()
+        try:
+            message, delay = self.transport.respond(params)
+            time.sleep(delay)
+            return message
+        finally:
+            self.transport._exit()
+
+    def stream(self, **params: Any) -> _ReplayStream:
+        return _ReplayStream(self.transport, params)
+
+
+class _AsyncReplayMessages:
+    def __init__(self, transport: ReplayTransport):
+        self.transport = transport
+
+    async def create(self, **params: Any) -> Message:
+        self.transport._enter()
+        try:
+            message, delay = self.transport.respond(params)
+            await asyncio.sleep(delay)
+            return message
+        finally:
+            self.transport._exit()
+
+    def stream(self, **params: Any) -> _AsyncReplayStream:
+        return _AsyncReplayStream(self.transport, params)
+
+
+class ReplayClient:
+    """Anthropic client stand-in backed by a ReplayTransport."""
+
+    def __init__(self, transport: ReplayTransport):
+        self.transport = transport
+        self.messages = _ReplayMessages(transport)
+
+
+class AsyncReplayClient:
+    """AsyncAnthropic client stand-in backed by a ReplayTransport."""
+
+    def __init__(self, transport: ReplayTransport):
+        self.transport = transport
+        self.messages = _AsyncReplayMessages(transport)
+
+
+class RecordingClient:
+    """
+    Wraps a live client and records its responses as a replay script.
+
+    Usage:
+        agent.anthropic = recorder = RecordingClient(agent.anthropic)
+        agent.chat("Check disk usage")
+        recorder.save("benchmarks/replay/vps_monitor.json")
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.messages = SimpleNamespace(create=self._create, stream=self._stream)
+        self._conversations: Dict[str, List[Dict[str, Any]]] = {}
+        self._latencies_ms: List[float] = []
+        self._lock = threading.Lock()
+
+    def save(self, path: str) -> None:
+        """Write recorded conversations (and their latencies) as a replay script."""
+        with self._lock:
+            config: Dict[str, Any] = {
+                "scripts": [{"match": opening, "turns": turns} for opening, turns in self._conversations.items()]
+            }
+            if self._latencies_ms:
+                config["latency"] = {"distribution": "empirical", "samples_ms": list(self._latencies_ms)}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(config, f, indent=2)
+
+    def _create(self, **params: Any) -> Any:
+        started = time.perf_counter()
+        response = self.client.messages.create(**params)
+        self._record(params, response, started)
+        return response
+
+    @contextmanager
+    def _stream(self, **params: Any) -> Any:
+        started = time.perf_counter()
+        with self.client.messages.stream(**params) as stream:
+            yield stream
+            self._record(params, stream.get_final_message(), started)
+
+    def _record(self, params: Dict[str, Any], response: Any, started: float) -> None:
+        opening, turn_index = current_turn(params.get("messages", []))
+        turn = {
+            "content": [block.model_dump(exclude_none=True) for block in response.content],
+            "stop_reason": response.stop_reason,
+            "usage": {
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+            },
+        }
+        with self._lock:
+            turns = self._conversations.setdefault(opening, [])
+            if turn_index < len(turns):
+                turns[turn_index] = turn
+            else:
+                turns.append(turn)
+            self._latencies_ms.append((time.perf_counter() - started) * 1000)
+
+
+def transport_from_env() -> Optional[ReplayTransport]:
+    """The transport named by LLM_TRANSPORT ("anthropic" or "replay:<script.json>")."""
+    spec = os.environ.get(TRANSPORT_ENV, "anthropic")
+    if spec == "anthropic":
+        return None
+    kind, _, path = spec.partition(":")
+    if kind != "replay" or not path:
+        raise ValueError(f"{TRANSPORT_ENV} must be 'anthropic' or 'replay:<script.json>', got {spec!r}")
+    with _env_lock:
+        if spec not in _env_transports:
+            _env_transports[spec] = ReplayTransport.from_file(path)
+        return _env_transports[spec]
+
+
+def create_client(api_key: Optional[str], transport: Optional[ReplayTransport] = None) -> Any:
+    """Messages API client: the transport's stand-in if given (or set by LLM_TRANSPORT), else Anthropic."""
+    transport = transport or transport_from_env()
+    if transport is not None:
+        return transport.client()
+    return Anthropic(api_key=api_key)
+
+
+def create_async_client(api_key: Optional[str], transport: Optional[ReplayTransport] = None) -> Any:
+    """Async counterpart of create_client()."""
+    transport = transport or transport_from_env()
+    if transport is not None:
+        return transport.async_client()
+    return AsyncAnthropic(api_key=api_key)
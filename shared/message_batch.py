@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Message Batch - Bulk single-shot requests through the Message Batches API
+
+Backfills (a docstring or a test suite for each of hundreds of functions)
+are many independent single-shot requests. Sending them one by one keeps a
+worker blocked per request at full price; the Message Batches API takes
+them all at once, processes them asynchronously (usually well under an
+hour) at half the cost, and returns every result together.
+
+MessageBatch collects requests, submits them (split into API-sized
+batches), polls until processing ends and maps each result back to the
+handle returned by add():
+
+    batch = agent.message_batch()
+    handles = [batch.add(params) for params in all_params]
+    batch.run()                      # submit + poll (blocking)
+
+    for handle in handles:
+        if handle.ok:
+            print(handle.message.content[0].text)
+        else:
+            print(handle.error)
+
+Works with any client exposing messages.batches.create / retrieve /
+results (the Anthropic SDK, or a stub in tests).
+"""
+
+from typing import Any, Dict, List, Optional
+import time
+
+
+# Requests per batch accepted by the API
+MAX_BATCH_REQUESTS = 100000
+
+
+class BatchHandle:
+    """Result slot for one request in a MessageBatch."""
+
+    def __init__(self, custom_id: str, params: Dict[str, Any]):
+        self.custom_id = custom_id
+        self.params = params
+        self.status: str = "pending"  # pending, succeeded, errored, canceled, expired
+        self.message: Any = None
+        self.error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True once the request has succeeded."""
+        return self.status == "succeeded"
+
+    @property
+    def text(self) -> str:
+        """Concatenated text blocks of the response ("" unless succeeded)."""
+        if not self.ok:
+            return ""
+        return "".join(block.text for block in self.message.content if block.type == "text")
+
+
+class MessageBatch:
+    """Collects Messages API requests and runs them as one or more batches."""
+
+    def __init__(self, client: Any, poll_interval: float = 30.0, timeout: Optional[float] = None):
+        """
+        Initialize the batch.
+
+        Args:
+            client: Anthropic client (uses client.messages.batches)
+            poll_interval: Seconds between status checks (default: 30)
+            timeout: Give up waiting after this many seconds (default: no limit;
+                     the API expires unfinished requests after 24 hours)
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.handles: List[BatchHandle] = []
+        self.batch_ids: List[str] = []
+
+    def add(self, params: Dict[str, Any]) -> BatchHandle:
+        """
+        Queue a request.
+
+        Args:
+            params: messages.create() keyword arguments (model, max_tokens, messages, ...)
+
+        Returns:
+            Handle that receives the result when the batch has run
+        """
+        if self.batch_ids:
+            raise RuntimeError("Batch already submitted")
+        handle = BatchHandle(f"req-{len(self.handles)}", params)
+        self.handles.append(handle)
+        return handle
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def run(self) -> List[BatchHandle]:
+        """Submit, wait for processing to end and collect results."""
+        self.submit()
+        self.wait()
+        return self.handles
+
+    def submit(self) -> List[str]:
+        """
+        Submit queued requests.
+
+        Returns:
+            IDs of the created batches
+        """
+        if self.batch_ids:
+            raise RuntimeError("Batch already submitted")
+
+        for start in range(0, len(self.handles), MAX_BATCH_REQUESTS):
+            chunk = self.handles[start:start + MAX_BATCH_REQUESTS]
+            batch = self.client.messages.batches.create(requests=[
+                {"custom_id": handle.custom_id, "params": handle.params}
+                for handle in chunk
+            ])
+            self.batch_ids.append(batch.id)
+        return self.batch_ids
+
+    def wait(self) -> List[BatchHandle]:
+        """Poll until every batch has ended, then collect results."""
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        by_id = {handle.custom_id: handle for handle in self.handles}
+
+        pending = list(self.batch_ids)
+        while pending:
+            still_running = []
+            for batch_id in pending:
+                if self.client.messages.batches.retrieve(batch_id).processing_status == "ended":
+                    self._collect(batch_id, by_id)
+                else:
+                    still_running.append(batch_id)
+            pending = still_running
+
+            if pending:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Message batches still processing: {', '.join(pending)}")
+                time.sleep(self.poll_interval)
+
+        return self.handles
+
+    def _collect(self, batch_id: str, by_id: Dict[str, BatchHandle]) -> None:
+        """Map an ended batch's results onto their handles."""
+        for entry in self.client.messages.batches.results(batch_id):
+            handle = by_id.get(entry.custom_id)
+            if handle is None:
+                continue
+            result = entry.result
+            handle.status = result.type
+            if result.type == "succeeded":
+                handle.message = result.message
+            elif result.type == "errored":
+                error = getattr(result.error, "error", result.error)
+                handle.error = getattr(error, "message", None) or str(error)
+            else:
+                handle.error = f"Request {result.type}"
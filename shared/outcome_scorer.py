@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Outcome Scorer - Route toward agents that succeed, and answer fast
+
+MetaLearner records every agent outcome (success, execution time) but
+routing used to rank on keyword count alone. OutcomeScorer blends routing
+confidence with each agent's recent record for the task type:
+
+    score = confidence × ((1 - outcome_weight) + outcome_weight × outcome)
+    outcome = reliability × latency_scale / (latency_scale + p50_ms)
+
+where reliability is the success rate smoothed toward prior_success_rate
+(so three lucky runs don't beat three hundred good ones) and p50_ms the
+median execution time (prior_p50_ms when unknown). Stats for (agent, task
+type) are used when the agent has enough of them, else its stats across
+all task types, else the priors.
+Equal scores go to the more reliable, then the faster agent.
+
+Stats are held in an in-memory snapshot refreshed by a background thread;
+scoring a route never queries the database. A failed refresh keeps the
+previous snapshot.
+
+Usage:
+    from shared.outcome_scorer import OutcomeScorer
+
+    scorer = OutcomeScorer(meta_learner.get_routing_stats)
+    scorer.start_refreshing(interval=300)
+    ranked = scorer.rank(matches, task_type="query_response")
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+
+
+StatsLoader = Callable[[], Iterable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class OutcomeStats:
+    """Recent outcomes of one agent (for one task type, or all of them)"""
+    attempts: int
+    successes: int
+    p50_ms: Optional[float] = None
+
+
+class OutcomeScorer:
+    """Blends routing confidence with agent success rate and median latency."""
+
+    def __init__(
+        self,
+        load_stats: StatsLoader,
+        outcome_weight: float = 0.5,
+        prior_success_rate: float = 0.8,
+        prior_weight: float = 5.0,
+        latency_scale_ms: float = 10000.0,
+        prior_p50_ms: float = 5000.0,
+        min_attempts: int = 3
+    ):
+        """
+        Initialize the scorer and load the first snapshot.
+
+        Args:
+            load_stats: Returns rows with agent_id, task_type (None for the
+                        agent's overall row), attempts, successes and p50_ms
+            outcome_weight: Share of the score decided by outcomes (0-1)
+            prior_success_rate: Success rate assumed for agents without history
+            prior_weight: Attempts' worth of weight given to the prior
+            latency_scale_ms: Median latency that halves the latency factor
+            prior_p50_ms: Median latency assumed for agents without timings
+            min_attempts: Attempts needed before task-type stats are trusted
+        """
+        self.load_stats = load_stats
+        self.outcome_weight = outcome_weight
+        self.prior_success_rate = prior_success_rate
+        self.prior_weight = prior_weight
+        self.latency_scale_ms = latency_scale_ms
+        self.prior_p50_ms = prior_p50_ms
+        self.min_attempts = min_attempts
+
+        self._snapshot: Dict[Tuple[str, Optional[str]], OutcomeStats] = {}
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self.refresh()
+
+    @property
+    def snapshot(self) -> Dict[Tuple[str, Optional[str]], OutcomeStats]:
+        """(agent id, task type or None) → stats, as of the last refresh."""
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        """
+        Reload stats into a new snapshot.
+
+        Returns:
+            True if the snapshot was replaced
+        """
+        try:
+            rows = list(self.load_stats())
+        except Exception as e:
+            print(f"Warning: Could not refresh agent outcome stats: {e}")
+            return False
+
+        self._snapshot = {
+            (row["agent_id"], row.get("task_type")): OutcomeStats(
+                attempts=int(row["attempts"]),
+                successes=int(row["successes"] or 0),
+                p50_ms=float(row["p50_ms"]) if row.get("p50_ms") is not None else None
+            )
+            for row in rows
+        }
+        return True
+
+    def start_refreshing(self, interval: float = 300.0) -> None:
+        """Refresh the snapshot every interval seconds on a daemon thread."""
+        if self._refresher is not None:
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(interval,), name="outcome-stats-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_refreshing(self) -> None:
+        """Stop the refresh thread."""
+        if self._refresher is None:
+            return
+        self._stop.set()
+        self._refresher.join()
+        self._refresher = None
+
+    def stats_for(self, agent_id: str, task_type: Optional[str] = None) -> Optional[OutcomeStats]:
+        """Stats for an agent on a task type, falling back to all task types."""
+        snapshot = self._snapshot
+        stats = snapshot.get((agent_id, task_type)) if task_type is not None else None
+        if stats is None or stats.attempts < self.min_attempts:
+            stats = snapshot.get((agent_id, None)) or stats
+        return stats
+
+    def reliability(self, stats: Optional[OutcomeStats]) -> float:
+        """Success rate smoothed toward the prior."""
+        if stats is None:
+            return self.prior_success_rate
+        return (stats.successes + self.prior_success_rate * self.prior_weight) / (stats.attempts + self.prior_weight)
+
+    def score(self, confidence: float, agent_id: str, task_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Blend a routing confidence with the agent's outcomes.
+
+        Returns:
+            score, success_rate (smoothed) and p50_ms (None if unknown)
+        """
+        stats = self.stats_for(agent_id, task_type)
+        reliability = self.reliability(stats)
+        p50_ms = stats.p50_ms if stats else None
+
+        latency = p50_ms if p50_ms is not None else self.prior_p50_ms
+        outcome = reliability * self.latency_scale_ms / (self.latency_scale_ms + latency)
+
+        return {
+            "score": confidence * ((1 - self.outcome_weight) + self.outcome_weight * outcome),
+            "success_rate": reliability,
+            "p50_ms": p50_ms
+        }
+
+    def rank(self, matches: List[Dict[str, Any]], task_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Re-rank routing matches by outcome-weighted score.
+
+        Args:
+            matches: Orchestrator matches (agent_id, confidence, ...), best first
+            task_type: Task type the outcomes were recorded under
+
+        Returns:
+            The matches with score, success_rate and p50_ms added, best first;
+            fully equal matches keep their order
+        """
+        for match in matches:
+            scored = self.score(match["confidence"], match["agent_id"], task_type)
+            match["score"] = round(scored["score"], 4)
+            match["success_rate"] = round(scored["success_rate"], 3)
+            match["p50_ms"] = scored["p50_ms"]
+
+        return sorted(matches, key=lambda m: (
+            -m["score"],
+            -m["success_rate"],
+            m["p50_ms"] if m["p50_ms"] is not None else self.prior_p50_ms
+        ))
+
+    def _refresh_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.refresh()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Multi-Pattern Scanner
+
+Compiles many regex rules into one alternation with a named group per
+pattern, so a file is scanned once no matter how many rules exist:
+    - One finditer over the whole file instead of one search per pattern
+    - Line numbers from a precomputed line-offset table (bisect, O(log n))
+    - Every pattern is a lookahead, so overlapping matches of different
+      rules are all reported, exactly like scanning with each pattern alone
+
+Rules come in two flavours:
+    - Content rules behave like re.finditer(pattern, content): each
+      non-overlapping match is reported, and matches may span lines
+    - Line rules behave like re.search(pattern, line) on every line: at
+      most one match per pattern per line, never crossing a line break
+
+Architecture:
+    Rules → one compiled alternation → finditer(content) → findings + line numbers
+
+Usage:
+    from shared.pattern_scanner import PatternScanner
+
+    scanner = PatternScanner()
+    scanner.add_rule("todo", [r"#\\s*TODO[:\\s]+(.+)"], per_line=True)
+    scanner.add_rule("dangerous_eval", [r"eval\\("])
+
+    for finding in scanner.scan(content):
+        print(finding["rule"], finding["line"], finding["groups"])
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+import re
+
+
+def line_offsets(content: str) -> List[int]:
+    """Start offset of every line in content (first entry is always 0)."""
+    return [0] + list(accumulate(len(line) + 1 for line in content.split('\n')))[:-1]
+
+
+def line_number(offsets: List[int], pos: int) -> int:
+    """1-based line number containing character offset pos."""
+    return bisect_right(offsets, pos)
+
+
+class PatternScanner:
+    """One-pass scanner over a set of named regex rules."""
+
+    def __init__(self):
+        # (rule name, pattern source, per_line) in registration order
+        self._patterns: List[Tuple[str, str, bool]] = []
+        self._combined: Optional[Pattern] = None
+        self._compiled: List[Pattern] = []
+        self._group_ids: List[int] = []
+
+    def add_rule(self, rule: str, patterns: Iterable[str], per_line: bool = False) -> "PatternScanner":
+        """Register patterns under a rule name.
+
+        Args:
+            rule: Name reported with each finding (e.g. "sql_injection")
+            patterns: Regex sources; ^ and $ match at line boundaries
+            per_line: Match each line separately (re.search per line semantics)
+
+        Returns:
+            self, for chaining
+        """
+        for pattern in patterns:
+            self._patterns.append((rule, pattern, per_line))
+        self._combined = None
+        return self
+
+    @property
+    def rules(self) -> List[Tuple[str, str, bool]]:
+        """Registered (rule, pattern, per_line) entries, for rule-set versioning."""
+        return list(self._patterns)
+
+    def compile(self) -> Pattern:
+        """Build the combined alternation (done lazily by scan())."""
+        self._compiled = [re.compile(pattern, re.MULTILINE) for _, pattern, _ in self._patterns]
+
+        # Each pattern sits in its own capturing lookahead (?=(?P<pN>...)), made
+        # optional so all of them are tried at every position. The leading
+        # lookahead of the plain alternation skips positions where none match.
+        # Pattern-internal groups are renumbered here, so they are read back
+        # from the individually compiled pattern.
+        scoped = [f"(?m:{pattern})" for _, pattern, _ in self._patterns]
+        prefilter = "(?=" + "|".join(scoped) + ")" if scoped else "(?!)"
+        captures = "".join(f"(?:(?=(?P<p{i}>{source}))|)" for i, source in enumerate(scoped))
+
+        self._combined = re.compile(prefilter + captures)
+        self._group_ids = [self._combined.groupindex[f"p{i}"] for i in range(len(scoped))]
+        return self._combined
+
+    def scan(self, content: str) -> List[Dict[str, Any]]:
+        """Scan content once for every registered pattern.
+
+        Returns:
+            Findings in order of position, each
+            {rule, pattern, line, start, end, groups, text}, where pattern is
+            the registration index and text is the stripped source line
+        """
+        combined = self._combined or self.compile()
+        offsets = line_offsets(content)
+        lines = content.split('\n')
+
+        findings = []
+        next_start = [0] * len(self._patterns)  # content rules: non-overlapping matches
+        seen_lines = set()                       # line rules: (pattern, line) already searched
+
+        for hit in combined.finditer(content):
+            pos = hit.start()
+            line_num = line_number(offsets, pos)
+
+            for index, group in enumerate(self._group_ids):
+                if hit.start(group) < 0:
+                    continue  # Pattern doesn't match here
+                rule, _, per_line = self._patterns[index]
+
+                if per_line:
+                    if (index, line_num) in seen_lines:
+                        continue
+                    seen_lines.add((index, line_num))
+
+                    # Re-run within the line so matches never cross a line break
+                    line_start = offsets[line_num - 1]
+                    match = self._compiled[index].search(
+                        content, line_start, line_start + len(lines[line_num - 1])
+                    )
+                    if not match:
+                        continue
+                else:
+                    if pos < next_start[index]:
+                        continue
+                    match = self._compiled[index].match(content, pos)
+                    next_start[index] = max(match.end(), pos + 1)
+
+                findings.append({
+                    "rule": rule,
+                    "pattern": index,
+                    "line": line_num,
+                    "start": match.start(),
+                    "end": match.end(),
+                    "groups": list(match.groups()),
+                    "text": lines[line_num - 1].strip()
+                })
+
+        return findings
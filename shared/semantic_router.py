@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Semantic Router - Embedding similarity between tasks and agents
+
+Keyword routing misses paraphrases ("who builds our fibre trenches?" names
+no contractor trigger), which sent such tasks to the expensive universal
+fallback. SemanticRouter is the second routing tier:
+    - Each agent's name, description and capabilities are embedded once;
+      vectors are cached on disk keyed by embedder and text, so restarts
+      and registry reloads only embed agents whose text changed
+    - A task is embedded and compared with every agent in one numpy matmul
+      over the L2-normalized matrix (cosine similarity)
+
+Embedders turn a batch of texts into vectors (create_embedder()):
+    - "local": sentence-transformers (all-MiniLM-L6-v2) if installed,
+      else "hashing"
+    - "hashing": dependency-free hashed words + character trigrams; matches
+      shared vocabulary and word forms, not synonyms
+    - "voyage" / "openai": EmbeddingService from memory/vector_memory.py
+
+Usage:
+    from shared.semantic_router import SemanticRouter, create_embedder
+
+    router = SemanticRouter(create_embedder("local"), cache_path="agent_vectors.json")
+    router.fit(registry["agents"])
+    router.rank("who builds our fibre trenches?")   # [(agent_pos, similarity), ...]
+
+rank() can also be given a matrix from agent_matrix(), to rank against a
+specific list of agents while fit() may be swapping the router's own.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import re
+import threading
+import zlib
+
+from shared.state_store import JSONStateStore
+
+
+Embedder = Callable[[List[str]], List[List[float]]]
+
+# Words too common in agent descriptions to say anything about the agent
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from how i in is it me my of on or our show "
+    "that the this to us we what which who with you your".split()
+)
+
+
+class HashingEmbedder:
+    """Signed feature hashing of words and character trigrams (no model needed)."""
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.model_id = f"hashing-{dim}"
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            if word in STOPWORDS:
+                continue
+            padded = f"<{word}>"
+            features = [word] + [padded[i:i + 3] for i in range(len(padded) - 2)]
+            for feature in features:
+                h = zlib.crc32(feature.encode())
+                vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return vector
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.model_id = f"sentence-transformers/{model_name}"
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts).tolist()
+
+
+class EmbeddingServiceEmbedder:
+    """Hosted embeddings through memory/vector_memory.py's EmbeddingService."""
+
+    def __init__(self, provider: str):
+        from memory.vector_memory import EmbeddingService
+
+        self.service = EmbeddingService(provider)
+        self.model_id = f"{provider}/{getattr(self.service, 'embed_model', provider)}"
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        return [self.service.embed(text) for text in texts]
+
+
+def create_embedder(name: str = "local") -> Embedder:
+    """
+    Build an embedder by name.
+
+    Args:
+        name: 'local', 'hashing', 'voyage' or 'openai'
+
+    Raises:
+        ValueError: Unknown embedder name
+    """
+    if name == "local":
+        try:
+            return SentenceTransformerEmbedder()
+        except ImportError:
+            return HashingEmbedder()
+    if name == "hashing":
+        return HashingEmbedder()
+    if name in ("voyage", "openai"):
+        return EmbeddingServiceEmbedder(name)
+    raise ValueError(f"Unknown embedder: {name}")
+
+
+def agent_text(agent: Dict[str, Any]) -> str:
+    """Text embedded for an agent: name, description and capabilities."""
+    parts = [agent.get("name", ""), agent.get("description", "")]
+    for category, items in agent.get("capabilities", {}).items():
+        parts.append(category.replace("_", " "))
+        parts.extend(items)
+    return "\n".join(part for part in parts if part)
+
+
+class SemanticRouter:
+    """Ranks agents by cosine similarity between task and agent embeddings."""
+
+    def __init__(self, embedder: Embedder, cache_path: Optional[str] = None):
+        """
+        Initialize the router.
+
+        Args:
+            embedder: Callable embedding a batch of texts; its model_id
+                      attribute (if any) separates cached vectors per model
+            cache_path: JSON file caching agent vectors (None: memory only)
+        """
+        import numpy as np
+
+        self._np = np
+        self.embedder = embedder
+        self.model_id = getattr(embedder, "model_id", type(embedder).__name__)
+        self.store = JSONStateStore(cache_path, save_delay=0, indent=None) if cache_path else None
+        self._vectors: Dict[str, List[float]] = (self.store.load() or {}) if self.store else {}
+        self._matrix = np.zeros((0, 0))
+        self._lock = threading.Lock()
+
+    def fit(self, agents: Sequence[Dict[str, Any]]) -> int:
+        """
+        Build the agent matrix, embedding only agents missing from the cache.
+
+        Args:
+            agents: Registry agent entries (rows follow this order)
+
+        Returns:
+            Number of agents embedded (0 when all were cached)
+        """
+        with self._lock:
+            matrix, keys, missing = self._build_matrix(agents)
+            if missing and self.store:
+                # Drop vectors of agents no longer registered
+                self._vectors = {key: self._vectors[key] for key in keys}
+                self.store.save(self._vectors)
+            self._matrix = matrix
+        return missing
+
+    def agent_matrix(self, agents: Sequence[Dict[str, Any]]):
+        """
+        Normalized matrix for a list of agents, without refitting the router.
+
+        Missing vectors are embedded and cached (and saved with the next fit()).
+        """
+        with self._lock:
+            return self._build_matrix(agents)[0]
+
+    @property
+    def matrix(self):
+        """Normalized agent matrix of the last fit()."""
+        return self._matrix
+
+    def rank(self, text: str, top_k: int = 3, matrix=None) -> List[Tuple[int, float]]:
+        """
+        Most similar agents to a task.
+
+        Args:
+            text: Task description
+            top_k: Number of agents to return
+            matrix: Agent matrix to rank (default: the last fit())
+
+        Returns:
+            (agent position, cosine similarity) pairs, most similar first
+        """
+        np = self._np
+        matrix = self._matrix if matrix is None else matrix
+        if not matrix.size:
+            return []
+
+        query = self._normalize(np.array(self.embedder([text]), dtype=np.float32))[0]
+        scores = matrix @ query
+        top = np.argsort(-scores, kind="stable")[:top_k]
+        return [(int(pos), float(scores[pos])) for pos in top]
+
+    def _build_matrix(self, agents: Sequence[Dict[str, Any]]):
+        """Matrix, cache keys and number embedded for agents (hold the lock)."""
+        np = self._np
+        texts = [agent_text(agent) for agent in agents]
+        keys = [self._cache_key(text) for text in texts]
+
+        missing = [i for i, key in enumerate(keys) if key not in self._vectors]
+        if missing:
+            vectors = self.embedder([texts[i] for i in missing])
+            for i, vector in zip(missing, vectors):
+                self._vectors[keys[i]] = [float(x) for x in vector]
+
+        if not keys:
+            return np.zeros((0, 0)), keys, len(missing)
+        matrix = np.array([self._vectors[key] for key in keys], dtype=np.float32)
+        return self._normalize(matrix), keys, len(missing)
+
+    def _normalize(self, matrix):
+        norms = self._np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / self._np.where(norms == 0, 1, norms)
+
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_id}\n{text}".encode()).hexdigest()
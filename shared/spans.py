@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Agent Spans - Timing and token instrumentation for BaseAgent
+
+BaseAgent emits a Span for every timed step of a conversation:
+    - "model": one Messages API call (latency, token usage, stop reason)
+    - "tool":  one tool invocation (latency, cache hit, error result)
+    - "chat":  one chat()/chat_stream() call (total latency, turns, tokens)
+
+Spans go to the agent's span hooks - plain callables. With no hooks
+registered, agents skip the timing entirely (a single list check per step).
+
+Usage:
+    from metrics.collector import get_collector
+
+    agent = VPSMonitorAgent(...)
+    agent.add_span_hook(get_collector().record_span)
+
+    # Or any callable
+    agent.add_span_hook(lambda span: print(span.kind, span.name, span.duration_ms))
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class Span:
+    """One timed step of an agent conversation"""
+    agent: str
+    kind: str  # model, tool, chat
+    name: str  # model id, tool name, or chat / chat_stream
+    duration_ms: float
+    success: bool = True
+    turn: Optional[int] = None
+    usage: Optional[Dict[str, int]] = None
+    error_type: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def tokens(self) -> int:
+        """Input plus output tokens (cache reads and writes included)."""
+        if not self.usage:
+            return 0
+        return sum(self.usage.values())
+
+
+SpanHook = Callable[[Span], None]
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+State Store - Crash-safe, debounced persistence for agent domain memory
+
+BaseAgent's domain memory used to be rewritten in full, in place, on every
+save: a crash mid-write left a truncated file that the next load silently
+replaced with empty state. State stores fix both problems:
+    - Atomic writes: temp file → fsync → rename, so the file on disk is
+      always either the old state or the new one
+    - Debouncing: schedule() coalesces many changes made within
+      save_delay seconds into a single write
+    - Compact backend: SQLiteStateStore rewrites only the keys that
+      changed, so large journals don't cost a full dump per update
+
+A state file that can't be parsed is moved aside (<file>.corrupt) instead
+of being overwritten. Pending writes are flushed at interpreter exit.
+
+Usage:
+    from shared.state_store import open_state_store
+
+    store = open_state_store("state/agent.json", save_delay=1.0)
+    state = store.load() or {}
+
+    state["last_run"] = "2025-01-01"
+    store.schedule(state, ["last_run"])   # written ~1s later, once
+    store.flush()                         # or now
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+import atexit
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+
+
+# Stores with pending writes to flush at interpreter exit
+_open_stores: "weakref.WeakSet[StateStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        store.flush()
+
+
+class StateStore:
+    """
+    Base class: debouncing and locking. Subclasses implement _read/_write.
+
+    The lock guards the state dict while it is serialized, so callers that
+    mutate state from several threads should hold store.lock too.
+    """
+
+    def __init__(self, path: str, save_delay: float = 1.0):
+        """
+        Initialize the store.
+
+        Args:
+            path: State file path
+            save_delay: Seconds to wait for more changes before writing (0 writes immediately)
+        """
+        self.path = Path(path)
+        self.save_delay = save_delay
+        self.lock = threading.RLock()
+        self.writes = 0
+
+        self._pending_state: Optional[Dict[str, Any]] = None
+        self._pending_keys: Optional[Set[str]] = set()  # None means "everything"
+        self._timer: Optional[threading.Timer] = None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the stored state.
+
+        Returns:
+            State dictionary, or None if nothing is stored (or it was corrupt)
+        """
+        if not self.path.exists():
+            return None
+        return self._read()
+
+    def save(self, state: Dict[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+        """Write state now (cancelling any pending write)."""
+        with self.lock:
+            self._cancel_timer()
+            keys = self._merge_keys(changed)
+            self._pending_state, self._pending_keys = None, set()
+            self._write(state, keys)
+            self.writes += 1
+
+    def schedule(self, state: Dict[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+        """
+        Write state after save_delay, coalescing with other scheduled writes.
+
+        Args:
+            state: The state dictionary (serialized when the write happens)
+            changed: Keys that changed (None = anything may have changed)
+        """
+        if self.save_delay <= 0:
+            self.save(state, changed)
+            return
+
+        with self.lock:
+            self._pending_state = state
+            self._pending_keys = self._merge_keys(changed)
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self._timed_flush)
+                self._timer.daemon = True
+                self._timer.start()
+                _open_stores.add(self)
+
+    def flush(self) -> None:
+        """Write any pending changes now."""
+        with self.lock:
+            if self._pending_state is not None:
+                self.save(self._pending_state, self._pending_keys)
+            self._cancel_timer()
+
+    def _timed_flush(self) -> None:
+        """Timer callback: flush, reporting (not raising) failures."""
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Warning: Could not save state to {self.path}: {e}")
+
+    def _merge_keys(self, changed: Optional[Iterable[str]]) -> Optional[Set[str]]:
+        """Pending changed keys plus new ones (None absorbs everything)."""
+        if changed is None or self._pending_keys is None:
+            return None
+        return self._pending_keys | set(changed)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _write(self, state: Dict[str, Any], changed: Optional[Set[str]]) -> None:
+        raise NotImplementedError
+
+
+class JSONStateStore(StateStore):
+    """Whole-state JSON file, replaced atomically on every write."""
+
+    def __init__(self, path: str, save_delay: float = 1.0, indent: Optional[int] = 2):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file path
+            save_delay: Seconds to wait for more changes before writing
+            indent: JSON indent (None for compact output)
+        """
+        super().__init__(path, save_delay)
+        self.indent = indent
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            corrupt = self.path.with_name(self.path.name + ".corrupt")
+            os.replace(self.path, corrupt)
+            print(f"Warning: Could not load state from {self.path}: {e} (moved to {corrupt})")
+            return None
+
+    def _write(self, state: Dict[str, Any], changed: Optional[Set[str]]) -> None:
+        payload = json.dumps(state, indent=self.indent)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        # Make the rename itself durable
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(self.path.parent, os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+
+class SQLiteStateStore(StateStore):
+    """One row per top-level key; writes touch only the keys that changed."""
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return conn
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT key, value FROM state").fetchall()
+        finally:
+            conn.close()
+        return {key: json.loads(value) for key, value in rows} if rows else None
+
+    def _write(self, state: Dict[str, Any], changed: Optional[Set[str]]) -> None:
+        keys = set(state) if changed is None else changed
+        upserts = [(key, json.dumps(state[key])) for key in keys if key in state]
+        deletes = [(key,) for key in keys if key not in state]
+
+        conn = self._connect()
+        try:
+            with conn:
+                if changed is None:
+                    conn.execute("DELETE FROM state")
+                conn.executemany("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", upserts)
+                conn.executemany("DELETE FROM state WHERE key = ?", deletes)
+        finally:
+            conn.close()
+
+
+def open_state_store(path: str, save_delay: float = 1.0) -> StateStore:
+    """State store for a path: SQLite for .db/.sqlite files, JSON otherwise."""
+    if Path(path).suffix in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteStateStore(path, save_delay)
+    return JSONStateStore(path, save_delay)
@@ -0,0 +1,159 @@
+"""
+Test Index - Parse test files once, answer "is this tested?" in O(1)
+
+AST-parses every Python file under tests/ into:
+    - Test function names (def test_* / async def test_*)
+    - Symbols the file references (names, attributes, imports)
+
+and answers lookups from in-memory sets instead of re-reading test files:
+    - has_test(test_file, "foo") → True if test_file defines test_foo*
+    - is_referenced("foo")       → True if any test file mentions foo
+
+Entries are keyed by (mtime, size), so an edited test file is re-parsed on
+its next lookup and deleted files drop out on refresh().
+
+Architecture:
+    tests/**/*.py → ast.parse (once per change) → TestIndex → Git Watcher / Test-Gen
+
+Usage:
+    from shared.test_index import TestIndex
+
+    index = TestIndex("tests").refresh()
+
+    if not index.has_test("tests/test_confidence.py", "add_task"):
+        print("add_task() has no test")
+"""
+
+import ast
+import os
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Set, Tuple, Union
+
+
+class TestFileEntry:
+    """Test names and referenced symbols of one parsed test file."""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, stamp: Tuple[int, int], tree: Optional[ast.AST]):
+        """Index a parsed test file.
+
+        Args:
+            stamp: (mtime_ns, size) the file had when parsed
+            tree: Parsed module, or None if the file doesn't parse
+        """
+        self.stamp = stamp
+        self.test_names: Set[str] = set()
+        self.referenced: Set[str] = set()
+
+        if tree is not None:
+            self._collect(tree)
+
+        # Every prefix of every "test_<suffix>", so "def test_foo_error" covers foo
+        self.tested_prefixes: FrozenSet[str] = frozenset(
+            name[5:5 + length]
+            for name in self.test_names
+            for length in range(1, len(name) - 4)
+        )
+
+    def _collect(self, tree: ast.AST) -> None:
+        """Collect test function names and referenced symbols in one walk."""
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if node.name.startswith("test_"):
+                    self.test_names.add(node.name)
+            elif isinstance(node, ast.Name):
+                self.referenced.add(node.id)
+            elif isinstance(node, ast.Attribute):
+                self.referenced.add(node.attr)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                for alias in node.names:
+                    self.referenced.add(alias.name.rsplit(".", 1)[-1])
+
+
+class TestIndex:
+    """In-memory index of test function names and referenced symbols."""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, tests_dir: Union[str, Path] = "tests"):
+        """Initialize an empty index (call refresh() to index every file).
+
+        Args:
+            tests_dir: Directory containing test files
+        """
+        self.tests_dir = Path(tests_dir).resolve()
+        self._entries: Dict[Path, TestFileEntry] = {}
+        self._referenced: Optional[Set[str]] = None  # Union over entries, rebuilt lazily
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of a file, or None if it doesn't exist."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _parse(self, path: Path, stamp: Tuple[int, int]) -> TestFileEntry:
+        """Parse a test file into an index entry."""
+        try:
+            tree = ast.parse(path.read_bytes())
+        except (OSError, SyntaxError, ValueError):
+            tree = None
+
+        entry = TestFileEntry(stamp, tree)
+        self._entries[path] = entry
+        self._referenced = None
+        return entry
+
+    def refresh(self) -> "TestIndex":
+        """Index every test file, re-parsing only files whose mtime or size changed.
+
+        Returns:
+            self, for chaining
+        """
+        current = set()
+
+        for dirpath, _, filenames in os.walk(self.tests_dir):
+            for name in filenames:
+                if name.endswith(".py"):
+                    path = Path(dirpath) / name
+                    current.add(path)
+                    self.entry(path)
+
+        for path in set(self._entries) - current:
+            del self._entries[path]
+            self._referenced = None
+
+        return self
+
+    def entry(self, test_file: Union[str, Path]) -> Optional[TestFileEntry]:
+        """Get the index entry for a test file, re-parsing it if it changed.
+
+        Returns:
+            TestFileEntry, or None if the file doesn't exist
+        """
+        path = Path(test_file).resolve()
+        stamp = self._stamp(path)
+
+        if stamp is None:
+            if self._entries.pop(path, None) is not None:
+                self._referenced = None
+            return None
+
+        entry = self._entries.get(path)
+        if entry is None or entry.stamp != stamp:
+            entry = self._parse(path, stamp)
+        return entry
+
+    def has_test(self, test_file: Union[str, Path], func_name: str) -> bool:
+        """Whether test_file defines a test named test_<func_name>*."""
+        entry = self.entry(test_file)
+        return entry is not None and func_name in entry.tested_prefixes
+
+    def is_referenced(self, name: str) -> bool:
+        """Whether any indexed test file references name."""
+        if self._referenced is None:
+            self._referenced = set().union(*(e.referenced for e in self._entries.values()))
+        return name in self._referenced
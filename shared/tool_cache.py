@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tool Result Cache - Memoized results for read-only agent tools
+
+Claude asks for the same schema lookups over and over (list_tables,
+describe_table, get_system_info...), and every request is a round trip to
+a database, API or SSH host. This cache memoizes tool results keyed by
+(tool name, canonical input JSON):
+    - Each tool has its own TTL and LRU size bound
+    - Persistent tools are also stored in SQLite and survive restarts
+    - Mutating tools invalidate the cached results of related tools
+
+Policies are declared next to the tool definition in define_tools():
+
+    {
+        "name": "describe_table",
+        "description": "...",
+        "input_schema": {...},
+        "cache": {"ttl": 3600, "max_entries": 256, "persist": True}
+    },
+    {
+        "name": "execute_update",
+        ...
+        "invalidates": ["describe_table", "get_table_stats"]
+    }
+
+BaseAgent strips "cache" and "invalidates" before sending tools to Claude.
+
+Architecture:
+    execute_tool() → LRU (memory) → SQLite (shared/tool_cache.db, persist only)
+
+Usage:
+    from shared.tool_cache import ToolResultCache
+
+    cache = ToolResultCache(namespace="NeonAgent")
+    policy = {"ttl": 3600, "persist": True}
+
+    result = cache.get("list_tables", {}, policy)
+    if result is None:
+        result = run_tool("list_tables", {})
+        cache.put("list_tables", {}, result, policy)
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+import json
+import sqlite3
+import threading
+import time
+
+
+# Keys of a tool definition that configure caching (not sent to the API)
+TOOL_POLICY_KEYS = ("cache", "invalidates")
+
+# Default LRU bound per tool
+DEFAULT_MAX_ENTRIES = 128
+
+
+def canonical_input(tool_input: Dict[str, Any]) -> str:
+    """Canonical JSON of a tool input (key order and spacing don't matter)."""
+    return json.dumps(tool_input, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def is_error_result(result: str) -> bool:
+    """True if a tool result is a JSON object with an "error" key (never cached)."""
+    try:
+        payload = json.loads(result)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(payload, dict) and "error" in payload
+
+
+class ToolResultCache:
+    """Per-tool TTL + LRU cache of tool results, optionally persisted to SQLite."""
+
+    def __init__(self, namespace: str, db_path: Optional[str] = "shared/tool_cache.db"):
+        """
+        Initialize the cache.
+
+        Args:
+            namespace: Separates agents (and data sources) sharing one database
+            db_path: SQLite path for persistent tools (None keeps everything in memory)
+        """
+        self.namespace = namespace
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+
+        # tool → OrderedDict(input key → (expires_at, result)), oldest first
+        self._entries: Dict[str, "OrderedDict[str, Tuple[float, str]]"] = {}
+        self._lock = threading.Lock()
+        self._db_ready = False
+
+    def get(self, tool_name: str, tool_input: Dict[str, Any], policy: Dict[str, Any]) -> Optional[str]:
+        """
+        Look up a cached result.
+
+        Args:
+            tool_name: Tool name
+            tool_input: Tool parameters
+            policy: Tool cache policy (ttl, max_entries, persist)
+
+        Returns:
+            Cached result string, or None on a miss
+        """
+        key = canonical_input(tool_input)
+        now = time.time()
+
+        with self._lock:
+            entries = self._entries.get(tool_name)
+            entry = entries.get(key) if entries else None
+            if entry and entry[0] > now:
+                entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        if policy.get("persist") and self.db_path:
+            row = self._load(tool_name, key, now)
+            if row:
+                self._remember(tool_name, key, row, policy)
+                with self._lock:
+                    self.hits += 1
+                return row[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, tool_name: str, tool_input: Dict[str, Any], result: str, policy: Dict[str, Any]) -> None:
+        """Store a tool result for policy["ttl"] seconds."""
+        key = canonical_input(tool_input)
+        entry = (time.time() + policy["ttl"], result)
+        self._remember(tool_name, key, entry, policy)
+
+        if policy.get("persist") and self.db_path:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO tool_results "
+                        "(namespace, tool, input_key, result, expires_at) VALUES (?, ?, ?, ?, ?)",
+                        (self.namespace, tool_name, key, result, entry[0])
+                    )
+            finally:
+                conn.close()
+
+    def invalidate(self, tool_names: Iterable[str]) -> None:
+        """Drop every cached result of the given tools (memory and SQLite)."""
+        tool_names = list(tool_names)
+        with self._lock:
+            for tool_name in tool_names:
+                self._entries.pop(tool_name, None)
+
+        if self.db_path and tool_names:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM tool_results WHERE namespace = ? AND tool = ?",
+                        [(self.namespace, tool_name) for tool_name in tool_names]
+                    )
+            finally:
+                conn.close()
+
+    def _remember(self, tool_name: str, key: str, entry: Tuple[float, str], policy: Dict[str, Any]) -> None:
+        """Insert into the in-memory LRU, evicting the least recently used."""
+        with self._lock:
+            entries = self._entries.setdefault(tool_name, OrderedDict())
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > policy.get("max_entries", DEFAULT_MAX_ENTRIES):
+                entries.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database (created on first use)."""
+        if not self._db_ready:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tool_results (
+                    namespace TEXT NOT NULL,
+                    tool TEXT NOT NULL,
+                    input_key TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, tool, input_key)
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+            self._db_ready = True
+        return conn
+
+    def _load(self, tool_name: str, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """Read an unexpired persisted entry."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT expires_at, result FROM tool_results "
+                "WHERE namespace = ? AND tool = ? AND input_key = ? AND expires_at > ?",
+                (self.namespace, tool_name, key, now)
+            ).fetchone()
+        finally:
+            conn.close()
+        return tuple(row) if row else None
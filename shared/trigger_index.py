@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Trigger Index - Compiled keyword routing for the agent orchestrator
+
+Routing used to check every trigger of every agent with a substring test:
+O(agents × triggers × text) per request, and "cpu" matched inside any
+word containing it. TriggerIndex compiles all triggers once into a token
+trie and finds every hit in a single pass over the task's words:
+    - Word-bounded: triggers match whole words ("ssh" doesn't match "sshd")
+    - Plural-insensitive: words are reduced to a singular form on both
+      sides, so "servers" matches "server" and "task" matches "tasks"
+    - Multi-word triggers ("health check") match as a phrase
+    - Case-insensitive; punctuation separates words on both sides
+    - Cost grows with the task length, not with the number of triggers
+
+Usage:
+    from shared.trigger_index import TriggerIndex
+
+    index = TriggerIndex(registry["agents"])
+    index.match("What's the CPU usage on the VPS?")
+    # → {0: [0, 3]}  (agent position → positions of its matched triggers)
+"""
+
+from typing import Any, Dict, List, Sequence
+import re
+
+
+# Word characters; everything else separates words
+_WORD = re.compile(r"\w+")
+
+# Trie node key holding the (agent position, trigger position) pairs ending there
+_END = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a text."""
+    return _WORD.findall(text.lower())
+
+
+def singular(word: str) -> str:
+    """
+    Strip a plural suffix ("queries" → "query", "servers" → "server").
+
+    Deliberately crude - it only has to map a trigger and the words of a
+    task to the same form, so it is applied to both.
+    """
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """Words of a text as matched by the index."""
+    return [singular(word) for word in tokenize(text)]
+
+
+class TriggerIndex:
+    """Token trie over every agent's triggers."""
+
+    def __init__(self, agents: Sequence[Dict[str, Any]]):
+        """
+        Compile the triggers of a list of registry agents.
+
+        Args:
+            agents: Registry agent entries (each with an optional "triggers" list)
+        """
+        self._root: Dict[str, Any] = {}
+        self.trigger_count = 0
+
+        for agent_pos, agent in enumerate(agents):
+            for trigger_pos, trigger in enumerate(agent.get("triggers", [])):
+                words = terms(trigger)
+                if not words:
+                    continue
+                node = self._root
+                for word in words:
+                    node = node.setdefault(word, {})
+                node.setdefault(_END, []).append((agent_pos, trigger_pos))
+                self.trigger_count += 1
+
+    def match(self, text: str) -> Dict[int, List[int]]:
+        """
+        Find every trigger in a text.
+
+        Args:
+            text: Task description
+
+        Returns:
+            Agent position → positions of its matched triggers (each once, in
+            registry order); agents without hits are absent
+        """
+        words = terms(text)
+        hits: Dict[int, set] = {}
+
+        for start in range(len(words)):
+            node = self._root
+            for word in words[start:]:
+                node = node.get(word)
+                if node is None:
+                    break
+                for agent_pos, trigger_pos in node.get(_END, ()):
+                    hits.setdefault(agent_pos, set()).add(trigger_pos)
+
+        return {agent_pos: sorted(triggers) for agent_pos, triggers in hits.items()}
@@ -0,0 +1,351 @@
+"""
+Tests for the Agent Pool
+
+Test coverage for:
+- Lazy construction and reuse of instances
+- Session checkout keeping one instance per conversation
+- Warm-up and idle eviction
+- Session cap evicting the least recently used session
+- Invalidation of changed agents, and on registry reloads
+- Async checkout building agents off the event loop
+- Orchestrator building pooled agents from registry entries
+"""
+import pytest
+import asyncio
+import json
+import threading
+import textwrap
+import time
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.agent_pool import AgentPool
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+from orchestrator import AgentOrchestrator
+
+
+class FakeAgent:
+    """Agent with a conversation and a construction counter"""
+    built = 0
+
+    def __init__(self):
+        FakeAgent.built += 1
+        self.conversation_history = []
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def chat(self, message):
+        self.conversation_history.append(message)
+        return f"{len(self.conversation_history)} messages"
+
+    def clear_history(self):
+        self.conversation_history = []
+
+
+@pytest.fixture
+def pool():
+    FakeAgent.built = 0
+    return AgentPool({"fake": FakeAgent}, max_idle=2, idle_ttl=60.0)
+
+
+class TestAgentPool:
+    """Test checkout, sessions, warm-up and eviction"""
+
+    def test_lazy_and_reused(self, pool):
+        """Test an agent is built on first checkout and reused afterwards"""
+        assert FakeAgent.built == 0
+
+        with pool.checkout("fake") as first:
+            pass
+        with pool.checkout("fake") as second:
+            pass
+
+        assert first is second
+        assert pool.stats()["created"] == 1
+        assert pool.stats()["reused"] == 1
+
+    def test_concurrent_checkouts_get_distinct_instances(self, pool):
+        """Test an instance is never handed out twice at once"""
+        with pool.checkout("fake") as first, pool.checkout("fake") as second:
+            assert first is not second
+
+    def test_history_cleared_between_requests(self, pool):
+        """Test a one-off request doesn't see the previous request's conversation"""
+        with pool.checkout("fake") as agent:
+            agent.chat("hello")
+        with pool.checkout("fake") as agent:
+            assert agent.conversation_history == []
+
+    def test_session_keeps_instance(self, pool):
+        """Test a session continues its conversation on the same instance"""
+        with pool.checkout("fake", session_id="a") as agent:
+            agent.chat("first")
+        with pool.checkout("fake") as other:
+            assert other is not agent
+        with pool.checkout("fake", session_id="a") as again:
+            assert again is agent
+            assert again.chat("second") == "2 messages"
+
+    def test_end_session_returns_instance(self, pool):
+        """Test an ended session's instance is cleared and reused"""
+        with pool.checkout("fake", session_id="a") as agent:
+            agent.chat("first")
+
+        assert pool.end_session("a") is True
+        assert pool.end_session("a") is False
+        with pool.checkout("fake") as reused:
+            assert reused is agent
+            assert reused.conversation_history == []
+
+    def test_session_agent_mismatch(self, pool):
+        """Test a session can't switch agents"""
+        pool.register("other", FakeAgent)
+        with pool.checkout("fake", session_id="a"):
+            pass
+
+        with pytest.raises(ValueError):
+            pool.acquire("other", session_id="a")
+
+    def test_max_idle(self, pool):
+        """Test at most max_idle instances are kept per agent"""
+        agents = [pool.acquire("fake") for _ in range(3)]
+        for agent in agents:
+            pool.release("fake", agent)
+
+        assert pool.stats()["idle"] == {"fake": 2}
+
+    def test_warm_up(self, pool):
+        """Test warm-up builds instances and reports failures without raising"""
+        pool.register("broken", lambda: 1 / 0)
+
+        results = pool.warm_up(["fake", "broken", "unknown"], instances=2)
+
+        assert results["fake"] is None
+        assert results["broken"].startswith("ZeroDivisionError")
+        assert results["unknown"].startswith("KeyError")
+        assert FakeAgent.built == 2
+
+        with pool.checkout("fake"):
+            assert FakeAgent.built == 2
+
+    def test_evict_idle(self, pool):
+        """Test idle instances and sessions past the TTL are dropped"""
+        pool.warm_up(["fake"], instances=2)
+        with pool.checkout("fake", session_id="a"):
+            pass
+
+        assert pool.evict_idle(now=time.monotonic()) == 0
+        assert pool.evict_idle(now=time.monotonic() + 120) == 2
+        assert pool.stats()["idle"] == {}
+        assert pool.stats()["sessions"] == 0
+
+    def test_async_checkout_builds_off_loop(self, pool):
+        """Test an async checkout builds in a worker thread and reuses idle instances"""
+        threads = []
+        pool.register("fake", lambda: threads.append(threading.current_thread()) or FakeAgent())
+
+        async def chat():
+            async with pool.checkout_async("fake", session_id="a") as agent:
+                agent.chat("hello")
+            async with pool.checkout_async("fake", session_id="a") as again:
+                return agent, again
+
+        agent, again = asyncio.run(chat())
+
+        assert again is agent
+        assert agent.conversation_history == ["hello"]
+        assert threads and threads[0] is not threading.main_thread()
+        assert pool.stats()["created"] == 1
+
+    def test_async_checkouts_chat_concurrently(self, pool):
+        """Test two async checkouts get their own instances and chat at the same time"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        async def chat(message):
+            async with pool.checkout_async("fake") as agent:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, barrier.wait)
+                return agent, agent.chat(message)
+
+        async def both():
+            return await asyncio.gather(chat("one"), chat("two"))
+
+        (first, reply), (second, _) = asyncio.run(both())
+
+        assert first is not second
+        assert reply == "1 messages"
+
+    def test_cancelled_async_build_pooled(self, pool):
+        """Test an instance whose request was cancelled mid-build isn't lost"""
+        started, finish = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            finish.wait(5)
+            return FakeAgent()
+
+        pool.register("slow", slow)
+
+        async def cancel():
+            task = asyncio.create_task(pool.acquire_async("slow"))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            finish.set()
+            for _ in range(100):
+                if pool.stats()["idle"]:
+                    break
+                await asyncio.sleep(0.01)
+
+        asyncio.run(cancel())
+
+        assert pool.stats()["idle"] == {"slow": 1}
+
+    def test_max_sessions_evicts_least_recent(self, pool):
+        """Test a new session beyond max_sessions evicts the least recently used one"""
+        pool.max_sessions = 2
+        for session_id in ("a", "b"):
+            with pool.checkout("fake", session_id=session_id) as agent:
+                agent.chat(session_id)
+        with pool.checkout("fake", session_id="a"):
+            pass
+
+        with pool.checkout("fake", session_id="c"):
+            pass
+
+        assert pool.stats()["sessions"] == 2
+        with pool.checkout("fake", session_id="a") as agent:
+            assert agent.conversation_history == ["a"]
+        with pool.checkout("fake", session_id="b") as agent:
+            assert agent.conversation_history == []
+
+    def test_evicted_session_in_use_not_shared(self, pool):
+        """Test a session evicted mid-request isn't handed out until released"""
+        pool.max_sessions = 1
+        first = pool.acquire("fake", session_id="a")
+        with pool.checkout("fake", session_id="b") as second:
+            assert second is not first
+        with pool.checkout("fake") as other:
+            assert other is not first
+
+        pool.release("fake", first, session_id="a")
+        assert pool.stats()["idle"] == {"fake": 2}
+
+    def test_invalidate(self, pool):
+        """Test invalidated agents are rebuilt from a fresh factory"""
+        calls = []
+        pool.resolve_factory = lambda agent_id: calls.append(agent_id) or FakeAgent
+        pool.warm_up(["resolved"])
+        with pool.checkout("resolved", session_id="a") as session_agent:
+            pass
+        in_use = pool.acquire("resolved")
+        with pool.checkout("fake") as registered:
+            pass
+
+        assert pool.invalidate(["resolved", "fake"]) == 2
+        assert session_agent.closed and registered.closed
+        assert pool.stats()["sessions"] == 0
+
+        pool.release("resolved", in_use)
+        assert in_use.closed
+        with pool.checkout("resolved") as rebuilt:
+            assert rebuilt not in (session_agent, in_use)
+        with pool.checkout("fake"):
+            pass
+        assert calls == ["resolved", "resolved"]
+        assert "fake" in pool.factories
+
+    def test_unknown_agent(self, pool):
+        """Test checking out an agent without a factory fails"""
+        with pytest.raises(KeyError):
+            pool.acquire("unknown")
+
+
+class TestOrchestratorPool:
+    """Test the orchestrator builds agents from the registry"""
+
+    @pytest.fixture
+    def orchestrator(self, tmp_path):
+        agent_dir = tmp_path / "greeter"
+        agent_dir.mkdir()
+        (agent_dir / "agent.py").write_text(textwrap.dedent("""
+            from shared.base_agent import BaseAgent
+
+            class GreeterAgent(BaseAgent):
+                def __init__(self):
+                    super().__init__("test-key")
+
+                def define_tools(self):
+                    return []
+
+                def execute_tool(self, tool_name, tool_input):
+                    return ""
+
+                def get_system_prompt(self):
+                    return "Greet."
+        """))
+        registry = tmp_path / "registry.json"
+        registry.write_text(json.dumps({"agents": [
+            {"id": "greeter", "name": "Greeter", "description": "", "path": str(agent_dir),
+             "triggers": ["hello"], "status": "active"},
+            {"id": "ghost", "name": "Ghost", "description": "", "path": str(tmp_path / "ghost"),
+             "triggers": [], "status": "active"},
+        ]}))
+        return AgentOrchestrator(registry_path=str(registry))
+
+    def test_checkout_builds_registry_class(self, orchestrator):
+        """Test the agent class is found in the registry entry's agent.py"""
+        with orchestrator.checkout("greeter") as agent:
+            assert type(agent).__name__ == "GreeterAgent"
+        with orchestrator.checkout("greeter") as again:
+            assert again is agent
+
+    def test_warm_up_active_agents(self, orchestrator):
+        """Test warm-up covers every active agent and reports the broken one"""
+        results = orchestrator.warm_up()
+
+        assert results["greeter"] is None
+        assert results["ghost"] is not None
+        assert orchestrator.agents.stats()["idle"] == {"greeter": 1}
+
+    def test_registry_reload_drops_changed_agents(self, orchestrator, tmp_path):
+        """Test a reload that changes an agent's entry drops its pooled instances"""
+        with orchestrator.checkout("greeter", session_id="a") as agent:
+            pass
+
+        registry = json.loads(orchestrator.registry_path.read_text())
+        registry["agents"][0]["triggers"] = ["hello", "hi"]
+        orchestrator.registry_path.write_text(json.dumps(registry))
+        assert orchestrator.registry_service.reload(force=True)
+
+        assert orchestrator.agents.stats()["sessions"] == 0
+        with orchestrator.checkout("greeter", session_id="a") as rebuilt:
+            assert rebuilt is not agent
+
+    def test_registry_reload_keeps_unchanged_agents(self, orchestrator):
+        """Test a reload leaves agents whose entry didn't change pooled"""
+        with orchestrator.checkout("greeter") as agent:
+            pass
+
+        assert orchestrator.registry_service.reload(force=True)
+
+        with orchestrator.checkout("greeter") as again:
+            assert again is agent
+
+    def test_agent_wrapper(self, orchestrator):
+        """Test pooled instances are wrapped as they're built"""
+        orchestrator.agent_wrapper = lambda agent: ("wrapped", agent)
+
+        async def chat():
+            async with orchestrator.checkout_async("greeter") as agent:
+                return agent
+
+        label, agent = asyncio.run(chat())
+
+        assert label == "wrapped"
+        assert type(agent).__name__ == "GreeterAgent"
@@ -0,0 +1,156 @@
+"""
+Tests for the Agent Registry
+
+Test coverage for:
+- Id and category indexes
+- Reloading on file change with subscriber notification
+- Invalid or missing registry files keep the previous snapshot
+- Background watching and orchestrator routing after an edit
+"""
+import pytest
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.agent_registry import AgentRegistry
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+from orchestrator import AgentOrchestrator
+
+
+def registry_data(*extra_agents):
+    agents = [
+        {"id": "vps", "name": "VPS", "description": "", "path": "", "triggers": ["vps", "cpu"]},
+        {"id": "db", "name": "DB", "description": "", "path": "", "triggers": ["sql"]},
+    ] + list(extra_agents)
+    return {
+        "agents": agents,
+        "agent_categories": {"infrastructure": ["vps"], "database": ["db", "missing"]},
+    }
+
+
+def write_registry(path, data):
+    """Write a registry and move its mtime forward so the change is always visible"""
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(previous + 10 ** 9, previous + 10 ** 9))
+
+
+@pytest.fixture
+def registry_file(tmp_path):
+    path = tmp_path / "registry.json"
+    write_registry(path, registry_data())
+    return path
+
+
+class TestAgentRegistry:
+    """Test snapshot indexes and reloading"""
+
+    def test_indexes(self, registry_file):
+        """Test agents are indexed by id and category"""
+        snapshot = AgentRegistry(registry_file).snapshot
+
+        assert snapshot.by_id["db"]["name"] == "DB"
+        assert [a["id"] for a in snapshot.by_category["database"]] == ["db"]
+        assert snapshot.version == 1
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing registry fails at startup"""
+        with pytest.raises(FileNotFoundError):
+            AgentRegistry(tmp_path / "nope.json")
+
+    def test_reload_only_on_change(self, registry_file):
+        """Test reload() re-reads only when mtime or size changed"""
+        registry = AgentRegistry(registry_file)
+        seen = []
+        registry.subscribe(seen.append)
+
+        assert registry.reload() is False
+        write_registry(registry_file, registry_data({"id": "new", "name": "New", "triggers": ["nginx"]}))
+        assert registry.reload() is True
+
+        assert registry.snapshot.version == 2
+        assert "new" in registry.snapshot.by_id
+        assert seen == [registry.snapshot]
+
+    def test_old_snapshot_unchanged(self, registry_file):
+        """Test a snapshot held by an in-flight route survives a reload intact"""
+        registry = AgentRegistry(registry_file)
+        held = registry.snapshot
+
+        write_registry(registry_file, {"agents": []})
+        registry.reload()
+
+        assert len(held.agents) == 2
+        assert held.index.match("cpu") == {0: [1]}
+        assert registry.snapshot.agents == []
+
+    @pytest.mark.parametrize("breakage", ["invalid", "missing"])
+    def test_broken_edit_keeps_previous(self, registry_file, breakage):
+        """Test an invalid or deleted file leaves the last good registry in service"""
+        registry = AgentRegistry(registry_file)
+
+        if breakage == "invalid":
+            registry_file.write_text("{ not json")
+        else:
+            registry_file.unlink()
+
+        assert registry.reload() is False
+        assert registry.snapshot.version == 1
+        assert "vps" in registry.snapshot.by_id
+
+    def test_failing_listener_isolated(self, registry_file):
+        """Test one failing subscriber doesn't stop the reload or the others"""
+        registry = AgentRegistry(registry_file)
+        seen = []
+        registry.subscribe(lambda snapshot: 1 / 0)
+        registry.subscribe(seen.append)
+
+        write_registry(registry_file, registry_data())
+        assert registry.reload() is True
+        assert len(seen) == 1
+
+    def test_unsubscribe(self, registry_file):
+        """Test an unsubscribed listener is no longer called"""
+        registry = AgentRegistry(registry_file)
+        seen = []
+        unsubscribe = registry.subscribe(seen.append)
+
+        unsubscribe()
+        write_registry(registry_file, registry_data())
+        registry.reload()
+
+        assert seen == []
+
+
+class TestOrchestratorHotReload:
+    """Test the orchestrator picks up registry edits"""
+
+    def test_watching_routes_new_agent(self, registry_file):
+        """Test a watched orchestrator routes to an agent added after startup"""
+        orchestrator = AgentOrchestrator(registry_path=str(registry_file), watch=True, poll_interval=0.01)
+        try:
+            assert orchestrator.route_task("restart nginx")["status"] == "no_match"
+
+            write_registry(registry_file, registry_data(
+                {"id": "web", "name": "Web", "description": "", "path": "", "triggers": ["nginx"]}
+            ))
+            deadline = time.monotonic() + 5
+            while orchestrator.get_agent_by_id("web") is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            result = orchestrator.route_task("restart nginx")
+            assert result["status"] == "routed"
+            assert result["agent"]["agent_id"] == "web"
+        finally:
+            orchestrator.close()
+
+    def test_get_agents_by_category(self, registry_file):
+        """Test category lookups skip ids missing from the agent list"""
+        orchestrator = AgentOrchestrator(registry_path=str(registry_file))
+
+        assert [a["id"] for a in orchestrator.get_agents_by_category("database")] == ["db"]
+        assert orchestrator.get_agents_by_category("unknown") == []
@@ -0,0 +1,168 @@
+"""
+Tests for the Content-Addressed Analysis Cache
+
+Test coverage for:
+- Blob SHA matches git
+- Hits, misses and rule-set version invalidation
+- Batched writes
+- Eviction: sweeps and the least-recently-used cap
+- Repository rescans only re-analyze changed files
+"""
+import pytest
+import importlib.util
+import subprocess
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.analysis_cache import AnalysisCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an empty cache in a temporary directory"""
+    return AnalysisCache(db_path=str(tmp_path / "analysis_cache.db"))
+
+
+def load_git_watcher():
+    """Load GitWatcherAgent from its hyphenated agent directory"""
+    agent_file = Path(__file__).parent.parent / "agents" / "git-watcher" / "agent.py"
+    spec = importlib.util.spec_from_file_location("git_watcher_agent", agent_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.GitWatcherAgent
+
+
+class TestAnalysisCache:
+    """Test content-addressed findings cache"""
+
+    def test_blob_sha_matches_git(self, tmp_path):
+        """Test blob SHA equals `git hash-object`"""
+        sample = tmp_path / "sample.py"
+        sample.write_bytes(b"print('hi')\n")
+
+        expected = subprocess.run(
+            ["git", "hash-object", str(sample)], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        assert AnalysisCache.blob_sha(sample.read_bytes()) == expected
+
+    def test_get_or_compute_hits_after_first_miss(self, cache):
+        """Test identical content is analyzed once"""
+        calls = []
+
+        def analyze():
+            calls.append(1)
+            return [{"line": 1, "rule": "todo"}]
+
+        first = cache.get_or_compute("scanner", "v1", b"# TODO: x\n", analyze)
+        second = cache.get_or_compute("scanner", "v1", b"# TODO: x\n", analyze)
+
+        assert first == second == [{"line": 1, "rule": "todo"}]
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Persisted: a fresh instance hits without computing
+        reopened = AnalysisCache(db_path=cache.db_path)
+        assert reopened.get_or_compute("scanner", "v1", b"# TODO: x\n", analyze) == first
+        assert len(calls) == 1
+
+    def test_key_includes_analyzer_and_version(self, cache):
+        """Test other analyzers and rule-set versions never share entries"""
+        cache.get_or_compute("scanner", "v1", b"x = 1\n", lambda: ["v1"])
+
+        assert cache.get_or_compute("scanner", "v2", b"x = 1\n", lambda: ["v2"]) == ["v2"]
+        assert cache.get_or_compute("other", "v1", b"x = 1\n", lambda: ["other"]) == ["other"]
+        assert AnalysisCache.ruleset_version([r"TODO"]) != AnalysisCache.ruleset_version([r"FIXME"])
+
+    def test_batch_defers_writes(self, cache):
+        """Test batch() stores new findings when the block exits"""
+        with cache.batch():
+            cache.get_or_compute("scanner", "v1", b"a\n", lambda: [])
+            cache.get_or_compute("scanner", "v1", b"b\n", lambda: [1])
+            assert AnalysisCache(db_path=cache.db_path).get_stats()["entries"] == 0
+
+        assert cache.get_stats()["entries"] == 2
+        assert cache.clear("scanner") == 2
+
+    def test_rescan_only_analyzes_changed_file(self, tmp_path, monkeypatch):
+        """Test a repository rescan re-analyzes only the edited file"""
+        monkeypatch.chdir(tmp_path)
+        for i in range(5):
+            (tmp_path / f"mod{i}.py").write_text(f"# TODO: item {i}\ndef run_{i}():\n    pass\n")
+
+        GitWatcherAgent = load_git_watcher()
+        watcher = GitWatcherAgent("sk-ant-test", repository_path=str(tmp_path))
+        first = watcher._scan_repository("todos")
+
+        (tmp_path / "mod3.py").write_text("# FIXME: changed\ndef run_3():\n    pass\n")
+
+        watcher = GitWatcherAgent("sk-ant-test", repository_path=str(tmp_path))
+        second = watcher._scan_repository("todos")
+
+        # Only the changed file is analyzed, everything else comes from cache
+        assert watcher.analysis_cache.misses == 1
+        assert watcher.analysis_cache.hits == 4
+        assert len(second["tasks"]) == len(first["tasks"])
+        assert "TODO comment: changed" in [t["description"] for t in second["tasks"]]
+
+        # The old contents of mod3.py were pruned by the full scan
+        assert watcher.analysis_cache.get_stats()["entries"] == 5
+        assert watcher.analysis_cache.evicted == 1
+
+    def test_sweep_prunes_entries_not_looked_up(self, cache):
+        """Test sweep() drops unseen blobs and old rule-set versions of that analyzer only"""
+        for data in (b"a\n", b"b\n", b"c\n"):
+            cache.get_or_compute("scanner", "v1", data, lambda: [])
+        cache.get_or_compute("scanner", "v0", b"a\n", lambda: [])
+        cache.get_or_compute("other", "v1", b"z\n", lambda: [])
+
+        with cache.batch(), cache.sweep("scanner", "v1"):
+            cache.get_or_compute("scanner", "v1", b"a\n", lambda: [])
+            cache.get_or_compute("scanner", "v1", b"d\n", lambda: [])  # New file
+
+        assert cache.evicted == 3  # b, c and the v0 entry
+        reopened = AnalysisCache(db_path=cache.db_path)
+        assert reopened.get_stats()["entries"] == 3
+        assert reopened.get("scanner", "v1", AnalysisCache.blob_sha(b"a\n")) == []
+        assert reopened.get("scanner", "v1", AnalysisCache.blob_sha(b"d\n")) == []
+        assert reopened.get("scanner", "v1", AnalysisCache.blob_sha(b"b\n")) is None
+        assert reopened.get("scanner", "v0", AnalysisCache.blob_sha(b"a\n")) is None
+        assert reopened.get("other", "v1", AnalysisCache.blob_sha(b"z\n")) == []
+
+        # In-memory buckets agree with the database
+        assert cache.get("scanner", "v1", AnalysisCache.blob_sha(b"b\n")) is None
+
+    def test_failed_sweep_prunes_nothing(self, cache):
+        """Test an interrupted scan doesn't delete entries it didn't reach"""
+        cache.get_or_compute("scanner", "v1", b"a\n", lambda: [])
+
+        with pytest.raises(RuntimeError):
+            with cache.sweep("scanner", "v1"):
+                raise RuntimeError("scan failed")
+
+        assert cache.get_stats()["entries"] == 1
+        assert cache.evicted == 0
+
+    def test_max_entries_evicts_least_recently_used(self, tmp_path):
+        """Test going over max_entries deletes the least recently used entries"""
+        cache = AnalysisCache(db_path=str(tmp_path / "analysis_cache.db"), max_entries=10)
+
+        with cache.batch():
+            for i in range(10):
+                cache.get_or_compute("scanner", "v1", b"%d\n" % i, lambda: [])
+
+        # Hits on 0-4 make 5-9 the least recently used
+        with cache.batch():
+            for i in range(5):
+                cache.get_or_compute("scanner", "v1", b"%d\n" % i, lambda: [])
+        with cache.batch():
+            cache.get_or_compute("scanner", "v1", b"new\n", lambda: [])
+
+        # Back down to 90% of the cap
+        assert cache.get_stats()["entries"] == 9
+        assert cache.evicted == 2
+        kept = [i for i in range(10) if cache.get("scanner", "v1", AnalysisCache.blob_sha(b"%d\n" % i)) is not None]
+        assert kept[:5] == [0, 1, 2, 3, 4]  # Recently used entries survive
+        assert len(kept) == 8
+        assert cache.get("scanner", "v1", AnalysisCache.blob_sha(b"new\n")) == []
@@ -0,0 +1,157 @@
+"""
+Tests for AsyncBaseAgent
+
+Test coverage for:
+- Async chat() tool loop and history
+- Async chat_stream() events
+- Parallel tools, serial tools and result order
+- AsyncAgentAdapter running sync agent tools in threads
+- Concurrent conversations on one event loop
+"""
+import pytest
+import asyncio
+from types import SimpleNamespace
+from pathlib import Path
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.async_base_agent import AsyncAgentAdapter, AsyncBaseAgent
+from tests.test_base_agent import EchoAgent, FINAL_TURN, TOOL_TURN, message, tool_block
+
+
+class FakeAsyncStream:
+    """Stand-in for anthropic's AsyncMessageStream context manager"""
+
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for block in self.response.content:
+            if block.type == "text":
+                yield SimpleNamespace(type="text", text=block.text)
+            yield SimpleNamespace(type="content_block_stop", content_block=block)
+
+    async def get_final_message(self):
+        return self.response
+
+
+class FakeAsyncMessages:
+    """Replays canned responses, taking `latency` seconds per request"""
+
+    def __init__(self, responses, latency=0.0):
+        self.responses = list(responses)
+        self.latency = latency
+
+    async def create(self, **params):
+        await asyncio.sleep(self.latency)
+        return self.responses.pop(0)
+
+    def stream(self, **params):
+        return FakeAsyncStream(self.responses.pop(0))
+
+
+class AsyncEchoAgent(AsyncBaseAgent):
+    """Minimal async agent; tools sleep and record concurrency"""
+
+    SERIAL_TOOLS = frozenset({"write"})
+
+    def __init__(self, responses, latency=0.0, **kwargs):
+        super().__init__("sk-ant-test", **kwargs)
+        self.async_anthropic = SimpleNamespace(messages=FakeAsyncMessages(responses, latency))
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+
+    def define_tools(self):
+        return [{"name": "echo", "description": "Echo input", "input_schema": {"type": "object"}}]
+
+    async def execute_tool(self, tool_name, tool_input):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.02)
+        self.running -= 1
+        self.calls.append(tool_name)
+        return json.dumps({"tool": tool_name, "value": tool_input["value"]})
+
+    def get_system_prompt(self):
+        return "You echo things."
+
+
+def tool_turn(*names):
+    return message("tool_use", *[tool_block(f"tu_{i}", name, {"value": i}) for i, name in enumerate(names)])
+
+
+class TestAsyncBaseAgent:
+    """Test the asyncio tool-calling loop"""
+
+    def test_chat_runs_tools_and_returns_text(self):
+        """Test chat() awaits tools then returns final text"""
+        agent = AsyncEchoAgent([tool_turn("read", "read"), FINAL_TURN])
+
+        assert asyncio.run(agent.chat("hi")) == "All good"
+        assert agent.peak == 1
+        assert agent.get_history_length() == 4
+        assert [r["tool_use_id"] for r in agent.conversation_history[2]["content"]] == ["tu_0", "tu_1"]
+
+    def test_chat_stream_events(self):
+        """Test chat_stream() yields text, tool and done events"""
+        agent = AsyncEchoAgent([TOOL_TURN, FINAL_TURN])
+
+        async def collect():
+            return [event async for event in agent.chat_stream("hi")]
+
+        events = asyncio.run(collect())
+
+        assert [e["type"] for e in events] == [
+            "text", "tool_use", "tool_use", "tool_result", "tool_result", "text", "done"
+        ]
+        assert events[-1] == {"type": "done", "text": "All good"}
+
+    def test_parallel_tools_keep_order_and_serial_barrier(self):
+        """Test parallel tools overlap, serial tools run alone, results stay ordered"""
+        agent = AsyncEchoAgent(
+            [tool_turn("read", "read", "write", "read"), FINAL_TURN], parallel_tools=True
+        )
+
+        asyncio.run(agent.chat("hi"))
+
+        results = agent.conversation_history[2]["content"]
+        assert [json.loads(r["content"])["value"] for r in results] == [0, 1, 2, 3]
+        assert agent.calls[2] == "write"
+        assert agent.peak == 2
+
+    def test_concurrent_conversations_share_event_loop(self):
+        """Test several chats overlap instead of running one after another"""
+        agents = [AsyncEchoAgent([FINAL_TURN], latency=0.1) for _ in range(5)]
+
+        async def run_all():
+            return await asyncio.gather(*(agent.chat("hi") for agent in agents))
+
+        start = time.perf_counter()
+        replies = asyncio.run(run_all())
+
+        assert replies == ["All good"] * 5
+        assert time.perf_counter() - start < 0.3
+
+
+class TestAsyncAgentAdapter:
+    """Test the compatibility shim for sync agents"""
+
+    def test_adapter_runs_sync_tools(self):
+        """Test a sync agent's tools and prompt are used through the adapter"""
+        sync_agent = EchoAgent([])
+        adapter = AsyncAgentAdapter(sync_agent, anthropic_api_key="sk-ant-test")
+        adapter.async_anthropic = SimpleNamespace(messages=FakeAsyncMessages([TOOL_TURN, FINAL_TURN]))
+
+        assert asyncio.run(adapter.chat("hi")) == "All good"
+        assert sync_agent.calls == [{"value": 1}, {"value": 2}]
+        assert adapter.get_system_prompt() == sync_agent.get_system_prompt()
+        assert sync_agent.get_history_length() == 0  # Adapter keeps its own conversation
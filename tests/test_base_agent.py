@@ -0,0 +1,348 @@
+"""
+Tests for BaseAgent
+
+Test coverage for:
+- Blocking chat() tool loop
+- Streaming chat_stream(): text deltas, early tool start, history
+- Opt-in parallel tool execution with serial tools
+- Prompt caching breakpoints and usage reporting
+"""
+import pytest
+from types import SimpleNamespace
+from pathlib import Path
+import json
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.base_agent import BaseAgent
+
+
+def text_block(text):
+    return SimpleNamespace(type="text", text=text)
+
+
+def tool_block(block_id, name, tool_input):
+    return SimpleNamespace(type="tool_use", id=block_id, name=name, input=tool_input)
+
+
+def message(stop_reason, *content):
+    return SimpleNamespace(stop_reason=stop_reason, content=list(content))
+
+
+class FakeStream:
+    """Stand-in for anthropic's MessageStream context manager"""
+
+    def __init__(self, response, log, before_block=None):
+        self.response = response
+        self.log = log
+        self.before_block = before_block
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for block in self.response.content:
+            if self.before_block:
+                self.before_block(block)
+            if block.type == "text":
+                for word in block.text.split(" "):
+                    self.log.append(("delta", word))
+                    yield SimpleNamespace(type="text", text=word)
+            self.log.append(("block_stop", block.type))
+            yield SimpleNamespace(type="content_block_stop", content_block=block)
+
+    def get_final_message(self):
+        return self.response
+
+
+class FakeMessages:
+    """Replays canned responses for create() and stream()"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.log = []
+        self.before_block = None
+
+    def create(self, **params):
+        self.requests.append(params)
+        return self.responses.pop(0)
+
+    def stream(self, **params):
+        self.requests.append(params)
+        return FakeStream(self.responses.pop(0), self.log, self.before_block)
+
+
+class EchoAgent(BaseAgent):
+    """Minimal agent with one tool"""
+
+    def __init__(self, responses):
+        super().__init__("sk-ant-test")
+        self.anthropic = SimpleNamespace(messages=FakeMessages(responses))
+        self.calls = []
+
+    def define_tools(self):
+        return [{"name": "echo", "description": "Echo input", "input_schema": {"type": "object"}}]
+
+    def execute_tool(self, tool_name, tool_input):
+        self.calls.append(tool_input)
+        self.anthropic.messages.log.append(("tool", tool_input["value"]))
+        return json.dumps({"echo": tool_input["value"]})
+
+    def get_system_prompt(self):
+        return "You echo things."
+
+
+TOOL_TURN = message(
+    "tool_use",
+    text_block("Checking now"),
+    tool_block("tu_1", "echo", {"value": 1}),
+    tool_block("tu_2", "echo", {"value": 2}),
+)
+FINAL_TURN = message("end_turn", text_block("All good"))
+
+
+class TestBaseAgentChat:
+    """Test tool-calling loops"""
+
+    def test_chat_runs_tools_and_returns_text(self):
+        """Test chat() executes tools then returns final text"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+
+        assert agent.chat("hi") == "All good"
+        assert agent.calls == [{"value": 1}, {"value": 2}]
+        assert agent.get_history_length() == 4
+        assert [r["tool_use_id"] for r in agent.conversation_history[2]["content"]] == ["tu_1", "tu_2"]
+
+    def test_chat_stream_yields_deltas_and_results(self):
+        """Test chat_stream() yields text, tool and done events"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+
+        events = list(agent.chat_stream("hi"))
+
+        assert "".join(e["text"] for e in events if e["type"] == "text") == "CheckingnowAllgood"
+        assert [e["type"] for e in events if e["type"] != "text"] == [
+            "tool_use", "tool_use", "tool_result", "tool_result", "done"
+        ]
+        assert events[-1] == {"type": "done", "text": "All good"}
+        assert agent.conversation_history[2]["content"][1]["content"] == json.dumps({"echo": 2})
+        assert agent.get_history_length() == 4
+
+    def test_chat_stream_starts_tools_before_response_ends(self):
+        """Test a tool is dispatched as soon as its block is complete"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+
+        first_tool_ran = threading.Event()
+        original = agent.execute_tool
+
+        def execute_tool(tool_name, tool_input):
+            first_tool_ran.set()
+            return original(tool_name, tool_input)
+
+        def before_block(block):
+            # The second tool_use block only arrives once the first tool has run
+            if getattr(block, "id", None) == "tu_2":
+                assert first_tool_ran.wait(timeout=5)
+
+        agent.execute_tool = execute_tool
+        agent.anthropic.messages.before_block = before_block
+
+        events = list(agent.chat_stream("hi"))
+
+        assert events[-1] == {"type": "done", "text": "All good"}
+        log = agent.anthropic.messages.log
+        tool_stops = [i for i, entry in enumerate(log) if entry == ("block_stop", "tool_use")]
+        assert tool_stops[0] < log.index(("tool", 1)) < tool_stops[1]
+
+    def test_chat_stream_first_text_before_tools(self):
+        """Test the first text delta is yielded before any tool runs"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+
+        first = next(agent.chat_stream("hi"))
+
+        assert first == {"type": "text", "text": "Checking"}
+        assert agent.calls == []
+
+
+class SlowAgent(EchoAgent):
+    """Agent whose tools sleep and record how many run at once"""
+
+    SERIAL_TOOLS = frozenset({"write"})
+
+    def __init__(self, responses, **kwargs):
+        BaseAgent.__init__(self, "sk-ant-test", **kwargs)
+        self.anthropic = SimpleNamespace(messages=FakeMessages(responses))
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+        self.overlapped_write = False
+        self.writing = False
+        self.lock = threading.Lock()
+
+    def execute_tool(self, tool_name, tool_input):
+        with self.lock:
+            # A write must start with nothing running, and nothing may start during a write
+            if self.writing or (tool_name == "write" and self.running):
+                self.overlapped_write = True
+            self.writing = tool_name == "write"
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.calls.append(tool_name)
+            self.running -= 1
+            self.writing = False
+        return json.dumps({"tool": tool_name, "value": tool_input["value"]})
+
+
+def tool_turn(*names):
+    return message("tool_use", *[tool_block(f"tu_{i}", name, {"value": i}) for i, name in enumerate(names)])
+
+
+class TestParallelTools:
+    """Test opt-in parallel tool execution"""
+
+    def test_sequential_by_default(self):
+        """Test tools run one at a time unless parallel_tools is set"""
+        agent = SlowAgent([tool_turn("read", "read", "read"), FINAL_TURN])
+
+        agent.chat("hi")
+
+        assert agent.peak == 1
+
+    def test_parallel_preserves_result_order(self):
+        """Test concurrent tools still answer in tool_use order"""
+        agent = SlowAgent([tool_turn("read", "read", "read", "read"), FINAL_TURN], parallel_tools=True)
+
+        start = time.perf_counter()
+        agent.chat("hi")
+        elapsed = time.perf_counter() - start
+
+        results = agent.conversation_history[2]["content"]
+        assert [r["tool_use_id"] for r in results] == ["tu_0", "tu_1", "tu_2", "tu_3"]
+        assert [json.loads(r["content"])["value"] for r in results] == [0, 1, 2, 3]
+        assert agent.peak > 1
+        assert elapsed < 0.15
+
+    def test_concurrency_limit(self):
+        """Test max_tool_concurrency caps tools running at once"""
+        agent = SlowAgent(
+            [tool_turn(*["read"] * 6), FINAL_TURN], parallel_tools=True, max_tool_concurrency=2
+        )
+
+        agent.chat("hi")
+
+        assert agent.peak == 2
+
+    def test_serial_tools_run_alone(self):
+        """Test SERIAL_TOOLS never overlap other tools, in chat and chat_stream"""
+        for run in ("chat", "chat_stream"):
+            agent = SlowAgent(
+                [tool_turn("read", "read", "write", "read", "read"), FINAL_TURN], parallel_tools=True
+            )
+
+            if run == "chat":
+                agent.chat("hi")
+            else:
+                list(agent.chat_stream("hi"))
+
+            assert agent.calls[2] == "write"
+            assert not agent.overlapped_write
+            assert agent.peak == 2
+
+
+def usage(input_tokens, output_tokens, cache_write=0, cache_read=0):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_creation_input_tokens=cache_write,
+        cache_read_input_tokens=cache_read,
+    )
+
+
+def cache_breakpoints(params):
+    """Paths of every cache_control marker in a request"""
+    found = []
+    for i, block in enumerate(params["system"]):
+        if "cache_control" in block:
+            found.append(("system", i))
+    for i, tool in enumerate(params["tools"]):
+        if "cache_control" in tool:
+            found.append(("tools", i))
+    for i, msg in enumerate(params["messages"]):
+        for j, block in enumerate(msg["content"] if isinstance(msg["content"], list) else []):
+            if isinstance(block, dict) and "cache_control" in block:
+                found.append(("messages", i, j))
+    return found
+
+
+class TestPromptCaching:
+    """Test cache_control breakpoints and usage accounting"""
+
+    def test_breakpoints_on_tools_system_and_latest_message(self):
+        """Test each request caches tools, system and the conversation so far"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+
+        agent.chat("hi")
+
+        first, second = agent.anthropic.messages.requests
+        assert cache_breakpoints(first) == [("system", 0), ("tools", 0), ("messages", 0, 0)]
+        assert first["messages"][0]["content"] == [
+            {"type": "text", "text": "hi", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert cache_breakpoints(second) == [("system", 0), ("tools", 0), ("messages", 2, 1)]
+
+    def test_history_and_tools_not_modified(self):
+        """Test breakpoints are added to copies only"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+
+        agent.chat("hi")
+
+        assert agent.conversation_history[0]["content"] == "hi"
+        assert all("cache_control" not in r for r in agent.conversation_history[2]["content"])
+        assert all("cache_control" not in t for t in agent.define_tools())
+
+    def test_sdk_block_converted_when_last(self):
+        """Test an SDK content block gets its request form plus a breakpoint"""
+        class Block(SimpleNamespace):
+            def model_dump(self, exclude_none=False):
+                return {"type": self.type, "text": self.text}
+
+        cached = BaseAgent._cache_message(
+            {"role": "assistant", "content": [Block(type="text", text="ok")]}, {"type": "ephemeral"}
+        )
+
+        assert cached["content"] == [{"type": "text", "text": "ok", "cache_control": {"type": "ephemeral"}}]
+
+    def test_caching_can_be_disabled(self):
+        """Test prompt_caching=False sends the plain request"""
+        agent = EchoAgent([FINAL_TURN])
+        agent.prompt_caching = False
+
+        agent.chat("hi")
+
+        request = agent.anthropic.messages.requests[0]
+        assert request["system"] == "You echo things."
+        assert request["messages"] is agent.conversation_history
+
+    def test_usage_recorded_per_call(self):
+        """Test cache reads and writes are reported per call and summed"""
+        first_turn = SimpleNamespace(**vars(TOOL_TURN), usage=usage(2100, 40, cache_write=2000))
+        final_turn = SimpleNamespace(**vars(FINAL_TURN), usage=usage(150, 10, cache_read=2000))
+        agent = EchoAgent([first_turn, final_turn])
+
+        agent.chat("hi")
+
+        assert agent.last_usage == {
+            "input_tokens": 150,
+            "output_tokens": 10,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 2000,
+        }
+        assert agent.usage_totals["cache_creation_input_tokens"] == 2000
+        assert agent.usage_totals["input_tokens"] == 2250
@@ -0,0 +1,77 @@
+"""
+Tests for the chat APIs' per-request agents
+
+Test coverage for:
+- Concurrent chats running side by side on their own agent instances
+- Sessions keeping their own conversation
+"""
+import pytest
+import asyncio
+import threading
+from pathlib import Path
+import sys
+
+pytest.importorskip("fastapi")
+pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "ui-module"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "agents" / "convex-database"))
+import unified_agent_api as api
+
+
+class BlockingAgent:
+    """Agent whose chat waits until two chats are in flight at once"""
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+        self.conversation_history = []
+
+    def chat(self, message):
+        self.barrier.wait()
+        self.conversation_history.append(message)
+        return f"{len(self.conversation_history)}: {message}"
+
+    def reset_conversation(self):
+        self.conversation_history = []
+
+
+@pytest.fixture
+def barrier(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    monkeypatch.setattr(api, "agents", api.AgentPool({api.AGENT_ID: lambda: BlockingAgent(barrier)}))
+    return barrier
+
+
+class TestUnifiedChatConcurrency:
+    """Test /chat doesn't serialize requests"""
+
+    def test_two_chats_run_at_once(self, barrier):
+        """Test two chats are in flight together (one at a time would break the barrier)"""
+        async def both():
+            return await asyncio.gather(
+                api.chat(api.ChatRequest(message="first")),
+                api.chat(api.ChatRequest(message="second")),
+            )
+
+        first, second = asyncio.run(both())
+
+        assert first.response == "1: first"
+        assert second.response == "1: second"
+        assert api.agents.stats()["created"] == 2
+
+    def test_sessions_keep_own_conversation(self, barrier):
+        """Test each session continues its own history"""
+        async def chats():
+            await asyncio.gather(
+                api.chat(api.ChatRequest(message="a1", session_id="a")),
+                api.chat(api.ChatRequest(message="b1", session_id="b")),
+            )
+            return await asyncio.gather(
+                api.chat(api.ChatRequest(message="a2", session_id="a")),
+                api.chat(api.ChatRequest(message="b2", session_id="b")),
+            )
+
+        a, b = asyncio.run(chats())
+
+        assert a.response == "2: a2"
+        assert b.response == "2: b2"
@@ -0,0 +1,87 @@
+"""
+Tests for the shared CommitContext
+
+Test coverage for:
+- Single `git show` parsing (hash, message, files)
+- Added-line numbering across context lines and multiple hunks
+- One AST per changed Python file
+"""
+import pytest
+import subprocess
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.commit_context import CommitContext
+
+
+GIT = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a git repo with two commits; the second edits mod.py mid-file"""
+    def commit(message):
+        subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+        subprocess.run(GIT + ["commit", "-q", "-m", message], cwd=tmp_path, check=True)
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    lines = [f"x{i} = {i}" for i in range(1, 21)]
+    (tmp_path / "mod.py").write_text("\n".join(lines) + "\n")
+    (tmp_path / "notes.txt").write_text("hello\n")
+    commit("initial")
+
+    lines.insert(4, "added_a = 1")    # becomes line 5
+    lines.insert(17, "added_b = 2")   # becomes line 18
+    (tmp_path / "mod.py").write_text("\n".join(lines) + "\n")
+    (tmp_path / "notes.txt").unlink()
+    commit("Edit mod\n\nWith a body.")
+    return tmp_path
+
+
+class TestCommitContext:
+    """Test parsing a commit once"""
+
+    def test_from_git_collects_commit_details(self, repo):
+        """Test hash, message and files come from one git show"""
+        context = CommitContext.from_git("HEAD", str(repo))
+
+        assert len(context.hash) == 40
+        assert context.message == "Edit mod\n\nWith a body."
+        assert context.files_changed == ["mod.py", "notes.txt"]
+        assert context.python_files == ["mod.py"]
+        assert context.to_commit_info()["success"] is True
+
+    def test_added_line_numbers_count_context_lines(self, repo):
+        """Test added lines report their line number in the new file"""
+        context = CommitContext.from_git("HEAD", str(repo))
+        source = (repo / "mod.py").read_text().split("\n")
+
+        added = context.added_lines_by_file["mod.py"]
+        assert [(a["line"], a["content"]) for a in added] == [(5, "added_a = 1"), (18, "added_b = 2")]
+        for a in added:
+            assert source[a["line"] - 1] == a["content"]
+
+        # Deleted files contribute no added lines
+        assert "notes.txt" not in context.added_lines_by_file
+
+    def test_python_files_parsed_once(self, repo, monkeypatch):
+        """Test each changed Python file is parsed exactly once"""
+        import shared.commit_context as commit_context
+
+        calls = []
+        real_parse = commit_context.ast.parse
+        monkeypatch.setattr(commit_context.ast, "parse", lambda src: calls.append(src) or real_parse(src))
+
+        context = CommitContext.from_git("HEAD", str(repo))
+        tree = context.get_ast("mod.py")
+
+        assert tree is context.get_ast("mod.py")
+        assert len(tree.body) == 22
+        assert len(calls) == 1
+        assert context.get_ast("notes.txt") is None
+
+    def test_unknown_commit_raises(self, repo):
+        """Test git failures surface as CalledProcessError"""
+        with pytest.raises(subprocess.CalledProcessError):
+            CommitContext.from_git("no-such-ref", str(repo))
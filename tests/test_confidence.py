@@ -0,0 +1,359 @@
+"""
+Tests for Confidence Scoring and the Proactivity Queue
+
+Test coverage for:
+- SQLite-backed queue CRUD operations
+- Filtering and sorting
+- One-shot migration from the legacy JSON queue
+- JSON export for the dashboard
+- Concurrent writers deduplicating atomically
+"""
+import pytest
+import json
+import threading
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.confidence import ProactivityQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Create an empty queue in a temporary directory"""
+    return ProactivityQueue(queue_file=str(tmp_path / "proactivity_queue.json"))
+
+
+class TestProactivityQueue:
+    """Test SQLite-backed proactivity queue"""
+
+    def test_empty_queue(self, queue):
+        """Test a fresh queue has no tasks"""
+        summary = queue.get_summary()
+
+        assert summary["total_tasks"] == 0
+        assert summary["high_confidence"] == 0
+        assert queue.load_queue()["tasks"] == []
+
+    def test_add_task_scores_confidence(self, queue):
+        """Test add_task stores a scored task"""
+        task = queue.add_task(
+            task_type="code_quality",
+            description="Unused import 'os'",
+            file="agents/example.py",
+            line=3
+        )
+
+        assert task["id"] == "task-001"
+        assert task["confidence"] == "high"
+        assert task["status"] == "queued"
+        assert queue.get_task("task-001")["auto_fixable"] is True
+
+    def test_task_ids_not_reused_after_remove(self, queue):
+        """Test removed task IDs are never handed out again"""
+        queue.add_task("code_quality", "Unused import 'os'", "a.py")
+        second = queue.add_task("code_quality", "Unused import 'sys'", "a.py")
+
+        assert queue.remove_task(second["id"]) is True
+        third = queue.add_task("code_quality", "Unused import 're'", "a.py")
+
+        assert third["id"] not in ("task-001", second["id"])
+
+    def test_update_task(self, queue):
+        """Test single-row update including non-column fields"""
+        task = queue.add_task("security", "Potential SQL injection", "db.py", 10)
+
+        updated = queue.update_task(task["id"], {"status": "approved", "reviewer": "ops"})
+
+        assert updated["status"] == "approved"
+        stored = queue.get_task(task["id"])
+        assert stored["status"] == "approved"
+        assert stored["reviewer"] == "ops"
+
+    def test_update_missing_task_raises(self, queue):
+        """Test updating unknown task raises ValueError"""
+        with pytest.raises(ValueError):
+            queue.update_task("task-999", {"status": "approved"})
+
+    def test_remove_missing_task(self, queue):
+        """Test removing unknown task returns False"""
+        assert queue.remove_task("task-999") is False
+
+    def test_filter_and_sort(self, queue):
+        """Test confidence/type filters and effort sorting"""
+        queue.add_task("security", "Potential SQL injection", "db.py")
+        queue.add_task("code_quality", "Unused import 'os'", "a.py")
+        queue.add_task("code_quality", "Missing docstring", "b.py")
+
+        high = queue.get_tasks(filter_confidence="high")
+        assert high["total_tasks"] == 3
+        assert high["filtered_tasks"] == 2
+
+        by_type = queue.get_tasks(filter_type="security")
+        assert [t["file"] for t in by_type["tasks"]] == ["db.py"]
+
+        by_effort = queue.get_tasks(sort_by="effort")
+        efforts = [t["estimated_effort"] for t in by_effort["tasks"]]
+        assert efforts == sorted(efforts)
+
+        by_confidence = queue.get_tasks(sort_by="confidence", limit=1)
+        assert by_confidence["tasks"][0]["confidence"] == "high"
+
+    def test_migrates_legacy_json_once(self, tmp_path):
+        """Test legacy JSON tasks are imported exactly once"""
+        queue_file = tmp_path / "proactivity_queue.json"
+        queue_file.write_text(json.dumps({
+            "version": "1.0",
+            "last_updated": "2025-12-16T07:11:37Z",
+            "total_tasks": 1,
+            "tasks": [{
+                "id": "task-041",
+                "type": "tech_debt",
+                "description": "TODO comment: tidy up",
+                "file": "a.py",
+                "line": 4,
+                "confidence": "medium",
+                "reasoning": "Unknown pattern, requires review",
+                "auto_fixable": False,
+                "estimated_effort": 15,
+                "risk_level": "medium",
+                "created_at": "2025-12-15T14:42:59Z",
+                "status": "queued",
+                "age_hours": 0
+            }]
+        }))
+
+        queue = ProactivityQueue(queue_file=str(queue_file))
+        assert queue.get_summary()["total_tasks"] == 1
+        assert queue.get_task("task-041")["line"] == 4
+
+        # New IDs continue after the migrated ones
+        assert queue.add_task("tech_debt", "TODO comment: more", "a.py")["id"] == "task-002"
+
+        # Re-opening does not import again
+        reopened = ProactivityQueue(queue_file=str(queue_file))
+        assert reopened.get_summary()["total_tasks"] == 2
+
+    def test_unparseable_legacy_json_retried(self, tmp_path):
+        """Test a legacy file that fails to parse is left for the next open"""
+        queue_file = tmp_path / "proactivity_queue.json"
+        queue_file.write_text('{"tasks": [')
+
+        assert ProactivityQueue(queue_file=str(queue_file)).get_summary()["total_tasks"] == 0
+
+        queue_file.write_text(json.dumps({"tasks": [{
+            "id": "task-007", "type": "tech_debt", "description": "TODO comment: x", "file": "a.py",
+            "confidence": "medium", "created_at": "2025-12-15T14:42:59Z", "status": "queued"
+        }]}))
+        assert ProactivityQueue(queue_file=str(queue_file)).get_task("task-007") is not None
+
+    def test_concurrent_writers_dedup(self, tmp_path):
+        """Test scanners writing the same findings at once neither collide nor duplicate"""
+        queue_file = str(tmp_path / "proactivity_queue.json")
+        ProactivityQueue(queue_file=queue_file)
+        findings = [
+            {"type": "security", "description": f"Finding {i}", "file": "a.py", "line": i,
+             "context": {"code_snippet": f"eval(x{i})", "rule": "eval_usage"}}
+            for i in range(20)
+        ]
+        start = threading.Barrier(4)
+        errors = []
+
+        def scan():
+            queue = ProactivityQueue(queue_file=queue_file)
+            start.wait()
+            try:
+                for _ in range(5):
+                    queue.add_tasks(findings)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=scan) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        tasks = ProactivityQueue(queue_file=queue_file).load_queue()["tasks"]
+        assert len(tasks) == 20
+        assert len({t["id"] for t in tasks}) == 20
+        assert all(t["seen_count"] == 20 for t in tasks)
+
+    def test_export_json(self, queue, tmp_path):
+        """Test export writes the legacy JSON shape"""
+        queue.add_task("code_quality", "Unused import 'os'", "a.py")
+
+        output = queue.export_json(str(tmp_path / "export.json"))
+        data = json.loads(Path(output).read_text())
+
+        assert data["total_tasks"] == 1
+        assert data["high_confidence"] == 1
+        assert data["tasks"][0]["id"] == "task-001"
+
+    def test_add_tasks_bulk(self, queue):
+        """Test bulk add scores every finding and preserves order"""
+        findings = [
+            {"type": "best_practices", "description": f"Print statement {i}", "file": "a.py", "line": i}
+            for i in range(1, 6)
+        ]
+        findings.append({
+            "type": "security",
+            "description": "Potential security issue",
+            "file": "db.py",
+            "context": {"commit": "abc123"}
+        })
+
+        created = queue.add_tasks(findings)
+
+        assert [t["id"] for t in created] == [f"task-{i:03d}" for i in range(1, 7)]
+        assert created[-1]["confidence"] == "low"
+        assert queue.get_summary()["total_tasks"] == 6
+
+    def test_add_tasks_accepts_generator_and_empty(self, queue):
+        """Test bulk add works with generators and empty input"""
+        assert queue.add_tasks(iter([])) == []
+
+        created = queue.add_tasks(
+            {"type": "tech_debt", "description": f"TODO comment: {i}", "file": "a.py"}
+            for i in range(3)
+        )
+        assert len(created) == 3
+
+    def test_rediscovered_task_is_merged(self, queue):
+        """Test re-adding the same finding bumps seen_count instead of growing"""
+        finding = {
+            "type": "security",
+            "description": "Potential sql injection detected",
+            "file": "db.py",
+            "line": 12,
+            "context": {"code_snippet": "cur.execute('SELECT ' + x)", "rule": "sql_injection"}
+        }
+        first = queue.add_tasks([finding])[0]
+
+        # Same code moved to another line with different whitespace
+        moved = dict(finding, line=40, context={
+            "code_snippet": "cur.execute('SELECT '  +  x)", "rule": "sql_injection"
+        })
+        second = queue.add_tasks([moved, moved])
+
+        assert queue.get_summary()["total_tasks"] == 1
+        assert second[0]["id"] == first["id"]
+        assert second[0]["line"] == 40
+        stored = queue.get_task(first["id"])
+        assert stored["seen_count"] == 3
+        assert stored["last_seen"] >= first["last_seen"]
+        assert stored["line"] == 40
+
+    def test_distinct_rules_not_merged(self, queue):
+        """Test same snippet flagged by different rules stays separate"""
+        snippet = "eval(user_input)"
+        queue.add_tasks([
+            {"type": "security", "description": "x", "file": "a.py",
+             "context": {"code_snippet": snippet, "rule": "eval_usage"}},
+            {"type": "security", "description": "x", "file": "a.py",
+             "context": {"code_snippet": snippet, "rule": "shell_injection"}},
+        ])
+
+        assert queue.get_summary()["total_tasks"] == 2
+
+    def test_migration_merges_legacy_duplicates(self, tmp_path):
+        """Test duplicate findings in the legacy JSON collapse on import"""
+        legacy_task = {
+            "type": "best_practices",
+            "description": "Print statement (use logging instead): print(x)...",
+            "file": "a.py",
+            "line": 3,
+            "confidence": "medium",
+            "auto_fixable": False,
+            "estimated_effort": 15,
+            "risk_level": "medium",
+            "status": "queued",
+            "age_hours": 0
+        }
+        tasks = [
+            dict(legacy_task, id=f"task-{i:03d}", created_at=f"2025-12-1{i}T00:00:00Z")
+            for i in range(1, 4)
+        ]
+        queue_file = tmp_path / "proactivity_queue.json"
+        queue_file.write_text(json.dumps({"tasks": tasks}))
+
+        queue = ProactivityQueue(queue_file=str(queue_file))
+
+        assert queue.get_summary()["total_tasks"] == 1
+        merged = queue.get_task("task-001")
+        assert merged["seen_count"] == 3
+        assert merged["last_seen"] == "2025-12-13T00:00:00Z"
+
+    def test_migration_keeps_distinct_lines(self, tmp_path):
+        """Test legacy findings sharing a description on different lines stay separate"""
+        legacy_task = {
+            "type": "best_practices",
+            "description": "Print statement (use logging instead)",
+            "file": "a.py",
+            "confidence": "medium",
+            "created_at": "2025-12-10T00:00:00Z",
+            "status": "queued"
+        }
+        queue_file = tmp_path / "proactivity_queue.json"
+        queue_file.write_text(json.dumps({"tasks": [
+            dict(legacy_task, id="task-001", line=3),
+            dict(legacy_task, id="task-002", line=9),
+        ]}))
+
+        queue = ProactivityQueue(queue_file=str(queue_file))
+
+        assert queue.get_summary()["total_tasks"] == 2
+
+    def test_rescan_merges_into_migrated_task(self, tmp_path):
+        """Test a migrated finding rediscovered with snippet and rule merges, then keeps merging"""
+        queue_file = tmp_path / "proactivity_queue.json"
+        queue_file.write_text(json.dumps({"tasks": [{
+            "id": "task-001",
+            "type": "best_practices",
+            "description": "Print statement (use logging instead): print(x)...",
+            "file": "a.py",
+            "line": 3,
+            "confidence": "medium",
+            "created_at": "2025-12-10T00:00:00Z",
+            "status": "queued"
+        }]}))
+        queue = ProactivityQueue(queue_file=str(queue_file))
+
+        finding = {
+            "type": "best_practices",
+            "description": "Print statement (use logging instead): print(x)...",
+            "file": "a.py",
+            "line": 3,
+            "context": {"code_snippet": "print(x)", "rule": "print_statement"}
+        }
+        assert queue.add_tasks([finding])[0]["id"] == "task-001"
+
+        # Later rescans match on the adopted snippet, even after the code moves
+        assert queue.add_tasks([dict(finding, line=20)])[0]["id"] == "task-001"
+
+        assert queue.get_summary()["total_tasks"] == 1
+        stored = queue.get_task("task-001")
+        assert stored["seen_count"] == 3
+        assert stored["line"] == 20
+        assert stored["snippet"] == "print(x)"
+        assert stored["rule"] == "print_statement"
+
+    def test_fingerprints_recomputed_from_stored_fields(self, tmp_path):
+        """Test reopening a queue rebuilds the same fingerprints from the rows"""
+        queue = ProactivityQueue(queue_file=str(tmp_path / "proactivity_queue.json"))
+        queue.add_tasks([
+            {"type": "security", "description": "x", "file": "a.py", "line": 1,
+             "context": {"code_snippet": "eval(y)", "rule": "eval_usage"}},
+            {"type": "tech_debt", "description": "TODO comment: later", "file": "a.py", "line": 2},
+        ])
+        before = {t["id"]: t["fingerprint"] for t in queue.load_queue()["tasks"]}
+
+        conn = queue._connect()
+        with conn:
+            conn.execute("UPDATE tasks SET fingerprint = NULL")
+            conn.execute("DELETE FROM queue_meta WHERE key = 'fingerprint_version'")
+        conn.close()
+
+        reopened = ProactivityQueue(queue_file=str(tmp_path / "proactivity_queue.json"))
+        assert {t["id"]: t["fingerprint"] for t in reopened.load_queue()["tasks"]} == before
@@ -0,0 +1,209 @@
+"""
+Tests for Multi-Agent Convergence Orchestrator
+
+Test coverage for concurrent agent fan-out:
+- Agents run concurrently (wall time ~ slowest agent, not the sum)
+- Per-agent timeout
+- Global deadline with partial results
+- Streaming results in completion order
+- Pluggable scan executors (thread / process) with deterministic merging
+- Shared CommitContext gives the same results as per-agent git calls
+"""
+import pytest
+import asyncio
+import subprocess
+import time
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+from convergence import ConvergenceOrchestrator
+from shared.commit_context import CommitContext
+
+
+def make_orchestrator(monkeypatch, tmp_path, delays, timeout=5, deadline=None, fail=()):
+    """Build an orchestrator whose agents just sleep for the given delays"""
+    monkeypatch.chdir(tmp_path)
+    orchestrator = ConvergenceOrchestrator("sk-ant-test", timeout=timeout, deadline=deadline)
+
+    def fake_agent(name):
+        async def run(*args, **kwargs):
+            await asyncio.sleep(delays[name])
+            if name in fail:
+                raise RuntimeError(f"{name} exploded")
+            return {"agent": name, "results": []}
+        return run
+
+    monkeypatch.setattr(orchestrator, "_run_critic_agent", fake_agent("critic"))
+    monkeypatch.setattr(orchestrator, "_run_test_gen_agent", fake_agent("test_gen"))
+    monkeypatch.setattr(orchestrator, "_run_doc_writer_agent", fake_agent("doc_writer"))
+    return orchestrator
+
+
+class TestConvergenceFanOut:
+    """Test concurrent agent execution"""
+
+    def test_agents_run_concurrently(self, monkeypatch, tmp_path):
+        """Test wall time is the slowest agent, not the sum"""
+        orchestrator = make_orchestrator(
+            monkeypatch, tmp_path, {"critic": 0.3, "test_gen": 0.3, "doc_writer": 0.3}
+        )
+
+        started = time.monotonic()
+        results = asyncio.run(orchestrator._run_agents_parallel("HEAD", ["a.py"]))
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.8
+        assert all(r["success"] for r in results.values())
+        assert set(results) == {"critic", "test_gen", "doc_writer"}
+
+    def test_results_stream_in_completion_order(self, monkeypatch, tmp_path):
+        """Test callback fires as each agent finishes"""
+        orchestrator = make_orchestrator(
+            monkeypatch, tmp_path, {"critic": 0.3, "test_gen": 0.01, "doc_writer": 0.15}
+        )
+        order = []
+
+        asyncio.run(orchestrator._run_agents_parallel(
+            "HEAD", ["a.py"], on_result=lambda name, result: order.append(name)
+        ))
+
+        assert order == ["test_gen", "doc_writer", "critic"]
+
+    def test_per_agent_timeout_and_failure(self, monkeypatch, tmp_path):
+        """Test a slow or failing agent doesn't affect the others"""
+        orchestrator = make_orchestrator(
+            monkeypatch, tmp_path,
+            {"critic": 1.0, "test_gen": 0.01, "doc_writer": 0.01},
+            timeout=0.2, fail=("doc_writer",)
+        )
+
+        results = asyncio.run(orchestrator._run_agents_parallel("HEAD", ["a.py"]))
+
+        assert results["test_gen"]["success"] is True
+        assert "timed out" in results["critic"]["error"]
+        assert results["doc_writer"]["error"] == "doc_writer exploded"
+
+    def test_global_deadline_keeps_partial_results(self, monkeypatch, tmp_path):
+        """Test agents past the deadline are cancelled, finished ones kept"""
+        orchestrator = make_orchestrator(
+            monkeypatch, tmp_path,
+            {"critic": 2.0, "test_gen": 0.01, "doc_writer": 2.0},
+            timeout=5, deadline=0.2
+        )
+
+        started = time.monotonic()
+        results = asyncio.run(orchestrator._run_agents_parallel("HEAD", ["a.py"]))
+
+        assert time.monotonic() - started < 1.0
+        assert results["test_gen"]["success"] is True
+        assert "global deadline" in results["critic"]["error"]
+        assert "global deadline" in results["doc_writer"]["error"]
+
+
+SAMPLE_MODULES = {
+    "alpha.py": (
+        "def documented():\n"
+        "    \"\"\"Return one.\"\"\"\n"
+        "    return 1\n\n"
+        "def bare(x):\n"
+        "    print(x)\n"
+        "    data = open(x).read()\n"
+        "    return eval(data)\n"
+    ),
+    "beta.py": (
+        "import os\n\n"
+        "def run(cmd):\n"
+        "    os.system(cmd)\n\n"
+        "class Thing:\n"
+        "    def method(self):\n"
+        "        return 2\n"
+    ),
+}
+
+
+@pytest.fixture
+def sample_repo(monkeypatch, tmp_path):
+    """Create a git repo with one commit touching two Python files"""
+    monkeypatch.chdir(tmp_path)
+    for name, source in SAMPLE_MODULES.items():
+        (tmp_path / name).write_text(source)
+
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run(["git", "init", "-q"], check=True)
+    subprocess.run(["git", "add", "."], check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "sample"], check=True)
+    return tmp_path
+
+
+class TestConvergenceExecutors:
+    """Test pluggable scan executors"""
+
+    def run_scans(self, executor, context=None):
+        orchestrator = ConvergenceOrchestrator("sk-ant-test", executor=executor, max_workers=2)
+        files = list(SAMPLE_MODULES)
+
+        async def scan():
+            return (
+                await orchestrator._run_critic_agent("HEAD", context),
+                await orchestrator._run_test_gen_agent(files, context),
+                await orchestrator._run_doc_writer_agent(files, context),
+            )
+
+        try:
+            return asyncio.run(scan())
+        finally:
+            orchestrator.shutdown()
+
+    def test_process_pool_matches_thread_results(self, sample_repo):
+        """Test process-pool sharding merges to the same results as threads"""
+        critic_t, test_gen_t, doc_t = self.run_scans("thread")
+        critic_p, test_gen_p, doc_p = self.run_scans("process")
+
+        assert critic_t["issues_found"] > 0
+        assert critic_p["issues"] == critic_t["issues"]
+        assert test_gen_p == test_gen_t
+        assert doc_p == doc_t
+        assert [r["file"] for r in doc_p["results"]] == ["alpha.py", "beta.py"]
+
+    def test_critic_issue_order_matches_unsharded_review(self, sample_repo):
+        """Test sharded critic output keeps the category-then-diff ordering"""
+        critic, _, _ = self.run_scans("thread")
+        categories = [issue["category"] for issue in critic["issues"]]
+
+        rank = {"security": 0, "performance": 1, "best_practices": 2}
+        assert categories == sorted(categories, key=rank.get)
+
+    def test_shared_context_matches_per_agent_parsing(self, sample_repo):
+        """Test agents fed one CommitContext report the same as parsing themselves"""
+        context = CommitContext.from_git("HEAD")
+
+        assert self.run_scans("thread", context) == self.run_scans("thread")
+        assert self.run_scans("process", context) == self.run_scans("thread")
+
+    def test_invalid_executor_rejected(self, monkeypatch, tmp_path):
+        """Test unknown executor names raise ValueError"""
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(ValueError):
+            ConvergenceOrchestrator("sk-ant-test", executor="gpu")
+
+    def test_worker_agents_keyed_by_api_key(self, monkeypatch, tmp_path):
+        """Test cached scan agents are per API key and dropped on shutdown"""
+        import convergence
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(convergence, "_worker_agents", {})
+        first = ConvergenceOrchestrator("sk-ant-first")
+        second = ConvergenceOrchestrator("sk-ant-second")
+
+        class Agent:
+            def __init__(self, api_key):
+                self.api_key = api_key
+
+        assert convergence._get_worker_agent(Agent, "sk-ant-first").api_key == "sk-ant-first"
+        assert convergence._get_worker_agent(Agent, "sk-ant-second").api_key == "sk-ant-second"
+
+        first.shutdown()
+        assert list(convergence._worker_agents) == [(Agent, "sk-ant-second")]
+        second.shutdown()
+        assert convergence._worker_agents == {}
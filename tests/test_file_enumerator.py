@@ -0,0 +1,92 @@
+"""
+Tests for Repository File Enumeration
+
+Test coverage for:
+- git ls-files listing honours .gitignore
+- Ignored directories are skipped even when tracked
+- os.walk fallback prunes ignored directories outside git
+- GitWatcherAgent scans enumerated files through its worker pool
+"""
+import pytest
+import importlib.util
+import subprocess
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.file_enumerator import IgnoreRules, list_repository_files, walk_files
+
+
+IGNORE = ["node_modules/", "venv/", "*.pyc", ".env"]
+
+
+def make_tree(root: Path):
+    """Create a small source tree with ignorable files"""
+    for relative in [
+        "app.py", "README.md", "notes.txt", ".env",
+        "src/util.js", "src/cache.pyc",
+        "node_modules/lib/index.js", "venv/lib/site.py", "build/out.py",
+    ]:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# TODO: check\n")
+    (root / ".gitignore").write_text("build/\n")
+
+
+def git(root: Path, *args):
+    """Run a git command in root"""
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+def load_git_watcher():
+    """Load GitWatcherAgent from its hyphenated agent directory"""
+    agent_file = Path(__file__).parent.parent / "agents" / "git-watcher" / "agent.py"
+    spec = importlib.util.spec_from_file_location("git_watcher_agent", agent_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.GitWatcherAgent
+
+
+class TestFileEnumerator:
+    """Test ignore-aware repository file listing"""
+
+    def test_ignore_rules(self):
+        """Test directory, glob and exact-name patterns"""
+        rules = IgnoreRules(IGNORE)
+
+        assert rules.ignores_path(("node_modules", "a", "b.js"))
+        assert rules.ignores_path(("src", "cache.pyc"))
+        assert rules.ignores_path((".env",))
+        assert not rules.ignores_path(("src", "venvironment.py"))
+
+    def test_git_listing_honours_gitignore_and_prunes_tracked_dirs(self, tmp_path):
+        """Test gitignored files are excluded and tracked ignored dirs are skipped"""
+        make_tree(tmp_path)
+        git(tmp_path, "init", "-q")
+        git(tmp_path, "add", "-f", "node_modules")  # Tracked, but still ignored by pattern
+
+        files = list_repository_files(tmp_path, [".py", ".js", ".md"], IGNORE)
+
+        assert [f.relative_to(tmp_path).as_posix() for f in files] == ["README.md", "app.py", "src/util.js"]
+
+    def test_walk_fallback_outside_git(self, tmp_path, monkeypatch):
+        """Test os.walk never descends into ignored directories"""
+        make_tree(tmp_path)
+        monkeypatch.setattr("shared.file_enumerator.git_ls_files", lambda root: None)
+
+        files = list_repository_files(tmp_path, [".py", ".js"], IGNORE)
+
+        assert [f.relative_to(tmp_path).as_posix() for f in files] == ["app.py", "build/out.py", "src/util.js"]
+        assert not any("node_modules" in p for p in walk_files(tmp_path, IgnoreRules(IGNORE)))
+
+    def test_git_watcher_scans_with_worker_pool(self, tmp_path, monkeypatch):
+        """Test a pooled scan finds TODOs in file order, skipping ignored files"""
+        monkeypatch.chdir(tmp_path)
+        make_tree(tmp_path)
+        git(tmp_path, "init", "-q")
+
+        GitWatcherAgent = load_git_watcher()
+        watcher = GitWatcherAgent("sk-ant-test", repository_path=str(tmp_path), max_workers=2)
+        result = watcher._scan_repository("todos")
+
+        assert [t["file"] for t in result["tasks"]] == ["README.md", "app.py", "src/util.js"]
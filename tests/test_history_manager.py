@@ -0,0 +1,141 @@
+"""
+Tests for the Conversation History Manager
+
+Test coverage for:
+- Under-budget histories left untouched
+- Old tool result truncation
+- Folding old turns into a pinned summary without splitting tool pairs
+- Bounded per-turn input size in a long BaseAgent session
+"""
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.history_manager import HistoryManager, estimate_tokens, is_turn_start
+from tests.test_base_agent import EchoAgent, FINAL_TURN, message, text_block, tool_block
+
+
+def tool_exchange(turn, result_chars):
+    """One turn: user request, assistant tool_use, tool_result, final answer"""
+    return [
+        {"role": "user", "content": f"question {turn}"},
+        {"role": "assistant", "content": [tool_block(f"tu_{turn}", "execute_select", {"query": "SELECT *"})]},
+        {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": f"tu_{turn}", "content": "x" * result_chars}
+        ]},
+        {"role": "assistant", "content": [text_block(f"answer {turn}")]},
+    ]
+
+
+class TestHistoryManager:
+    """Test token-budgeted compaction"""
+
+    def test_under_budget_untouched(self):
+        """Test a small history is returned as the same list"""
+        history = tool_exchange(0, 100)
+        manager = HistoryManager(budget_tokens=10000)
+
+        assert manager.compact(history) is history
+        assert manager.summary == ""
+
+    def test_truncates_old_tool_results_first(self):
+        """Test old tool results are cut to a preview; recent ones are kept"""
+        history = tool_exchange(0, 20000) + tool_exchange(1, 20000) + tool_exchange(2, 100)
+        manager = HistoryManager(
+            budget_tokens=6000, target_ratio=0.9, keep_recent_turns=2, tool_result_max_chars=500
+        )
+
+        compacted = manager.compact(history)
+
+        assert compacted[2]["content"][0]["content"].endswith("[truncated 19500 chars]")
+        assert len(compacted[6]["content"][0]["content"]) == 20000
+        assert history[2]["content"][0]["content"] == "x" * 20000
+        assert manager.summary == ""
+
+    def test_truncation_idempotent(self):
+        """Test a truncated result is never truncated again"""
+        history = tool_exchange(0, 20000) + tool_exchange(1, 20000) + tool_exchange(2, 100)
+        manager = HistoryManager(
+            budget_tokens=6000, target_ratio=0.9, keep_recent_turns=2, tool_result_max_chars=500
+        )
+
+        truncated = manager.compact(history)[2]
+
+        assert manager._truncate_tool_results(truncated) is truncated
+        assert truncated["content"][0]["content"].endswith("[truncated 19500 chars]")
+
+    def test_compactions_count_only_changes(self):
+        """Test an over-budget history that can't be reduced isn't counted as compacted"""
+        history = tool_exchange(0, 50000)
+        manager = HistoryManager(budget_tokens=1000)
+
+        manager.compact(history)
+        manager.compact(history)
+
+        assert manager.compactions == 0
+
+    def test_folds_old_turns_into_summary(self):
+        """Test whole turns are dropped into the summary until under target"""
+        history = []
+        for turn in range(20):
+            history += tool_exchange(turn, 400)
+        manager = HistoryManager(budget_tokens=1500, target_ratio=0.5)
+
+        compacted = manager.compact(history)
+
+        assert estimate_tokens(compacted) <= 750
+        assert is_turn_start(compacted[0])
+        assert compacted[-4:] == history[-4:]
+        assert "- User: question 0" in manager.summary
+        assert "- Tools used: execute_select" in manager.summary
+        assert manager.dropped_messages == len(history) - len(compacted)
+        assert manager.system_prompt("Base.").startswith("Base.\n\n## Earlier in this conversation")
+
+    def test_current_turn_never_dropped(self):
+        """Test a single oversized turn is kept whole"""
+        history = tool_exchange(0, 50000)
+        manager = HistoryManager(budget_tokens=1000)
+
+        assert manager.compact(history) == history
+
+    def test_summary_bounded(self):
+        """Test the pinned summary stays within summary_max_chars"""
+        manager = HistoryManager(budget_tokens=500, summary_max_chars=300)
+        history = []
+        for turn in range(50):
+            history += tool_exchange(turn, 400)
+            history = manager.compact(history)
+
+        assert len(manager.summary) <= 300
+        assert manager.summary.startswith("- ")
+
+
+class TestAgentHistoryBudget:
+    """Test BaseAgent keeps per-turn input bounded"""
+
+    def test_input_size_stops_growing(self):
+        """Test requests stay under budget over a long session"""
+        turns = 30
+        responses = []
+        for turn in range(turns):
+            responses += [message("tool_use", tool_block(f"tu_{turn}", "echo", {"value": "y" * 8000})), FINAL_TURN]
+        agent = EchoAgent(responses)
+        agent.history_manager = HistoryManager(budget_tokens=8000)
+
+        for turn in range(turns):
+            agent.chat(f"question {turn}")
+
+        sizes = [estimate_tokens(r["messages"]) for r in agent.anthropic.messages.requests]
+        assert max(sizes) < 8000 + 4000
+        assert agent.history_manager.dropped_messages > 0
+        assert "question 0" in agent.anthropic.messages.requests[-1]["system"][0]["text"]
+
+    def test_clear_history_resets_summary(self):
+        """Test clearing the conversation forgets the pinned summary"""
+        agent = EchoAgent([])
+        agent.history_manager.summary = "- User: old"
+
+        agent.clear_history()
+
+        assert agent.history_manager.summary == ""
@@ -0,0 +1,192 @@
+"""
+Tests for the LLM Transport
+
+Test coverage for:
+- Replaying scripted tool calls through chat(), chat_stream() and the async adapter
+- Script selection and per-turn replies across a multi-question session
+- Seeded latency distributions
+- LLM_TRANSPORT selection
+- Recording live responses into a replayable script
+"""
+import pytest
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared import llm_transport
+from shared.async_base_agent import AsyncAgentAdapter
+from shared.llm_transport import (
+    LatencyModel, RecordingClient, ReplayClient, ReplayTransport, create_client, current_turn
+)
+from tests.test_base_agent import EchoAgent
+
+
+SCRIPTS = [
+    {"match": "echo", "turns": [
+        {"content": [
+            {"type": "text", "text": "Echoing now"},
+            {"type": "tool_use", "name": "echo", "input": {"value": 1}},
+            {"type": "tool_use", "name": "echo", "input": {"value": 2}},
+        ]},
+        {"content": [{"type": "text", "text": "Echoed 1 and 2"}]},
+    ]},
+    {"turns": [{"content": [{"type": "text", "text": "Nothing to echo"}]}]},
+]
+
+
+class ReplayEchoAgent(EchoAgent):
+    """EchoAgent talking to a replay transport instead of canned messages"""
+
+    def __init__(self, transport):
+        super().__init__([])
+        self.transport = transport
+        self.anthropic = transport.client()
+
+    def execute_tool(self, tool_name, tool_input):
+        self.calls.append(tool_input)
+        return json.dumps({"echo": tool_input["value"]})
+
+
+class TestReplayTransport:
+    """Test replayed conversations"""
+
+    def test_chat_replays_tool_calls(self):
+        """Test chat() runs the scripted tools and returns the final text"""
+        agent = ReplayEchoAgent(ReplayTransport(SCRIPTS))
+
+        assert agent.chat("please echo") == "Echoed 1 and 2"
+        assert agent.calls == [{"value": 1}, {"value": 2}]
+        assert agent.usage_totals["input_tokens"] > 0
+
+    def test_chat_stream_replays_tool_calls(self):
+        """Test chat_stream() yields the scripted text and tool events"""
+        agent = ReplayEchoAgent(ReplayTransport(SCRIPTS))
+
+        events = list(agent.chat_stream("please echo"))
+
+        assert [e["name"] for e in events if e["type"] == "tool_use"] == ["echo", "echo"]
+        assert events[-1] == {"type": "done", "text": "Echoed 1 and 2"}
+
+    def test_async_adapter_replays(self):
+        """Test the async adapter shares the wrapped agent's transport"""
+        transport = ReplayTransport(SCRIPTS)
+        agent = ReplayEchoAgent(transport)
+
+        text = asyncio.run(AsyncAgentAdapter(agent).chat("please echo"))
+
+        assert text == "Echoed 1 and 2"
+        assert transport.calls == 2
+
+    def test_each_question_starts_its_script(self):
+        """Test later questions in one session replay from their first turn"""
+        agent = ReplayEchoAgent(ReplayTransport(SCRIPTS))
+
+        assert agent.chat("hello") == "Nothing to echo"
+        assert agent.chat("now echo") == "Echoed 1 and 2"
+        assert agent.chat("echo again") == "Echoed 1 and 2"
+        assert len(agent.calls) == 4
+
+    def test_current_turn(self):
+        """Test requests are located by their turn-starting user message"""
+        messages = [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "done"},
+            {"role": "user", "content": [{"type": "text", "text": "second"}]},
+            {"role": "assistant", "content": [{"type": "tool_use", "id": "t", "name": "echo", "input": {}}]},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t", "content": "{}"}]},
+        ]
+
+        assert current_turn(messages) == ("second", 1)
+
+    def test_concurrent_conversations_independent(self):
+        """Test interleaved conversations each get their own scripted turns"""
+        transport = ReplayTransport(SCRIPTS, LatencyModel("fixed", ms=20))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            answers = list(pool.map(lambda _: ReplayEchoAgent(transport).chat("echo"), range(8)))
+
+        assert answers == ["Echoed 1 and 2"] * 8
+        assert transport.calls == 16
+        assert transport.peak_in_flight > 1
+
+
+class TestLatencyModel:
+    """Test latency distributions"""
+
+    @pytest.mark.parametrize("spec", [
+        {"distribution": "uniform", "min_ms": 10, "max_ms": 20},
+        {"distribution": "normal", "mean_ms": 100, "stdev_ms": 30},
+        {"distribution": "lognormal", "median_ms": 800, "sigma": 0.5},
+        {"distribution": "empirical", "samples_ms": [5, 50, 500]},
+    ])
+    def test_seeded_sequences_repeat(self, spec):
+        """Test the same seed draws the same latencies"""
+        first = LatencyModel(seed=3, **spec)
+        second = LatencyModel(seed=3, **spec)
+
+        samples = [first.sample_ms() for _ in range(20)]
+
+        assert samples == [second.sample_ms() for _ in range(20)]
+        assert all(sample >= 0 for sample in samples)
+
+    def test_per_output_token_time(self):
+        """Test generation time is added per output token"""
+        latency = LatencyModel("fixed", ms=100, per_output_token_ms=2)
+
+        assert latency.sample_ms(output_tokens=50) == 200
+
+    def test_replay_sleeps(self):
+        """Test a replayed call takes the sampled latency"""
+        client = ReplayTransport(SCRIPTS, LatencyModel("fixed", ms=50)).client()
+
+        started = time.perf_counter()
+        client.messages.create(model="m", max_tokens=10, messages=[{"role": "user", "content": "hi"}])
+
+        assert time.perf_counter() - started >= 0.05
+
+    def test_unknown_distribution(self):
+        """Test an unknown distribution is rejected"""
+        with pytest.raises(ValueError):
+            LatencyModel("pareto")
+
+
+class TestTransportSelection:
+    """Test LLM_TRANSPORT and recording"""
+
+    def test_env_selects_replay(self, tmp_path, monkeypatch):
+        """Test LLM_TRANSPORT=replay:<file> gives every client one shared transport"""
+        script = tmp_path / "replay.json"
+        script.write_text(json.dumps({"scripts": SCRIPTS}))
+        monkeypatch.setenv("LLM_TRANSPORT", f"replay:{script}")
+        monkeypatch.setattr(llm_transport, "_env_transports", {})
+
+        first, second = create_client(None), create_client(None)
+
+        assert isinstance(first, ReplayClient)
+        assert first.transport is second.transport
+
+    def test_env_rejects_unknown(self, monkeypatch):
+        """Test an unknown LLM_TRANSPORT value fails loudly"""
+        monkeypatch.setenv("LLM_TRANSPORT", "fake")
+
+        with pytest.raises(ValueError):
+            create_client(None)
+
+    def test_recording_replays_identically(self, tmp_path):
+        """Test a recorded session replays the same answers and tool calls"""
+        live = ReplayEchoAgent(ReplayTransport(SCRIPTS))
+        live.anthropic = recorder = RecordingClient(live.anthropic)
+        live_answers = [live.chat("hi"), live.chat("echo please")]
+        recorder.save(str(tmp_path / "recorded.json"))
+
+        replayed = ReplayEchoAgent(ReplayTransport.from_file(str(tmp_path / "recorded.json")))
+        replay_answers = [replayed.chat("hi"), replayed.chat("echo please")]
+
+        assert replay_answers == live_answers
+        assert replayed.calls == live.calls
+        recorded = json.loads((tmp_path / "recorded.json").read_text())
+        assert recorded["latency"]["distribution"] == "empirical"
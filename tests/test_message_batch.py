@@ -0,0 +1,222 @@
+"""
+Tests for the Message Batch runner
+
+Test coverage for:
+- Submitting queued requests and mapping results back by custom_id
+- Polling until processing ends, and timing out
+- Errored / expired requests
+- Doc writer and test generator backfills through one batch
+"""
+import pytest
+from types import SimpleNamespace
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared import message_batch
+from shared.message_batch import MessageBatch
+from tests.test_base_agent import EchoAgent, message, text_block
+from tests.test_test_index import load_agent
+
+
+SOURCE = '''
+def add(a: int, b: int) -> int:
+    return a + b
+
+def scale(value: float, factor: float = 2.0) -> float:
+    return value * factor
+'''
+
+
+class FakeBatches:
+    """Local stand-in for client.messages.batches"""
+
+    def __init__(self, respond, polls_until_ended=1):
+        self.respond = respond
+        self.polls_until_ended = polls_until_ended
+        self.created = []
+        self.polls = 0
+
+    def create(self, requests):
+        self.created.append(requests)
+        return SimpleNamespace(id=f"msgbatch_{len(self.created)}", processing_status="in_progress")
+
+    def retrieve(self, batch_id):
+        self.polls += 1
+        ended = self.polls >= self.polls_until_ended
+        return SimpleNamespace(id=batch_id, processing_status="ended" if ended else "in_progress")
+
+    def results(self, batch_id):
+        requests = self.created[int(batch_id.split("_")[1]) - 1]
+        # Results come back in any order
+        for request in reversed(requests):
+            yield SimpleNamespace(custom_id=request["custom_id"], result=self.respond(request["params"]))
+
+
+def succeeded(text):
+    response = message("end_turn", text_block(text))
+    response.usage = SimpleNamespace(input_tokens=100, output_tokens=20)
+    return SimpleNamespace(type="succeeded", message=response)
+
+
+def echo_prompt(params):
+    return succeeded(f"re: {params['messages'][0]['content']}")
+
+
+def prompted_function(params):
+    """Function name from a doc writer / test generator prompt"""
+    return params["messages"][0]["content"].split("Function: ")[1].split("\n")[0]
+
+
+def client_with(batches):
+    return SimpleNamespace(messages=SimpleNamespace(batches=batches))
+
+
+class TestMessageBatch:
+    """Test batch submission, polling and result mapping"""
+
+    def test_results_mapped_to_handles(self):
+        """Test each handle receives its own response whatever the result order"""
+        batches = FakeBatches(echo_prompt)
+        batch = MessageBatch(client_with(batches), poll_interval=0)
+        handles = [batch.add({"messages": [{"role": "user", "content": f"q{i}"}]}) for i in range(3)]
+
+        batch.run()
+
+        assert len(batches.created) == 1
+        assert [h.text for h in handles] == ["re: q0", "re: q1", "re: q2"]
+        assert all(h.ok for h in handles)
+
+    def test_polls_until_ended(self):
+        """Test wait() keeps polling while the batch is in progress"""
+        batches = FakeBatches(echo_prompt, polls_until_ended=3)
+        batch = MessageBatch(client_with(batches), poll_interval=0)
+        handle = batch.add({"messages": [{"role": "user", "content": "q"}]})
+
+        batch.run()
+
+        assert batches.polls == 3
+        assert handle.ok
+
+    def test_timeout(self):
+        """Test wait() gives up after timeout seconds"""
+        batches = FakeBatches(echo_prompt, polls_until_ended=10 ** 9)
+        batch = MessageBatch(client_with(batches), poll_interval=0, timeout=0)
+        batch.add({"messages": [{"role": "user", "content": "q"}]})
+
+        with pytest.raises(TimeoutError):
+            batch.run()
+
+    def test_failed_requests(self):
+        """Test errored and expired requests carry an error, not a message"""
+        outcomes = {
+            "bad": SimpleNamespace(type="errored", error=SimpleNamespace(
+                type="error", error=SimpleNamespace(type="invalid_request_error", message="max_tokens too large")
+            )),
+            "late": SimpleNamespace(type="expired"),
+        }
+        batches = FakeBatches(lambda params: outcomes[params["messages"][0]["content"]])
+        batch = MessageBatch(client_with(batches), poll_interval=0)
+        bad = batch.add({"messages": [{"role": "user", "content": "bad"}]})
+        late = batch.add({"messages": [{"role": "user", "content": "late"}]})
+
+        batch.run()
+
+        assert (bad.ok, bad.error) == (False, "max_tokens too large")
+        assert (late.status, late.error) == ("expired", "Request expired")
+        assert bad.text == ""
+
+    def test_large_batches_split(self, monkeypatch):
+        """Test requests beyond the per-batch limit go into further batches"""
+        monkeypatch.setattr(message_batch, "MAX_BATCH_REQUESTS", 2)
+        batches = FakeBatches(echo_prompt)
+        batch = MessageBatch(client_with(batches), poll_interval=0)
+        handles = [batch.add({"messages": [{"role": "user", "content": f"q{i}"}]}) for i in range(5)]
+
+        batch.run()
+
+        assert [len(requests) for requests in batches.created] == [2, 2, 1]
+        assert handles[4].text == "re: q4"
+
+    def test_add_after_submit_rejected(self):
+        """Test a submitted batch can't take more requests"""
+        batch = MessageBatch(client_with(FakeBatches(echo_prompt)), poll_interval=0)
+        batch.add({"messages": []})
+        batch.submit()
+
+        with pytest.raises(RuntimeError):
+            batch.add({"messages": []})
+
+
+class TestAgentBatchMode:
+    """Test BaseAgent batch helpers and the backfill agents"""
+
+    def test_run_batch_records_usage(self):
+        """Test succeeded batch results count towards usage_totals"""
+        agent = EchoAgent([])
+        agent.anthropic.messages.batches = FakeBatches(echo_prompt)
+        batch = agent.message_batch(poll_interval=0)
+        for prompt in ("a", "b"):
+            batch.add(agent.single_shot_params(prompt, max_tokens=100))
+
+        agent.run_batch(batch)
+
+        assert agent.model_calls == 2
+        assert agent.usage_totals["input_tokens"] == 200
+
+    def test_single_shot_params_cache_system_prompt(self):
+        """Test single-shot requests mark the shared system prompt for caching"""
+        agent = EchoAgent([])
+
+        params = agent.single_shot_params("hello", max_tokens=100)
+
+        assert params["system"] == [
+            {"type": "text", "text": "You echo things.", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert params["messages"] == [{"role": "user", "content": "hello"}]
+
+    def test_doc_writer_backfill(self, tmp_path):
+        """Test write_docstrings makes one batch and keeps target order"""
+        source_file = tmp_path / "math_utils.py"
+        source_file.write_text(SOURCE)
+        DocWriterAgent = load_agent("doc-writer", "DocWriterAgent")
+        agent = DocWriterAgent("sk-ant-test")
+        batches = FakeBatches(lambda params: succeeded(f"Docstring for {prompted_function(params)}"))
+        agent.anthropic = client_with(batches)
+
+        results = agent.write_docstrings([
+            {"file_path": str(source_file), "function_name": "add"},
+            {"file_path": str(source_file), "function_name": "missing"},
+            {"file_path": str(source_file), "function_name": "scale"},
+        ], poll_interval=0)
+
+        assert len(batches.created) == 1
+        assert len(batches.created[0]) == 2
+        assert results[0]["docstring"] == "Docstring for add"
+        assert results[0]["args"] == [{"name": "a", "type": "int"}, {"name": "b", "type": "int"}]
+        assert results[1] == {"success": False, "error": f"Function 'missing' not found in {source_file}"}
+        assert results[2]["docstring"] == "Docstring for scale"
+
+    def test_test_generator_backfill(self, tmp_path):
+        """Test generate_tests_batch returns code per function and maps failures"""
+        source_file = tmp_path / "math_utils.py"
+        source_file.write_text(SOURCE)
+        TestGeneratorAgent = load_agent("test-generator", "TestGeneratorAgent")
+        agent = TestGeneratorAgent("sk-ant-test")
+
+        def respond(params):
+            if prompted_function(params) == "scale":
+                return SimpleNamespace(type="canceled")
+            return succeeded("```python\ndef test_add_happy_path():\n    assert add(1, 2) == 3\n```")
+        batches = FakeBatches(respond)
+        agent.anthropic = client_with(batches)
+
+        results = agent.generate_tests_batch([
+            {"file_path": str(source_file), "function_name": "add"},
+            {"file_path": str(source_file), "function_name": "scale", "test_type": "integration"},
+        ], poll_interval=0)
+
+        assert results[0]["success"]
+        assert results[0]["test_code"].startswith("def test_add_happy_path")
+        assert results[0]["test_type"] == "unit"
+        assert results[1] == {"success": False, "error": "Failed to generate tests: Request canceled"}
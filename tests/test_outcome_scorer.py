@@ -0,0 +1,162 @@
+"""
+Tests for the Outcome Scorer
+
+Test coverage for:
+- Smoothed success rate and latency blended into the routing score
+- Task-type stats with fallback to agent-wide stats
+- Ties broken toward the more reliable, faster agent
+- Snapshot refresh without per-route queries
+- Orchestrator re-ranking routes by outcomes
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.outcome_scorer import OutcomeScorer, OutcomeStats
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+from orchestrator import AgentOrchestrator
+
+
+def row(agent_id, attempts, successes, p50_ms=None, task_type=None):
+    return {"agent_id": agent_id, "task_type": task_type, "attempts": attempts,
+            "successes": successes, "p50_ms": p50_ms}
+
+
+class StatsSource:
+    """Stats loader counting how often it's queried"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def __call__(self):
+        self.queries += 1
+        if isinstance(self.rows, Exception):
+            raise self.rows
+        return self.rows
+
+
+def match(agent_id, confidence=1):
+    return {"agent_id": agent_id, "confidence": confidence}
+
+
+class TestOutcomeScorer:
+    """Test scoring and ranking"""
+
+    def test_reliable_agent_wins_tie(self):
+        """Test equal keyword confidence goes to the agent that succeeds more"""
+        scorer = OutcomeScorer(StatsSource([row("flaky", 50, 25, 2000), row("solid", 50, 49, 2000)]))
+
+        ranked = scorer.rank([match("flaky"), match("solid")])
+
+        assert [m["agent_id"] for m in ranked] == ["solid", "flaky"]
+        assert ranked[0]["score"] > ranked[1]["score"]
+
+    def test_faster_agent_wins_tie(self):
+        """Test with equal success rates the faster agent ranks first"""
+        scorer = OutcomeScorer(StatsSource([row("slow", 40, 40, 30000), row("fast", 40, 40, 1500)]))
+
+        ranked = scorer.rank([match("slow"), match("fast")])
+
+        assert [m["agent_id"] for m in ranked] == ["fast", "slow"]
+        assert ranked[0]["p50_ms"] == 1500
+
+    def test_keywords_still_dominate(self):
+        """Test outcomes don't overturn a clearly stronger keyword match"""
+        scorer = OutcomeScorer(StatsSource([row("weak", 40, 10, 20000), row("strong", 40, 40, 500)]))
+
+        ranked = scorer.rank([match("weak", confidence=3), match("strong", confidence=1)])
+
+        assert ranked[0]["agent_id"] == "weak"
+
+    def test_few_attempts_smoothed(self):
+        """Test a short perfect record doesn't beat a long near-perfect one"""
+        scorer = OutcomeScorer(StatsSource([row("lucky", 2, 2, 2000), row("proven", 200, 196, 2000)]))
+
+        assert scorer.rank([match("lucky"), match("proven")])[0]["agent_id"] == "proven"
+
+    def test_unknown_agents_keep_order(self):
+        """Test agents without history score equally and keep their order"""
+        scorer = OutcomeScorer(StatsSource([]))
+
+        ranked = scorer.rank([match("b"), match("a")])
+
+        assert [m["agent_id"] for m in ranked] == ["b", "a"]
+        assert ranked[0]["success_rate"] == pytest.approx(0.8)
+
+    def test_task_type_fallback(self):
+        """Test task-type stats are used once there are enough, else agent-wide stats"""
+        scorer = OutcomeScorer(StatsSource([
+            row("db", 100, 90, 3000),
+            row("db", 10, 2, 9000, task_type="report"),
+            row("db", 1, 0, 9000, task_type="lookup"),
+        ]))
+
+        assert scorer.stats_for("db", "report") == OutcomeStats(10, 2, 9000.0)
+        assert scorer.stats_for("db", "lookup") == OutcomeStats(100, 90, 3000.0)
+        assert scorer.stats_for("db", "other") == OutcomeStats(100, 90, 3000.0)
+        assert scorer.stats_for("vps", "report") is None
+
+    def test_routes_read_snapshot(self):
+        """Test scoring uses the snapshot, querying only on refresh"""
+        source = StatsSource([row("a", 10, 10)])
+        scorer = OutcomeScorer(source)
+
+        for _ in range(20):
+            scorer.rank([match("a")])
+        assert source.queries == 1
+
+        source.rows = [row("a", 10, 0)]
+        assert scorer.refresh() is True
+        assert scorer.stats_for("a").successes == 0
+
+    def test_failed_refresh_keeps_snapshot(self):
+        """Test a database error leaves the previous stats in place"""
+        source = StatsSource([row("a", 10, 7)])
+        scorer = OutcomeScorer(source)
+
+        source.rows = ConnectionError("neon unreachable")
+
+        assert scorer.refresh() is False
+        assert scorer.stats_for("a").successes == 7
+
+    def test_background_refresh(self):
+        """Test the refresh thread reloads stats periodically"""
+        source = StatsSource([])
+        scorer = OutcomeScorer(source)
+        scorer.start_refreshing(interval=0.01)
+        try:
+            for _ in range(500):
+                if source.queries > 2:
+                    break
+                time.sleep(0.01)
+        finally:
+            scorer.stop_refreshing()
+
+        assert source.queries > 2
+
+
+class TestOrchestratorOutcomeRouting:
+    """Test route_task ranks by outcomes"""
+
+    def test_tie_routed_to_reliable_agent(self, tmp_path):
+        """Test a keyword tie routes to the agent with the better record"""
+        registry = tmp_path / "registry.json"
+        registry.write_text(json.dumps({"agents": [
+            {"id": "neon", "name": "Neon", "description": "", "path": "", "triggers": ["database"]},
+            {"id": "convex", "name": "Convex", "description": "", "path": "", "triggers": ["database"]},
+        ]}))
+        scorer = OutcomeScorer(StatsSource([
+            row("neon", 30, 12, 8000, task_type="query_response"),
+            row("convex", 30, 29, 2000, task_type="query_response"),
+        ]))
+        orchestrator = AgentOrchestrator(registry_path=str(registry), outcome_scorer=scorer)
+
+        result = orchestrator.route_task("check the database", auto_select=True, task_type="query_response")
+
+        assert result["agent"]["agent_id"] == "convex"
+        assert result["alternatives"][0]["agent_id"] == "neon"
@@ -0,0 +1,117 @@
+"""
+Tests for the Single-Pass Pattern Scanner
+
+Test coverage for:
+- Line offset table and line lookup
+- Content rules match like re.finditer
+- Line rules match like re.search per line
+- Overlapping rules are all reported
+- GitWatcherAgent findings from one scan
+"""
+import pytest
+import importlib.util
+import re
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.pattern_scanner import PatternScanner, line_number, line_offsets
+
+
+def load_git_watcher():
+    """Load GitWatcherAgent from its hyphenated agent directory"""
+    agent_file = Path(__file__).parent.parent / "agents" / "git-watcher" / "agent.py"
+    spec = importlib.util.spec_from_file_location("git_watcher_agent", agent_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.GitWatcherAgent
+
+
+class TestPatternScanner:
+    """Test compiled multi-pattern scanning"""
+
+    def test_line_lookup(self):
+        """Test offsets map to 1-based line numbers"""
+        content = "a\nbb\n\nccc"
+        offsets = line_offsets(content)
+
+        assert offsets == [0, 2, 5, 6]
+        assert [line_number(offsets, pos) for pos in range(len(content))] == [1, 1, 2, 2, 2, 3, 4, 4, 4]
+
+    def test_content_rules_match_finditer(self):
+        """Test content rules report the same matches as re.finditer per pattern"""
+        content = "x = eval(a) + eval(b)\npassword = 'a\nb'\nexec(c)\n"
+        patterns = {"dangerous_eval": [r"eval\(", r"exec\("], "exposed_secret": [r"password\s*=\s*['\"][^'\"]+['\"]"]}
+
+        scanner = PatternScanner()
+        for rule, rule_patterns in patterns.items():
+            scanner.add_rule(rule, rule_patterns)
+
+        expected = sorted(
+            (m.start(), rule)
+            for rule, rule_patterns in patterns.items()
+            for pattern in rule_patterns
+            for m in re.finditer(pattern, content)
+        )
+        found = [(f["start"], f["rule"]) for f in scanner.scan(content)]
+
+        assert found == expected
+        assert [f["line"] for f in scanner.scan(content)] == [1, 1, 2, 4]
+
+    def test_line_rules_stay_within_line(self):
+        """Test line rules never match across a line break"""
+        scanner = PatternScanner().add_rule("todo", [r"#\s*TODO[:\s]+(.+)"], per_line=True)
+        content = "# TODO\nnext line\n# TODO: real one  # TODO: again\n"
+
+        findings = scanner.scan(content)
+
+        assert [(f["line"], f["groups"]) for f in findings] == [(3, ["real one  # TODO: again"])]
+
+    def test_overlapping_rules_all_reported(self):
+        """Test matches of different rules at the same position are all found"""
+        scanner = PatternScanner()
+        scanner.add_rule("call", [r"\w+\("])
+        scanner.add_rule("eval", [r"eval\("])
+
+        assert [f["rule"] for f in scanner.scan("eval(x)")] == ["call", "eval"]
+
+
+class TestGitWatcherScan:
+    """Test GitWatcherAgent uses one scan for all finding types"""
+
+    def test_find_all_matches_per_pattern_results(self, tmp_path, monkeypatch):
+        """Test TODO, security and function findings match per-pattern scanning"""
+        monkeypatch.chdir(tmp_path)
+        GitWatcherAgent = load_git_watcher()
+        watcher = GitWatcherAgent("sk-ant-test", repository_path=str(tmp_path))
+
+        content = (
+            "def load(path):\n"
+            "    # FIXME: handle errors\n"
+            "    password = \"hunter2\"\n"
+            "    return eval(open(path).read())  # TODO: no eval\n"
+            "\n"
+            "def _private():\n"
+            "    exec('pass')\n"
+        )
+
+        findings = watcher._find_all(content)
+
+        assert [(f["line"], f["comment"]) for f in findings["todos"]] == [(2, "handle errors"), (4, "no eval")]
+        assert [(f["rule"], f["line"]) for f in findings["security"]] == [
+            ("exposed_secret", 3), ("dangerous_eval", 4), ("dangerous_eval", 7)
+        ]
+        assert findings["functions"] == [{"name": "load", "line": 1}]
+
+    def test_scan_repository_reads_each_file_once(self, tmp_path, monkeypatch):
+        """Test a full scan does one cache lookup per file"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "app.py").write_text("# TODO: tidy\ndef run():\n    eval('1')\n")
+
+        GitWatcherAgent = load_git_watcher()
+        watcher = GitWatcherAgent("sk-ant-test", repository_path=str(tmp_path))
+        result = watcher._scan_repository("all")
+
+        assert watcher.analysis_cache.misses == 1
+        assert watcher.analysis_cache.hits == 0
+        assert [t["type"] for t in result["tasks"]][:2] == ["tech_debt", "security"]
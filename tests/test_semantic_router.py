@@ -0,0 +1,174 @@
+"""
+Tests for the Semantic Router
+
+Test coverage for:
+- Cosine ranking of agents against a task
+- On-disk vector cache: agents embedded once across restarts and reloads
+- Hashing embedder matching word forms
+- Orchestrator semantic tier on keyword misses and ties only
+- A route ranking against the registry snapshot it started with
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.semantic_router import HashingEmbedder, SemanticRouter, agent_text, create_embedder
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+from orchestrator import AgentOrchestrator
+
+
+AXES = ["server", "contractor", "project"]
+
+
+class AxisEmbedder:
+    """One dimension per topic word; records every text it embeds"""
+    model_id = "axis"
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(text.lower().count(axis)) for axis in AXES] for text in texts]
+
+
+AGENTS = [
+    {"id": "vps", "name": "VPS", "description": "Watches the server", "path": "",
+     "triggers": ["vps", "status"], "capabilities": {"monitoring": ["server load"]}},
+    {"id": "contractors", "name": "Contractors", "description": "Contractor records", "path": "",
+     "triggers": ["contractor", "status"]},
+    {"id": "projects", "name": "Projects", "description": "Project tracking for each contractor", "path": "",
+     "triggers": ["project"]},
+]
+
+
+class TestSemanticRouter:
+    """Test ranking and the vector cache"""
+
+    def test_rank(self):
+        """Test agents are ranked by cosine similarity"""
+        router = SemanticRouter(AxisEmbedder())
+        router.fit(AGENTS)
+
+        ranked = router.rank("which contractor handles this?", top_k=2)
+
+        assert [pos for pos, _ in ranked] == [1, 2]
+        assert ranked[0][1] == pytest.approx(1.0)
+        assert ranked[1][1] == pytest.approx(0.447, abs=1e-3)
+
+    def test_rank_before_fit(self):
+        """Test an unfitted router ranks nothing"""
+        assert SemanticRouter(AxisEmbedder()).rank("server") == []
+
+    def test_cache_survives_restart(self, tmp_path):
+        """Test cached agent vectors aren't embedded again by a new router"""
+        cache = tmp_path / "vectors.json"
+        SemanticRouter(AxisEmbedder(), cache_path=str(cache)).fit(AGENTS)
+
+        embedder = AxisEmbedder()
+        router = SemanticRouter(embedder, cache_path=str(cache))
+
+        assert router.fit(AGENTS) == 0
+        assert embedder.calls == []
+        assert router.rank("server")[0][0] == 0
+
+    def test_only_changed_agents_embedded(self, tmp_path):
+        """Test a registry edit embeds only the edited agent, in one batch"""
+        embedder = AxisEmbedder()
+        router = SemanticRouter(embedder, cache_path=str(tmp_path / "vectors.json"))
+        router.fit(AGENTS)
+
+        edited = AGENTS[:2] + [dict(AGENTS[2], description="Project dashboards")]
+        assert router.fit(edited) == 1
+        assert embedder.calls[-1] == [agent_text(edited[2])]
+
+    def test_cache_keyed_by_model(self, tmp_path):
+        """Test vectors from another embedder aren't reused"""
+        cache = str(tmp_path / "vectors.json")
+        SemanticRouter(AxisEmbedder(), cache_path=cache).fit(AGENTS)
+
+        assert SemanticRouter(HashingEmbedder(), cache_path=cache).fit(AGENTS) == len(AGENTS)
+
+    def test_agent_text(self):
+        """Test name, description and capabilities are all embedded"""
+        assert agent_text(AGENTS[0]) == "VPS\nWatches the server\nmonitoring\nserver load"
+
+    def test_hashing_embedder_word_forms(self):
+        """Test the hashing embedder relates plural and singular forms"""
+        router = SemanticRouter(HashingEmbedder())
+        router.fit(AGENTS)
+
+        assert router.rank("list all subcontractors")[0][0] == 1
+
+    def test_unknown_embedder(self):
+        """Test an unknown embedder name is rejected"""
+        with pytest.raises(ValueError):
+            create_embedder("word2vec")
+
+
+class TestOrchestratorSemanticTier:
+    """Test the semantic tier backs up keyword routing"""
+
+    @pytest.fixture
+    def embedder(self):
+        return AxisEmbedder()
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        registry = tmp_path / "registry.json"
+        registry.write_text(json.dumps({"agents": AGENTS}))
+        return registry
+
+    @pytest.fixture
+    def orchestrator(self, registry, embedder):
+        return AgentOrchestrator(registry_path=str(registry), embedder=embedder)
+
+    def test_keyword_hit_skips_embedding(self, orchestrator, embedder):
+        """Test a clear keyword match never embeds the task"""
+        result = orchestrator.route_task("vps uptime")
+
+        assert result["agent"]["agent_id"] == "vps"
+        assert embedder.calls == []
+
+    def test_keyword_miss_routes_semantically(self, orchestrator):
+        """Test a task with no trigger is routed by similarity"""
+        result = orchestrator.route_task("is the server overloaded?")
+
+        assert result["status"] == "routed"
+        assert result["agent"]["agent_id"] == "vps"
+        assert result["agent"]["routing"] == "semantic"
+
+    def test_keyword_tie_reordered(self, orchestrator):
+        """Test agents tied on keywords are ordered by similarity"""
+        matches = orchestrator.route_task("subcontractors status?", auto_select=True)
+
+        assert matches["agent"]["agent_id"] == "contractors"
+        assert [m["agent_id"] for m in matches["alternatives"]] == ["vps"]
+
+    def test_below_threshold_no_match(self, orchestrator):
+        """Test an unrelated task still falls through to no_match"""
+        assert orchestrator.route_task("tell me a joke")["status"] == "no_match"
+
+    def test_vectors_cached_next_to_registry(self, orchestrator, tmp_path):
+        """Test agent vectors are written beside the registry by default"""
+        orchestrator.route_task("is the server overloaded?")
+
+        assert (tmp_path / "agent_vectors.json").exists()
+
+    def test_route_uses_its_snapshot(self, orchestrator, registry):
+        """Test a route started before a reload ranks that snapshot's agents"""
+        old = orchestrator.registry_service.snapshot
+        orchestrator.find_agent_semantic("server", snapshot=old)
+
+        registry.write_text(json.dumps({"agents": AGENTS[::-1]}))
+        assert orchestrator.registry_service.reload(force=True)
+        new = orchestrator.registry_service.snapshot
+        assert orchestrator.find_agent_semantic("is the server overloaded?", snapshot=new)[0]["agent_id"] == "vps"
+
+        matches = orchestrator.find_agent_semantic("is the server overloaded?", snapshot=old)
+
+        assert matches[0]["agent_id"] == "vps"
+        assert orchestrator.semantic_router.rank("server")[0][0] == 2
@@ -0,0 +1,121 @@
+"""
+Tests for agent spans
+
+Test coverage for:
+- Model, tool and chat spans from chat() and chat_stream()
+- Token usage and turn counts on spans
+- Failing chats and failing hooks
+- Recording spans into MetricsCollector
+"""
+import pytest
+import asyncio
+from types import SimpleNamespace
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from metrics.collector import MetricsCollector
+from tests.test_async_base_agent import AsyncEchoAgent, tool_turn
+from tests.test_base_agent import EchoAgent, FINAL_TURN, TOOL_TURN
+
+
+def with_usage(response, input_tokens, output_tokens):
+    usage = SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+    return SimpleNamespace(**vars(response), usage=usage)
+
+
+def traced(agent):
+    spans = []
+    agent.add_span_hook(spans.append)
+    return spans
+
+
+class TestSpans:
+    """Test span emission from BaseAgent"""
+
+    def test_no_hooks_no_spans(self):
+        """Test agents without hooks still work and time nothing"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+
+        assert agent.chat("hi") == "All good"
+        assert agent.span_hooks == []
+
+    def test_chat_spans(self):
+        """Test one span per model call and tool call, then the chat span"""
+        agent = EchoAgent([with_usage(TOOL_TURN, 100, 20), with_usage(FINAL_TURN, 150, 10)])
+        spans = traced(agent)
+
+        agent.chat("hi")
+
+        assert [(s.kind, s.name) for s in spans] == [
+            ("model", agent.model), ("tool", "echo"), ("tool", "echo"), ("model", agent.model), ("chat", "chat")
+        ]
+        first_model, chat = spans[0], spans[-1]
+        assert first_model.turn == 1
+        assert first_model.usage["input_tokens"] == 100
+        assert first_model.metadata["stop_reason"] == "tool_use"
+        assert chat.turn == 2
+        assert chat.usage["input_tokens"] == 250
+        assert chat.tokens == 280
+        assert all(s.duration_ms >= 0 and s.agent == "EchoAgent" for s in spans)
+
+    def test_stream_spans(self):
+        """Test streaming model spans carry time to first text"""
+        agent = EchoAgent([TOOL_TURN, FINAL_TURN])
+        spans = traced(agent)
+
+        list(agent.chat_stream("hi"))
+
+        model_spans = [s for s in spans if s.kind == "model"]
+        assert [s.turn for s in model_spans] == [1, 2]
+        assert model_spans[0].metadata["first_text_ms"] is not None
+        assert spans[-1].kind == "chat" and spans[-1].name == "chat_stream"
+
+    def test_failed_chat_span(self):
+        """Test an API error marks the chat span failed and still propagates"""
+        agent = EchoAgent([])
+        spans = traced(agent)
+
+        with pytest.raises(IndexError):
+            agent.chat("hi")
+
+        assert spans[-1].kind == "chat"
+        assert not spans[-1].success
+        assert spans[-1].error_type == "IndexError"
+
+    def test_failing_hook_ignored(self):
+        """Test a broken hook does not break the conversation"""
+        agent = EchoAgent([FINAL_TURN])
+        agent.add_span_hook(lambda span: 1 / 0)
+
+        assert agent.chat("hi") == "All good"
+
+    def test_async_spans(self):
+        """Test AsyncBaseAgent emits the same spans"""
+        agent = AsyncEchoAgent([tool_turn("read"), FINAL_TURN])
+        spans = traced(agent)
+
+        asyncio.run(agent.chat("hi"))
+
+        assert [s.kind for s in spans] == ["model", "tool", "model", "chat"]
+
+
+class TestCollectorSpans:
+    """Test MetricsCollector.record_span"""
+
+    def test_spans_recorded_per_agent_model_and_tool(self, tmp_path):
+        """Test spans land in separate comparable summaries"""
+        collector = MetricsCollector(metrics_dir=tmp_path)
+        agent = EchoAgent([with_usage(TOOL_TURN, 100, 20), with_usage(FINAL_TURN, 150, 10)])
+        agent.add_span_hook(collector.record_span)
+
+        agent.chat("hi")
+
+        summaries = {s["agent"]: s for s in collector.get_all_agents_summary()}
+        assert summaries["EchoAgent"]["total_calls"] == 1
+        assert summaries["EchoAgent"]["avg_tokens"] == 280
+        assert summaries["EchoAgent:model"]["total_calls"] == 2
+        assert summaries["EchoAgent:tool:echo"]["total_calls"] == 2
+        chat_event = collector.events[-1]
+        assert chat_event.operation == "chat"
+        assert chat_event.metadata["turns"] == 2
@@ -0,0 +1,145 @@
+"""
+Tests for the State Store
+
+Test coverage for:
+- Atomic JSON writes and corrupt-file handling
+- Debounced, coalesced writes
+- SQLite backend writing only changed keys
+- BaseAgent domain memory on top of the stores
+"""
+import pytest
+from pathlib import Path
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.base_agent import BaseAgent
+from shared.state_store import JSONStateStore, SQLiteStateStore, open_state_store
+from tests.test_base_agent import EchoAgent
+
+
+class JournalAgent(EchoAgent):
+    """Agent with persistent state"""
+
+    def __init__(self, state_file, state_save_delay=1.0):
+        BaseAgent.__init__(self, "sk-ant-test", state_file=state_file, state_save_delay=state_save_delay)
+
+    def initialize_state(self):
+        return {"journal": []}
+
+
+class TestJSONStateStore:
+    """Test atomic JSON persistence"""
+
+    def test_save_and_load(self, tmp_path):
+        """Test state round-trips and no temp files are left behind"""
+        store = JSONStateStore(str(tmp_path / "state.json"))
+        store.save({"a": 1})
+
+        assert JSONStateStore(str(tmp_path / "state.json")).load() == {"a": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_failed_write_keeps_old_state(self, tmp_path):
+        """Test an unserializable state never truncates the existing file"""
+        store = JSONStateStore(str(tmp_path / "state.json"))
+        store.save({"a": 1})
+
+        with pytest.raises(TypeError):
+            store.save({"a": object()})
+
+        assert store.load() == {"a": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_corrupt_file_moved_aside(self, tmp_path):
+        """Test a corrupt file is preserved as .corrupt instead of overwritten"""
+        path = tmp_path / "state.json"
+        path.write_text('{"journal": [1, 2')
+
+        assert JSONStateStore(str(path)).load() is None
+        assert (tmp_path / "state.json.corrupt").read_text() == '{"journal": [1, 2'
+        assert not path.exists()
+
+    def test_debounced_writes_coalesce(self, tmp_path):
+        """Test many scheduled changes become one write"""
+        store = JSONStateStore(str(tmp_path / "state.json"), save_delay=0.05)
+        state = {}
+        for i in range(100):
+            state["count"] = i
+            store.schedule(state, ["count"])
+
+        assert store.writes == 0
+        time.sleep(0.2)
+        assert store.writes == 1
+        assert store.load() == {"count": 99}
+
+
+class TestSQLiteStateStore:
+    """Test the per-key SQLite backend"""
+
+    def test_writes_only_changed_keys(self, tmp_path):
+        """Test changed keys are upserted and removed keys deleted"""
+        path = str(tmp_path / "state.db")
+        store = SQLiteStateStore(path, save_delay=0)
+        state = {"journal": list(range(1000)), "cursor": 0}
+        store.save(state)
+
+        # A stale in-memory journal proves unchanged keys are not rewritten
+        store.save({"journal": [], "cursor": 5}, changed=["cursor"])
+        assert store.load() == {"journal": list(range(1000)), "cursor": 5}
+
+        store.save({"journal": []}, changed=["cursor"])
+        assert store.load() == {"journal": list(range(1000))}
+
+    def test_backend_by_suffix(self, tmp_path):
+        """Test .db files use SQLite and anything else JSON"""
+        assert isinstance(open_state_store(str(tmp_path / "s.db")), SQLiteStateStore)
+        assert isinstance(open_state_store(str(tmp_path / "s.json")), JSONStateStore)
+
+
+class TestAgentState:
+    """Test BaseAgent domain memory"""
+
+    def test_initializes_and_persists(self, tmp_path):
+        """Test a new state file is initialized and saved immediately"""
+        path = tmp_path / "agent.json"
+        agent = JournalAgent(str(path))
+
+        assert agent.state == {"journal": []}
+        assert json.loads(path.read_text()) == {"journal": []}
+
+    def test_set_state_debounced_then_flushed(self, tmp_path):
+        """Test set_state in a hot loop costs one write"""
+        path = tmp_path / "agent.json"
+        agent = JournalAgent(str(path), state_save_delay=60)
+        writes = agent.state_store.writes
+
+        for i in range(500):
+            agent.set_state("cursor", i)
+        agent.update_state({"done": True})
+
+        assert agent.state_store.writes == writes
+        agent.state_store.flush()
+        assert agent.state_store.writes == writes + 1
+        assert JournalAgent(str(path)).state == {"journal": [], "cursor": 499, "done": True}
+
+    def test_save_state_immediate(self, tmp_path):
+        """Test save_state() writes now, including pending changes"""
+        path = tmp_path / "agent.db"
+        agent = JournalAgent(str(path), state_save_delay=60)
+        agent.set_state("cursor", 1)
+        agent.state["journal"].append("entry")
+
+        agent.save_state()
+
+        assert JournalAgent(str(path)).state == {"journal": ["entry"], "cursor": 1}
+
+    def test_corrupt_state_reinitialized(self, tmp_path):
+        """Test a corrupt file is kept aside and the agent starts fresh"""
+        path = tmp_path / "agent.json"
+        path.write_text("{not json")
+
+        agent = JournalAgent(str(path))
+
+        assert agent.state == {"journal": []}
+        assert (tmp_path / "agent.json.corrupt").exists()
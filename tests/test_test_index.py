@@ -0,0 +1,110 @@
+"""
+Tests for the Test Index
+
+Test coverage for:
+- Test name prefix lookups (test_foo, test_foo_error, async tests)
+- Referenced symbol lookups
+- Re-parsing on mtime change and dropping deleted files
+- Git watcher and test generator coverage checks through the index
+"""
+import pytest
+import importlib.util
+import os
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.test_index import TestIndex
+
+
+TEST_SOURCE = '''
+from shared.confidence import ProactivityQueue
+
+def test_add_task():
+    queue = ProactivityQueue()
+    queue.get_tasks()
+
+async def test_fetch_error():
+    pass
+
+# def test_commented_out(): not a real test
+'''
+
+
+def load_agent(agent_dir: str, class_name: str):
+    """Load an agent class from its hyphenated agent directory"""
+    agent_file = Path(__file__).parent.parent / "agents" / agent_dir / "agent.py"
+    spec = importlib.util.spec_from_file_location(f"{agent_dir}_agent", agent_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, class_name)
+
+
+@pytest.fixture
+def tests_dir(tmp_path):
+    """Create a tests/ directory with one test file"""
+    directory = tmp_path / "tests"
+    directory.mkdir()
+    (directory / "test_queue.py").write_text(TEST_SOURCE)
+    return directory
+
+
+class TestTestIndex:
+    """Test AST-based test name index"""
+
+    def test_has_test_matches_name_prefixes(self, tests_dir):
+        """Test test_<name>* definitions count, comments don't"""
+        index = TestIndex(tests_dir).refresh()
+        test_file = tests_dir / "test_queue.py"
+
+        assert index.has_test(test_file, "add_task")
+        assert index.has_test(test_file, "add")
+        assert index.has_test(test_file, "fetch")
+        assert not index.has_test(test_file, "commented_out")
+        assert not index.has_test(tests_dir / "test_missing.py", "add_task")
+
+    def test_referenced_symbols(self, tests_dir):
+        """Test imported names, calls and attributes are indexed"""
+        index = TestIndex(tests_dir).refresh()
+
+        assert index.is_referenced("ProactivityQueue")
+        assert index.is_referenced("get_tasks")
+        assert not index.is_referenced("add_tasks")
+
+    def test_invalidated_by_mtime_and_deletion(self, tests_dir):
+        """Test changed files are re-parsed and deleted files are dropped"""
+        index = TestIndex(tests_dir).refresh()
+        test_file = tests_dir / "test_queue.py"
+        assert not index.has_test(test_file, "remove_task")
+
+        test_file.write_text(TEST_SOURCE + "\ndef test_remove_task():\n    pass\n")
+        stat = test_file.stat()
+        os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert index.has_test(test_file, "remove_task")
+
+        test_file.unlink()
+        index.refresh()
+        assert not index.is_referenced("ProactivityQueue")
+
+    def test_agents_use_index(self, tmp_path, tests_dir, monkeypatch):
+        """Test both agents report coverage from the index"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "queue.py").write_text(
+            "def add_task():\n    pass\n\ndef get_tasks():\n    pass\n\ndef fetch():\n    pass\n"
+        )
+
+        GitWatcherAgent = load_agent("git-watcher", "GitWatcherAgent")
+        watcher = GitWatcherAgent("sk-ant-test", repository_path=str(tmp_path))
+        watcher.test_index.refresh()
+        tasks = watcher._missing_test_tasks("queue.py", watcher._find_all(
+            (tmp_path / "queue.py").read_text())["functions"], tests_dir / "test_queue.py")
+
+        assert [t["context"]["function_name"] for t in tasks] == ["get_tasks"]
+        assert tasks[0]["context"]["referenced_in_tests"] is True
+
+        TestGeneratorAgent = load_agent("test-generator", "TestGeneratorAgent")
+        generator = TestGeneratorAgent("sk-ant-test")
+        result = generator._scan_for_untested_functions("queue.py")
+
+        assert result["test_file_path"] == "tests/test_queue.py"
+        assert [f["name"] for f in result["untested"]] == ["get_tasks"]
@@ -0,0 +1,141 @@
+"""
+Tests for the Tool Result Cache
+
+Test coverage for:
+- Canonical input keys, TTL expiry and per-tool LRU bounds
+- Persistence across instances and invalidation
+- BaseAgent serving declared tools from cache and invalidating on mutation
+"""
+import pytest
+from pathlib import Path
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.tool_cache import ToolResultCache, canonical_input
+from tests.test_base_agent import EchoAgent, FINAL_TURN, message, tool_block
+
+
+class TestToolResultCache:
+    """Test TTL + LRU memoization"""
+
+    def test_canonical_input_ignores_key_order(self):
+        """Test equivalent inputs share a key"""
+        assert canonical_input({"b": 1, "a": [1, 2]}) == canonical_input({"a": [1, 2], "b": 1})
+
+    def test_hit_and_ttl_expiry(self):
+        """Test results are served until their TTL passes"""
+        cache = ToolResultCache("test", db_path=None)
+        cache.put("describe_table", {"table_name": "users"}, "schema", {"ttl": 0.05})
+
+        assert cache.get("describe_table", {"table_name": "users"}, {"ttl": 0.05}) == "schema"
+        assert cache.get("describe_table", {"table_name": "orders"}, {"ttl": 0.05}) is None
+        time.sleep(0.06)
+        assert cache.get("describe_table", {"table_name": "users"}, {"ttl": 0.05}) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_lru_bound_per_tool(self):
+        """Test the least recently used entry is evicted past max_entries"""
+        cache = ToolResultCache("test", db_path=None)
+        policy = {"ttl": 60, "max_entries": 2}
+        cache.put("describe_table", {"t": 1}, "one", policy)
+        cache.put("describe_table", {"t": 2}, "two", policy)
+        cache.get("describe_table", {"t": 1}, policy)
+        cache.put("describe_table", {"t": 3}, "three", policy)
+
+        assert cache.get("describe_table", {"t": 1}, policy) == "one"
+        assert cache.get("describe_table", {"t": 2}, policy) is None
+        assert cache.get("describe_table", {"t": 3}, policy) == "three"
+
+    def test_persisted_across_instances(self, tmp_path):
+        """Test persistent tools survive a new cache instance; invalidation removes them"""
+        db_path = str(tmp_path / "tool_cache.db")
+        policy = {"ttl": 60, "persist": True}
+        ToolResultCache("neon:a", db_path).put("list_tables", {}, "tables", policy)
+
+        assert ToolResultCache("neon:a", db_path).get("list_tables", {}, policy) == "tables"
+        assert ToolResultCache("neon:b", db_path).get("list_tables", {}, policy) is None
+
+        ToolResultCache("neon:a", db_path).invalidate(["list_tables"])
+        assert ToolResultCache("neon:a", db_path).get("list_tables", {}, policy) is None
+
+
+class SchemaAgent(EchoAgent):
+    """Agent with a cached lookup, a mutation and an uncached tool"""
+
+    def define_tools(self):
+        return [
+            {"name": "describe", "description": "Describe", "input_schema": {"type": "object"},
+             "cache": {"ttl": 60}},
+            {"name": "write", "description": "Write", "input_schema": {"type": "object"},
+             "invalidates": ["describe"]},
+            {"name": "echo", "description": "Echo", "input_schema": {"type": "object"}},
+        ]
+
+    def tool_cache_namespace(self):
+        return "SchemaAgent:test"
+
+    def execute_tool(self, tool_name, tool_input):
+        self.calls.append(tool_name)
+        if tool_input.get("fail"):
+            return json.dumps({"error": "boom"})
+        return json.dumps({"tool": tool_name, "n": len(self.calls)})
+
+
+def schema_turn(*calls):
+    return message("tool_use", *[tool_block(f"tu_{i}", name, tool_input) for i, (name, tool_input) in enumerate(calls)])
+
+
+class TestAgentToolCache:
+    """Test BaseAgent integration"""
+
+    def test_repeated_lookup_served_from_cache(self):
+        """Test a cached tool runs once per input; others always run"""
+        agent = SchemaAgent([
+            schema_turn(("describe", {"table": "users"}), ("echo", {"value": 1})),
+            schema_turn(("describe", {"table": "users"}), ("echo", {"value": 1}), ("describe", {"table": "jobs"})),
+            FINAL_TURN,
+        ])
+
+        agent.chat("hi")
+
+        assert agent.calls == ["describe", "echo", "echo", "describe"]
+        results = agent.conversation_history[4]["content"]
+        assert results[0]["content"] == agent.conversation_history[2]["content"][0]["content"]
+        assert agent.tool_cache.hits == 1
+
+    def test_mutation_invalidates(self):
+        """Test a mutating tool drops the results it declares stale"""
+        agent = SchemaAgent([
+            schema_turn(("describe", {})),
+            schema_turn(("write", {})),
+            schema_turn(("describe", {})),
+            FINAL_TURN,
+        ])
+
+        agent.chat("hi")
+
+        assert agent.calls == ["describe", "write", "describe"]
+
+    def test_errors_not_cached(self):
+        """Test error results are retried"""
+        agent = SchemaAgent([
+            schema_turn(("describe", {"fail": True})),
+            schema_turn(("describe", {"fail": True})),
+            FINAL_TURN,
+        ])
+
+        agent.chat("hi")
+
+        assert agent.calls == ["describe", "describe"]
+
+    def test_policy_keys_not_sent(self):
+        """Test cache/invalidates are stripped from tools sent to Claude"""
+        agent = SchemaAgent([FINAL_TURN])
+
+        agent.chat("hi")
+
+        sent = agent.anthropic.messages.requests[0]["tools"]
+        assert all("cache" not in tool and "invalidates" not in tool for tool in sent)
+        assert "cache" in agent.define_tools()[0]
@@ -0,0 +1,135 @@
+"""
+Tests for the Trigger Index
+
+Test coverage for:
+- Whole-word, case-insensitive trigger matching
+- Multi-word (phrase) triggers
+- Each trigger counted once, in registry order
+- Orchestrator routing through the compiled index
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.trigger_index import TriggerIndex, singular, tokenize
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+from orchestrator import AgentOrchestrator
+
+
+AGENTS = [
+    {"id": "vps", "triggers": ["vps", "cpu", "ssh", "health check"]},
+    {"id": "db", "triggers": ["database", "sql", "query", "node.js"]},
+    {"id": "health", "triggers": ["health"]},
+]
+
+
+class TestTriggerIndex:
+    """Test compiled trigger matching"""
+
+    def test_whole_words_only(self):
+        """Test triggers don't match inside longer words"""
+        index = TriggerIndex(AGENTS)
+
+        assert index.match("restart sshd and check cpuinfo") == {}
+        assert index.match("ssh in and check the cpu") == {0: [1, 2]}
+
+    def test_case_and_punctuation(self):
+        """Test matching ignores case and surrounding punctuation"""
+        index = TriggerIndex(AGENTS)
+
+        assert index.match("CPU?! (VPS)") == {0: [0, 1]}
+
+    def test_phrase_triggers(self):
+        """Test multi-word triggers match as a phrase, overlapping single words"""
+        index = TriggerIndex(AGENTS)
+
+        assert index.match("run a health check") == {0: [3], 2: [0]}
+        assert index.match("check health") == {2: [0]}
+        assert index.match("upgrade node js") == {1: [3]}
+
+    def test_repeated_trigger_counted_once(self):
+        """Test a trigger appearing twice scores once"""
+        index = TriggerIndex(AGENTS)
+
+        assert index.match("sql sql sql query") == {1: [1, 2]}
+
+    def test_trigger_count(self):
+        """Test every non-empty trigger is compiled"""
+        index = TriggerIndex(AGENTS + [{"id": "empty", "triggers": ["", "!!"]}, {"id": "none"}])
+
+        assert index.trigger_count == 9
+
+    def test_plural_forms(self):
+        """Test singular and plural forms match each other"""
+        index = TriggerIndex(AGENTS + [{"id": "tasks", "triggers": ["tasks"]}])
+
+        assert index.match("two databases and some queries") == {1: [0, 2]}
+        assert index.match("my task list") == {3: [0]}
+        assert index.match("health checks") == {0: [3], 2: [0]}
+
+    def test_singular(self):
+        """Test plural suffixes are stripped and short or non-plural words kept"""
+        assert [singular(w) for w in ["queries", "servers", "tables", "boxes", "vps", "status", "analysis"]] == [
+            "query", "server", "table", "box", "vps", "status", "analysis"
+        ]
+
+    def test_tokenize(self):
+        """Test tokenization lowercases and splits on non-word characters"""
+        assert tokenize("What's the CPU-load?") == ["what", "s", "the", "cpu", "load"]
+
+
+class TestOrchestratorRouting:
+    """Test AgentOrchestrator routes through the index"""
+
+    @pytest.fixture
+    def orchestrator(self, tmp_path):
+        registry = tmp_path / "registry.json"
+        registry.write_text(json.dumps({"agents": [
+            {"id": agent["id"], "name": agent["id"].upper(), "description": "", "path": "",
+             "triggers": agent["triggers"]}
+            for agent in AGENTS
+        ]}))
+        return AgentOrchestrator(registry_path=str(registry))
+
+    def test_matched_keywords_in_registry_order(self, orchestrator):
+        """Test matched keywords are the original triggers in registry order"""
+        matches = orchestrator.find_agent_for_task("Check CPU on the VPS")
+
+        assert matches[0]["agent_id"] == "vps"
+        assert matches[0]["matched_keywords"] == ["vps", "cpu"]
+        assert matches[0]["confidence"] == 2
+
+    def test_no_substring_routing(self, orchestrator):
+        """Test a trigger inside another word no longer routes"""
+        assert orchestrator.route_task("Is sshd healthy?")["status"] == "no_match"
+
+    def test_ties_keep_registry_order(self, orchestrator):
+        """Test equally confident agents stay in registry order"""
+        matches = orchestrator.find_agent_for_task("health of the database")
+
+        assert [m["agent_id"] for m in matches] == ["db", "health"]
+
+
+class TestRegistryRouting:
+    """Test routing against the shipped registry"""
+
+    @pytest.fixture
+    def orchestrator(self):
+        return AgentOrchestrator()
+
+    @pytest.mark.parametrize("task, agent_id", [
+        ("List all tables", "neon-database"),
+        ("monitor the servers", "vps-monitor"),
+        ("show me my task list", "convex-database"),
+        ("Run a few queries on the databases", "neon-database"),
+        ("Which companies supply us?", "contractor-agent"),
+    ])
+    def test_inflected_forms_route(self, orchestrator, task, agent_id):
+        """Test plural and singular forms of registry triggers still route"""
+        result = orchestrator.route_task(task, auto_select=True)
+
+        assert result["status"] == "routed"
+        assert result["agent"]["agent_id"] == agent_id
@@ -13,6 +13,7 @@ Usage:
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any, Literal
 import os
 import sys
@@ -23,6 +24,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dual_agent import DualDatabaseAgent, load_env
+from shared.agent_pool import AgentPool
 
 # Configure logging
 logging.basicConfig(
@@ -56,17 +58,11 @@ app.add_middleware(
 # Optional: API Key authentication
 API_KEY = os.getenv("AGENT_API_KEY")
 
-# Initialize agent (singleton pattern for performance)
-agent = None
-
-def get_agent() -> DualDatabaseAgent:
-    """Get or create dual database agent instance."""
-    global agent
-    if agent is None:
-        logger.info("Initializing Dual Database Agent...")
-        agent = DualDatabaseAgent()
-        logger.info("Agent initialized successfully")
-    return agent
+# Pooled agent instances (built once, reused for performance). Each chat
+# checks out its own - pinned to its session_id, so conversations never mix -
+# and runs in a worker thread, so concurrent chats run side by side
+AGENT_ID = "dual-database-agent"
+agents = AgentPool({AGENT_ID: DualDatabaseAgent})
 
 
 # Request/Response models
@@ -74,6 +70,7 @@ class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=5000, description="User's question")
     context: Optional[Dict[str, Any]] = Field(default={}, description="Optional page context")
     database: Optional[Literal["neon", "convex"]] = Field(default=None, description="Which database to query (neon or convex)")
+    session_id: Optional[str] = Field(default=None, description="Continue this conversation (omit for a one-off question)")
 
     class Config:
         json_schema_extra = {
@@ -150,17 +147,16 @@ async def health_check():
     Verifies database connections and agent status.
     """
     try:
-        # Try to get agent (will initialize if needed)
-        agent_instance = get_agent()
-
-        return HealthResponse(
-            status="healthy",
-            neon_database="connected" if agent_instance.neon_db else "not configured",
-            convex_database="connected" if agent_instance.convex_db else "not configured",
-            agent="ready",
-            active_database=agent_instance.active_db,
-            timestamp=datetime.utcnow().isoformat()
-        )
+        # Try to get an agent (will initialize one if needed)
+        async with agents.checkout_async(AGENT_ID) as agent_instance:
+            return HealthResponse(
+                status="healthy",
+                neon_database="connected" if agent_instance.neon_db else "not configured",
+                convex_database="connected" if agent_instance.convex_db else "not configured",
+                agent="ready",
+                active_database=agent_instance.active_db,
+                timestamp=datetime.utcnow().isoformat()
+            )
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         raise HTTPException(
@@ -196,9 +192,6 @@ async def chat(
     start_time = datetime.utcnow()
 
     try:
-        # Get agent instance
-        agent_instance = get_agent()
-
         # Enhance message with context if provided
         enhanced_message = request.message
         if request.context:
@@ -217,14 +210,17 @@ async def chat(
             if context_hints:
                 enhanced_message = " ".join(context_hints) + " " + request.message
 
-        # Determine which database to use
-        database = request.database or agent_instance.active_db
+        # Get response from this request's (or session's) agent, with logging
+        async with agents.checkout_async(AGENT_ID, request.session_id) as agent_instance:
+            # Determine which database to use
+            database = request.database or agent_instance.active_db
 
-        # Log request
-        logger.info(f"Query: {request.message[:100]}... | Database: {database} | Context: {request.context.get('page', 'none')}")
+            # Log request
+            logger.info(f"Query: {request.message[:100]}... | Database: {database} | Context: {request.context.get('page', 'none')}")
 
-        # Get response from agent with logging
-        agent_response = agent_instance.chat(enhanced_message, database=database, return_logs=True)
+            agent_response = await run_in_threadpool(
+                agent_instance.chat, enhanced_message, database=database, return_logs=True
+            )
 
         # Handle response (dict if return_logs=True, string otherwise)
         if isinstance(agent_response, dict):
@@ -263,9 +259,9 @@ async def chat(
 
 
 @app.post("/agent/reset", tags=["Agent"])
-async def reset_conversation(authorization: Optional[str] = Header(None)):
+async def reset_conversation(session_id: str, authorization: Optional[str] = Header(None)):
     """
-    Reset the agent's conversation history.
+    Reset a session's conversation history.
     Useful when starting a new topic.
     """
     # Verify API key if configured
@@ -273,14 +269,13 @@ async def reset_conversation(authorization: Optional[str] = Header(None)):
         await verify_api_key(authorization)
 
     try:
-        agent_instance = get_agent()
-        agent_instance.reset_conversation()
+        ended = agents.end_session(session_id)
 
-        logger.info("Conversation reset")
+        logger.info(f"Conversation {session_id} reset")
 
         return {
-            "success": True,
-            "message": "Conversation history cleared",
+            "success": ended,
+            "message": "Conversation history cleared" if ended else "No such session",
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
@@ -307,7 +302,10 @@ async def startup_event():
     """Initialize agent on startup."""
     logger.info("Starting Dual Database Agent API...")
     try:
-        get_agent()  # Initialize agent
+        # Initialize an agent (a failure here stops startup, as before)
+        error = (await run_in_threadpool(agents.warm_up))[AGENT_ID]
+        if error:
+            raise RuntimeError(error)
         logger.info("Startup complete - API ready")
     except Exception as e:
         logger.error(f"Startup failed: {e}")
@@ -317,10 +315,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    global agent
     logger.info("Shutting down...")
-    if agent:
-        agent.close()
+    agents.close()
     logger.info("Shutdown complete")
 
 
@@ -5,13 +5,19 @@ Allows switching between databases for comparison and testing
 """
 
 import os
+import sys
 import json
 import requests
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Literal
-from anthropic import Anthropic
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+# Add project root to path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.llm_transport import create_client, transport_from_env
+
 
 # ============================================================================
 # PostgreSQL (Neon) Client
@@ -129,10 +135,11 @@ class DualDatabaseAgent:
         """
         # Load API key
         api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
+        transport = transport_from_env()
+        if not api_key and transport is None:
             raise ValueError("ANTHROPIC_API_KEY not set")
 
-        self.client = Anthropic(api_key=api_key)
+        self.client = create_client(api_key, transport)
         self.model = model
         self.conversation_history: List[Dict[str, Any]] = []
         self.max_tokens = 4096
@@ -12,6 +12,7 @@ Endpoints:
     GET /api/dashboard/workload - Team workload distribution
     GET /api/dashboard/conflicts - Active conflict predictions
     GET /api/dashboard/tasks - Proactivity queue status
+    GET /api/dashboard/tasks/export - Full queue as JSON (also written to shared/proactivity_queue.json)
 
 Usage:
     uvicorn fibreflow-dashboard-api:app --host 0.0.0.0 --port 8001 --reload
@@ -20,6 +21,7 @@ Usage:
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, Any, List
+import json
 import sys
 import os
 
@@ -60,7 +62,7 @@ async def get_overview() -> Dict[str, Any]:
         workload = WorkloadAnalyzer()
 
         # Get queue status
-        queue_data = queue.load_queue()
+        queue_data = queue.get_summary()
 
         # Get pattern learning summary
         learning = learner.get_learning_summary(days=7)
@@ -259,13 +261,10 @@ async def get_tasks() -> Dict[str, Any]:
     """Get proactivity queue status and recent tasks."""
     try:
         queue = ProactivityQueue()
-        data = queue.load_queue()
+        data = queue.get_summary()
 
         # Get high-confidence tasks
-        high_conf_tasks = [
-            task for task in data.get("tasks", [])
-            if task.get("confidence") == "high"
-        ][:10]  # Top 10
+        high_conf_tasks = queue.get_tasks(filter_confidence="high", limit=10)["tasks"]  # Top 10
 
         return {
             "success": True,
@@ -280,6 +279,20 @@ async def get_tasks() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/dashboard/tasks/export")
+async def export_tasks() -> Dict[str, Any]:
+    """Export the full proactivity queue (legacy JSON shape) for dashboard consumers."""
+    try:
+        queue = ProactivityQueue()
+        path = queue.export_json()
+
+        with open(path) as f:
+            return {"success": True, "path": path, "queue": json.load(f)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
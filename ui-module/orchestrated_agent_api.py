@@ -17,6 +17,7 @@ Usage:
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
 import os
 import sys
@@ -28,6 +29,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import orchestrator and agents
 from orchestrator.orchestrator import AgentOrchestrator
+from shared.async_base_agent import AsyncAgentAdapter
+from shared.config import get_agent_config
 from universal_convex_agent import UniversalConvexAgent, load_env
 
 # Configure logging
@@ -58,15 +61,67 @@ app.add_middleware(
 
 # Initialize orchestrator and universal agent
 orchestrator = None
-universal_agent = None
+universal_agent = None  # Table metadata for /health; chats use pooled instances
+UNIVERSAL_AGENT = "universal-convex-agent"
+
+# Direct-chat agents, pooled by the orchestrator and warmed at startup
+DIRECT_AGENTS = ["contractor-agent", "project-agent"]
+
+
+def vps_monitor_factory() -> AsyncAgentAdapter:
+    """Build the VPS monitor, which needs its host and API key from the environment."""
+    config = get_agent_config("vps")
+    agent_class = get_orchestrator().agent_factory("vps-monitor")
+    return AsyncAgentAdapter(agent_class(
+        config["VPS_HOSTNAME"], config["ANTHROPIC_API_KEY"], ssh_user=config.get("VPS_SSH_USER", "root")
+    ))
+
+
+# /agents payload, rebuilt whenever the registry reloads
+agents_payload: Optional[Dict[str, Any]] = None
+
+
+def build_agents_payload(agents) -> Dict[str, Any]:
+    """Public summary of the registered agents."""
+    agents_info = [
+        {
+            "id": agent["id"],
+            "name": agent["name"],
+            "type": agent["type"],
+            "triggers": agent.get("triggers", []),
+            "status": agent["status"]
+        }
+        for agent in agents
+    ]
+    return {"total_agents": len(agents_info), "agents": agents_info}
+
+
+def on_registry_change(snapshot) -> None:
+    """Registry file edited: refresh what we serve from it."""
+    global agents_payload
+    agents_payload = build_agents_payload(snapshot.agents)
+    logger.info(f"Agent registry reloaded (version {snapshot.version}, {len(snapshot.agents)} agents)")
+
 
 def get_orchestrator() -> AgentOrchestrator:
     """Get or create orchestrator instance."""
-    global orchestrator
+    global orchestrator, agents_payload
     if orchestrator is None:
         logger.info("Initializing Agent Orchestrator...")
-        orchestrator = AgentOrchestrator()
-        logger.info("Orchestrator initialized with 5 agents")
+        # Watch registry.json so agent edits apply without a restart; paraphrased
+        # tasks that miss every trigger are routed semantically before falling back.
+        # Pooled agents are async adapters: Claude calls don't block the event loop
+        orchestrator = AgentOrchestrator(
+            watch=True,
+            agent_wrapper=AsyncAgentAdapter,
+            embedder=os.getenv("ROUTING_EMBEDDER", "local")
+        )
+        # Agents whose constructor takes arguments get their own factory
+        orchestrator.agents.register("vps-monitor", vps_monitor_factory)
+        orchestrator.agents.register(UNIVERSAL_AGENT, UniversalConvexAgent)
+        agents_payload = build_agents_payload(orchestrator.list_agents())
+        orchestrator.subscribe(on_registry_change)
+        logger.info(f"Orchestrator initialized with {len(orchestrator.list_agents())} agents")
     return orchestrator
 
 def get_universal_agent() -> UniversalConvexAgent:
@@ -83,6 +138,7 @@ def get_universal_agent() -> UniversalConvexAgent:
 class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=5000)
     mode: Optional[str] = Field(default="orchestrated", description="'orchestrated' or 'universal'")
+    session_id: Optional[str] = Field(default=None, description="Continue this conversation (direct agents)")
 
     class Config:
         json_schema_extra = {
@@ -145,7 +201,7 @@ async def health_check():
         return HealthResponse(
             status="healthy",
             version="3.0.0",
-            agents_available=orch.total_agents,
+            agents_available=len(orch.list_agents()),
             tables_accessible=len(universal.available_tables),
             records_accessible=14173  # Known count
         )
@@ -157,22 +213,36 @@ async def health_check():
 @app.get("/agents")
 async def list_agents():
     """List all available agents."""
-    orch = get_orchestrator()
+    get_orchestrator()
+    return agents_payload
 
-    agents_info = []
-    for agent in orch.agents:
-        agents_info.append({
-            "id": agent["id"],
-            "name": agent["name"],
-            "type": agent["type"],
-            "triggers": agent.get("triggers", []),
-            "status": agent["status"]
-        })
 
-    return {
-        "total_agents": len(agents_info),
-        "agents": agents_info
-    }
+async def universal_chat(message: str) -> str:
+    """Run one stateless universal-agent chat in a worker thread, on its own instance."""
+    # The pool resets the instance's conversation when it's returned
+    async with get_orchestrator().checkout_async(UNIVERSAL_AGENT) as universal:
+        return await run_in_threadpool(universal.chat, message)
+
+
+async def routed_chat(agent_id: str, message: str) -> Optional[str]:
+    """
+    Run one chat with a routed agent from the pool.
+
+    Returns:
+        The agent's response, or None if the agent can't be built here
+        (no loadable agent.py, missing configuration, ...) and the caller
+        should fall back
+    """
+    orch = get_orchestrator()
+    try:
+        agent = await orch.agents.acquire_async(agent_id)
+    except Exception as e:
+        logger.warning(f"Routed agent {agent_id} unavailable: {e}")
+        return None
+    try:
+        return await agent.chat(message)
+    finally:
+        orch.agents.release(agent_id, agent)
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -189,9 +259,7 @@ async def chat(request: ChatRequest):
 
         if request.mode == "universal":
             # Use universal agent for direct table access
-            universal = get_universal_agent()
-            response_text = universal.chat(request.message)
-            universal.reset_conversation()
+            response_text = await universal_chat(request.message)
 
             return ChatResponse(
                 response=response_text,
@@ -200,36 +268,38 @@ async def chat(request: ChatRequest):
                 agent_used="universal-convex-agent",
                 mode="universal",
                 routing_info={
-                    "tables_available": len(universal.available_tables),
+                    "tables_available": len(get_universal_agent().available_tables),
                     "direct_access": True
                 }
             )
 
         else:
-            # Use orchestrator for smart routing
+            # Use orchestrator for smart routing (in a thread: the semantic tier embeds the task)
             orch = get_orchestrator()
-            result = orch.route_task(request.message, auto_select=True)
+            result = await run_in_threadpool(orch.route_task, request.message, auto_select=True)
 
+            response_text = None
             if result["status"] == "routed":
                 agent_info = result["agent"]
+                response_text = await routed_chat(agent_info["agent_id"], request.message)
 
+            if response_text is not None:
                 return ChatResponse(
-                    response=result["response"],
+                    response=response_text,
                     success=True,
                     timestamp=datetime.now().isoformat(),
                     agent_used=agent_info["agent_id"],
                     mode="orchestrated",
                     routing_info={
                         "agent_name": agent_info["agent_name"],
-                        "confidence": result.get("confidence", "high"),
-                        "matched_keywords": result.get("matched_keywords", [])
+                        "confidence": agent_info["confidence"],
+                        "matched_keywords": agent_info.get("matched_keywords", []),
+                        "routing": agent_info.get("routing", "keyword")
                     }
                 )
             else:
                 # Fallback to universal agent
-                universal = get_universal_agent()
-                response_text = universal.chat(request.message)
-                universal.reset_conversation()
+                response_text = await universal_chat(request.message)
 
                 return ChatResponse(
                     response=response_text,
@@ -239,7 +309,8 @@ async def chat(request: ChatRequest):
                     mode="universal",
                     routing_info={
                         "fallback": True,
-                        "reason": "No specific agent matched"
+                        "reason": "No specific agent matched" if result["status"] != "routed"
+                                  else f"{result['agent']['agent_id']} unavailable"
                     }
                 )
 
@@ -251,11 +322,11 @@ async def chat(request: ChatRequest):
 @app.post("/chat/contractor")
 async def chat_contractor(request: ChatRequest):
     """Direct access to Contractor Agent."""
-    from agents.contractor_agent.agent import ContractorAgent
-
-    agent = ContractorAgent()
-    response = agent.chat(request.message)
-    agent.reset_conversation()
+    # Pooled instance: no client/Convex setup per request (a missing one is
+    # built in a worker thread). Native async chat: Claude calls don't block
+    # the event loop, tools run in threads
+    async with get_orchestrator().checkout_async("contractor-agent", request.session_id) as agent:
+        response = await agent.chat(request.message)
 
     return ChatResponse(
         response=response,
@@ -269,11 +340,8 @@ async def chat_contractor(request: ChatRequest):
 @app.post("/chat/project")
 async def chat_project(request: ChatRequest):
     """Direct access to Project Agent."""
-    from agents.project_agent.agent import ProjectAgent
-
-    agent = ProjectAgent()
-    response = agent.chat(request.message)
-    agent.reset_conversation()
+    async with get_orchestrator().checkout_async("project-agent", request.session_id) as agent:
+        response = await agent.chat(request.message)
 
     return ChatResponse(
         response=response,
@@ -284,6 +352,28 @@ async def chat_project(request: ChatRequest):
     )
 
 
+@app.delete("/sessions/{session_id}")
+async def end_session(session_id: str):
+    """End a direct-agent conversation; its agent returns to the pool."""
+    return {"session_id": session_id, "ended": get_orchestrator().agents.end_session(session_id)}
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Build the orchestrator and direct agents before the first request."""
+    orch = await run_in_threadpool(get_orchestrator)
+    await run_in_threadpool(lambda: orch.semantic_router)  # Embed agents now, not on the first miss
+    failures = {
+        agent_id: error
+        for agent_id, error in (await run_in_threadpool(orch.warm_up, DIRECT_AGENTS)).items()
+        if error
+    }
+    for agent_id, error in failures.items():
+        # Not fatal: the agent is built on its first request instead
+        logger.warning(f"Warm-up of {agent_id} failed: {error}")
+    logger.info(f"Agent pool warm: {orch.agents.stats()}")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -11,6 +11,7 @@ Usage:
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any, List
 import os
 import sys
@@ -21,6 +22,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from convex_agent import ConvexAgent, load_env
+from shared.agent_pool import AgentPool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -45,22 +47,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global agent instance
-agent = None
-
-def get_agent() -> ConvexAgent:
-    """Get or create unified agent."""
-    global agent
-    if agent is None:
-        logger.info("Initializing Unified Convex Agent...")
-        agent = ConvexAgent()
-        logger.info(f"✅ Agent ready with 17 tools")
-    return agent
+# Pooled agent instances: each chat gets its own (one per session_id, so a
+# conversation continues without mixing with other users'), built in a worker
+# thread and chatting in one - concurrent chats run side by side
+AGENT_ID = "convex-agent"
+agents = AgentPool({AGENT_ID: ConvexAgent})
 
 
 # Models
 class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=5000)
+    session_id: Optional[str] = Field(default=None, description="Continue this conversation (omit for a one-off question)")
 
     class Config:
         json_schema_extra = {
@@ -108,7 +105,8 @@ async def root():
 async def health():
     """Health check."""
     try:
-        agent = get_agent()
+        async with agents.checkout_async(AGENT_ID) as agent:
+            convex_url = agent.convex_url
 
         return HealthResponse(
             status="healthy",
@@ -120,7 +118,7 @@ async def health():
                 "tasks (0)",
                 "syncRecords"
             ],
-            convex_url=agent.convex_url
+            convex_url=convex_url
         )
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -141,11 +139,9 @@ async def chat(request: ChatRequest):
     try:
         logger.info(f"Query: {request.message[:100]}")
 
-        agent = get_agent()
-        response_text = agent.chat(request.message)
-
-        # Don't reset - maintain conversation context!
-        # agent.reset_conversation()
+        # Conversation context is kept per session_id
+        async with agents.checkout_async(AGENT_ID, request.session_id) as agent:
+            response_text = await run_in_threadpool(agent.chat, request.message)
 
         return ChatResponse(
             response=response_text,
@@ -160,16 +156,29 @@ async def chat(request: ChatRequest):
 
 
 @app.post("/reset")
-async def reset():
-    """Reset conversation history."""
+async def reset(session_id: str):
+    """Reset a session's conversation history."""
     try:
-        agent = get_agent()
-        agent.reset_conversation()
-        return {"message": "Conversation reset", "success": True}
+        ended = agents.end_session(session_id)
+        return {"message": "Conversation reset" if ended else "No such session", "success": ended}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Build an agent before the first request."""
+    for agent_id, error in (await run_in_threadpool(agents.warm_up)).items():
+        if error:
+            logger.warning(f"Warm-up of {agent_id} failed: {error}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drop pooled agents."""
+    agents.close()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -115,8 +115,8 @@ class ProactiveWorker:
                 "reason": "outside_work_hours"
             }
 
-        # Load queue
-        queue_data = self.queue.load_queue()
+        # Load queue counts
+        queue_data = self.queue.get_summary()
         total_tasks = queue_data["total_tasks"]
         high_conf_count = queue_data.get("high_confidence", 0)
 